@@ -0,0 +1,97 @@
+"""
+Compares blurhash_decode and blurhash_decode_many with the per-pixel
+reference decoder of tests/test_blurhash.py, checking that they decode
+the same pixels first.
+
+    python benchmarks/bench_blurhash.py [--size 32] [--count 100]
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from misskey.blurhash import (  # noqa: E402
+    _blurhash_decode_cached,
+    _decode_colors,
+    blurhash_decode_many,
+    blurhash_encode,
+)
+from tests.test_blurhash import reference_decode  # noqa: E402
+
+
+def best_of(repeat, func, *args):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(*args)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def clear_caches():
+    # The caches would skip the work after the first run
+    _blurhash_decode_cached.cache_clear()
+    _decode_colors.cache_clear()
+
+
+def decode_each(blurhashes, width, height):
+    clear_caches()
+    return np.stack([
+        _blurhash_decode_cached(blurhash, width, height, 1.0)
+        for blurhash in blurhashes
+    ])
+
+
+def decode_many(blurhashes, width, height):
+    clear_caches()
+    return blurhash_decode_many(blurhashes, width, height)
+
+
+def decode_reference(blurhashes, width, height):
+    return np.array([
+        reference_decode(blurhash, width, height) for blurhash in blurhashes
+    ])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip())
+    parser.add_argument("--size", type=int, default=32)
+    parser.add_argument("--count", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    blurhashes = [
+        blurhash_encode(
+            rng.integers(0, 256, size=(16, 16, 3)), 4, 3)
+        for _ in range(args.count)
+    ]
+
+    results = {}
+    for name, func in (
+        ("reference", decode_reference),
+        ("blurhash_decode", decode_each),
+        ("blurhash_decode_many", decode_many),
+    ):
+        results[name] = best_of(
+            args.repeat, func, blurhashes, args.size, args.size)
+
+    reference_time, expected = results.pop("reference")
+    print(f"{args.count} BlurHashes of 4x3 components "
+          f"decoded to {args.size}x{args.size}:")
+    print(f"  {'reference':20} {reference_time:8.3f} s")
+    for name, (seconds, images) in results.items():
+        # Sums in another order may round a channel the other way
+        if not np.allclose(images, expected, rtol=0, atol=1):
+            sys.exit(f"{name} differs from the reference decoder")
+        print(f"  {name:20} {seconds:8.3f} s"
+              f"  {reference_time / seconds:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""
+Compares the array functions of misskey.id.aid with the scalar path of
+AID, decoding and encoding the same IDs with both.
+
+    python benchmarks/bench_id.py [--count 1000000] [--repeat 3]
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from misskey.id.aid import (  # noqa: E402
+    AID,
+    AID_NOISE_LENGTH,
+    aids_to_timestamps,
+    timestamps_to_aids,
+)
+
+# 2020-01-01 to 2025-01-01 in UNIX time in milliseconds
+TIME_RANGE = (1577836800000, 1735689600000)
+
+
+def best_of(repeat, func, *args):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(*args)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def scalar_decode(ids):
+    return [AID(i).time_ms for i in ids]
+
+
+def scalar_encode(timestamps):
+    suffix = AID.MIN_SUFFIX
+    return [AID.get_time_part(ms) + suffix for ms in timestamps]
+
+
+def report(name, scalar, vectorized, count):
+    print(f"{name}:")
+    for label, seconds in (("scalar", scalar), ("vectorized", vectorized)):
+        print(f"  {label:10} {seconds:8.3f} s  {count / seconds:12,.0f} ids/s")
+    print(f"  speedup    {scalar / vectorized:8.1f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip())
+    parser.add_argument("--count", type=int, default=1000000)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    timestamps = rng.integers(*TIME_RANGE, size=args.count, dtype=np.int64)
+    noise = rng.integers(0, 36 ** AID_NOISE_LENGTH, size=args.count)
+    ids = timestamps_to_aids(timestamps, noise=noise).tolist()
+    timestamp_list = timestamps.tolist()
+
+    scalar, expected = best_of(args.repeat, scalar_decode, ids)
+    vectorized, decoded = best_of(args.repeat, aids_to_timestamps, ids)
+    if decoded.tolist() != expected:
+        sys.exit("aids_to_timestamps differs from AID.time_ms")
+    report("aids_to_timestamps", scalar, vectorized, args.count)
+
+    scalar, expected = best_of(args.repeat, scalar_encode, timestamp_list)
+    vectorized, encoded = best_of(
+        args.repeat, timestamps_to_aids, timestamps)
+    if encoded.tolist() != expected:
+        sys.exit("timestamps_to_aids differs from AID.get_time_part")
+    report("timestamps_to_aids", scalar, vectorized, args.count)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""
+Measures the import time of misskey with ``python -X importtime``, each
+run in a fresh interpreter so nothing is cached in sys.modules.
+
+    python benchmarks/bench_import.py [--runs 10] [--max-ms 50]
+
+With ``--max-ms``, exits with an error if ``import misskey`` takes longer
+than that (by the median), to catch regressions.
+"""
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+STATEMENTS = (
+    "import misskey",
+    "import misskey.id",
+    "from misskey import Misskey",
+)
+
+# "import time: self [us] | cumulative | imported package"
+IMPORTTIME_LINE = re.compile(r"^import time:\s+\d+ \|\s+(\d+) \| ( *)(\S+)$")
+
+
+def import_time_us(statement):
+    # Sums the top-level imports from the first misskey module onwards,
+    # which leaves out the startup of the interpreter
+    stderr = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        cwd=ROOT,
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stderr
+    total = 0
+    started = False
+    for line in stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if match is None or match.group(2):
+            continue
+        started = started or match.group(3).startswith("misskey")
+        if started:
+            total += int(match.group(1))
+    return total
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip())
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--max-ms", type=float, default=None)
+    args = parser.parse_args()
+
+    medians = {}
+    for statement in STATEMENTS:
+        times = [import_time_us(statement) / 1000 for _ in range(args.runs)]
+        medians[statement] = statistics.median(times)
+        print(f"{statement:30} median {medians[statement]:8.1f} ms"
+              f"  min {min(times):8.1f} ms")
+
+    if args.max_ms is not None and medians[STATEMENTS[0]] > args.max_ms:
+        sys.exit(f"{STATEMENTS[0]} took {medians[STATEMENTS[0]]:.1f} ms, "
+                 f"more than {args.max_ms} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,17 @@
-from .misskey import (
-    Misskey,
-)
+from typing import TYPE_CHECKING
+
+from ._lazy import lazy_attributes
 
 __version__ = "5.0.0.a1"  # PEP 440
+
+__all__ = (
+    "Misskey",
+)
+
+if TYPE_CHECKING:
+    from .misskey import Misskey
+
+# Loaded on first access, so "import misskey" stays cheap
+__getattr__, __dir__ = lazy_attributes(__name__, {
+    "Misskey": ".misskey",
+})
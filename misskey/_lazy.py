@@ -0,0 +1,33 @@
+import importlib
+import sys
+from typing import Any, Callable, Dict, List, Tuple
+
+__all__ = (
+    "lazy_attributes",
+)
+
+
+def lazy_attributes(
+    package: str,
+    attributes: Dict[str, str],
+) -> Tuple[Callable[[str], Any], Callable[[], List[str]]]:
+    """
+    Returns the module ``__getattr__`` and ``__dir__`` (PEP 562) of
+    ``package``, which import each of ``attributes`` from its (relative)
+    module on first access.
+    """
+    def __getattr__(name: str) -> Any:
+        try:
+            module_name = attributes[name]
+        except KeyError:
+            raise AttributeError(
+                f"module {package!r} has no attribute {name!r}") from None
+        value = getattr(importlib.import_module(module_name, package), name)
+        # Cache it, so __getattr__ is called only once per name
+        setattr(sys.modules[package], name, value)
+        return value
+
+    def __dir__() -> List[str]:
+        return sorted(set(vars(sys.modules[package])) | set(attributes))
+
+    return __getattr__, __dir__
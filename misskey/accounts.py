@@ -0,0 +1,66 @@
+import threading
+from typing import Dict, Generic, Optional, TypeVar
+
+from .base import BaseMisskey
+from .ratelimit import RateLimiter
+
+__all__ = (
+    "AccountPool",
+)
+
+ClientT = TypeVar("ClientT", bound=BaseMisskey)
+
+
+class AccountPool(Generic[ClientT]):
+    """
+    Serves many accounts of one instance over a single client.
+
+    ``pool.account(token)`` (or ``pool[token]``) returns a handle of
+    ``client`` which shares its session, so all accounts use one
+    connection pool. The handles of a token share one
+    :class:`~misskey.ratelimit.RateLimiter` of ``rate`` requests per
+    second if ``rate`` is given, which is penalized when the server
+    answers ``RATE_LIMIT_EXCEEDED``, so one account hitting its limit
+    does not slow down the others.
+
+    Works for both :class:`~misskey.Misskey` and
+    :class:`~misskey.asynchronous.AsyncMisskey`.
+    """
+
+    def __init__(
+        self,
+        client: ClientT, *,
+        rate: Optional[float] = None,
+        burst: int = 1,
+    ):
+        self.client = client
+        self.rate = rate
+        self.burst = burst
+        self._rate_limiters: Dict[str, RateLimiter] = {}
+        self._lock = threading.Lock()
+
+    def rate_limiter(self, token: str) -> Optional[RateLimiter]:
+        if self.rate is None:
+            return None
+        with self._lock:
+            limiter = self._rate_limiters.get(token)
+            if limiter is None:
+                limiter = RateLimiter(self.rate, self.burst)
+                self._rate_limiters[token] = limiter
+            return limiter
+
+    def account(self, token: str) -> ClientT:
+        return self.client.with_token(
+            token, rate_limiter=self.rate_limiter(token))
+
+    __getitem__ = account
+
+    def forget(self, token: str) -> None:
+        """
+        Drops the rate limit state of ``token``.
+        """
+        with self._lock:
+            self._rate_limiters.pop(token, None)
+
+    def __len__(self) -> int:
+        return len(self._rate_limiters)
@@ -1,3 +1,14 @@
-from .misskey import (
-    AsyncMisskey,
+from typing import TYPE_CHECKING
+
+from misskey._lazy import lazy_attributes
+
+__all__ = (
+    "AsyncMisskey",
 )
+
+if TYPE_CHECKING:
+    from .misskey import AsyncMisskey
+
+__getattr__, __dir__ = lazy_attributes(__name__, {
+    "AsyncMisskey": ".misskey",
+})
@@ -0,0 +1,60 @@
+import asyncio
+import datetime
+from typing import Any, Awaitable, Callable, List, Optional, Type
+
+from misskey.backfill import IDWindow, plan_id_windows, merge_windows
+from misskey.id import AID, MisskeyID
+
+__all__ = (
+    "fetch_window",
+    "backfill",
+)
+
+
+async def fetch_window(
+    fetch: Callable[..., Awaitable[List[Any]]],
+    window: IDWindow, *,
+    limit: int = 100,
+) -> List[Any]:
+    """
+    Fetches every item in a window with a cursor endpoint such as
+    ``AsyncMisskey.notes_local_timeline`` and returns them in ascending
+    order.
+    """
+    since_id, until_id = window
+    items = []
+    while True:
+        # With both since_id and until_id, items are returned newest first
+        page = await fetch(since_id=since_id, until_id=until_id, limit=limit)
+        if not page:
+            break
+        items.extend(page)
+        until_id = page[-1].id
+    items.reverse()
+    return items
+
+
+async def backfill(
+    fetch: Callable[..., Awaitable[List[Any]]],
+    since: datetime.datetime,
+    until: datetime.datetime, *,
+    windows: int = 8,
+    limit: int = 100,
+    concurrency: Optional[int] = None,
+    id_type: Type[MisskeyID] = AID,
+) -> List[Any]:
+    """
+    Fetches every item created in ``[since, until)`` from a cursor
+    endpoint, fetching up to ``concurrency`` time windows at once
+    (all windows if not given).
+    Use ``functools.partial`` to give other arguments to ``fetch``.
+    """
+    plan = plan_id_windows(since, until, windows, id_type=id_type)
+    semaphore = asyncio.Semaphore(concurrency or len(plan))
+
+    async def run(window: IDWindow) -> List[Any]:
+        async with semaphore:
+            return await fetch_window(fetch, window, limit=limit)
+
+    results = await asyncio.gather(*(run(window) for window in plan))
+    return merge_windows(results)
@@ -0,0 +1,242 @@
+import asyncio
+import concurrent.futures
+import functools
+import inspect
+import threading
+from concurrent.futures import Future
+from typing import (
+    TYPE_CHECKING, Any, Awaitable, Callable, Optional, TypeVar,
+)
+
+import aiohttp
+
+from .misskey import AsyncMisskey
+from misskey.enum import RequestPriorityEnum
+from misskey.misskey import Misskey
+from misskey.ratelimit import RateLimiter
+from misskey.registry import EndpointRegistry
+
+if TYPE_CHECKING:
+    from misskey.cache import PersistentCache
+    from misskey.circuit_breaker import CircuitBreaker
+    from misskey.scheduler import RequestScheduler
+    from misskey.transport import Transport
+
+__all__ = (
+    "BackgroundMisskey",
+    "BackgroundFutures",
+)
+
+T = TypeVar("T")
+
+
+class _EventLoopThread(object):
+    # Event loop running forever in a daemon thread
+
+    def __init__(self):
+        self.loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(
+            target=self._run, name="misskey-event-loop", daemon=True)
+        self._thread.start()
+
+    def _run(self) -> None:
+        asyncio.set_event_loop(self.loop)
+        self.loop.run_forever()
+
+    def submit(self, coro: Awaitable[T]) -> "Future[T]":
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    def stop(self) -> None:
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self._thread.join()
+        self.loop.close()
+
+
+class BackgroundMisskey(object):
+    """
+    Synchronous client which runs an :class:`AsyncMisskey` on an event loop
+    in a background thread.
+
+    It has the methods of :class:`misskey.Misskey` with the same
+    signatures, which block until the request is done. Unlike the sync
+    client, it can be called from many threads at once, and all requests
+    share one ``aiohttp`` session. The ``futures`` attribute has the same
+    methods, returning a :class:`concurrent.futures.Future` instead::
+
+        with BackgroundMisskey(address="misskey.io", token=token) as mk:
+            futures = [mk.futures.notes_show(note_id=i) for i in note_ids]
+            notes = [future.result() for future in futures]
+    """
+
+    client: AsyncMisskey
+    futures: "BackgroundFutures"
+
+    def __init__(
+        self, *,
+        address: str,
+        token: Optional[str] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        scheduler: Optional["RequestScheduler"] = None,
+        circuit_breaker: Optional["CircuitBreaker"] = None,
+        transport: Optional["Transport"] = None,
+        cache: Optional["PersistentCache"] = None,
+        limit: int = 100,
+        timeout: Optional[float] = None,
+    ):
+        runner = _EventLoopThread()
+
+        async def create_client() -> AsyncMisskey:
+            # The session must be created in its event loop
+            session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=limit))
+            return AsyncMisskey(
+                address=address,
+                token=token,
+                rate_limiter=rate_limiter,
+                scheduler=scheduler,
+                circuit_breaker=circuit_breaker,
+                transport=transport,
+                cache=cache,
+                session=session,
+            )
+
+        try:
+            client = runner.submit(create_client()).result()
+        except BaseException:
+            runner.stop()
+            raise
+        self._setup(runner, client, timeout, owner=True)
+
+    def _setup(
+        self,
+        runner: _EventLoopThread,
+        client: AsyncMisskey,
+        timeout: Optional[float], *,
+        owner: bool,
+    ) -> None:
+        self._runner = runner
+        self._owner = owner
+        self.client = client
+        self.timeout = timeout
+        self.futures = BackgroundFutures(self)
+
+    @property
+    def address(self) -> str:
+        return self.client.address
+
+    @property
+    def token(self) -> Optional[str]:
+        return self.client.token
+
+    @property
+    def registry(self) -> Optional[EndpointRegistry]:
+        return self.client.registry
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        return self._runner.loop
+
+    def submit(self, coro: Awaitable[T]) -> "Future[T]":
+        """
+        Schedules ``coro`` on the background loop.
+        """
+        return self._runner.submit(coro)
+
+    def run(self, coro: Awaitable[T]) -> T:
+        """
+        Runs ``coro`` on the background loop and returns its result.
+        If it takes longer than ``timeout``, it is cancelled and
+        :class:`concurrent.futures.TimeoutError` is raised.
+        """
+        future = self.submit(coro)
+        try:
+            return future.result(self.timeout)
+        except concurrent.futures.TimeoutError:
+            # Otherwise the request would keep running on the loop
+            future.cancel()
+            raise
+
+    def with_token(
+        self,
+        token: Optional[str], *,
+        rate_limiter: Optional[RateLimiter] = None,
+    ) -> "BackgroundMisskey":
+        """
+        Returns a handle for another account, which shares the loop and the
+        session of this client. Closing the handle does nothing.
+        """
+        handle = object.__new__(type(self))
+        handle._setup(
+            self._runner,
+            self.client.with_token(token, rate_limiter=rate_limiter),
+            self.timeout,
+            owner=False,
+        )
+        return handle
+
+    def with_priority(
+        self,
+        priority: Optional[RequestPriorityEnum],
+    ) -> "BackgroundMisskey":
+        """
+        Returns a handle whose requests have ``priority`` in the scheduler,
+        like :meth:`misskey.Misskey.with_priority`.
+        """
+        handle = object.__new__(type(self))
+        handle._setup(
+            self._runner,
+            self.client.with_priority(priority),
+            self.timeout,
+            owner=False,
+        )
+        return handle
+
+    def close(self) -> None:
+        if not self._owner or self._runner.loop.is_closed():
+            return
+        self.run(self.client.session.close())
+        self._runner.stop()
+
+    def __enter__(self) -> "BackgroundMisskey":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+class BackgroundFutures(object):
+    """
+    Methods of the :class:`AsyncMisskey` of a :class:`BackgroundMisskey`,
+    returning :class:`concurrent.futures.Future`.
+    """
+
+    def __init__(self, background: BackgroundMisskey):
+        self._background = background
+
+
+def _blocking_method(name: str) -> Callable[..., Any]:
+    @functools.wraps(getattr(Misskey, name))
+    def method(self: BackgroundMisskey, *args, **kwargs) -> Any:
+        return self.run(getattr(self.client, name)(*args, **kwargs))
+    return method
+
+
+def _future_method(name: str) -> Callable[..., Future]:
+    @functools.wraps(getattr(Misskey, name))
+    def method(self: BackgroundFutures, *args, **kwargs) -> Future:
+        background = self._background
+        return background.submit(
+            getattr(background.client, name)(*args, **kwargs))
+    return method
+
+
+# Every API method of the sync client is mirrored, so a method missing
+# from the async mixins fails here rather than at the call site
+for _name, _ in inspect.getmembers(Misskey, inspect.isfunction):
+    if _name.startswith("_") or _name in vars(BackgroundMisskey):
+        continue
+    if not inspect.iscoroutinefunction(getattr(AsyncMisskey, _name, None)):
+        raise RuntimeError(f"AsyncMisskey has no coroutine for {_name}")
+    setattr(BackgroundMisskey, _name, _blocking_method(_name))
+    setattr(BackgroundFutures, _name, _future_method(_name))
+del _name, _
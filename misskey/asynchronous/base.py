@@ -1,24 +1,36 @@
+import asyncio
+import contextlib
 import copy
 import json
-from typing import Optional, Any
+from typing import Any, AsyncContextManager, AsyncIterator, Optional, Tuple
 
 import aiohttp
 
 from misskey.base import BaseMisskey
 from misskey.exceptions import (
-    MisskeyAPIError,
     MisskeyNetworkError,
     MisskeyResponseError,
 )
 from misskey.enum import (
     HttpMethodEnum,
 )
+from misskey.multipart import (
+    MultipartEncoder,
+    UploadFile,
+    ProgressCallback,
+)
 
 __all__ = (
     "AsyncMisskey",
 )
 
 
+@contextlib.asynccontextmanager
+async def _no_slot() -> AsyncIterator[None]:
+    # contextlib.nullcontext is not an async context manager before 3.10
+    yield
+
+
 class AsyncMisskey(BaseMisskey):
     session: aiohttp.ClientSession
 
@@ -46,6 +58,81 @@ class AsyncMisskey(BaseMisskey):
         if self.token is not None:
             params["i"] = self.token
 
+        cache_key, cached = self._cache_lookup(endpoint, params)
+        if cached is not None:
+            return cached
+
+        self._check_circuit(endpoint)
+        async with self._request_slot(endpoint, params):
+            if self.rate_limiter is not None:
+                await self.rate_limiter.acquire_async()
+            with self._circuit_guard(endpoint):
+                body = await self._send_request(method, endpoint, params)
+
+        if cache_key is not None:
+            self._cache_store(cache_key, endpoint, body)
+        return body
+
+    async def _api_request_multipart(
+        self, *,
+        endpoint: str,
+        params: Optional[dict] = None,
+        file_field: str = "file",
+        upload: UploadFile,
+        progress: Optional[ProgressCallback] = None,
+        chunk_size: int = 256 * 1024,
+    ) -> Any:
+        # Multipart form fields are always strings
+        fields = {} if params is None else dict(params)
+        if self.token is not None:
+            fields["i"] = self.token
+
+        self._check_circuit(endpoint)
+        async with self._request_slot(endpoint, fields):
+            if self.rate_limiter is not None:
+                await self.rate_limiter.acquire_async()
+            body = MultipartEncoder(
+                fields=fields,
+                file_field=file_field,
+                upload=upload,
+                progress=progress,
+            )
+            with self._circuit_guard(endpoint):
+                return await self._send_multipart(endpoint, body, chunk_size)
+
+    async def _send_request(
+        self,
+        method: HttpMethodEnum,
+        endpoint: str,
+        params: dict,
+    ) -> Any:
+        if self.transport is not None:
+            status, body = await self.transport.send_request_async(
+                self, method, endpoint, params)
+        else:
+            status, body = await self._http_request(method, endpoint, params)
+        return self._handle_response(status, body)
+
+    async def _send_multipart(
+        self,
+        endpoint: str,
+        body: MultipartEncoder,
+        chunk_size: int,
+    ) -> Any:
+        if self.transport is not None:
+            status, data = await self.transport.send_multipart_async(
+                self, endpoint, body, chunk_size)
+        else:
+            status, data = await self._http_multipart(
+                endpoint, body, chunk_size)
+        return self._handle_response(status, data)
+
+    async def _http_request(
+        self,
+        method: HttpMethodEnum,
+        endpoint: str,
+        params: dict,
+    ) -> Tuple[int, Any]:
         try:
             if method == HttpMethodEnum.POST:
                 context = self.session.post(
@@ -54,25 +141,72 @@ class AsyncMisskey(BaseMisskey):
                     json=params,
                 )
             elif method == HttpMethodEnum.GET:
-                context = self.session.post(
-                    self.address + endpoint,
-                    headers={"Content-Type": "application/json"},
-                )
+                context = self.session.get(self.address + endpoint)
             else:
                 raise NotImplementedError()
             async with context as response_data:
-                if response_data.ok and response_data.status == 204:
-                    # response is ok, but body is empty
-                    return
-
-                response = await response_data.json()
-                if response_data.ok:
-                    return response
-                else:
-                    raise MisskeyAPIError.from_dict(response)
+                return await self._read_response(response_data)
+        except json.JSONDecodeError:
+            raise MisskeyResponseError("JSON decode error")
+        except aiohttp.ContentTypeError as e:
+            raise MisskeyNetworkError(f"Content-Type error: ${e}")
+        except aiohttp.ClientError as e:
+            raise MisskeyNetworkError(f"Could not complete request: {e}")
+        except asyncio.TimeoutError:
+            # Not a builtin TimeoutError before Python 3.11
+            raise MisskeyNetworkError("Request timed out")
+
+    async def _http_multipart(
+        self,
+        endpoint: str,
+        body: MultipartEncoder,
+        chunk_size: int,
+    ) -> Tuple[int, Any]:
+        async def stream_body():
+            loop = asyncio.get_running_loop()
+            while True:
+                # File reads are blocking, so run them in the executor
+                chunk = await loop.run_in_executor(None, body.read, chunk_size)
+                if not chunk:
+                    break
+                yield chunk
+
+        try:
+            async with self.session.post(
+                self.address + endpoint,
+                headers={
+                    "Content-Type": body.content_type,
+                    "Content-Length": str(len(body)),
+                },
+                data=stream_body(),
+            ) as response_data:
+                return await self._read_response(response_data)
         except json.JSONDecodeError:
             raise MisskeyResponseError("JSON decode error")
         except aiohttp.ContentTypeError as e:
             raise MisskeyNetworkError(f"Content-Type error: ${e}")
         except aiohttp.ClientError as e:
             raise MisskeyNetworkError(f"Could not complete request: {e}")
+        except asyncio.TimeoutError:
+            # Not a builtin TimeoutError before Python 3.11
+            raise MisskeyNetworkError("Request timed out")
+
+    @staticmethod
+    async def _read_response(
+        response_data: aiohttp.ClientResponse
+    ) -> Tuple[int, Any]:
+        if response_data.ok and response_data.status == 204:
+            # response is ok, but body is empty
+            return response_data.status, None
+
+        return response_data.status, await response_data.json()
+
+    def _request_slot(
+        self,
+        endpoint: str,
+        params: Optional[dict],
+    ) -> AsyncContextManager[None]:
+        if self.scheduler is None:
+            return _no_slot()
+        return self.scheduler.slot_async(
+            self._request_priority(endpoint, params))
@@ -0,0 +1,254 @@
+import asyncio
+import os
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    Hashable,
+    Iterable,
+    List,
+    Optional,
+    TypeVar,
+    Union,
+)
+
+from .misskey import AsyncMisskey
+from misskey.bulk_result import BulkResult
+from misskey.bulk import (
+    DRIVE_FILES_DELETE_MISSING_CODES,
+    NOTES_DELETE_MISSING_CODES,
+    NOTES_REACTIONS_DELETE_MISSING_CODES,
+    BulkCheckpoint,
+    BulkProgressCallback,
+    NoteSpec,
+    collect_note_results,
+    is_missing_error,
+    normalize_note_specs,
+    note_spec_parents,
+    open_checkpoint,
+    plan_note_specs,
+    resolve_note_params,
+    retry_delay,
+)
+from misskey.ratelimit import RateLimiter, is_rate_limit_error
+
+__all__ = (
+    "call_with_retry",
+    "bulk_notes_create",
+    "iter_bulk",
+    "bulk_notes_delete",
+    "bulk_notes_reactions_delete",
+    "bulk_drive_files_delete",
+)
+
+T = TypeVar("T")
+
+
+async def call_with_retry(
+    func: Callable[[], Awaitable[T]], *,
+    rate_limiter: Optional[RateLimiter] = None,
+    max_retries: int = 3,
+    base_delay: float = 1.0,
+) -> T:
+    """
+    Awaits ``func()`` after taking a token from ``rate_limiter``, retrying
+    with exponential backoff while the server answers
+    ``RATE_LIMIT_EXCEEDED``.
+    """
+    attempt = 0
+    while True:
+        if rate_limiter is not None:
+            await rate_limiter.acquire_async()
+        try:
+            return await func()
+        except Exception as e:
+            if not is_rate_limit_error(e) or attempt >= max_retries:
+                raise
+            delay = retry_delay(attempt, base_delay)
+            if rate_limiter is not None:
+                rate_limiter.penalize(delay)
+            else:
+                await asyncio.sleep(delay)
+            attempt += 1
+
+
+async def bulk_notes_create(
+    mk: AsyncMisskey,
+    specs: Iterable[Union[NoteSpec, Dict[str, Any]]], *,
+    concurrency: int = 4,
+    rate_limiter: Optional[RateLimiter] = None,
+    max_retries: int = 3,
+    progress: Optional[BulkProgressCallback] = None,
+) -> List[BulkResult]:
+    """
+    Posts many notes with ``notes_create``, ``concurrency`` at a time.
+
+    See :func:`misskey.bulk.bulk_notes_create` for the specs and results.
+    """
+    specs = normalize_note_specs(specs)
+    children = plan_note_specs(specs)
+    results: Dict[Hashable, BulkResult] = {}
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def post(spec: NoteSpec) -> None:
+        try:
+            params = resolve_note_params(spec, results)
+            async with semaphore:
+                value = await call_with_retry(
+                    lambda: mk.notes_create(**params),
+                    rate_limiter=rate_limiter,
+                    max_retries=max_retries,
+                )
+            result = BulkResult(key=spec.key, value=value)
+        except Exception as e:
+            result = BulkResult(key=spec.key, error=e)
+        results[spec.key] = result
+        if progress is not None:
+            progress(result)
+        await post_children(spec.key)
+
+    async def post_children(parent: Optional[Hashable]) -> None:
+        await asyncio.gather(*(
+            post(child) for child in children.pop(parent, [])
+            if all(p in results for p in note_spec_parents(child))
+        ))
+
+    await post_children(None)
+
+    return collect_note_results(specs, results)
+
+
+async def iter_bulk(
+    func: Callable[[Any], Awaitable[Any]],
+    keys: Iterable[Any], *,
+    concurrency: int = 4,
+    rate_limiter: Optional[RateLimiter] = None,
+    max_retries: int = 3,
+    checkpoint: Optional[Union[BulkCheckpoint, str, os.PathLike]] = None,
+    missing_codes: Iterable[str] = (),
+) -> AsyncIterator[BulkResult]:
+    """
+    Awaits ``func(key)`` for each key, ``concurrency`` at a time, and
+    yields a :class:`misskey.bulk_result.BulkResult` per key as it completes.
+
+    See :func:`misskey.bulk.iter_bulk` for the options.
+    """
+    checkpoint, owned = open_checkpoint(checkpoint)
+    missing_codes = tuple(missing_codes)
+
+    async def run(key: Any) -> BulkResult:
+        try:
+            value = await call_with_retry(
+                lambda: func(key),
+                rate_limiter=rate_limiter,
+                max_retries=max_retries,
+            )
+        except Exception as e:
+            if not is_missing_error(e, missing_codes):
+                return BulkResult(key=key, error=e)
+            value = None
+        return BulkResult(key=key, value=value)
+
+    pending = set()
+    try:
+        key_iter = iter(keys)
+        exhausted = False
+        while True:
+            while not exhausted and len(pending) < concurrency:
+                try:
+                    key = next(key_iter)
+                except StopIteration:
+                    exhausted = True
+                    break
+                if checkpoint is None or key not in checkpoint:
+                    pending.add(asyncio.ensure_future(run(key)))
+            if not pending:
+                break
+            done, pending = await asyncio.wait(
+                pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                result = task.result()
+                if checkpoint is not None:
+                    checkpoint.record(result)
+                yield result
+    finally:
+        for task in pending:
+            task.cancel()
+        if owned:
+            checkpoint.close()
+
+
+async def run_bulk(
+    func: Callable[[Any], Awaitable[Any]],
+    keys: Iterable[Any], *,
+    progress: Optional[BulkProgressCallback] = None,
+    **kwargs,
+) -> List[BulkResult]:
+    results = []
+    async for result in iter_bulk(func, keys, **kwargs):
+        results.append(result)
+        if progress is not None:
+            progress(result)
+    return results
+
+
+async def bulk_notes_delete(
+    mk: AsyncMisskey,
+    note_ids: Iterable[str], *,
+    progress: Optional[BulkProgressCallback] = None,
+    **kwargs,
+) -> List[BulkResult]:
+    """
+    Deletes many notes. Notes already deleted count as done.
+
+    Takes the options of :func:`iter_bulk`, and returns a
+    :class:`misskey.bulk.BulkResult` per note ID processed, in completion
+    order. ``progress`` is called with each result as it completes.
+    """
+    return await run_bulk(
+        lambda note_id: mk.notes_delete(note_id=note_id),
+        note_ids,
+        progress=progress,
+        missing_codes=NOTES_DELETE_MISSING_CODES,
+        **kwargs,
+    )
+
+
+async def bulk_notes_reactions_delete(
+    mk: AsyncMisskey,
+    note_ids: Iterable[str], *,
+    progress: Optional[BulkProgressCallback] = None,
+    **kwargs,
+) -> List[BulkResult]:
+    """
+    Removes own reactions from many notes. Notes not reacted to count as
+    done. See :func:`bulk_notes_delete` for the options and results.
+    """
+    return await run_bulk(
+        lambda note_id: mk.notes_reactions_delete(note_id=note_id),
+        note_ids,
+        progress=progress,
+        missing_codes=NOTES_REACTIONS_DELETE_MISSING_CODES,
+        **kwargs,
+    )
+
+
+async def bulk_drive_files_delete(
+    mk: AsyncMisskey,
+    file_ids: Iterable[str], *,
+    progress: Optional[BulkProgressCallback] = None,
+    **kwargs,
+) -> List[BulkResult]:
+    """
+    Deletes many drive files. Files already deleted count as done.
+    See :func:`bulk_notes_delete` for the options and results.
+    """
+    return await run_bulk(
+        lambda file_id: mk.drive_files_delete(file_id=file_id),
+        file_ids,
+        progress=progress,
+        missing_codes=DRIVE_FILES_DELETE_MISSING_CODES,
+        **kwargs,
+    )
@@ -0,0 +1,91 @@
+import asyncio
+import os
+from concurrent.futures import Executor
+from typing import Dict, Iterable, Optional, Union
+
+from .misskey import AsyncMisskey
+from misskey.bulk_result import BulkUploadResult
+from misskey.files import md5_file
+from misskey.schemas import DriveFile
+
+__all__ = (
+    "bulk_upload",
+)
+
+
+async def bulk_upload(
+    mk: AsyncMisskey,
+    paths: Iterable[Union[str, os.PathLike]], *,
+    folder_id: Optional[str] = None,
+    is_sensitive: bool = False,
+    reuse_existing: bool = True,
+    concurrency: int = 4,
+    hash_executor: Optional[Executor] = None,
+) -> BulkUploadResult:
+    """
+    Uploads many files to the drive, skipping files which already exist.
+
+    MD5s of the files are computed in ``hash_executor`` (the default
+    executor of the event loop if not given). When ``reuse_existing`` is
+    true, each distinct MD5 is looked up with ``drive_files_find_by_hash``
+    and an existing ``DriveFile`` is reused for it; otherwise a new copy is
+    always uploaded. The files are uploaded ``concurrency`` at a time, and
+    local files with the same contents are uploaded only once.
+
+    Returns a :class:`~misskey.bulk_result.BulkUploadResult` mapping each
+    local path (as ``str``) to its ``DriveFile``, or to the error which
+    stopped it. A failure only affects the paths with that content.
+    """
+    loop = asyncio.get_running_loop()
+    local_paths = [os.fspath(path) for path in paths]
+
+    result = BulkUploadResult()
+    digests = await asyncio.gather(*(
+        loop.run_in_executor(hash_executor, md5_file, path)
+        for path in local_paths
+    ), return_exceptions=True)
+    hashes: Dict[str, str] = {}
+    for path, digest in zip(local_paths, digests):
+        if isinstance(digest, Exception):
+            result.errors[path] = digest
+        elif isinstance(digest, BaseException):
+            raise digest
+        else:
+            hashes[path] = digest
+
+    # One representative path per distinct content
+    representatives: Dict[str, str] = {}
+    for path, md5 in hashes.items():
+        representatives.setdefault(md5, path)
+
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def resolve(md5: str, path: str) -> DriveFile:
+        async with semaphore:
+            if reuse_existing:
+                files = await mk.drive_files_find_by_hash(md5=md5)
+                if files:
+                    return files[0]
+            return await mk.drive_files_create(
+                file=path,
+                folder_id=folder_id,
+                is_sensitive=is_sensitive,
+                # Otherwise Misskey returns its file with the same MD5
+                force=not reuse_existing,
+            )
+
+    resolved = await asyncio.gather(*(
+        resolve(md5, path) for md5, path in representatives.items()
+    ), return_exceptions=True)
+    outcomes = dict(zip(representatives.keys(), resolved))
+
+    for path, md5 in hashes.items():
+        outcome = outcomes[md5]
+        if isinstance(outcome, Exception):
+            result.errors[path] = outcome
+        elif isinstance(outcome, BaseException):
+            # Cancellation is not a failure of the upload
+            raise outcome
+        else:
+            result.files[path] = outcome
+    return result
@@ -0,0 +1,36 @@
+from typing import List, Optional
+
+from .base import AsyncMisskey as Base
+
+from misskey.schemas import Note, NoteSchema
+from misskey.schemas.arguments import ChannelsTimelineArgumentsSchema
+
+__all__ = (
+    "AsyncMisskey",
+)
+
+
+class AsyncMisskey(Base):
+    async def channels_timeline(
+        self, *,
+        channel_id: str,
+        limit: int = 10,
+        since_id: Optional[str] = None,
+        until_id: Optional[str] = None,
+    ) -> List[Note]:
+        payload_dict = {
+            "channel_id": channel_id,
+            "limit": limit,
+        }
+        if since_id is not None:
+            payload_dict["since_id"] = since_id
+        if until_id is not None:
+            payload_dict["until_id"] = until_id
+
+        payload = ChannelsTimelineArgumentsSchema().dump(payload_dict)
+
+        return NoteSchema().load(
+            await self._api_request(
+                endpoint="/api/channels/timeline", params=payload),
+            many=True,
+        )
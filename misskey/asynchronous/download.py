@@ -0,0 +1,149 @@
+import asyncio
+import hashlib
+import os
+from typing import Iterable, Optional
+
+import aiohttp
+
+from .misskey import AsyncMisskey
+from misskey.bulk_result import BulkDownloadResult
+from misskey.download import (
+    DOWNLOAD_CHUNK_SIZE,
+    PART_SUFFIX,
+    PathLike,
+    get_download_url,
+    hash_partial_file,
+    verify_download,
+)
+from misskey.exceptions import (
+    MisskeyNetworkError,
+    MisskeyResponseError,
+)
+from misskey.multipart import ProgressCallback
+from misskey.schemas import DriveFile
+
+__all__ = (
+    "download_drive_file",
+    "download_drive_files",
+)
+
+
+async def download_drive_file(
+    mk: AsyncMisskey,
+    drive_file: DriveFile,
+    destination: PathLike, *,
+    thumbnail: bool = False,
+    resume: bool = True,
+    verify: bool = True,
+    chunk_size: int = DOWNLOAD_CHUNK_SIZE,
+    progress: Optional[ProgressCallback] = None,
+) -> str:
+    """
+    Downloads the contents of a drive file to ``destination``, streaming
+    it to disk in chunks of ``chunk_size`` bytes.
+    See :func:`misskey.download.download_drive_file` for resuming and
+    verification.
+
+    Returns the path of the downloaded file.
+    """
+    loop = asyncio.get_running_loop()
+    destination = os.fspath(destination)
+    part_path = destination + PART_SUFFIX
+    url = get_download_url(drive_file, thumbnail=thumbnail)
+
+    if resume:
+        digest, offset = await loop.run_in_executor(
+            None, hash_partial_file, part_path, chunk_size)
+    else:
+        digest, offset = hashlib.md5(), 0
+
+    headers = {}
+    if offset > 0:
+        headers["Range"] = f"bytes={offset}-"
+
+    try:
+        async with mk.session.get(url, headers=headers) as response:
+            if response.status == 416 and offset > 0:
+                # The part file is already complete
+                pass
+            else:
+                response.raise_for_status()
+                if response.status != 206:
+                    # The server ignored the Range header
+                    digest, offset = hashlib.md5(), 0
+                total = offset + (response.content_length or 0)
+
+                f = await loop.run_in_executor(
+                    None, open, part_path, "ab" if offset > 0 else "wb")
+                try:
+                    async for chunk in response.content.iter_chunked(
+                            chunk_size):
+                        # Disk writes are blocking
+                        await loop.run_in_executor(None, f.write, chunk)
+                        digest.update(chunk)
+                        offset += len(chunk)
+                        if progress is not None:
+                            progress(offset, max(total, offset))
+                finally:
+                    await loop.run_in_executor(None, f.close)
+    except aiohttp.ClientError as e:
+        raise MisskeyNetworkError(f"Could not complete download: {e}")
+    except asyncio.TimeoutError:
+        # Not a builtin TimeoutError before Python 3.11
+        raise MisskeyNetworkError("Download timed out")
+
+    if verify:
+        try:
+            verify_download(
+                drive_file, offset, digest.hexdigest(), thumbnail=thumbnail)
+        except MisskeyResponseError:
+            # Do not resume from a broken part file next time
+            os.remove(part_path)
+            raise
+
+    os.replace(part_path, destination)
+    return destination
+
+
+async def download_drive_files(
+    mk: AsyncMisskey,
+    drive_files: Iterable[DriveFile],
+    directory: PathLike, *,
+    concurrency: int = 4,
+    **kwargs,
+) -> BulkDownloadResult:
+    """
+    Downloads many drive files into ``directory``, ``concurrency`` at a
+    time. Each file is saved as ``{id}_{name}``; other keyword arguments
+    are passed to :func:`download_drive_file`.
+
+    See :func:`misskey.download.download_drive_files` for the result.
+    """
+    directory = os.fspath(directory)
+    os.makedirs(directory, exist_ok=True)
+    semaphore = asyncio.Semaphore(concurrency)
+    targets = {
+        drive_file.id: (drive_file, os.path.join(
+            directory,
+            f"{drive_file.id}_{os.path.basename(drive_file.name)}"))
+        for drive_file in drive_files
+    }
+
+    async def run(drive_file: DriveFile, path: str) -> str:
+        async with semaphore:
+            return await download_drive_file(mk, drive_file, path, **kwargs)
+
+    outcomes = await asyncio.gather(*(
+        run(drive_file, path) for drive_file, path in targets.values()
+    ), return_exceptions=True)
+
+    result = BulkDownloadResult()
+    for file_id, outcome in zip(targets.keys(), outcomes):
+        if isinstance(outcome, Exception):
+            result.errors[file_id] = outcome
+        elif isinstance(outcome, BaseException):
+            # Cancellation is not a failure of the download
+            raise outcome
+        else:
+            result.paths[file_id] = outcome
+    return result
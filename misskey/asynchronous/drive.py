@@ -0,0 +1,249 @@
+from typing import Optional, List, Union
+
+from .base import AsyncMisskey as Base
+
+from misskey.drive import (
+    UNCHANGED,
+    _Unchanged,
+    drive_files_create_fields,
+    drive_files_update_payload,
+)
+from misskey.multipart import UploadFile, UploadSource, ProgressCallback
+from misskey.schemas import (
+    Drive,
+    DriveSchema,
+    DriveFile,
+    DriveFileSchema,
+    DriveFolder,
+    DriveFolderSchema,
+)
+from misskey.schemas.arguments import (
+    DriveFilesArgumentsSchema,
+    DriveFoldersArgumentsSchema,
+)
+from misskey.enum import (
+    DriveFilesSortEnum,
+)
+
+__all__ = (
+    "AsyncMisskey",
+)
+
+
+class AsyncMisskey(Base):
+    async def drive(self) -> Drive:
+        return DriveSchema().load(
+            await self._api_request(endpoint="/api/drive"))
+
+    async def drive_files(
+        self, *,
+        limit: int = 10,
+        since_id: Optional[str] = None,
+        until_id: Optional[str] = None,
+        folder_id: Optional[str] = None,
+        type: Optional[str] = None,
+        sort: Optional[DriveFilesSortEnum] = None,
+    ) -> List[DriveFile]:
+        payload_dict = {
+            "limit": limit,
+            "folder_id": folder_id,
+        }
+        if since_id is not None:
+            payload_dict["since_id"] = since_id
+        if until_id is not None:
+            payload_dict["until_id"] = until_id
+        if type is not None:
+            payload_dict["type"] = type
+        if sort is not None:
+            payload_dict["sort"] = sort
+
+        payload = DriveFilesArgumentsSchema().dump(payload_dict)
+
+        return DriveFileSchema().load(
+            await self._api_request(
+                endpoint="/api/drive/files", params=payload),
+            many=True)
+
+    async def drive_files_create(
+        self, *,
+        file: UploadSource,
+        folder_id: Optional[str] = None,
+        name: Optional[str] = None,
+        comment: Optional[str] = None,
+        is_sensitive: bool = False,
+        force: bool = False,
+        progress: Optional[ProgressCallback] = None,
+        chunk_size: int = 256 * 1024,
+    ) -> DriveFile:
+        """
+        Uploads a file to the drive.
+
+        ``file`` can be a path, a binary file object, a memory-mapped file
+        or bytes. The file is streamed in chunks of ``chunk_size`` bytes
+        from its current position, so it is never loaded into memory as a
+        whole. ``progress`` is called with (bytes sent, total bytes).
+
+        Concurrent calls (e.g. with ``asyncio.gather``) share the
+        connection pool of the session.
+        """
+        with UploadFile.open(file, filename=name) as upload:
+            return DriveFileSchema().load(
+                await self._api_request_multipart(
+                    endpoint="/api/drive/files/create",
+                    params=drive_files_create_fields(
+                        folder_id=folder_id,
+                        name=name,
+                        comment=comment,
+                        is_sensitive=is_sensitive,
+                        force=force,
+                    ),
+                    upload=upload,
+                    progress=progress,
+                    chunk_size=chunk_size,
+                ))
+
+    async def drive_files_upload_from_url(
+        self, *,
+        url: str,
+        folder_id: Optional[str] = None,
+        is_sensitive: bool = False,
+        comment: Optional[str] = None,
+        marker: Optional[str] = None,
+        force: bool = False,
+    ) -> None:
+        # TODO
+        raise NotImplementedError()
+
+    async def drive_files_show(
+        self, *,
+        file_id: Optional[str] = None,
+        url: Optional[str] = None,
+    ) -> DriveFile:
+        payload = {}
+        if file_id is not None:
+            payload["fileId"] = file_id
+        if url is not None:
+            payload["url"] = url
+
+        return DriveFileSchema().load(
+            await self._api_request(
+                endpoint="/api/drive/files/show", params=payload))
+
+    async def drive_files_delete(
+        self, *,
+        file_id: str,
+    ) -> None:
+        payload = {
+            "fileId": file_id,
+        }
+        await self._api_request(
+            endpoint="/api/drive/files/delete", params=payload)
+
+    async def drive_files_update(
+        self, *,
+        file_id: str,
+        # None moves the file to the root folder
+        folder_id: Union[Optional[str], _Unchanged] = UNCHANGED,
+        name: Optional[str] = None,
+        is_sensitive: Optional[bool] = None,
+        # None removes the comment
+        comment: Union[Optional[str], _Unchanged] = UNCHANGED,
+    ) -> DriveFile:
+        payload = drive_files_update_payload(
+            file_id=file_id,
+            folder_id=folder_id,
+            name=name,
+            is_sensitive=is_sensitive,
+            comment=comment,
+        )
+        return DriveFileSchema().load(
+            await self._api_request(
+                endpoint="/api/drive/files/update", params=payload))
+
+    async def drive_files_find(
+        self, *,
+        name: str,
+        folder_id: Optional[str] = None,
+    ) -> List[DriveFile]:
+        # TODO
+        raise NotImplementedError()
+
+    async def drive_files_find_by_hash(
+        self, *,
+        md5: str,
+    ) -> List[DriveFile]:
+        payload = {
+            "md5": md5,
+        }
+        return DriveFileSchema().load(
+            await self._api_request(
+                endpoint="/api/drive/files/find-by-hash", params=payload),
+            many=True)
+
+    async def drive_files_check_existence(
+        self, *,
+        md5: str,
+    ) -> bool:
+        payload = {
+            "md5": md5,
+        }
+        return await self._api_request(
+            endpoint="/api/drive/files/check-existence", params=payload)
+
+    async def drive_files_attached_notes(
+        self, *,
+        file_id: str,
+        since_id: Optional[str] = None,
+        until_id: Optional[str] = None,
+        limit: int = 10,
+    ) -> List[DriveFile]:
+        # TODO
+        raise NotImplementedError()
+
+    async def drive_folders(
+        self, *,
+        limit: int = 10,
+        since_id: Optional[str] = None,
+        until_id: Optional[str] = None,
+        folder_id: Optional[str] = None,
+    ) -> List[DriveFolder]:
+        payload_dict = {
+            "limit": limit,
+            "folder_id": folder_id,
+        }
+        if since_id is not None:
+            payload_dict["since_id"] = since_id
+        if until_id is not None:
+            payload_dict["until_id"] = until_id
+
+        payload = DriveFoldersArgumentsSchema().dump(payload_dict)
+
+        return DriveFolderSchema().load(
+            await self._api_request(
+                endpoint="/api/drive/folders", params=payload),
+            many=True)
+
+    async def drive_folders_show(
+        self, *,
+        folder_id: str,
+    ) -> DriveFolder:
+        payload = {
+            "folderId": folder_id,
+        }
+        return DriveFolderSchema().load(
+            await self._api_request(
+                endpoint="/api/drive/folders/show", params=payload))
+
+    async def drive_folders_create(
+        self, *,
+        name: Optional[str] = None,
+        parent_id: Optional[str] = None,
+    ) -> DriveFolder:
+        payload = {
+            "parentId": parent_id,
+        }
+        if name is not None:
+            payload["name"] = name
+        return DriveFolderSchema().load(
+            await self._api_request(
+                endpoint="/api/drive/folders/create", params=payload))
@@ -0,0 +1,59 @@
+import asyncio
+from typing import Any, Awaitable, Callable, List, Optional
+
+from .misskey import AsyncMisskey
+from misskey.drive_walker import DRIVE_PAGE_LIMIT, DriveIndex
+from misskey.enum import DriveFilesSortEnum
+
+__all__ = (
+    "walk_drive",
+)
+
+
+async def fetch_all(
+    fetch: Callable[..., Awaitable[List[Any]]],
+    **kwargs,
+) -> List[Any]:
+    items = []
+    until_id = None
+    while True:
+        page = await fetch(
+            until_id=until_id, limit=DRIVE_PAGE_LIMIT, **kwargs)
+        items.extend(page)
+        if len(page) < DRIVE_PAGE_LIMIT:
+            return items
+        until_id = page[-1].id
+
+
+async def walk_drive(
+    mk: AsyncMisskey, *,
+    folder_id: Optional[str] = None,
+    sort: Optional[DriveFilesSortEnum] = None,
+    type: Optional[str] = None,
+    concurrency: int = 8,
+) -> DriveIndex:
+    """
+    Walks the folder tree under ``folder_id`` (the root of the drive if
+    not given) and returns a :class:`misskey.drive_walker.DriveIndex` of
+    all folders and files, fetching up to ``concurrency`` listings at once.
+    """
+    index = DriveIndex(root_folder_id=folder_id, sort=sort)
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def limited(fetch, **kwargs):
+        async with semaphore:
+            return await fetch_all(fetch, **kwargs)
+
+    async def visit(current_id: Optional[str], path: str):
+        folders, files = await asyncio.gather(
+            limited(mk.drive_folders, folder_id=current_id),
+            limited(mk.drive_files, folder_id=current_id, type=type),
+        )
+        index.add_files(path, files)
+        await asyncio.gather(*(
+            visit(folder.id, index.add_folder(path, folder))
+            for folder in folders
+        ))
+
+    await visit(folder_id, "")
+    return index
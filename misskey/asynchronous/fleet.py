@@ -0,0 +1,263 @@
+import asyncio
+import time
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Mapping,
+    Optional,
+    Tuple,
+    Union,
+)
+
+import aiohttp
+
+from .misskey import AsyncMisskey
+from misskey.bulk_result import BulkResult
+from misskey.schemas import Meta
+
+__all__ = (
+    "AsyncMisskeyFleet",
+)
+
+FleetCall = Union[str, Callable[[AsyncMisskey], Awaitable[Any]]]
+
+
+class _FleetMisskey(AsyncMisskey):
+    # Client of a fleet, which takes the semaphores of the fleet and of its
+    # host around each request
+    _fleet: "AsyncMisskeyFleet"
+
+    async def _api_request(self, **kwargs) -> Any:
+        fleet_limit, host_limit = self._fleet._limits(self.address)
+        async with fleet_limit, host_limit:
+            return await super()._api_request(**kwargs)
+
+    async def _api_request_multipart(self, **kwargs) -> Any:
+        fleet_limit, host_limit = self._fleet._limits(self.address)
+        async with fleet_limit, host_limit:
+            return await super()._api_request_multipart(**kwargs)
+
+
+class AsyncMisskeyFleet(object):
+    """
+    Clients of many Misskey instances over one ``aiohttp`` session.
+
+    Clients are created on first use of a host, and share the session and
+    its connector. At most ``per_host`` requests run at once against one
+    host, and ``concurrency`` requests in total. ``tokens`` maps hosts to
+    the tokens of their clients.
+
+    ``meta`` responses are cached per host for ``meta_ttl`` seconds
+    (forever if ``None``).
+    """
+
+    def __init__(
+        self,
+        hosts: Iterable[str] = (), *,
+        tokens: Optional[Mapping[str, str]] = None,
+        per_host: int = 4,
+        concurrency: int = 64,
+        session: Optional[aiohttp.ClientSession] = None,
+        meta_ttl: Optional[float] = 3600,
+    ):
+        if per_host < 1 or concurrency < 1:
+            raise ValueError("per_host and concurrency must be positive")
+        self.per_host = per_host
+        self.concurrency = concurrency
+        self.meta_ttl = meta_ttl
+        self._tokens = {
+            self.normalize_host(host): token
+            for host, token in (tokens or {}).items()
+        }
+        self._session = session
+        self._owns_session = session is None
+        self._limit: Optional[asyncio.Semaphore] = None
+        self._host_limits: Dict[str, asyncio.Semaphore] = {}
+        self._clients: Dict[str, AsyncMisskey] = {}
+        self._meta: Dict[Tuple[str, bool], Tuple[float, asyncio.Task]] = {}
+        self._hosts: List[str] = []
+        for host in hosts:
+            self.add(host)
+
+    @staticmethod
+    def normalize_host(host: str) -> str:
+        return AsyncMisskey._address_parse(host)
+
+    @property
+    def hosts(self) -> List[str]:
+        return list(self._hosts)
+
+    @property
+    def session(self) -> aiohttp.ClientSession:
+        if self._session is None:
+            # Created on first use, as it must be inside the event loop
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=self.concurrency,
+                    limit_per_host=self.per_host,
+                ))
+        return self._session
+
+    def add(self, host: str, token: Optional[str] = None) -> str:
+        """
+        Adds ``host`` to the hosts of the fleet and returns its address.
+        """
+        address = self.normalize_host(host)
+        if token is not None:
+            self._tokens[address] = token
+            self._clients.pop(address, None)
+        if address not in self._hosts:
+            self._hosts.append(address)
+        return address
+
+    def remove(self, host: str) -> None:
+        address = self.normalize_host(host)
+        if address in self._hosts:
+            self._hosts.remove(address)
+        self._clients.pop(address, None)
+        self._tokens.pop(address, None)
+        self._host_limits.pop(address, None)
+        for detail in (False, True):
+            self._meta.pop((address, detail), None)
+
+    def client(self, host: str) -> AsyncMisskey:
+        address = self.add(host)
+        client = self._clients.get(address)
+        if client is None:
+            client = _FleetMisskey(
+                address=address,
+                token=self._tokens.get(address),
+                session=self.session,
+            )
+            client._fleet = self
+            self._clients[address] = client
+        return client
+
+    __getitem__ = client
+
+    def _limits(
+        self, address: str
+    ) -> Tuple[asyncio.Semaphore, asyncio.Semaphore]:
+        # Created on first use, so that they belong to the running loop
+        if self._limit is None:
+            self._limit = asyncio.Semaphore(self.concurrency)
+        host_limit = self._host_limits.get(address)
+        if host_limit is None:
+            host_limit = asyncio.Semaphore(self.per_host)
+            self._host_limits[address] = host_limit
+        return self._limit, host_limit
+
+    async def meta(
+        self,
+        host: str, *,
+        detail: bool = False,
+        refresh: bool = False,
+    ) -> Meta:
+        """
+        Returns the cached ``meta`` of ``host``, fetching it if missing,
+        expired or ``refresh`` is set. Concurrent calls share one request.
+        """
+        key = (self.normalize_host(host), detail)
+        cached = self._meta.get(key)
+        now = time.monotonic()
+        if (cached is not None and not refresh and
+                (self.meta_ttl is None or now - cached[0] < self.meta_ttl)):
+            task = cached[1]
+        else:
+            task = asyncio.ensure_future(
+                self.client(key[0]).meta(detail=detail))
+            self._meta[key] = (now, task)
+        try:
+            # Shielded, so a cancelled caller does not cancel the others
+            return await asyncio.shield(task)
+        except Exception:
+            if self._meta.get(key, (None, None))[1] is task:
+                del self._meta[key]
+            raise
+
+    def invalidate_meta(self, host: Optional[str] = None) -> None:
+        if host is None:
+            self._meta.clear()
+            return
+        address = self.normalize_host(host)
+        for detail in (False, True):
+            self._meta.pop((address, detail), None)
+
+    async def map(
+        self,
+        func: FleetCall,
+        *args,
+        hosts: Optional[Iterable[str]] = None,
+        **kwargs,
+    ) -> AsyncIterator[BulkResult]:
+        """
+        Calls ``func`` for each host of the fleet (or of ``hosts``) and
+        yields a :class:`~misskey.bulk_result.BulkResult` keyed by the host
+        address as each call completes.
+
+        ``func`` is either the name of a client method, which is called
+        with ``args`` and ``kwargs``, or a coroutine function taking the
+        client, e.g. ``fleet.map("users", origin=UsersOriginEnum.LOCAL)``.
+        ``"meta"`` uses the cache of :meth:`meta`.
+        """
+        if isinstance(func, str):
+            name = func
+            if name == "meta":
+                def func(client: AsyncMisskey) -> Awaitable[Any]:
+                    return self.meta(client.address, *args, **kwargs)
+            else:
+                def func(client: AsyncMisskey) -> Awaitable[Any]:
+                    return getattr(client, name)(*args, **kwargs)
+
+        async def run(address: str) -> BulkResult:
+            try:
+                value = await func(self.client(address))
+            except Exception as e:
+                return BulkResult(address, error=e)
+            return BulkResult(address, value)
+
+        addresses = self.hosts if hosts is None else list(dict.fromkeys(
+            self.normalize_host(host) for host in hosts))
+        # Requests are limited by the semaphores, so all calls are started
+        tasks = [asyncio.ensure_future(run(address)) for address in addresses]
+        try:
+            for completed in asyncio.as_completed(tasks):
+                yield await completed
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def gather(
+        self,
+        func: FleetCall,
+        *args,
+        hosts: Optional[Iterable[str]] = None,
+        **kwargs,
+    ) -> Dict[str, BulkResult]:
+        """
+        Same as :meth:`map`, but returns all results keyed by host address.
+        """
+        return {
+            result.key: result
+            async for result in self.map(func, *args, hosts=hosts, **kwargs)
+        }
+
+    async def close(self) -> None:
+        for _, task in self._meta.values():
+            task.cancel()
+        self._meta.clear()
+        self._clients.clear()
+        if self._owns_session and self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    async def __aenter__(self) -> "AsyncMisskeyFleet":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
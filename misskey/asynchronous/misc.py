@@ -0,0 +1,99 @@
+from typing import Any, List, Optional
+
+from .base import AsyncMisskey as Base
+
+from misskey.enum import HttpMethodEnum
+from misskey.exceptions import (
+    MisskeyAPIError,
+    MisskeyNetworkError,
+    MisskeyResponseError,
+)
+from misskey.schemas import AnnouncementsSchema, Announcements
+from misskey.schemas.arguments import AnnouncementsArgumentsSchema
+from misskey.registry import (
+    REGISTRY_MAX_AGE,
+    EndpointRegistry,
+    prepare_call,
+    registry_cache_path,
+)
+
+__all__ = (
+    "AsyncMisskey",
+)
+
+
+class AsyncMisskey(Base):
+    registry: Optional[EndpointRegistry] = None
+
+    async def endpoints(self) -> List[str]:
+        return await self._api_request(endpoint="/api/endpoints")
+
+    async def fetch_registry(self) -> EndpointRegistry:
+        try:
+            document = await self._api_request(
+                method=HttpMethodEnum.GET, endpoint="/api.json")
+        except (MisskeyAPIError, MisskeyNetworkError, MisskeyResponseError):
+            # No OpenAPI document, so only the names are known
+            return EndpointRegistry.from_endpoint_names(
+                await self.endpoints())
+        return EndpointRegistry.from_openapi(document)
+
+    async def load_registry(
+        self, *,
+        cache_dir: Optional[str] = None,
+        max_age: Optional[float] = REGISTRY_MAX_AGE,
+        refresh: bool = False,
+        validate_responses: bool = False,
+    ) -> EndpointRegistry:
+        """
+        See :meth:`misskey.Misskey.load_registry`.
+        """
+        path = registry_cache_path(self.address, cache_dir)
+        registry = None
+        if not refresh:
+            registry = EndpointRegistry.load(path, max_age=max_age)
+        if registry is None:
+            registry = await self.fetch_registry()
+            try:
+                registry.save(path)
+            except OSError:
+                # Only a cache, e.g. on a read-only home directory
+                pass
+        registry.validate_responses = validate_responses
+        self.registry = registry
+        return registry
+
+    async def call(self, endpoint: str, params: Optional[dict] = None, /,
+                   **kwargs) -> Any:
+        """
+        See :meth:`misskey.Misskey.call`.
+        """
+        name, payload = prepare_call(self.registry, endpoint, params, kwargs)
+        response = await self._api_request(
+            endpoint=f"/api/{name}", params=payload)
+        if self.registry is not None and self.registry.validate_responses:
+            self.registry.validate_response(name, response)
+        return response
+
+    async def announcements(
+        self, *,
+        limit: int = 10,
+        with_unreads: bool = False,
+        since_id: Optional[str] = None,
+        until_id: Optional[str] = None,
+    ) -> Announcements:
+        payload_dict = {
+            "limit": limit,
+            "with_unreads": with_unreads,
+        }
+        if since_id is not None:
+            payload_dict["since_id"] = since_id
+        if until_id is not None:
+            payload_dict["until_id"] = until_id
+
+        payload = AnnouncementsArgumentsSchema().dump(payload_dict)
+
+        return AnnouncementsSchema().load(
+            await self._api_request(
+                endpoint="/api/announcements", params=payload),
+            many=True)
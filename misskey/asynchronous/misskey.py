@@ -1,6 +1,11 @@
 from .i import AsyncMisskey as MeAsyncMisskey
 from .notes import AsyncMisskey as NotesAsyncMisskey
 from .meta import AsyncMisskey as MetaAsyncMisskey
+from .drive import AsyncMisskey as DriveAsyncMisskey
+from .notifications import AsyncMisskey as NotificationsAsyncMisskey
+from .channels import AsyncMisskey as ChannelsAsyncMisskey
+from .users import AsyncMisskey as UsersAsyncMisskey
+from .misc import AsyncMisskey as MiscAsyncMisskey
 
 __all__ = (
     "AsyncMisskey",
@@ -11,6 +16,11 @@ class AsyncMisskey(
     MeAsyncMisskey,
     NotesAsyncMisskey,
     MetaAsyncMisskey,
+    DriveAsyncMisskey,
+    NotificationsAsyncMisskey,
+    ChannelsAsyncMisskey,
+    UsersAsyncMisskey,
+    MiscAsyncMisskey,
 ):
     """
     This class allows asynchronous processing and manipulation
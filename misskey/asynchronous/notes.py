@@ -1,3 +1,4 @@
+import datetime
 from typing import Optional, List
 
 from .base import AsyncMisskey as Base
@@ -9,9 +10,15 @@ from misskey.enum import (
 from misskey.schemas import (
     CreatedNote,
     CreatedNoteSchema,
+    Note,
+    NoteSchema,
 )
 from misskey.schemas.arguments import (
     NotesCreateArgumentsSchema,
+    NotesLocalTimelineArgumentsSchema,
+    NotesTimelineArgumentsSchema,
+    NotesHybridTimelineArgumentsSchema,
+    NotesGlobalTimelineArgumentsSchema,
 )
 from misskey.dict import (
     PollCreateDict,
@@ -21,6 +28,10 @@ __all__ = (
     "AsyncMisskey",
 )
 
+# Schemas are stateless, so the ones used per note are built only once
+_notes_create_arguments_schema = NotesCreateArgumentsSchema()
+_created_note_schema = CreatedNoteSchema()
+
 
 class AsyncMisskey(Base):
     async def notes_create(
@@ -68,14 +79,160 @@ class AsyncMisskey(Base):
 
         payload_dict.update(kwargs)
 
-        payload = NotesCreateArgumentsSchema().dump(payload_dict)
+        payload = _notes_create_arguments_schema.dump(payload_dict)
 
-        return CreatedNoteSchema().load(
+        return _created_note_schema.load(
             await self._api_request(endpoint="/api/notes/create",
                                     params=payload))
 
+    async def notes_show(self, *, note_id: str) -> Note:
+        payload = {
+            "noteId": note_id,
+        }
+        return NoteSchema().load(
+            await self._api_request(endpoint="/api/notes/show",
+                                    params=payload))
+
     async def notes_delete(self, *, note_id: str) -> None:
         payload = {
             "noteId": note_id,
         }
         await self._api_request(endpoint="/api/notes/delete", params=payload)
+
+    async def notes_reactions_create(
+        self, *,
+        note_id: str,
+        reaction: str,
+    ) -> None:
+        payload = {
+            "noteId": note_id,
+            "reaction": reaction,
+        }
+        await self._api_request(
+            endpoint="/api/notes/reactions/create", params=payload)
+
+    async def notes_reactions_delete(
+        self, *,
+        note_id: str,
+    ) -> None:
+        payload = {
+            "noteId": note_id,
+        }
+        await self._api_request(
+            endpoint="/api/notes/reactions/delete", params=payload)
+
+    async def notes_local_timeline(
+        self, *,
+        with_files: bool = False,
+        with_renotes: bool = False,
+        with_replies: bool = False,
+        exclude_nsfw: bool = False,
+        limit: int = 10,
+        since_id: Optional[str] = None,
+        until_id: Optional[str] = None,
+        # TODO: API is int, so convert
+        since_date: Optional[datetime.datetime] = None,
+        # TODO: API is int, so convert
+        until_date: Optional[datetime.datetime] = None,
+    ) -> List[Note]:
+        payload_dict = {
+            "with_files": with_files,
+            "with_renotes": with_renotes,
+            "with_replies": with_replies,
+            "exclude_nsfw": exclude_nsfw,
+            "limit": limit,
+        }
+        if since_id is not None:
+            payload_dict["since_id"] = since_id
+        if until_id is not None:
+            payload_dict["until_id"] = until_id
+
+        payload = NotesLocalTimelineArgumentsSchema().dump(payload_dict)
+
+        return NoteSchema().load(
+            await self._api_request(
+                endpoint="/api/notes/local-timeline", params=payload),
+            many=True,
+        )
+
+    async def notes_timeline(
+        self, *,
+        with_files: bool = False,
+        with_renotes: bool = False,
+        limit: int = 10,
+        since_id: Optional[str] = None,
+        until_id: Optional[str] = None,
+    ) -> List[Note]:
+        payload_dict = {
+            "with_files": with_files,
+            "with_renotes": with_renotes,
+            "limit": limit,
+        }
+        if since_id is not None:
+            payload_dict["since_id"] = since_id
+        if until_id is not None:
+            payload_dict["until_id"] = until_id
+
+        payload = NotesTimelineArgumentsSchema().dump(payload_dict)
+
+        return NoteSchema().load(
+            await self._api_request(
+                endpoint="/api/notes/timeline", params=payload),
+            many=True,
+        )
+
+    async def notes_hybrid_timeline(
+        self, *,
+        with_files: bool = False,
+        with_renotes: bool = False,
+        with_replies: bool = False,
+        exclude_nsfw: bool = False,
+        limit: int = 10,
+        since_id: Optional[str] = None,
+        until_id: Optional[str] = None,
+    ) -> List[Note]:
+        payload_dict = {
+            "with_files": with_files,
+            "with_renotes": with_renotes,
+            "with_replies": with_replies,
+            "exclude_nsfw": exclude_nsfw,
+            "limit": limit,
+        }
+        if since_id is not None:
+            payload_dict["since_id"] = since_id
+        if until_id is not None:
+            payload_dict["until_id"] = until_id
+
+        payload = NotesHybridTimelineArgumentsSchema().dump(payload_dict)
+
+        return NoteSchema().load(
+            await self._api_request(
+                endpoint="/api/notes/hybrid-timeline", params=payload),
+            many=True,
+        )
+
+    async def notes_global_timeline(
+        self, *,
+        with_files: bool = False,
+        with_renotes: bool = False,
+        limit: int = 10,
+        since_id: Optional[str] = None,
+        until_id: Optional[str] = None,
+    ) -> List[Note]:
+        payload_dict = {
+            "with_files": with_files,
+            "with_renotes": with_renotes,
+            "limit": limit,
+        }
+        if since_id is not None:
+            payload_dict["since_id"] = since_id
+        if until_id is not None:
+            payload_dict["until_id"] = until_id
+
+        payload = NotesGlobalTimelineArgumentsSchema().dump(payload_dict)
+
+        return NoteSchema().load(
+            await self._api_request(
+                endpoint="/api/notes/global-timeline", params=payload),
+            many=True,
+        )
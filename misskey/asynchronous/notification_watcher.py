@@ -0,0 +1,70 @@
+import asyncio
+from typing import AsyncIterator, List, Optional
+
+from .misskey import AsyncMisskey
+from misskey.notification_watcher import NotificationWatcherBase
+from misskey.schemas import Notification
+
+__all__ = (
+    "AsyncNotificationWatcher",
+)
+
+
+class AsyncNotificationWatcher(NotificationWatcherBase):
+    """
+    Watches notifications by adaptive polling.
+
+    .. code-block:: python
+
+       watcher = AsyncNotificationWatcher(mk, state_path="notifications.json")
+       async for notification in watcher:
+           await handle(notification)
+
+    See :class:`misskey.notification_watcher.NotificationWatcherBase`
+    for the options.
+    """
+
+    def __init__(self, mk: AsyncMisskey, **kwargs):
+        super().__init__(**kwargs)
+        self.mk = mk
+        # Created by watch(), as events are bound to the running loop on
+        # older versions of Python
+        self._stop_event: Optional[asyncio.Event] = None
+
+    async def poll(self) -> List[Notification]:
+        items = []
+        until_id = None
+        while True:
+            page = await self.mk.i_notifications(
+                **self._request_kwargs(until_id))
+            items.extend(page)
+            if not page or not self._has_more(page):
+                break
+            until_id = min(n.id for n in page)
+        return self._accept(items)
+
+    async def commit(self) -> None:
+        # Called after a batch is consumed
+        self._save_state()
+        if self._should_mark():
+            await self.mk.notifications_mark_all_as_read()
+            self._marked()
+
+    def stop(self) -> None:
+        if self._stop_event is not None:
+            self._stop_event.set()
+
+    async def watch(self) -> AsyncIterator[Notification]:
+        self._stop_event = asyncio.Event()
+        while not self._stop_event.is_set():
+            for notification in await self.poll():
+                yield notification
+            await self.commit()
+            try:
+                await asyncio.wait_for(
+                    self._stop_event.wait(), timeout=self.interval)
+            except asyncio.TimeoutError:
+                pass
+
+    def __aiter__(self) -> AsyncIterator[Notification]:
+        return self.watch()
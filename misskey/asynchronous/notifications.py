@@ -0,0 +1,75 @@
+from typing import Optional, List
+
+from .base import AsyncMisskey as Base
+
+from misskey.enum import NotificationTypeEnum
+from misskey.notifications import i_notifications_payload
+from misskey.schemas import (
+    Notification,
+    NotificationSchema,
+)
+
+__all__ = (
+    "AsyncMisskey",
+)
+
+
+class AsyncMisskey(Base):
+    async def i_notifications(
+        self, *,
+        limit: int = 10,
+        since_id: Optional[str] = None,
+        until_id: Optional[str] = None,
+        mark_as_read: bool = True,
+        include_types: Optional[List[NotificationTypeEnum]] = None,
+        exclude_types: Optional[List[NotificationTypeEnum]] = None,
+    ) -> List[Notification]:
+        payload = i_notifications_payload(
+            limit=limit,
+            since_id=since_id,
+            until_id=until_id,
+            mark_as_read=mark_as_read,
+            include_types=include_types,
+            exclude_types=exclude_types,
+        )
+        return NotificationSchema().load(
+            await self._api_request(
+                endpoint="/api/i/notifications", params=payload),
+            many=True)
+
+    async def i_notifications_grouped(
+        self, *,
+        limit: int = 10,
+        since_id: Optional[str] = None,
+        until_id: Optional[str] = None,
+        mark_as_read: bool = True,
+        include_types: Optional[List[NotificationTypeEnum]] = None,
+        exclude_types: Optional[List[NotificationTypeEnum]] = None,
+    ) -> List[Notification]:
+        payload = i_notifications_payload(
+            limit=limit,
+            since_id=since_id,
+            until_id=until_id,
+            mark_as_read=mark_as_read,
+            include_types=include_types,
+            exclude_types=exclude_types,
+        )
+        return NotificationSchema().load(
+            await self._api_request(
+                endpoint="/api/i/notifications-grouped", params=payload),
+            many=True)
+
+    async def notifications_create(
+        self, *,
+        body: str,
+        header: Optional[str] = None,
+        icon: Optional[str] = None,
+    ):
+        raise NotImplementedError()
+
+    async def notifications_mark_all_as_read(self) -> None:
+        await self._api_request(
+            endpoint="/api/notifications/mark-all-as-read")
+
+    async def notifications_test_notification(self):
+        raise NotImplementedError()
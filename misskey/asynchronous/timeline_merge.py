@@ -0,0 +1,168 @@
+import asyncio
+import heapq
+from collections import deque
+from typing import (
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Hashable,
+    List,
+    Optional,
+)
+
+from misskey.schemas import Note
+from misskey.timeline_merge import (
+    TimelineMergerBase,
+    newest_first,
+    oldest_first,
+)
+
+__all__ = (
+    "AsyncTimelineFetch",
+    "AsyncTimelineMerger",
+)
+
+AsyncTimelineFetch = Callable[..., Awaitable[List[Note]]]
+
+
+class _Descending(object):
+    __slots__ = ("value",)
+
+    def __init__(self, value: str):
+        self.value = value
+
+    def __lt__(self, other: "_Descending") -> bool:
+        return self.value > other.value
+
+
+class _SourcePager(object):
+    # Pages a source backwards, fetching the next page while the current
+    # one is merged
+
+    def __init__(
+        self,
+        fetch: AsyncTimelineFetch,
+        limit: int,
+        until_id: Optional[str],
+        since_id: Optional[str],
+    ):
+        self.fetch = fetch
+        self.limit = limit
+        self.since_id = since_id
+        self._buffer = deque()
+        self._task = asyncio.ensure_future(
+            fetch(limit=limit, until_id=until_id))
+
+    async def next(self) -> Optional[Note]:
+        while not self._buffer:
+            if self._task is None:
+                return None
+            page = newest_first(await self._task)
+            self._task = None
+            if len(page) >= self.limit:
+                self._task = asyncio.ensure_future(
+                    self.fetch(limit=self.limit, until_id=page[-1].id))
+            self._buffer.extend(page)
+        note = self._buffer.popleft()
+        if self.since_id is not None and note.id <= self.since_id:
+            self.close()
+            return None
+        return note
+
+    def close(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        self._buffer.clear()
+
+
+class AsyncTimelineMerger(TimelineMergerBase):
+    """
+    Merges several timelines into one stream ordered by note ID, with
+    duplicate notes and renotes removed. Sources are coroutine functions
+    such as ``mk.notes_local_timeline``.
+
+    See :class:`misskey.timeline_merge.TimelineMerger` for the usage.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Created by watch(), as events are bound to the running loop on
+        # older versions of Python
+        self._stop_event: Optional[asyncio.Event] = None
+
+    async def history(
+        self, *,
+        until_id: Optional[str] = None,
+        since_id: Optional[str] = None,
+    ) -> AsyncIterator[Note]:
+        """
+        Yields notes older than ``until_id`` (or the newest notes) down to
+        ``since_id`` (or the end of the timelines), newest first.
+        """
+        pagers = [
+            _SourcePager(fetch, self.limit, until_id, since_id)
+            for fetch in self.sources.values()
+        ]
+        try:
+            heap = []
+            heads = await asyncio.gather(*(pager.next() for pager in pagers))
+            for index, note in enumerate(heads):
+                if note is not None:
+                    heap.append((_Descending(note.id), index, note))
+            heapq.heapify(heap)
+
+            while heap:
+                _, index, note = heapq.heappop(heap)
+                if self._is_new(note):
+                    yield note
+                note = await pagers[index].next()
+                if note is not None:
+                    heapq.heappush(heap, (_Descending(note.id), index, note))
+        finally:
+            for pager in pagers:
+                pager.close()
+
+    async def _poll_source(self, name: Hashable) -> List[Note]:
+        fetch = self.sources[name]
+        since_id = self.cursors[name]
+        if since_id is None:
+            # First poll, so only the latest page
+            return oldest_first(await fetch(limit=self.limit))
+        notes = []
+        while True:
+            # With only since_id, pages are returned oldest first
+            page = oldest_first(
+                await fetch(limit=self.limit, since_id=since_id))
+            notes.extend(page)
+            if len(page) < self.limit:
+                return notes
+            since_id = page[-1].id
+
+    async def poll(self) -> List[Note]:
+        """
+        Fetches the notes posted to any source since the last poll, and
+        returns the new ones oldest first.
+        """
+        names = list(self.sources)
+        polled = await asyncio.gather(*(
+            self._poll_source(name) for name in names))
+        return self._merge_polled(dict(zip(names, polled)))
+
+    def stop(self) -> None:
+        if self._stop_event is not None:
+            self._stop_event.set()
+
+    async def watch(self, *, interval: float = 10.0) -> AsyncIterator[Note]:
+        """
+        Polls every ``interval`` seconds until :meth:`stop` is called.
+        """
+        self._stop_event = asyncio.Event()
+        while not self._stop_event.is_set():
+            for note in await self.poll():
+                yield note
+            try:
+                await asyncio.wait_for(
+                    self._stop_event.wait(), timeout=interval)
+            except asyncio.TimeoutError:
+                pass
@@ -0,0 +1,92 @@
+import datetime
+from typing import List, Optional, Union
+
+from .base import AsyncMisskey as Base
+
+from misskey.enum import (
+    UsersSortEnum,
+    UsersStateEnum,
+    UsersOriginEnum,
+)
+from misskey.exceptions import MisskeyResponseError
+from misskey.schemas import (
+    MeDetailed,
+    UserDetailed,
+    Note,
+)
+from misskey.users import (
+    load_user,
+    load_users,
+    users_payload,
+    users_show_payload,
+)
+
+__all__ = (
+    "AsyncMisskey",
+)
+
+
+class AsyncMisskey(Base):
+    async def users(
+        self, *,
+        limit: int = 10,
+        offset: int = 0,
+        sort: Optional[UsersSortEnum] = None,
+        state: Optional[UsersStateEnum] = None,
+        origin: UsersOriginEnum = UsersOriginEnum.LOCAL,
+        hostname: Optional[str] = None,
+    ) -> List[Union[UserDetailed, MeDetailed]]:
+        payload = users_payload(
+            limit=limit,
+            offset=offset,
+            sort=sort,
+            state=state,
+            origin=origin,
+            hostname=hostname,
+        )
+        return load_users(
+            await self._api_request(endpoint="/api/users", params=payload))
+
+    async def users_show(
+        self, *,
+        user_id: Optional[str] = None,
+        user_ids: Optional[List[str]] = None,
+        username: Optional[str] = None,
+        host: Optional[str] = None,
+    ) -> Union[
+        UserDetailed,
+        MeDetailed,
+        List[Union[UserDetailed, MeDetailed]]
+    ]:
+        payload = users_show_payload(
+            user_id=user_id,
+            user_ids=user_ids,
+            username=username,
+            host=host,
+        )
+        response = await self._api_request(
+            endpoint="/api/users/show", params=payload)
+
+        if type(response) is dict:
+            return load_user(response)
+        elif type(response) is list:
+            return load_users(response)
+        else:
+            raise MisskeyResponseError("Illegal response type received")
+
+    async def users_notes(
+        self, *,
+        user_id: str,
+        with_replies: bool = False,
+        with_renotes: bool = False,
+        with_channel_notes: bool = False,
+        limit: int = 10,
+        since_id: Optional[str] = None,
+        until_id: Optional[str] = None,
+        # TODO: How to process a date specification
+        since_date: Optional[datetime.datetime] = None,
+        until_date: Optional[datetime.datetime] = None,
+        with_files: bool = False,
+        exclude_nsfw: bool = False,
+    ) -> List[Note]:
+        raise NotImplementedError()
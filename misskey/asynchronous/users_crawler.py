@@ -0,0 +1,92 @@
+import asyncio
+from collections import deque
+from concurrent.futures import Executor
+from typing import AsyncIterator, Deque, List, Optional, Tuple, Union
+
+from .misskey import AsyncMisskey
+from misskey.enum import UsersOriginEnum, UsersSortEnum, UsersStateEnum
+from misskey.schemas import MeDetailed, UserDetailed
+from misskey.users import load_users, users_payload
+from misskey.users_crawler import USERS_PAGE_LIMIT
+
+__all__ = (
+    "crawl_users",
+)
+
+
+async def crawl_users(
+    mk: AsyncMisskey, *,
+    sort: Optional[UsersSortEnum] = None,
+    state: Optional[UsersStateEnum] = None,
+    origin: UsersOriginEnum = UsersOriginEnum.LOCAL,
+    hostname: Optional[str] = None,
+    offset: int = 0,
+    max_users: Optional[int] = None,
+    limit: int = USERS_PAGE_LIMIT,
+    concurrency: int = 4,
+    decode_executor: Optional[Executor] = None,
+) -> AsyncIterator[Union[UserDetailed, MeDetailed]]:
+    """
+    Yields all users matching the filters of ``users``, starting at
+    ``offset``, in the order of the listing, fetching up to
+    ``concurrency`` pages at once.
+
+    Pages are decoded in ``decode_executor`` (the default executor of the
+    event loop if not given), so decoding does not block the loop.
+    See :func:`misskey.users_crawler.crawl_users` for the details.
+    """
+    loop = asyncio.get_running_loop()
+
+    async def fetch(page_offset: int) -> Tuple[int, List]:
+        payload = users_payload(
+            limit=limit,
+            offset=page_offset,
+            sort=sort,
+            state=state,
+            origin=origin,
+            hostname=hostname,
+        )
+        raw = await mk._api_request(endpoint="/api/users", params=payload)
+        users = await loop.run_in_executor(decode_executor, load_users, raw)
+        return len(raw), users
+
+    seen = set()
+    count = 0
+    duplicates = 0
+
+    def wanted(page_offset: int) -> bool:
+        # Each duplicate skipped takes one more user from the listing
+        return (max_users is None or
+                page_offset < offset + max_users + duplicates)
+
+    pending: Deque[asyncio.Future] = deque()
+    next_offset = offset
+    finished = False
+    try:
+        while True:
+            while (not finished and len(pending) < concurrency and
+                   wanted(next_offset)):
+                pending.append(asyncio.ensure_future(fetch(next_offset)))
+                next_offset += limit
+            if not pending:
+                return
+
+            size, users = await pending.popleft()
+            if size < limit:
+                # End of data, so the pages after it are empty
+                finished = True
+                while pending:
+                    pending.pop().cancel()
+
+            for user in users:
+                if user.id in seen:
+                    duplicates += 1
+                    continue
+                seen.add(user.id)
+                yield user
+                count += 1
+                if max_users is not None and count >= max_users:
+                    return
+    finally:
+        for task in pending:
+            task.cancel()
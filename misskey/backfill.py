@@ -0,0 +1,132 @@
+import datetime
+import heapq
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Iterable, List, Optional, Tuple, Type
+
+from .id import AID, MisskeyID
+from .id.base import datetime_to_ms, ms_to_datetime
+
+__all__ = (
+    "plan_id_windows",
+    "merge_windows",
+    "fetch_window",
+    "backfill",
+)
+
+# (since_id, until_id)
+IDWindow = Tuple[str, str]
+
+
+def plan_id_windows(
+    since: datetime.datetime,
+    until: datetime.datetime,
+    windows: int, *,
+    id_type: Type[MisskeyID] = AID,
+) -> List[IDWindow]:
+    """
+    Splits ``[since, until)`` into ``windows`` time slices of equal length
+    and returns a ``(since_id, until_id)`` pair for each of them.
+
+    Both ``since_id`` and ``until_id`` are exclusive in Misskey's API, so
+    each window covers exactly the IDs generated in its time slice, and
+    adjacent windows neither overlap nor leave gaps.
+
+    Slices start and end on whole units of the ID's time part (seconds
+    for :class:`~misskey.id.ObjectID`), widening ``[since, until)`` to
+    them, as a boundary inside a unit would drop that unit from both
+    adjacent windows.
+    """
+    if windows < 1:
+        raise ValueError("windows must be 1 or more")
+
+    since_ms, until_ms = datetime_to_ms(since), datetime_to_ms(until)
+    if since_ms >= until_ms:
+        raise ValueError("since must be earlier than until")
+    resolution = id_type.TIME_RESOLUTION_MS
+    since_unit = since_ms // resolution
+    until_unit = -(-until_ms // resolution)
+    windows = min(windows, until_unit - since_unit)
+
+    boundaries = [
+        (since_unit + (until_unit - since_unit) * i // windows) * resolution
+        for i in range(windows + 1)
+    ]
+    return [
+        (
+            # The largest ID of the previous millisecond
+            str(id_type.upper_bound(ms_to_datetime(start - 1))),
+            str(id_type.lower_bound(ms_to_datetime(end))),
+        )
+        for start, end in zip(boundaries, boundaries[1:])
+    ]
+
+
+def merge_windows(
+    results: Iterable[List[Any]], *,
+    key: Callable[[Any], str] = lambda item: item.id,
+) -> List[Any]:
+    """
+    Merges the ascending results of each window into one ascending list,
+    dropping items with duplicated IDs.
+    """
+    merged = []
+    seen = set()
+    for item in heapq.merge(*results, key=key):
+        item_id = key(item)
+        if item_id not in seen:
+            seen.add(item_id)
+            merged.append(item)
+    return merged
+
+
+def fetch_window(
+    fetch: Callable[..., List[Any]],
+    window: IDWindow, *,
+    limit: int = 100,
+) -> List[Any]:
+    """
+    Fetches every item in a window with a cursor endpoint such as
+    ``Misskey.notes_local_timeline`` and returns them in ascending order.
+    """
+    since_id, until_id = window
+    items = []
+    while True:
+        # With both since_id and until_id, items are returned newest first
+        page = fetch(since_id=since_id, until_id=until_id, limit=limit)
+        if not page:
+            break
+        items.extend(page)
+        until_id = page[-1].id
+    items.reverse()
+    return items
+
+
+def backfill(
+    fetch: Callable[..., List[Any]],
+    since: datetime.datetime,
+    until: datetime.datetime, *,
+    windows: int = 8,
+    limit: int = 100,
+    max_workers: Optional[int] = None,
+    id_type: Type[MisskeyID] = AID,
+) -> List[Any]:
+    """
+    Fetches every item created in ``[since, until)`` from a cursor
+    endpoint, fetching the time windows in parallel with threads.
+    Use ``functools.partial`` to give other arguments to ``fetch``.
+
+    .. code-block:: python
+
+       notes = backfill(
+           mk.notes_local_timeline,
+           datetime.datetime(2023, 1, 1, tzinfo=datetime.timezone.utc),
+           datetime.datetime(2024, 1, 1, tzinfo=datetime.timezone.utc),
+           windows=16,
+       )
+    """
+    plan = plan_id_windows(since, until, windows, id_type=id_type)
+    with ThreadPoolExecutor(
+            max_workers=max_workers or len(plan)) as executor:
+        results = list(executor.map(
+            lambda window: fetch_window(fetch, window, limit=limit), plan))
+    return merge_windows(results)
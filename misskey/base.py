@@ -1,11 +1,30 @@
+from __future__ import annotations
+
+import contextlib
+import copy
 from urllib.parse import urlparse
 
-from typing import Optional, Any
+from typing import (
+    TYPE_CHECKING, Optional, Any, ContextManager, Tuple, TypeVar,
+)
+
+from .exceptions import MisskeyAPIError
+
+if TYPE_CHECKING:
+    # Only imported for annotations, as most clients use none of them
+    from .cache import PersistentCache
+    from .circuit_breaker import CircuitBreaker
+    from .enum import RequestPriorityEnum
+    from .ratelimit import RateLimiter
+    from .scheduler import RequestScheduler
+    from .transport import Transport
 
 __all__ = (
     "BaseMisskey",
 )
 
+MisskeyT = TypeVar("MisskeyT", bound="BaseMisskey")
+
 
 class BaseMisskey(object):
     """
@@ -17,6 +36,17 @@ class BaseMisskey(object):
 
     _address: str
     _token: Optional[str] = None
+    # Taken before each request of this client (or account handle)
+    rate_limiter: Optional[RateLimiter] = None
+    # Admits each request by its priority
+    scheduler: Optional[RequestScheduler] = None
+    request_priority: Optional[RequestPriorityEnum] = None
+    # Fails fast on endpoints which keep failing
+    circuit_breaker: Optional[CircuitBreaker] = None
+    # Sends the requests instead of the session, e.g. to record or replay
+    transport: Optional[Transport] = None
+    # Keeps responses of slowly changing endpoints across processes
+    cache: Optional[PersistentCache] = None
 
     @property
     def address(self) -> str:
@@ -30,10 +60,102 @@ class BaseMisskey(object):
         self, *,
         address: str,
         token: Optional[str] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        scheduler: Optional[RequestScheduler] = None,
+        circuit_breaker: Optional[CircuitBreaker] = None,
+        transport: Optional[Transport] = None,
+        cache: Optional[PersistentCache] = None,
     ):
         self._address = self._address_parse(address)
 
         self._token = token
+        self.rate_limiter = rate_limiter
+        self.scheduler = scheduler
+        self.circuit_breaker = circuit_breaker
+        self.transport = transport
+        self.cache = cache
+
+    def with_token(
+        self: MisskeyT,
+        token: Optional[str], *,
+        rate_limiter: Optional[RateLimiter] = None,
+    ) -> MisskeyT:
+        """
+        Returns a handle of this client for another account.
+
+        The handle is a shallow copy, so it shares the session and its
+        connection pool, and only differs in the token and the rate
+        limiter. Creating one per call is cheap.
+        """
+        handle = copy.copy(self)
+        handle._token = token
+        handle.rate_limiter = rate_limiter
+        return handle
+
+    def with_priority(
+        self: MisskeyT,
+        priority: Optional[RequestPriorityEnum],
+    ) -> MisskeyT:
+        """
+        Returns a handle of this client whose requests have ``priority`` in
+        its scheduler, e.g. for background crawls. ``None`` lets the
+        scheduler classify each request.
+        """
+        handle = copy.copy(self)
+        handle.request_priority = priority
+        return handle
+
+    def _request_priority(
+        self,
+        endpoint: str,
+        params: Optional[dict],
+    ) -> RequestPriorityEnum:
+        if self.request_priority is not None:
+            return self.request_priority
+        return self.scheduler.classify(endpoint, params)
+
+    def _cache_lookup(
+        self,
+        endpoint: str,
+        params: Optional[dict],
+    ) -> Tuple[Optional[str], Any]:
+        # Returns the cache key (None if not cached) and the cached response
+        if self.cache is None or not self.cache.caches(endpoint):
+            return None, None
+        key = self.cache.key(self.address, endpoint, params, self.token)
+        return key, self.cache.get(key, self.address)
+
+    def _cache_store(self, key: str, endpoint: str, body: Any) -> None:
+        if endpoint == "/api/meta" and isinstance(body, dict) and (
+                body.get("version") is not None):
+            self.cache.set_version(self.address, body["version"])
+        self.cache.put(key, self.address, endpoint, body)
+
+    def _check_circuit(self, endpoint: str) -> None:
+        # Before queueing, so that requests to a failing endpoint fail fast
+        if self.circuit_breaker is not None:
+            self.circuit_breaker.check(endpoint)
+
+    def _circuit_guard(self, endpoint: str) -> ContextManager[None]:
+        if self.circuit_breaker is None:
+            return contextlib.nullcontext()
+        return self.circuit_breaker.guard(endpoint)
+
+    def _on_api_error(self, error: MisskeyAPIError) -> None:
+        if self.rate_limiter is not None:
+            # Imported here, as only clients with a rate limiter need it
+            from .ratelimit import is_rate_limit_error
+
+            if is_rate_limit_error(error):
+                self.rate_limiter.penalize()
+
+    def _handle_response(self, status: int, body: Any) -> Any:
+        # Same as the "ok" of requests and aiohttp
+        if status < 400:
+            return body
+        error = MisskeyAPIError.from_dict(body)
+        self._on_api_error(error)
+        raise error
 
     @staticmethod
     def _address_parse(address: str) -> str:
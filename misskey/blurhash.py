@@ -0,0 +1,230 @@
+import functools
+import math
+from typing import Dict, Iterable, List, Tuple
+
+import numpy as np
+
+__all__ = (
+    "blurhash_decode",
+    "blurhash_decode_many",
+    "blurhash_encode",
+    "blurhash_components",
+)
+
+BASE83_DIGITS = (
+    "0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz"
+    "#$%*+,-.:;=?@[]^_{|}~"
+)
+_BASE83_VALUES = {char: value for value, char in enumerate(BASE83_DIGITS)}
+
+# The colors of a hash take at most 2 KB, so many of them are cached
+COLORS_CACHE_SIZE = 4096
+# Decoded images are cached by (hash, width, height, punch). They take
+# width * height * 3 bytes each, so only a few are kept.
+DECODE_CACHE_SIZE = 32
+
+
+def _decode83(value: str) -> int:
+    result = 0
+    for char in value:
+        try:
+            result = result * 83 + _BASE83_VALUES[char]
+        except KeyError:
+            raise ValueError(f'Invalid BlurHash character "{char}"')
+    return result
+
+
+def _encode83(value: int, length: int) -> str:
+    chars = []
+    for _ in range(length):
+        value, remainder = divmod(value, 83)
+        chars.append(BASE83_DIGITS[remainder])
+    return "".join(reversed(chars))
+
+
+def _srgb_to_linear(value: np.ndarray) -> np.ndarray:
+    value = np.asarray(value, dtype=np.float64) / 255
+    return np.where(
+        value <= 0.04045,
+        value / 12.92,
+        ((value + 0.055) / 1.055) ** 2.4)
+
+
+def _linear_to_srgb(value: np.ndarray) -> np.ndarray:
+    value = np.clip(value, 0, 1)
+    return np.where(
+        value <= 0.0031308,
+        value * 12.92 * 255 + 0.5,
+        (1.055 * value ** (1 / 2.4) - 0.055) * 255 + 0.5,
+    ).astype(np.uint8)
+
+
+def _sign_pow(value: np.ndarray, exponent: float) -> np.ndarray:
+    return np.copysign(np.abs(value) ** exponent, value)
+
+
+@functools.lru_cache(maxsize=256)
+def _cosine_basis(components: int, size: int) -> np.ndarray:
+    # basis[i, x] = cos(pi * i * x / size)
+    basis = np.cos(
+        np.pi * np.outer(np.arange(components), np.arange(size)) / size)
+    basis.setflags(write=False)
+    return basis
+
+
+def blurhash_components(blurhash: str) -> Tuple[int, int]:
+    """
+    Returns the number of components (x, y) of a BlurHash.
+    """
+    if len(blurhash) < 6:
+        raise ValueError("BlurHash must be at least 6 characters")
+    size_flag = _decode83(blurhash[0])
+    return size_flag % 9 + 1, size_flag // 9 + 1
+
+
+@functools.lru_cache(maxsize=COLORS_CACHE_SIZE)
+def _decode_colors(blurhash: str, punch: float) -> np.ndarray:
+    # Returns the linear RGB factors of shape (components_y, components_x, 3)
+    components_x, components_y = blurhash_components(blurhash)
+    if len(blurhash) != 4 + 2 * components_x * components_y:
+        raise ValueError(
+            f"BlurHash length must be {4 + 2 * components_x * components_y}"
+            f", got {len(blurhash)}")
+
+    max_value = (_decode83(blurhash[1]) + 1) / 166 * punch
+
+    dc = _decode83(blurhash[2:6])
+    ac = np.array([
+        _decode83(blurhash[i:i + 2]) for i in range(6, len(blurhash), 2)
+    ], dtype=np.int64)
+
+    colors = np.empty((components_x * components_y, 3), dtype=np.float64)
+    colors[0] = _srgb_to_linear([dc >> 16, (dc >> 8) & 255, dc & 255])
+    quantised = np.stack([ac // (19 * 19), (ac // 19) % 19, ac % 19], axis=1)
+    colors[1:] = _sign_pow((quantised - 9) / 9, 2) * max_value
+    colors = colors.reshape(components_y, components_x, 3)
+    colors.setflags(write=False)
+    return colors
+
+
+@functools.lru_cache(maxsize=DECODE_CACHE_SIZE)
+def _blurhash_decode_cached(
+    blurhash: str, width: int, height: int, punch: float,
+) -> np.ndarray:
+    colors = _decode_colors(blurhash, punch)
+    components_y, components_x, _ = colors.shape
+    pixels = np.einsum(
+        "jic,jy,ix->yxc",
+        colors,
+        _cosine_basis(components_y, height),
+        _cosine_basis(components_x, width),
+        optimize=True,
+    )
+    image = _linear_to_srgb(pixels)
+    image.setflags(write=False)
+    return image
+
+
+def blurhash_decode(
+    blurhash: str,
+    width: int,
+    height: int, *,
+    punch: float = 1.0,
+) -> np.ndarray:
+    """
+    Decodes a BlurHash (e.g. ``DriveFile.blurhash``) into an RGB image,
+    a read-only ``uint8`` array of shape ``(height, width, 3)``.
+
+    The last few results are cached by the arguments, so the same
+    placeholder is decoded only once. Copy the array to modify it.
+    """
+    return _blurhash_decode_cached(blurhash, width, height, float(punch))
+
+
+def blurhash_decode_many(
+    blurhashes: Iterable[str],
+    width: int,
+    height: int, *,
+    punch: float = 1.0,
+) -> np.ndarray:
+    """
+    Decodes many BlurHashes into images of the same size at once.
+    Returns a ``uint8`` array of shape ``(n, height, width, 3)``.
+
+    Hashes with the same number of components are decoded together with
+    a single tensor contraction, so a page of placeholders costs a few
+    NumPy calls instead of one per hash.
+    """
+    blurhashes = list(blurhashes)
+    images = np.empty((len(blurhashes), height, width, 3), dtype=np.uint8)
+
+    groups: Dict[Tuple[int, int], List[int]] = {}
+    for index, blurhash in enumerate(blurhashes):
+        groups.setdefault(blurhash_components(blurhash), []).append(index)
+
+    for (components_x, components_y), indices in groups.items():
+        colors = np.stack([
+            _decode_colors(blurhashes[i], float(punch)) for i in indices])
+        pixels = np.einsum(
+            "njic,jy,ix->nyxc",
+            colors,
+            _cosine_basis(components_y, height),
+            _cosine_basis(components_x, width),
+            optimize=True,
+        )
+        images[indices] = _linear_to_srgb(pixels)
+    return images
+
+
+def blurhash_encode(
+    image: np.ndarray,
+    components_x: int = 4,
+    components_y: int = 3,
+) -> str:
+    """
+    Encodes an RGB image (an array of shape ``(height, width, 3)`` with
+    values in 0-255) into a BlurHash.
+    """
+    if not (1 <= components_x <= 9 and 1 <= components_y <= 9):
+        raise ValueError("Number of components must be from 1 to 9")
+    image = np.asarray(image)
+    if image.ndim != 3 or image.shape[2] < 3:
+        raise ValueError("image must be an array of shape (height, width, 3)")
+    height, width = image.shape[:2]
+
+    linear = _srgb_to_linear(image[:, :, :3])
+    factors = np.einsum(
+        "jy,ix,yxc->jic",
+        _cosine_basis(components_y, height),
+        _cosine_basis(components_x, width),
+        linear,
+        optimize=True,
+    ) / (width * height)
+    # All factors but DC are normalised by 2
+    factors *= 2
+    factors[0, 0] /= 2
+
+    factors = factors.reshape(components_x * components_y, 3)
+    dc, ac = factors[0], factors[1:]
+
+    blurhash = _encode83((components_x - 1) + (components_y - 1) * 9, 1)
+
+    if len(ac) > 0:
+        actual_max = float(np.abs(ac).max())
+        quantised_max = max(0, min(82, math.floor(actual_max * 166 - 0.5)))
+        max_value = (quantised_max + 1) / 166
+        blurhash += _encode83(quantised_max, 1)
+    else:
+        max_value = 1
+        blurhash += _encode83(0, 1)
+
+    red, green, blue = (int(v) for v in _linear_to_srgb(dc))
+    blurhash += _encode83((red << 16) + (green << 8) + blue, 4)
+
+    quantised = np.clip(
+        np.floor(_sign_pow(ac / max_value, 0.5) * 9 + 9.5), 0, 18,
+    ).astype(np.int64)
+    for r, g, b in quantised:
+        blurhash += _encode83(int(r * 19 * 19 + g * 19 + b), 2)
+
+    return blurhash
@@ -0,0 +1,453 @@
+import json
+import os
+import time
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Future,
+    ThreadPoolExecutor,
+    wait,
+)
+from dataclasses import dataclass, field
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Hashable,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    TypeVar,
+    Union,
+)
+
+from .bulk_result import BulkResult
+from .exceptions import MisskeyAPIError, MisskeyIllegalArgumentError
+from .misskey import Misskey
+from .ratelimit import RateLimiter, is_rate_limit_error
+from .schemas import CreatedNote
+
+__all__ = (
+    "BulkResult",
+    "BulkProgressCallback",
+    "NoteSpec",
+    "call_with_retry",
+    "bulk_notes_create",
+    "BulkCheckpoint",
+    "iter_bulk",
+    "bulk_notes_delete",
+    "bulk_notes_reactions_delete",
+    "bulk_drive_files_delete",
+)
+
+T = TypeVar("T")
+
+# Error codes meaning the target is already gone, so deleting it again
+# is counted as done
+NOTES_DELETE_MISSING_CODES = ("NO_SUCH_NOTE",)
+NOTES_REACTIONS_DELETE_MISSING_CODES = ("NO_SUCH_NOTE", "NOT_REACTED")
+DRIVE_FILES_DELETE_MISSING_CODES = ("NO_SUCH_FILE",)
+
+
+BulkProgressCallback = Callable[[BulkResult], None]
+
+
+@dataclass
+class NoteSpec:
+    """
+    A note to post with :func:`bulk_notes_create`.
+
+    ``params`` are the keyword arguments of ``notes_create``. ``reply_to``
+    and ``renote_of`` refer to the ``key`` of another spec in the same
+    batch, whose note ID is used as ``reply_id`` / ``renote_id`` once it
+    is posted. ``key`` defaults to the index of the spec in the batch.
+    """
+    params: Dict[str, Any] = field(default_factory=dict)
+    key: Optional[Hashable] = None
+    reply_to: Optional[Hashable] = None
+    renote_of: Optional[Hashable] = None
+
+
+def retry_delay(attempt: int, base_delay: float) -> float:
+    return base_delay * 2 ** attempt
+
+
+def call_with_retry(
+    func: Callable[[], T], *,
+    rate_limiter: Optional[RateLimiter] = None,
+    max_retries: int = 3,
+    base_delay: float = 1.0,
+) -> T:
+    """
+    Calls ``func`` after taking a token from ``rate_limiter``, retrying
+    with exponential backoff while the server answers
+    ``RATE_LIMIT_EXCEEDED``.
+    """
+    attempt = 0
+    while True:
+        if rate_limiter is not None:
+            rate_limiter.acquire()
+        try:
+            return func()
+        except Exception as e:
+            if not is_rate_limit_error(e) or attempt >= max_retries:
+                raise
+            delay = retry_delay(attempt, base_delay)
+            if rate_limiter is not None:
+                rate_limiter.penalize(delay)
+            else:
+                time.sleep(delay)
+            attempt += 1
+
+
+def normalize_note_specs(
+    specs: Iterable[Union[NoteSpec, Dict[str, Any]]],
+) -> List[NoteSpec]:
+    result = []
+    keys = set()
+    for index, spec in enumerate(specs):
+        if not isinstance(spec, NoteSpec):
+            spec = NoteSpec(params=dict(spec))
+        if spec.key is None:
+            spec = NoteSpec(
+                params=spec.params,
+                key=index,
+                reply_to=spec.reply_to,
+                renote_of=spec.renote_of,
+            )
+        if spec.key in keys:
+            raise MisskeyIllegalArgumentError(
+                f"Duplicate note spec key: {spec.key!r}")
+        keys.add(spec.key)
+        result.append(spec)
+    return result
+
+
+def note_spec_parents(spec: NoteSpec) -> List[Hashable]:
+    parents = []
+    for parent in (spec.reply_to, spec.renote_of):
+        if parent is not None and parent not in parents:
+            parents.append(parent)
+    return parents
+
+
+def resolve_note_params(
+    spec: NoteSpec,
+    results: Dict[Hashable, BulkResult],
+) -> Dict[str, Any]:
+    # Fills reply_id / renote_id from the posted parents, or raises if a
+    # parent failed
+    params = dict(spec.params)
+    for name, parent in (
+        ("reply_id", spec.reply_to),
+        ("renote_id", spec.renote_of),
+    ):
+        if parent is None:
+            continue
+        parent_result = results[parent]
+        if not parent_result.ok:
+            raise MisskeyIllegalArgumentError(
+                f"Parent note {parent!r} was not posted")
+        params[name] = parent_result.value.created_note.id
+    return params
+
+
+def plan_note_specs(specs: List[NoteSpec]) -> Dict[Hashable, List[NoteSpec]]:
+    """
+    Returns the children of each key, with ``None`` for the specs that do
+    not depend on others. Raises if a spec refers to an unknown key.
+    """
+    keys = {spec.key for spec in specs}
+    children: Dict[Hashable, List[NoteSpec]] = {None: []}
+    for spec in specs:
+        parents = note_spec_parents(spec)
+        for parent in parents:
+            if parent not in keys:
+                raise MisskeyIllegalArgumentError(
+                    f"Note spec {spec.key!r} refers to unknown key "
+                    f"{parent!r}")
+        # Checked after each parent, and posted once all are done
+        for parent in parents or [None]:
+            children.setdefault(parent, []).append(spec)
+    return children
+
+
+def collect_note_results(
+    specs: List[NoteSpec],
+    results: Dict[Hashable, BulkResult],
+) -> List[BulkResult]:
+    for spec in specs:
+        if spec.key not in results:
+            # Never posted, as it is part of a reply cycle
+            results[spec.key] = BulkResult(
+                key=spec.key,
+                error=MisskeyIllegalArgumentError(
+                    f"Note spec {spec.key!r} depends on itself"),
+            )
+    return [results[spec.key] for spec in specs]
+
+
+def bulk_notes_create(
+    mk: Misskey,
+    specs: Iterable[Union[NoteSpec, Dict[str, Any]]], *,
+    max_workers: int = 4,
+    rate_limiter: Optional[RateLimiter] = None,
+    max_retries: int = 3,
+    progress: Optional[BulkProgressCallback] = None,
+) -> List[BulkResult]:
+    """
+    Posts many notes with ``notes_create``, ``max_workers`` at a time.
+
+    Specs are :class:`NoteSpec` or plain dicts of ``notes_create``
+    arguments. A spec replying to or renoting another spec of the batch
+    is posted only after its parent, with the parent's note ID.
+
+    A failed note does not abort the batch; notes depending on it fail
+    too. Returns a :class:`BulkResult` per spec, in the order of
+    ``specs``, whose ``value`` is the ``CreatedNote``.
+    """
+    specs = normalize_note_specs(specs)
+    children = plan_note_specs(specs)
+    results: Dict[Hashable, BulkResult] = {}
+
+    def post(spec: NoteSpec) -> CreatedNote:
+        params = resolve_note_params(spec, results)
+        return call_with_retry(
+            lambda: mk.notes_create(**params),
+            rate_limiter=rate_limiter,
+            max_retries=max_retries,
+        )
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        pending: Dict[Future, NoteSpec] = {}
+
+        def submit(parent: Optional[Hashable]):
+            for child in children.pop(parent, []):
+                if all(p in results for p in note_spec_parents(child)):
+                    pending[executor.submit(post, child)] = child
+
+        submit(None)
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                spec = pending.pop(future)
+                try:
+                    result = BulkResult(key=spec.key, value=future.result())
+                except Exception as e:
+                    result = BulkResult(key=spec.key, error=e)
+                results[spec.key] = result
+                if progress is not None:
+                    progress(result)
+                submit(spec.key)
+
+    return collect_note_results(specs, results)
+
+
+class BulkCheckpoint(object):
+    """
+    Append-only log of the outcome of each key of a bulk operation, one
+    JSON object per line.
+
+    Keys which succeeded in an earlier run are in :attr:`done` and are
+    skipped when the same checkpoint is passed again; failed keys are
+    retried.
+    """
+
+    def __init__(self, path: Union[str, os.PathLike]):
+        self.path = os.fspath(path)
+        self.done = set()
+        self._file = None
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except json.JSONDecodeError:
+                        # Torn write of the last line
+                        continue
+                    if record["ok"]:
+                        self.done.add(record["key"])
+                    else:
+                        self.done.discard(record["key"])
+        except FileNotFoundError:
+            pass
+
+    def __contains__(self, key: Any) -> bool:
+        return key in self.done
+
+    def record(self, result: BulkResult) -> None:
+        if self._file is None:
+            self._file = open(self.path, "a", encoding="utf-8")
+        self._file.write(json.dumps({
+            "key": result.key,
+            "ok": result.ok,
+            "error": None if result.ok else str(result.error),
+        }) + "\n")
+        self._file.flush()
+        if result.ok:
+            self.done.add(result.key)
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def __enter__(self) -> "BulkCheckpoint":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+
+def open_checkpoint(
+    checkpoint: Optional[Union[BulkCheckpoint, str, os.PathLike]],
+) -> Tuple[Optional[BulkCheckpoint], bool]:
+    # Returns the checkpoint and whether it is owned by the caller
+    if checkpoint is None or isinstance(checkpoint, BulkCheckpoint):
+        return checkpoint, False
+    return BulkCheckpoint(checkpoint), True
+
+
+def is_missing_error(error: BaseException, codes: Iterable[str]) -> bool:
+    return isinstance(error, MisskeyAPIError) and error.code in codes
+
+
+def iter_bulk(
+    func: Callable[[Any], Any],
+    keys: Iterable[Any], *,
+    max_workers: int = 4,
+    rate_limiter: Optional[RateLimiter] = None,
+    max_retries: int = 3,
+    checkpoint: Optional[Union[BulkCheckpoint, str, os.PathLike]] = None,
+    missing_codes: Iterable[str] = (),
+) -> Iterator[BulkResult]:
+    """
+    Calls ``func(key)`` for each key, ``max_workers`` at a time, and
+    yields a :class:`BulkResult` per key as it completes.
+
+    Errors whose code is in ``missing_codes`` count as success with
+    ``None`` as the value. With ``checkpoint`` (a :class:`BulkCheckpoint`
+    or a path), each outcome is logged as it completes and the keys done
+    in an earlier run are skipped, so an interrupted run can be resumed.
+    Keys are read from ``keys`` lazily.
+    """
+    checkpoint, owned = open_checkpoint(checkpoint)
+    missing_codes = tuple(missing_codes)
+
+    def run(key: Any) -> Any:
+        try:
+            return call_with_retry(
+                lambda: func(key),
+                rate_limiter=rate_limiter,
+                max_retries=max_retries,
+            )
+        except Exception as e:
+            if is_missing_error(e, missing_codes):
+                return None
+            raise
+
+    try:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            pending: Dict[Future, Any] = {}
+            key_iter = iter(keys)
+            exhausted = False
+            while True:
+                # Keep the pool busy without reading all keys at once
+                while not exhausted and len(pending) < max_workers * 2:
+                    try:
+                        key = next(key_iter)
+                    except StopIteration:
+                        exhausted = True
+                        break
+                    if checkpoint is None or key not in checkpoint:
+                        pending[executor.submit(run, key)] = key
+                if not pending:
+                    break
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    key = pending.pop(future)
+                    try:
+                        result = BulkResult(key=key, value=future.result())
+                    except Exception as e:
+                        result = BulkResult(key=key, error=e)
+                    if checkpoint is not None:
+                        checkpoint.record(result)
+                    yield result
+    finally:
+        if owned:
+            checkpoint.close()
+
+
+def run_bulk(
+    func: Callable[[Any], Any],
+    keys: Iterable[Any], *,
+    progress: Optional[BulkProgressCallback] = None,
+    **kwargs,
+) -> List[BulkResult]:
+    results = []
+    for result in iter_bulk(func, keys, **kwargs):
+        results.append(result)
+        if progress is not None:
+            progress(result)
+    return results
+
+
+def bulk_notes_delete(
+    mk: Misskey,
+    note_ids: Iterable[str], *,
+    progress: Optional[BulkProgressCallback] = None,
+    **kwargs,
+) -> List[BulkResult]:
+    """
+    Deletes many notes. Notes already deleted count as done.
+
+    Takes the options of :func:`iter_bulk`, and returns a
+    :class:`BulkResult` per note ID processed, in completion order.
+    ``progress`` is called with each result as it completes.
+    """
+    return run_bulk(
+        lambda note_id: mk.notes_delete(note_id=note_id),
+        note_ids,
+        progress=progress,
+        missing_codes=NOTES_DELETE_MISSING_CODES,
+        **kwargs,
+    )
+
+
+def bulk_notes_reactions_delete(
+    mk: Misskey,
+    note_ids: Iterable[str], *,
+    progress: Optional[BulkProgressCallback] = None,
+    **kwargs,
+) -> List[BulkResult]:
+    """
+    Removes own reactions from many notes. Notes not reacted to count as
+    done. See :func:`bulk_notes_delete` for the options and results.
+    """
+    return run_bulk(
+        lambda note_id: mk.notes_reactions_delete(note_id=note_id),
+        note_ids,
+        progress=progress,
+        missing_codes=NOTES_REACTIONS_DELETE_MISSING_CODES,
+        **kwargs,
+    )
+
+
+def bulk_drive_files_delete(
+    mk: Misskey,
+    file_ids: Iterable[str], *,
+    progress: Optional[BulkProgressCallback] = None,
+    **kwargs,
+) -> List[BulkResult]:
+    """
+    Deletes many drive files. Files already deleted count as done.
+    See :func:`bulk_notes_delete` for the options and results.
+    """
+    return run_bulk(
+        lambda file_id: mk.drive_files_delete(file_id=file_id),
+        file_ids,
+        progress=progress,
+        missing_codes=DRIVE_FILES_DELETE_MISSING_CODES,
+        **kwargs,
+    )
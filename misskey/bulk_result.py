@@ -0,0 +1,46 @@
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Dict, Optional
+
+if TYPE_CHECKING:
+    from .schemas import DriveFile
+
+__all__ = (
+    "BulkResult",
+    "BulkUploadResult",
+    "BulkDownloadResult",
+)
+
+
+@dataclass
+class BulkResult:
+    key: Any
+    value: Any = None
+    error: Optional[BaseException] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+@dataclass
+class BulkUploadResult:
+    # Local path (as str) to its drive file, and to the error of the paths
+    # which failed to be hashed, looked up or uploaded
+    files: Dict[str, "DriveFile"] = field(default_factory=dict)
+    errors: Dict[str, Exception] = field(default_factory=dict)
+
+    @property
+    def ok(self) -> bool:
+        return not self.errors
+
+
+@dataclass
+class BulkDownloadResult:
+    # Drive file ID to its downloaded path, and to the error of the files
+    # which failed to be downloaded or verified
+    paths: Dict[str, str] = field(default_factory=dict)
+    errors: Dict[str, Exception] = field(default_factory=dict)
+
+    @property
+    def ok(self) -> bool:
+        return not self.errors
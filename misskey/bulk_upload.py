@@ -0,0 +1,97 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, Optional, Union
+
+from .bulk_result import BulkUploadResult
+from .files import md5_file
+from .misskey import Misskey
+from .schemas import DriveFile
+
+__all__ = (
+    "bulk_upload",
+)
+
+
+def bulk_upload(
+    mk: Misskey,
+    paths: Iterable[Union[str, os.PathLike]], *,
+    folder_id: Optional[str] = None,
+    is_sensitive: bool = False,
+    reuse_existing: bool = True,
+    max_workers: int = 4,
+    hash_workers: Optional[int] = None,
+) -> BulkUploadResult:
+    """
+    Uploads many files to the drive, skipping files which already exist.
+
+    MD5s of the files are computed in a thread pool of ``hash_workers``
+    threads. When ``reuse_existing`` is true, each distinct MD5 is looked
+    up with ``drive_files_find_by_hash`` and an existing ``DriveFile`` is
+    reused for it; otherwise a new copy is always uploaded. The files are
+    uploaded ``max_workers`` at a time, and local files with the same
+    contents are uploaded only once.
+
+    Returns a :class:`~misskey.bulk_result.BulkUploadResult` mapping each
+    local path (as ``str``) to its ``DriveFile``, or to the error which
+    stopped it. A failure only affects the paths with that content.
+    """
+    local_paths = [os.fspath(path) for path in paths]
+    result = BulkUploadResult()
+
+    with ThreadPoolExecutor(max_workers=hash_workers) as executor:
+        digests = {
+            path: executor.submit(md5_file, path) for path in local_paths
+        }
+    hashes: Dict[str, str] = {}
+    for path, future in digests.items():
+        try:
+            hashes[path] = future.result()
+        except Exception as e:
+            result.errors[path] = e
+
+    # One representative path per distinct content
+    representatives: Dict[str, str] = {}
+    for path, md5 in hashes.items():
+        representatives.setdefault(md5, path)
+
+    uploaded: Dict[str, DriveFile] = {}
+    failed: Dict[str, Exception] = {}
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        if reuse_existing:
+            found = {
+                md5: executor.submit(mk.drive_files_find_by_hash, md5=md5)
+                for md5 in representatives
+            }
+            for md5, future in found.items():
+                try:
+                    files = future.result()
+                except Exception as e:
+                    failed[md5] = e
+                    continue
+                if files:
+                    uploaded[md5] = files[0]
+
+        created = {
+            md5: executor.submit(
+                mk.drive_files_create,
+                file=path,
+                folder_id=folder_id,
+                is_sensitive=is_sensitive,
+                # Otherwise Misskey returns its file with the same MD5
+                force=not reuse_existing,
+            )
+            for md5, path in representatives.items()
+            if md5 not in uploaded and md5 not in failed
+        }
+        for md5, future in created.items():
+            try:
+                uploaded[md5] = future.result()
+            except Exception as e:
+                failed[md5] = e
+
+    for path, md5 in hashes.items():
+        if md5 in uploaded:
+            result.files[path] = uploaded[md5]
+        else:
+            result.errors[path] = failed[md5]
+    return result
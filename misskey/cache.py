@@ -0,0 +1,262 @@
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from typing import Any, Collection, Dict, Mapping, Optional
+
+__all__ = (
+    "DEFAULT_CACHE_TTLS",
+    "SHARED_CACHE_ENDPOINTS",
+    "PersistentCache",
+)
+
+# Seconds each endpoint is cached for by default
+DEFAULT_CACHE_TTLS: Dict[str, float] = {
+    "/api/meta": 3600.0,
+    "/api/i": 300.0,
+    "/api/users/show": 600.0,
+    "/api/emojis": 3600.0,
+    "/api/emoji": 3600.0,
+}
+
+# Endpoints whose responses are the same for every account
+SHARED_CACHE_ENDPOINTS = frozenset((
+    "/api/meta",
+    "/api/emojis",
+    "/api/emoji",
+))
+
+# Bumped when the layout of the database changes
+_SCHEMA_VERSION = 2
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    key TEXT PRIMARY KEY,
+    host TEXT NOT NULL,
+    endpoint TEXT NOT NULL,
+    version TEXT,
+    expires REAL NOT NULL,
+    stored REAL NOT NULL,
+    size INTEGER NOT NULL,
+    body TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS entries_host ON entries (host);
+CREATE INDEX IF NOT EXISTS entries_stored ON entries (stored);
+CREATE TABLE IF NOT EXISTS versions (
+    host TEXT PRIMARY KEY,
+    version TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS totals (
+    name TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+INSERT OR IGNORE INTO totals VALUES ('size', 0);
+CREATE TRIGGER IF NOT EXISTS entries_insert AFTER INSERT ON entries BEGIN
+    UPDATE totals SET value = value + new.size WHERE name = 'size';
+END;
+CREATE TRIGGER IF NOT EXISTS entries_delete AFTER DELETE ON entries BEGIN
+    UPDATE totals SET value = value - old.size WHERE name = 'size';
+END;
+"""
+
+
+class PersistentCache(object):
+    """
+    Cache of API responses in an SQLite database at ``path``, shared by
+    the clients of every process on the host which open the same file.
+    Set it as the ``cache`` of :class:`~misskey.Misskey` or
+    :class:`~misskey.asynchronous.AsyncMisskey`.
+
+    Responses of the endpoints in ``ttls`` are kept for that many seconds
+    (by default ``meta``, ``i``, ``users/show`` and the emojis). They are
+    stored per account, except for ``shared`` endpoints, and tokens are
+    only stored as hashes.
+
+    Entries are stamped with the ``version`` of the server from its last
+    ``meta`` response, and dropped once ``meta`` returns another version.
+    Once the stored responses exceed ``max_size`` bytes, the expired ones
+    and then the oldest ones are evicted.
+
+    Nothing is loaded when opening the cache, so startup stays fast, and
+    each lookup is a single indexed query. The database is in WAL mode,
+    so readers do not wait for writers; the lookups of async clients run
+    on their event loop, as they take microseconds.
+    """
+
+    def __init__(
+        self,
+        path: str, *,
+        ttls: Optional[Mapping[str, float]] = None,
+        shared: Optional[Collection[str]] = None,
+        max_size: int = 64 * 1024 * 1024,
+        timeout: float = 5.0,
+    ):
+        self.path = path
+        self.ttls = dict(DEFAULT_CACHE_TTLS if ttls is None else ttls)
+        self.shared = frozenset(
+            SHARED_CACHE_ENDPOINTS if shared is None else shared)
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._versions: Dict[str, Optional[str]] = {}
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(
+            path, timeout=timeout, isolation_level=None,
+            check_same_thread=False)
+        self._setup()
+
+    def _setup(self) -> None:
+        with self._lock:
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("PRAGMA synchronous=NORMAL")
+            (schema_version,) = self._db.execute(
+                "PRAGMA user_version").fetchone()
+            # Rows replaced by INSERT OR REPLACE fire the delete trigger
+            self._db.execute("PRAGMA recursive_triggers=ON")
+            if schema_version != _SCHEMA_VERSION:
+                # Written by another version of the library
+                self._db.executescript(
+                    "DROP TABLE IF EXISTS entries;"
+                    "DROP TABLE IF EXISTS versions;"
+                    "DROP TABLE IF EXISTS totals;")
+                self._db.execute(f"PRAGMA user_version={_SCHEMA_VERSION}")
+            self._db.executescript(_SCHEMA)
+
+    def caches(self, endpoint: str) -> bool:
+        return endpoint in self.ttls
+
+    def key(
+        self,
+        host: str,
+        endpoint: str,
+        params: Optional[dict],
+        token: Optional[str],
+    ) -> str:
+        account = None
+        if token is not None and endpoint not in self.shared:
+            account = hashlib.sha256(token.encode()).hexdigest()
+        params = {
+            key: value for key, value in (params or {}).items()
+            if key != "i"
+        }
+        return json.dumps(
+            [host, endpoint, account, params],
+            sort_keys=True,
+            separators=(",", ":"),
+        )
+
+    def _version(self, host: str) -> Optional[str]:
+        # Called with the lock held. Other processes may change it, but
+        # only until the next meta response of this one.
+        if host not in self._versions:
+            row = self._db.execute(
+                "SELECT version FROM versions WHERE host = ?",
+                (host,)).fetchone()
+            self._versions[host] = None if row is None else row[0]
+        return self._versions[host]
+
+    def get(self, key: str, host: str) -> Optional[Any]:
+        """
+        Returns the cached response of ``key``, or ``None``.
+        """
+        with self._lock:
+            row = self._db.execute(
+                "SELECT body FROM entries WHERE key = ? AND expires > ? "
+                "AND version IS ?",
+                (key, time.time(), self._version(host))).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        return json.loads(row[0])
+
+    def put(self, key: str, host: str, endpoint: str, body: Any) -> None:
+        if body is None:
+            return
+        data = json.dumps(body, separators=(",", ":"), ensure_ascii=False)
+        now = time.time()
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO entries "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (key, host, endpoint, self._version(host),
+                 now + self.ttls.get(endpoint, 0.0), now, len(data), data))
+            self._evict(now)
+
+    def _size(self) -> int:
+        # Kept up to date by the triggers, so no scan of the entries
+        (size,) = self._db.execute(
+            "SELECT value FROM totals WHERE name = 'size'").fetchone()
+        return size
+
+    def _evict(self, now: float) -> None:
+        if self._size() <= self.max_size:
+            return
+        self._db.execute("DELETE FROM entries WHERE expires <= ?", (now,))
+        size = self._size()
+        if size <= self.max_size:
+            return
+        # Deletes the oldest entries until enough bytes are freed
+        excess = size - self.max_size
+        keys = []
+        for key, entry_size in self._db.execute(
+                "SELECT key, size FROM entries ORDER BY stored"):
+            keys.append((key,))
+            excess -= entry_size
+            if excess <= 0:
+                break
+        self._db.executemany("DELETE FROM entries WHERE key = ?", keys)
+
+    def set_version(self, host: str, version: str) -> None:
+        """
+        Records the server version of ``host``, dropping the entries of
+        other versions if it changed.
+        """
+        with self._lock:
+            if self._version(host) == version:
+                return
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                self._db.execute(
+                    "DELETE FROM entries WHERE host = ? AND version IS NOT ?",
+                    (host, version))
+                self._db.execute(
+                    "INSERT OR REPLACE INTO versions VALUES (?, ?)",
+                    (host, version))
+                self._db.execute("COMMIT")
+            except BaseException:
+                self._db.execute("ROLLBACK")
+                raise
+            self._versions[host] = version
+
+    def invalidate(
+        self,
+        host: Optional[str] = None,
+        endpoint: Optional[str] = None,
+    ) -> None:
+        """
+        Drops the entries of ``host`` and ``endpoint`` (all if ``None``).
+        """
+        with self._lock:
+            self._db.execute(
+                "DELETE FROM entries WHERE (? IS NULL OR host = ?) "
+                "AND (? IS NULL OR endpoint = ?)",
+                (host, host, endpoint, endpoint))
+
+    def __len__(self) -> int:
+        with self._lock:
+            (count,) = self._db.execute(
+                "SELECT COUNT(*) FROM entries WHERE expires > ?",
+                (time.time(),)).fetchone()
+        return count
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+    def __enter__(self) -> "PersistentCache":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
@@ -0,0 +1,270 @@
+import contextlib
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Collection, Deque, Dict, Iterator, Optional, Tuple
+
+from .enum import CircuitStateEnum
+from .exceptions import (
+    MisskeyAPIError,
+    MisskeyCircuitOpenError,
+    MisskeyNetworkError,
+    MisskeyResponseError,
+)
+
+__all__ = (
+    "SERVER_ERROR_CODES",
+    "EndpointHealth",
+    "CircuitBreaker",
+)
+
+# API error codes meaning the server failed, rather than the request
+SERVER_ERROR_CODES = ("INTERNAL_ERROR",)
+
+
+@dataclass
+class EndpointHealth:
+    endpoint: str
+    state: CircuitStateEnum
+    # Rates and latencies are over the recent requests
+    error_rate: float
+    slow_rate: float
+    mean_latency: float
+    max_latency: float
+    requests: int
+    failures: int
+    rejected: int
+    # Seconds until the next probe is let through while open
+    retry_after: float
+
+    @property
+    def available(self) -> bool:
+        return self.state != CircuitStateEnum.OPEN or self.retry_after <= 0
+
+
+class _Circuit(object):
+    def __init__(self, window_size: int):
+        self.state = CircuitStateEnum.CLOSED
+        # (failed, slow, latency) of the recent requests
+        self.outcomes: Deque[Tuple[bool, bool, float]] = deque(
+            maxlen=window_size)
+        self.opened_at = 0.0
+        self.probes = 0
+        self.probe_successes = 0
+        self.requests = 0
+        self.failures = 0
+        self.rejected = 0
+
+
+class CircuitBreaker(object):
+    """
+    Per-endpoint circuit breaker of a client.
+
+    Each endpoint keeps the outcomes of its last ``window_size`` requests.
+    Once at least ``min_requests`` of them are known, the circuit opens if
+    ``error_rate`` of them failed, or ``slow_rate`` of them took longer
+    than ``slow_call_duration`` seconds. While open, requests to the
+    endpoint raise :class:`~misskey.exceptions.MisskeyCircuitOpenError`
+    without being sent (nor queued by the scheduler). After
+    ``open_timeout`` seconds, up to ``half_open_probes`` requests are let
+    through, and the circuit closes if they all succeed, or opens again.
+
+    Network and response errors, timeouts and API errors with one of
+    ``failure_codes`` are failures. Other API errors mean that the server
+    is answering, so they are successes.
+    """
+
+    def __init__(
+        self, *,
+        window_size: int = 50,
+        min_requests: int = 10,
+        error_rate: float = 0.5,
+        slow_call_duration: Optional[float] = None,
+        slow_rate: float = 0.8,
+        open_timeout: float = 30.0,
+        half_open_probes: int = 1,
+        failure_codes: Collection[str] = SERVER_ERROR_CODES,
+    ):
+        if not 0 < min_requests <= window_size:
+            raise ValueError("min_requests must be in [1, window_size]")
+        if half_open_probes < 1:
+            raise ValueError("half_open_probes must be positive")
+        self.window_size = window_size
+        self.min_requests = min_requests
+        self.error_rate = error_rate
+        self.slow_call_duration = slow_call_duration
+        self.slow_rate = slow_rate
+        self.open_timeout = open_timeout
+        self.half_open_probes = half_open_probes
+        self.failure_codes = frozenset(failure_codes)
+        self._circuits: Dict[str, _Circuit] = {}
+        self._lock = threading.Lock()
+
+    def is_failure(self, error: BaseException) -> bool:
+        if isinstance(error, MisskeyAPIError):
+            return error.code in self.failure_codes
+        return isinstance(
+            error, (MisskeyNetworkError, MisskeyResponseError, TimeoutError))
+
+    def _circuit(self, endpoint: str) -> _Circuit:
+        circuit = self._circuits.get(endpoint)
+        if circuit is None:
+            circuit = _Circuit(self.window_size)
+            self._circuits[endpoint] = circuit
+        return circuit
+
+    def _retry_after(self, circuit: _Circuit, now: float) -> float:
+        return max(0.0, circuit.opened_at + self.open_timeout - now)
+
+    def _admit(self, endpoint: str, *, reserve: bool) -> bool:
+        # Raises if the request must fail fast, and returns whether it is a
+        # probe. Called with the lock held.
+        circuit = self._circuit(endpoint)
+        if circuit.state == CircuitStateEnum.CLOSED:
+            return False
+        now = time.monotonic()
+        if circuit.state == CircuitStateEnum.OPEN:
+            retry_after = self._retry_after(circuit, now)
+            if retry_after > 0:
+                circuit.rejected += 1
+                raise MisskeyCircuitOpenError(
+                    endpoint=endpoint, retry_after=retry_after)
+            circuit.state = CircuitStateEnum.HALF_OPEN
+            circuit.probes = 0
+            circuit.probe_successes = 0
+        if circuit.probes >= self.half_open_probes:
+            circuit.rejected += 1
+            raise MisskeyCircuitOpenError(endpoint=endpoint, retry_after=0.0)
+        if reserve:
+            circuit.probes += 1
+        return True
+
+    def check(self, endpoint: str) -> None:
+        """
+        Raises :class:`~misskey.exceptions.MisskeyCircuitOpenError` if a
+        request to ``endpoint`` would fail fast now.
+        """
+        with self._lock:
+            self._admit(endpoint, reserve=False)
+
+    def _open(self, circuit: _Circuit, now: float) -> None:
+        circuit.state = CircuitStateEnum.OPEN
+        circuit.opened_at = now
+        circuit.probes = 0
+
+    def _record(
+        self,
+        endpoint: str,
+        probe: bool,
+        latency: float,
+        failed: Optional[bool],
+    ) -> None:
+        now = time.monotonic()
+        with self._lock:
+            circuit = self._circuit(endpoint)
+            if probe and circuit.state == CircuitStateEnum.HALF_OPEN:
+                circuit.probes -= 1
+            if failed is None:
+                # Cancelled, so nothing is known about the endpoint
+                return
+
+            slow = (self.slow_call_duration is not None and
+                    latency > self.slow_call_duration)
+            circuit.requests += 1
+            circuit.failures += failed
+            circuit.outcomes.append((failed, slow, latency))
+            if circuit.state == CircuitStateEnum.HALF_OPEN and probe:
+                if failed or slow:
+                    self._open(circuit, now)
+                    return
+                circuit.probe_successes += 1
+                if circuit.probe_successes >= self.half_open_probes:
+                    circuit.state = CircuitStateEnum.CLOSED
+                    circuit.outcomes.clear()
+            elif circuit.state == CircuitStateEnum.CLOSED:
+                outcomes = circuit.outcomes
+                if len(outcomes) < self.min_requests:
+                    return
+                failures = sum(1 for failed, _, _ in outcomes if failed)
+                slows = sum(1 for _, slow, _ in outcomes if slow)
+                if (failures >= self.error_rate * len(outcomes) or
+                        (self.slow_call_duration is not None and
+                         slows >= self.slow_rate * len(outcomes))):
+                    self._open(circuit, now)
+
+    @contextlib.contextmanager
+    def guard(self, endpoint: str) -> Iterator[None]:
+        """
+        Admits a request to ``endpoint`` and records the outcome and the
+        latency of the ``with`` block. It only uses a lock briefly, so it
+        may wrap awaits in coroutines too.
+        """
+        with self._lock:
+            probe = self._admit(endpoint, reserve=True)
+        started = time.monotonic()
+        try:
+            yield
+        except Exception as e:
+            self._record(
+                endpoint, probe, time.monotonic() - started,
+                self.is_failure(e))
+            raise
+        except BaseException:
+            self._record(endpoint, probe, 0.0, None)
+            raise
+        self._record(endpoint, probe, time.monotonic() - started, False)
+
+    def _health(
+        self, endpoint: str, circuit: _Circuit, now: float
+    ) -> EndpointHealth:
+        # Avoids dividing by zero before the first outcome
+        count = max(len(circuit.outcomes), 1)
+        failures = sum(1 for failed, _, _ in circuit.outcomes if failed)
+        slows = sum(1 for _, slow, _ in circuit.outcomes if slow)
+        latencies = [latency for _, _, latency in circuit.outcomes]
+        retry_after = 0.0
+        if circuit.state == CircuitStateEnum.OPEN:
+            retry_after = self._retry_after(circuit, now)
+        return EndpointHealth(
+            endpoint=endpoint,
+            state=circuit.state,
+            error_rate=failures / count,
+            slow_rate=slows / count,
+            mean_latency=sum(latencies) / count,
+            max_latency=max(latencies, default=0.0),
+            requests=circuit.requests,
+            failures=circuit.failures,
+            rejected=circuit.rejected,
+            retry_after=retry_after,
+        )
+
+    def health(self, endpoint: str) -> EndpointHealth:
+        with self._lock:
+            return self._health(
+                endpoint, self._circuit(endpoint), time.monotonic())
+
+    def health_all(self) -> Dict[str, EndpointHealth]:
+        """
+        Returns the health of every endpoint requested so far.
+        """
+        now = time.monotonic()
+        with self._lock:
+            return {
+                endpoint: self._health(endpoint, circuit, now)
+                for endpoint, circuit in self._circuits.items()
+            }
+
+    def is_available(self, endpoint: str) -> bool:
+        return self.health(endpoint).available
+
+    def reset(self, endpoint: Optional[str] = None) -> None:
+        """
+        Closes the circuit of ``endpoint`` (of all endpoints if ``None``)
+        and forgets its outcomes.
+        """
+        with self._lock:
+            if endpoint is None:
+                self._circuits.clear()
+            else:
+                self._circuits.pop(endpoint, None)
@@ -0,0 +1,177 @@
+import hashlib
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable, Optional, Union
+
+from .bulk_result import BulkDownloadResult
+from .exceptions import (
+    MisskeyIllegalArgumentError,
+    MisskeyNetworkError,
+    MisskeyResponseError,
+)
+from .misskey import Misskey
+from .multipart import ProgressCallback
+from .schemas import DriveFile
+
+__all__ = (
+    "download_drive_file",
+    "download_drive_files",
+)
+
+DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+PART_SUFFIX = ".part"
+
+PathLike = Union[str, os.PathLike]
+
+
+def get_download_url(drive_file: DriveFile, *, thumbnail: bool) -> str:
+    url = drive_file.thumbnail_url if thumbnail else drive_file.url
+    if url is None:
+        raise MisskeyIllegalArgumentError(
+            f"Drive file {drive_file.id} has no URL to download")
+    return url
+
+
+def hash_partial_file(path: str, chunk_size: int):
+    # Returns the MD5 object of an already downloaded part and its size
+    digest = hashlib.md5()
+    size = 0
+    if os.path.exists(path):
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(chunk_size), b""):
+                digest.update(chunk)
+                size += len(chunk)
+    return digest, size
+
+
+def verify_download(
+    drive_file: DriveFile,
+    size: int,
+    md5: str, *,
+    thumbnail: bool,
+) -> None:
+    # Thumbnails are different files, so only the original is verified
+    if thumbnail:
+        return
+    if drive_file.size is not None and size != int(drive_file.size):
+        raise MisskeyResponseError(
+            f"Size mismatch: expected {drive_file.size} bytes, got {size}")
+    if drive_file.md5 and md5 != drive_file.md5:
+        raise MisskeyResponseError(
+            f"MD5 mismatch: expected {drive_file.md5}, got {md5}")
+
+
+def download_drive_file(
+    mk: Misskey,
+    drive_file: DriveFile,
+    destination: PathLike, *,
+    thumbnail: bool = False,
+    resume: bool = True,
+    verify: bool = True,
+    chunk_size: int = DOWNLOAD_CHUNK_SIZE,
+    progress: Optional[ProgressCallback] = None,
+) -> str:
+    """
+    Downloads the contents of a drive file to ``destination``, streaming
+    it to disk in chunks of ``chunk_size`` bytes.
+
+    The file is written to ``destination + ".part"`` and renamed when
+    complete. If ``resume`` is true and a ``.part`` file is left by an
+    interrupted download, only the rest is requested with an HTTP Range
+    header. If ``verify`` is true, the size and MD5 of the downloaded file
+    are checked against ``drive_file``, and ``MisskeyResponseError`` is
+    raised on mismatch.
+    ``progress`` is called with (bytes written, total bytes).
+
+    Returns the path of the downloaded file.
+    """
+    import requests
+
+    destination = os.fspath(destination)
+    part_path = destination + PART_SUFFIX
+    url = get_download_url(drive_file, thumbnail=thumbnail)
+
+    if resume:
+        digest, offset = hash_partial_file(part_path, chunk_size)
+    else:
+        digest, offset = hashlib.md5(), 0
+
+    headers = {}
+    if offset > 0:
+        headers["Range"] = f"bytes={offset}-"
+
+    try:
+        with mk.session.get(url, headers=headers, stream=True) as response:
+            if response.status_code == 416 and offset > 0:
+                # The part file is already complete
+                total = offset
+            else:
+                response.raise_for_status()
+                if response.status_code != requests.codes.partial_content:
+                    # The server ignored the Range header
+                    digest, offset = hashlib.md5(), 0
+                total = offset + int(
+                    response.headers.get("Content-Length", 0))
+
+                with open(part_path, "ab" if offset > 0 else "wb") as f:
+                    for chunk in response.iter_content(chunk_size):
+                        f.write(chunk)
+                        digest.update(chunk)
+                        offset += len(chunk)
+                        if progress is not None:
+                            progress(offset, max(total, offset))
+    except requests.exceptions.RequestException as e:
+        raise MisskeyNetworkError(f"Could not complete download: {e}")
+
+    if verify:
+        try:
+            verify_download(
+                drive_file, offset, digest.hexdigest(), thumbnail=thumbnail)
+        except MisskeyResponseError:
+            # Do not resume from a broken part file next time
+            os.remove(part_path)
+            raise
+
+    os.replace(part_path, destination)
+    return destination
+
+
+def download_drive_files(
+    mk: Misskey,
+    drive_files: Iterable[DriveFile],
+    directory: PathLike, *,
+    max_workers: int = 4,
+    **kwargs,
+) -> BulkDownloadResult:
+    """
+    Downloads many drive files into ``directory`` with a pool of
+    ``max_workers`` threads sharing the session of ``mk``.
+    Each file is saved as ``{id}_{name}``; other keyword arguments are
+    passed to :func:`download_drive_file`.
+
+    Returns a :class:`~misskey.bulk_result.BulkDownloadResult` mapping
+    each drive file ID to its downloaded path, or to the error which
+    stopped it. A failed file does not stop the others.
+    """
+    directory = os.fspath(directory)
+    os.makedirs(directory, exist_ok=True)
+    targets = {
+        drive_file.id: (drive_file, os.path.join(
+            directory,
+            f"{drive_file.id}_{os.path.basename(drive_file.name)}"))
+        for drive_file in drive_files
+    }
+
+    result = BulkDownloadResult()
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {
+            file_id: executor.submit(
+                download_drive_file, mk, drive_file, path, **kwargs)
+            for file_id, (drive_file, path) in targets.items()
+        }
+        for file_id, future in futures.items():
+            try:
+                result.paths[file_id] = future.result()
+            except Exception as e:
+                result.errors[file_id] = e
+    return result
@@ -1,11 +1,18 @@
-from typing import Optional, List
+from typing import Optional, List, Union
 
 from .sync_base import Misskey as Base
+from .multipart import UploadFile, UploadSource, ProgressCallback
 from .schemas import (
     Drive,
     DriveSchema,
     DriveFile,
     DriveFileSchema,
+    DriveFolder,
+    DriveFolderSchema,
+)
+from .schemas.arguments import (
+    DriveFilesArgumentsSchema,
+    DriveFoldersArgumentsSchema,
 )
 from .enum import (
     DriveFilesSortEnum,
@@ -13,9 +20,66 @@ from .enum import (
 
 __all__ = (
     "Misskey",
+    "UNCHANGED",
+    "drive_files_create_fields",
+    "drive_files_update_payload",
 )
 
 
+class _Unchanged(object):
+    # Marks an argument which should not be sent, for arguments where
+    # None means null (e.g. moving a file to the root folder)
+    def __repr__(self):
+        return "UNCHANGED"
+
+
+UNCHANGED = _Unchanged()
+
+
+def drive_files_create_fields(
+    *,
+    folder_id: Optional[str] = None,
+    name: Optional[str] = None,
+    comment: Optional[str] = None,
+    is_sensitive: bool = False,
+    force: bool = False,
+) -> dict:
+    # /api/drive/files/create receives multipart/form-data, not JSON
+    fields = {
+        "isSensitive": "true" if is_sensitive else "false",
+        "force": "true" if force else "false",
+    }
+    if folder_id is not None:
+        fields["folderId"] = folder_id
+    if name is not None:
+        fields["name"] = name
+    if comment is not None:
+        fields["comment"] = comment
+    return fields
+
+
+def drive_files_update_payload(
+    *,
+    file_id: str,
+    folder_id: Union[Optional[str], _Unchanged] = UNCHANGED,
+    name: Optional[str] = None,
+    is_sensitive: Optional[bool] = None,
+    comment: Union[Optional[str], _Unchanged] = UNCHANGED,
+) -> dict:
+    payload = {
+        "fileId": file_id,
+    }
+    if folder_id is not UNCHANGED:
+        payload["folderId"] = folder_id
+    if name is not None:
+        payload["name"] = name
+    if is_sensitive is not None:
+        payload["isSensitive"] = is_sensitive
+    if comment is not UNCHANGED:
+        payload["comment"] = comment
+    return payload
+
+
 class Misskey(Base):
     def drive(self) -> Drive:
         return DriveSchema().load(self._api_request(endpoint="/api/drive"))
@@ -29,20 +93,60 @@ class Misskey(Base):
         type: Optional[str] = None,
         sort: Optional[DriveFilesSortEnum] = None,
     ) -> List[DriveFile]:
-        # TODO
-        raise NotImplementedError()
+        payload_dict = {
+            "limit": limit,
+            "folder_id": folder_id,
+        }
+        if since_id is not None:
+            payload_dict["since_id"] = since_id
+        if until_id is not None:
+            payload_dict["until_id"] = until_id
+        if type is not None:
+            payload_dict["type"] = type
+        if sort is not None:
+            payload_dict["sort"] = sort
+
+        payload = DriveFilesArgumentsSchema().dump(payload_dict)
+
+        return DriveFileSchema().load(
+            self._api_request(endpoint="/api/drive/files", params=payload),
+            many=True)
 
     def drive_files_create(
         self, *,
-        file,
+        file: UploadSource,
         folder_id: Optional[str] = None,
         name: Optional[str] = None,
         comment: Optional[str] = None,
         is_sensitive: bool = False,
         force: bool = False,
+        progress: Optional[ProgressCallback] = None,
     ) -> DriveFile:
-        # TODO: This API has a special behavior, so process it accordingly.
-        raise NotImplementedError()
+        """
+        Uploads a file to the drive.
+
+        ``file`` can be a path, a binary file object, a memory-mapped file
+        or bytes. The file is streamed in chunks from its current position,
+        so it is never loaded into memory as a whole.
+        ``progress`` is called with (bytes sent, total bytes) while sending.
+
+        This method can be called from several threads at once to upload
+        concurrently over the connection pool of the session.
+        """
+        with UploadFile.open(file, filename=name) as upload:
+            return DriveFileSchema().load(
+                self._api_request_multipart(
+                    endpoint="/api/drive/files/create",
+                    params=drive_files_create_fields(
+                        folder_id=folder_id,
+                        name=name,
+                        comment=comment,
+                        is_sensitive=is_sensitive,
+                        force=force,
+                    ),
+                    upload=upload,
+                    progress=progress,
+                ))
 
     def drive_files_upload_from_url(
         self, *,
@@ -84,14 +188,23 @@ class Misskey(Base):
     def drive_files_update(
         self, *,
         file_id: str,
-        # TODO: Think about how you want to null
-        folder_id: Optional[str] = None,
+        # None moves the file to the root folder
+        folder_id: Union[Optional[str], _Unchanged] = UNCHANGED,
         name: Optional[str] = None,
         is_sensitive: Optional[bool] = None,
-        comment: Optional[bool] = None,
+        # None removes the comment
+        comment: Union[Optional[str], _Unchanged] = UNCHANGED,
     ) -> DriveFile:
-        # TODO
-        raise NotImplementedError()
+        payload = drive_files_update_payload(
+            file_id=file_id,
+            folder_id=folder_id,
+            name=name,
+            is_sensitive=is_sensitive,
+            comment=comment,
+        )
+        return DriveFileSchema().load(
+            self._api_request(
+                endpoint="/api/drive/files/update", params=payload))
 
     def drive_files_find(
         self, *,
@@ -105,15 +218,23 @@ class Misskey(Base):
         self, *,
         md5: str,
     ) -> List[DriveFile]:
-        # TODO
-        raise NotImplementedError()
+        payload = {
+            "md5": md5,
+        }
+        return DriveFileSchema().load(
+            self._api_request(
+                endpoint="/api/drive/files/find-by-hash", params=payload),
+            many=True)
 
     def drive_files_check_existence(
         self, *,
         md5: str,
     ) -> bool:
-        # TODO
-        raise NotImplementedError()
+        payload = {
+            "md5": md5,
+        }
+        return self._api_request(
+            endpoint="/api/drive/files/check-existence", params=payload)
 
     def drive_files_attached_notes(
         self, *,
@@ -124,3 +245,50 @@ class Misskey(Base):
     ) -> List[DriveFile]:
         # TODO
         raise NotImplementedError()
+
+    def drive_folders(
+        self, *,
+        limit: int = 10,
+        since_id: Optional[str] = None,
+        until_id: Optional[str] = None,
+        folder_id: Optional[str] = None,
+    ) -> List[DriveFolder]:
+        payload_dict = {
+            "limit": limit,
+            "folder_id": folder_id,
+        }
+        if since_id is not None:
+            payload_dict["since_id"] = since_id
+        if until_id is not None:
+            payload_dict["until_id"] = until_id
+
+        payload = DriveFoldersArgumentsSchema().dump(payload_dict)
+
+        return DriveFolderSchema().load(
+            self._api_request(endpoint="/api/drive/folders", params=payload),
+            many=True)
+
+    def drive_folders_show(
+        self, *,
+        folder_id: str,
+    ) -> DriveFolder:
+        payload = {
+            "folderId": folder_id,
+        }
+        return DriveFolderSchema().load(
+            self._api_request(
+                endpoint="/api/drive/folders/show", params=payload))
+
+    def drive_folders_create(
+        self, *,
+        name: Optional[str] = None,
+        parent_id: Optional[str] = None,
+    ) -> DriveFolder:
+        payload = {
+            "parentId": parent_id,
+        }
+        if name is not None:
+            payload["name"] = name
+        return DriveFolderSchema().load(
+            self._api_request(
+                endpoint="/api/drive/folders/create", params=payload))
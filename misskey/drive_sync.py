@@ -0,0 +1,419 @@
+import json
+import os
+import posixpath
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field as dc_field, asdict
+from typing import Dict, List, Optional, Union
+
+from .download import PART_SUFFIX, download_drive_file
+from .drive_walker import DriveIndex, walk_drive
+from .enum import DriveSyncDirectionEnum, DriveSyncActionEnum
+from .exceptions import MisskeyResponseError
+from .files import md5_file
+from .misskey import Misskey
+from .schemas import DriveFile
+
+__all__ = (
+    "ManifestEntry",
+    "SyncManifest",
+    "SyncAction",
+    "SyncResult",
+    "compute_sync_plan",
+    "DriveSync",
+)
+
+MANIFEST_FILENAME = ".misskey-sync.json"
+MANIFEST_VERSION = 1
+
+
+@dataclass
+class ManifestEntry:
+    md5: str
+    size: int
+    mtime_ns: int
+    file_id: Optional[str] = None
+
+
+class SyncManifest(object):
+    """
+    The state of a local directory and its drive folder at the last sync,
+    persisted as JSON.
+    It lets unchanged local files skip hashing (by size and mtime) and is
+    the common base to tell which side changed in a two-way sync.
+    """
+
+    path: str
+    entries: Dict[str, ManifestEntry]
+
+    def __init__(self, path: Union[str, os.PathLike]):
+        self.path = os.fspath(path)
+        self.entries = {}
+
+    @classmethod
+    def load(cls, path: Union[str, os.PathLike]):
+        manifest = cls(path)
+        try:
+            with open(manifest.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return manifest
+
+        if data.get("version") == MANIFEST_VERSION:
+            manifest.entries = {
+                p: ManifestEntry(**entry)
+                for p, entry in data["entries"].items()
+            }
+        return manifest
+
+    def save(self) -> None:
+        # Write to a temporary file first so a crash never leaves a
+        # half-written manifest
+        temp_path = self.path + ".tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump({
+                "version": MANIFEST_VERSION,
+                "entries": {
+                    p: asdict(entry) for p, entry in self.entries.items()
+                },
+            }, f, ensure_ascii=False)
+        os.replace(temp_path, self.path)
+
+
+@dataclass
+class SyncAction:
+    action: DriveSyncActionEnum
+    # Slash-separated path relative to the synced directory
+    path: str
+    md5: Optional[str] = None
+    # For moves, the path the file is moved from
+    source_path: Optional[str] = None
+    # The drive file to be downloaded, moved, deleted or replaced
+    drive_file: Optional[DriveFile] = None
+
+
+@dataclass
+class SyncResult:
+    actions: List[SyncAction]
+    dry_run: bool = False
+    errors: Dict[str, Exception] = dc_field(default_factory=dict)
+
+    @property
+    def ok(self) -> bool:
+        return not self.errors
+
+
+def compute_sync_plan(
+    local: Dict[str, str],
+    remote: Dict[str, DriveFile],
+    base: Dict[str, str],
+    direction: DriveSyncDirectionEnum, *,
+    delete: bool = True,
+) -> List[SyncAction]:
+    """
+    Computes the minimal actions to bring the local files (path to MD5)
+    and the drive files (path to ``DriveFile``) in sync.
+
+    ``base`` (path to MD5 at the last sync) decides which side wins in a
+    two-way sync; a path changed on both sides is reported as a conflict.
+    Pairs of a new file and a deleted file with the same contents are
+    turned into moves.
+    """
+    actions: List[SyncAction] = []
+    for path in sorted(set(local) | set(remote) | set(base)):
+        local_md5 = local.get(path)
+        remote_file = remote.get(path)
+        remote_md5 = remote_file.md5 if remote_file is not None else None
+        if local_md5 == remote_md5:
+            continue
+
+        if direction == DriveSyncDirectionEnum.PUSH:
+            local_wins = True
+        elif direction == DriveSyncDirectionEnum.PULL:
+            local_wins = False
+        else:
+            base_md5 = base.get(path)
+            if local_md5 != base_md5 and remote_md5 != base_md5:
+                actions.append(SyncAction(
+                    DriveSyncActionEnum.CONFLICT, path,
+                    md5=local_md5, drive_file=remote_file))
+                continue
+            local_wins = local_md5 != base_md5
+
+        if local_wins and local_md5 is not None:
+            actions.append(SyncAction(
+                DriveSyncActionEnum.UPLOAD, path,
+                md5=local_md5, drive_file=remote_file))
+        elif local_wins and delete:
+            actions.append(SyncAction(
+                DriveSyncActionEnum.DELETE_REMOTE, path,
+                md5=remote_md5, drive_file=remote_file))
+        elif not local_wins and remote_md5 is not None:
+            actions.append(SyncAction(
+                DriveSyncActionEnum.DOWNLOAD, path,
+                md5=remote_md5, drive_file=remote_file))
+        elif not local_wins and delete:
+            actions.append(SyncAction(
+                DriveSyncActionEnum.DELETE_LOCAL, path, md5=local_md5))
+
+    return _detect_moves(actions)
+
+
+def _detect_moves(actions: List[SyncAction]) -> List[SyncAction]:
+    pairs = (
+        (DriveSyncActionEnum.UPLOAD, DriveSyncActionEnum.DELETE_REMOTE,
+         DriveSyncActionEnum.MOVE_REMOTE),
+        (DriveSyncActionEnum.DOWNLOAD, DriveSyncActionEnum.DELETE_LOCAL,
+         DriveSyncActionEnum.MOVE_LOCAL),
+    )
+    for create, delete, move in pairs:
+        deletions: Dict[str, List[SyncAction]] = {}
+        for action in actions:
+            if action.action == delete and action.md5 is not None:
+                deletions.setdefault(action.md5, []).append(action)
+
+        moved = set()
+        for index, action in enumerate(actions):
+            # Only a new path can be the destination of a move
+            if (action.action != create or
+                    (create == DriveSyncActionEnum.UPLOAD and
+                     action.drive_file is not None) or
+                    not deletions.get(action.md5)):
+                continue
+            source = deletions[action.md5].pop()
+            moved.add(id(source))
+            actions[index] = SyncAction(
+                move, action.path,
+                md5=action.md5,
+                source_path=source.path,
+                drive_file=(
+                    source.drive_file
+                    if move == DriveSyncActionEnum.MOVE_REMOTE
+                    else action.drive_file),
+            )
+        actions = [a for a in actions if id(a) not in moved]
+    return actions
+
+
+class DriveSync(object):
+    """
+    Keeps a local directory and a drive folder in sync, like rsync.
+
+    .. code-block:: python
+
+       sync = DriveSync(mk, "./assets", folder_id="...")
+       print(sync.sync(dry_run=True).actions)
+       sync.sync()
+
+    Only files are synced; empty folders are neither created nor deleted.
+    Files ending with ``.part`` (unfinished downloads) are ignored.
+    """
+
+    def __init__(
+        self,
+        mk: Misskey,
+        local_dir: Union[str, os.PathLike], *,
+        folder_id: Optional[str] = None,
+        direction: DriveSyncDirectionEnum = DriveSyncDirectionEnum.PUSH,
+        delete: bool = True,
+        manifest_path: Optional[Union[str, os.PathLike]] = None,
+        max_workers: int = 4,
+    ):
+        self.mk = mk
+        self.local_dir = os.path.abspath(os.fspath(local_dir))
+        self.folder_id = folder_id
+        self.direction = direction
+        self.delete = delete
+        self.max_workers = max_workers
+        if manifest_path is None:
+            manifest_path = os.path.join(self.local_dir, MANIFEST_FILENAME)
+        self.manifest = SyncManifest.load(manifest_path)
+        self._index: Optional[DriveIndex] = None
+        self._local: Dict[str, str] = {}
+
+    def _local_path(self, path: str) -> str:
+        return os.path.join(self.local_dir, *path.split("/"))
+
+    def _stat_entry(
+        self, path: str, md5: str, file_id: Optional[str],
+    ) -> ManifestEntry:
+        stat = os.stat(self._local_path(path))
+        return ManifestEntry(
+            md5=md5, size=stat.st_size, mtime_ns=stat.st_mtime_ns,
+            file_id=file_id)
+
+    def scan_local(self) -> Dict[str, str]:
+        # Returns path to MD5, hashing only the files changed since the
+        # last sync
+        manifest_path = os.path.abspath(self.manifest.path)
+        stats = {}
+        for root, _, filenames in os.walk(self.local_dir):
+            for filename in filenames:
+                full_path = os.path.join(root, filename)
+                if (filename.endswith(PART_SUFFIX) or
+                        full_path in (manifest_path, manifest_path + ".tmp")):
+                    continue
+                path = os.path.relpath(
+                    full_path, self.local_dir).replace(os.sep, "/")
+                stats[path] = os.stat(full_path)
+
+        hashes = {}
+        to_hash = []
+        for path, stat in stats.items():
+            entry = self.manifest.entries.get(path)
+            if (entry is not None and entry.size == stat.st_size and
+                    entry.mtime_ns == stat.st_mtime_ns):
+                hashes[path] = entry.md5
+            else:
+                to_hash.append(path)
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            hashes.update(zip(to_hash, executor.map(
+                lambda p: md5_file(self._local_path(p)), to_hash)))
+        return hashes
+
+    def plan(self) -> List[SyncAction]:
+        self._local = self.scan_local()
+        self._index = walk_drive(
+            self.mk, folder_id=self.folder_id, max_workers=self.max_workers)
+        base = {p: entry.md5 for p, entry in self.manifest.entries.items()}
+        return compute_sync_plan(
+            self._local, self._index.files, base, self.direction,
+            delete=self.delete)
+
+    def _ensure_folder(self, path: str) -> Optional[str]:
+        # Returns the ID of the drive folder at path, creating it and its
+        # parents if missing. Called from one thread only.
+        if path == "":
+            return self.folder_id
+        if path not in self._index.folders:
+            parent_path, name = posixpath.split(path)
+            parent_id = self._ensure_folder(parent_path)
+            self._index.add_folder(
+                parent_path,
+                self.mk.drive_folders_create(name=name, parent_id=parent_id))
+        return self._index.folders[path].id
+
+    def _apply_action(
+        self, action: SyncAction, folder_ids: Dict[str, Optional[str]],
+    ) -> Optional[DriveFile]:
+        folder_path, name = posixpath.split(action.path)
+        if action.action == DriveSyncActionEnum.UPLOAD:
+            # Without force, Misskey returns any drive file of the same
+            # content instead, wherever it is
+            created = self.mk.drive_files_create(
+                file=self._local_path(action.path),
+                folder_id=folder_ids[folder_path],
+                name=name,
+                force=True,
+            )
+            if (created.folder_id != folder_ids[folder_path] or
+                    created.name != name):
+                raise MisskeyResponseError(
+                    f"Uploaded {action.path} but got {created.name} "
+                    f"in folder {created.folder_id}")
+            if action.drive_file is not None:
+                # Drive files can not be overwritten
+                self.mk.drive_files_delete(file_id=action.drive_file.id)
+            return created
+        elif action.action == DriveSyncActionEnum.MOVE_REMOTE:
+            return self.mk.drive_files_update(
+                file_id=action.drive_file.id,
+                folder_id=folder_ids[folder_path],
+                name=name,
+            )
+        elif action.action == DriveSyncActionEnum.DELETE_REMOTE:
+            self.mk.drive_files_delete(file_id=action.drive_file.id)
+        elif action.action == DriveSyncActionEnum.DOWNLOAD:
+            destination = self._local_path(action.path)
+            os.makedirs(os.path.dirname(destination), exist_ok=True)
+            download_drive_file(self.mk, action.drive_file, destination)
+        elif action.action == DriveSyncActionEnum.MOVE_LOCAL:
+            destination = self._local_path(action.path)
+            os.makedirs(os.path.dirname(destination), exist_ok=True)
+            os.replace(self._local_path(action.source_path), destination)
+        elif action.action == DriveSyncActionEnum.DELETE_LOCAL:
+            os.remove(self._local_path(action.path))
+        return None
+
+    def apply(self, actions: List[SyncAction]) -> SyncResult:
+        if self._index is None:
+            raise RuntimeError("plan() must be called before apply()")
+        result = SyncResult(actions=actions)
+
+        folder_ids: Dict[str, Optional[str]] = {}
+        for action in actions:
+            if action.action in (DriveSyncActionEnum.UPLOAD,
+                                 DriveSyncActionEnum.MOVE_REMOTE):
+                folder_path = posixpath.dirname(action.path)
+                try:
+                    if folder_path not in folder_ids:
+                        folder_ids[folder_path] = self._ensure_folder(
+                            folder_path)
+                except Exception as e:
+                    result.errors[action.path] = e
+
+        runnable = [
+            action for action in actions
+            if action.action != DriveSyncActionEnum.CONFLICT and
+            action.path not in result.errors
+        ]
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = [
+                executor.submit(self._apply_action, action, folder_ids)
+                for action in runnable
+            ]
+            outcomes = {}
+            for action, future in zip(runnable, futures):
+                try:
+                    outcomes[action.path] = future.result()
+                except Exception as e:
+                    result.errors[action.path] = e
+
+        self._update_manifest(actions, outcomes, result.errors)
+        return result
+
+    def _update_manifest(
+        self,
+        actions: List[SyncAction],
+        outcomes: Dict[str, Optional[DriveFile]],
+        errors: Dict[str, Exception],
+    ) -> None:
+        entries = self.manifest.entries
+        handled = {action.path for action in actions}
+        handled.update(
+            action.source_path for action in actions
+            if action.source_path is not None)
+
+        # Paths which were already in sync
+        for path, drive_file in self._index.files.items():
+            if path not in handled and self._local.get(path) == drive_file.md5:
+                entries[path] = self._stat_entry(
+                    path, drive_file.md5, drive_file.id)
+
+        for action in actions:
+            if action.path not in outcomes or action.path in errors:
+                continue
+            if action.source_path is not None:
+                entries.pop(action.source_path, None)
+            if action.action in (DriveSyncActionEnum.DELETE_REMOTE,
+                                 DriveSyncActionEnum.DELETE_LOCAL):
+                entries.pop(action.path, None)
+            elif action.action in (DriveSyncActionEnum.UPLOAD,
+                                   DriveSyncActionEnum.MOVE_REMOTE):
+                entries[action.path] = self._stat_entry(
+                    action.path, action.md5, outcomes[action.path].id)
+            else:
+                entries[action.path] = self._stat_entry(
+                    action.path, action.md5, action.drive_file.id)
+
+        for path in list(entries):
+            if (path not in self._local and path not in self._index.files and
+                    path not in handled):
+                del entries[path]
+        self.manifest.save()
+
+    def sync(self, *, dry_run: bool = False) -> SyncResult:
+        actions = self.plan()
+        if dry_run:
+            return SyncResult(actions=actions, dry_run=True)
+        return self.apply(actions)
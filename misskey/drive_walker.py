@@ -0,0 +1,150 @@
+import posixpath
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from dataclasses import dataclass, field as dc_field
+from typing import Any, Callable, Dict, List, Optional, Union
+
+from .enum import DriveFilesSortEnum
+from .misskey import Misskey
+from .schemas import DriveFile, DriveFolder
+
+__all__ = (
+    "DriveIndex",
+    "walk_drive",
+)
+
+# The maximum of "limit" of /api/drive/files and /api/drive/folders
+DRIVE_PAGE_LIMIT = 100
+
+_SORT_KEYS: Dict[DriveFilesSortEnum, Callable[[DriveFile], Any]] = {
+    DriveFilesSortEnum.DESCENDING_CREATED_AT:
+        lambda f: (f.created_at, f.id),
+    DriveFilesSortEnum.ASCENDING_CREATED_AT:
+        lambda f: (f.created_at, f.id),
+    DriveFilesSortEnum.DESCENDING_NAME: lambda f: (f.name, f.id),
+    DriveFilesSortEnum.ASCENDING_NAME: lambda f: (f.name, f.id),
+    DriveFilesSortEnum.DESCENDING_SIZE: lambda f: (int(f.size), f.id),
+    DriveFilesSortEnum.ASCENDING_SIZE: lambda f: (int(f.size), f.id),
+}
+
+
+def normalize_drive_path(path: str) -> str:
+    path = posixpath.normpath("/" + path.strip()).lstrip("/")
+    return "" if path == "." else path
+
+
+@dataclass
+class DriveIndex:
+    """
+    An in-memory index of a drive, mapping slash-separated paths
+    (relative to the walked folder, e.g. ``"assets/2024/banner.png"``)
+    to folders and files.
+
+    Misskey allows several files with the same name in a folder; the path
+    of such a name resolves to the first one in the listing order.
+    """
+
+    root_folder_id: Optional[str] = None
+    sort: Optional[DriveFilesSortEnum] = None
+    folders: Dict[str, DriveFolder] = dc_field(default_factory=dict)
+    files: Dict[str, DriveFile] = dc_field(default_factory=dict)
+    # Listing of each folder path in the walked order
+    folder_files: Dict[str, List[DriveFile]] = dc_field(default_factory=dict)
+    folder_children: Dict[str, List[str]] = dc_field(default_factory=dict)
+
+    def add_folder(self, parent_path: str, folder: DriveFolder) -> str:
+        path = posixpath.join(parent_path, folder.name)
+        self.folders.setdefault(path, folder)
+        self.folder_children.setdefault(parent_path, []).append(folder.name)
+        return path
+
+    def add_files(self, folder_path: str, files: List[DriveFile]) -> None:
+        if self.sort is not None:
+            files = sorted(
+                files,
+                key=_SORT_KEYS[self.sort],
+                # "+" sorts are descending in Misskey
+                reverse=self.sort.value.startswith("+"))
+        self.folder_files[folder_path] = files
+        for drive_file in files:
+            self.files.setdefault(
+                posixpath.join(folder_path, drive_file.name), drive_file)
+
+    def resolve(self, path: str) -> Union[DriveFile, DriveFolder]:
+        path = normalize_drive_path(path)
+        if path in self.files:
+            return self.files[path]
+        elif path in self.folders:
+            return self.folders[path]
+        raise KeyError(path)
+
+    def get_file(self, path: str) -> DriveFile:
+        return self.files[normalize_drive_path(path)]
+
+    def get_folder(self, path: str) -> DriveFolder:
+        return self.folders[normalize_drive_path(path)]
+
+    def get_folder_id(self, path: str) -> Optional[str]:
+        path = normalize_drive_path(path)
+        if path == "":
+            return self.root_folder_id
+        return self.folders[path].id
+
+    def listdir(self, path: str = "") -> List[str]:
+        path = normalize_drive_path(path)
+        names = list(self.folder_children.get(path, []))
+        names.extend(f.name for f in self.folder_files.get(path, []))
+        return names
+
+
+def fetch_all(fetch: Callable[..., List[Any]], **kwargs) -> List[Any]:
+    items = []
+    until_id = None
+    while True:
+        page = fetch(until_id=until_id, limit=DRIVE_PAGE_LIMIT, **kwargs)
+        items.extend(page)
+        if len(page) < DRIVE_PAGE_LIMIT:
+            return items
+        until_id = page[-1].id
+
+
+def walk_drive(
+    mk: Misskey, *,
+    folder_id: Optional[str] = None,
+    sort: Optional[DriveFilesSortEnum] = None,
+    type: Optional[str] = None,
+    max_workers: int = 8,
+) -> DriveIndex:
+    """
+    Walks the folder tree under ``folder_id`` (the root of the drive if
+    not given) and returns a :class:`DriveIndex` of all folders and files.
+
+    Subfolder and file listings of every folder are fetched concurrently
+    in a pool of ``max_workers`` threads, so the walk takes about as many
+    round trips as the depth of the tree rather than the number of
+    folders. Files are paged by ID and ordered by ``sort`` in the index.
+    """
+    index = DriveIndex(root_folder_id=folder_id, sort=sort)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        pending = {}
+
+        def visit(current_id: Optional[str], path: str):
+            pending[executor.submit(
+                fetch_all, mk.drive_folders, folder_id=current_id)] = (
+                "folders", path)
+            pending[executor.submit(
+                fetch_all, mk.drive_files, folder_id=current_id,
+                type=type)] = ("files", path)
+
+        visit(folder_id, "")
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                kind, path = pending.pop(future)
+                if kind == "folders":
+                    for folder in future.result():
+                        visit(folder.id, index.add_folder(path, folder))
+                else:
+                    index.add_files(path, future.result())
+
+    return index
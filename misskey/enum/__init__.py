@@ -9,3 +9,7 @@ from .reaction_acceptance import ReactionAcceptanceEnum
 from .http_method import HttpMethodEnum
 from .users import UsersSortEnum, UsersStateEnum, UsersOriginEnum
 from .drive_files_sort import DriveFilesSortEnum
+from .drive_sync import DriveSyncDirectionEnum, DriveSyncActionEnum
+from .notification_type import NotificationTypeEnum
+from .request_priority import RequestPriorityEnum
+from .circuit_state import CircuitStateEnum
@@ -0,0 +1,14 @@
+from enum import Enum
+
+__all__ = (
+    "CircuitStateEnum",
+)
+
+
+class CircuitStateEnum(Enum):
+    # Requests pass
+    CLOSED = "closed"
+    # Requests fail fast
+    OPEN = "open"
+    # A few probe requests pass to test whether the endpoint recovered
+    HALF_OPEN = "half_open"
@@ -0,0 +1,25 @@
+from enum import Enum
+
+__all__ = (
+    "DriveSyncDirectionEnum",
+    "DriveSyncActionEnum",
+)
+
+
+class DriveSyncDirectionEnum(Enum):
+    # Local directory to drive
+    PUSH = "push"
+    # Drive to local directory
+    PULL = "pull"
+    # Both ways, based on the changes since the last sync
+    BOTH = "both"
+
+
+class DriveSyncActionEnum(Enum):
+    UPLOAD = "upload"
+    DOWNLOAD = "download"
+    MOVE_REMOTE = "move_remote"
+    MOVE_LOCAL = "move_local"
+    DELETE_REMOTE = "delete_remote"
+    DELETE_LOCAL = "delete_local"
+    CONFLICT = "conflict"
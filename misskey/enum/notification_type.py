@@ -0,0 +1,25 @@
+from enum import Enum
+
+__all__ = (
+    "NotificationTypeEnum",
+)
+
+
+class NotificationTypeEnum(Enum):
+    NOTE = "note"
+    FOLLOW = "follow"
+    MENTION = "mention"
+    REPLY = "reply"
+    RENOTE = "renote"
+    QUOTE = "quote"
+    REACTION = "reaction"
+    POLL_ENDED = "pollEnded"
+    RECEIVE_FOLLOW_REQUEST = "receiveFollowRequest"
+    FOLLOW_REQUEST_ACCEPTED = "followRequestAccepted"
+    ROLE_ASSIGNED = "roleAssigned"
+    ACHIEVEMENT_EARNED = "achievementEarned"
+    APP = "app"
+    TEST = "test"
+    # Only returned by i/notifications-grouped
+    REACTION_GROUPED = "reaction:grouped"
+    RENOTE_GROUPED = "renote:grouped"
@@ -0,0 +1,12 @@
+from enum import IntEnum
+
+__all__ = (
+    "RequestPriorityEnum",
+)
+
+
+class RequestPriorityEnum(IntEnum):
+    # Lower values are served first
+    INTERACTIVE = 0
+    NORMAL = 1
+    BACKGROUND = 2
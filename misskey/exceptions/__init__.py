@@ -4,6 +4,15 @@ from .api import (
 from .network import (
     MisskeyNetworkError,
 )
+from .scheduler import (
+    MisskeyOverloadedError,
+)
+from .circuit_breaker import (
+    MisskeyCircuitOpenError,
+)
+from .cassette import (
+    MisskeyCassetteError,
+)
 
 
 class MisskeyIllegalArgumentError(Exception):
@@ -0,0 +1,9 @@
+__all__ = (
+    "MisskeyCassetteError",
+)
+
+
+# Raised by the replay transport for a request which was not recorded, or
+# for a file which is not a cassette
+class MisskeyCassetteError(Exception):
+    pass
@@ -0,0 +1,18 @@
+__all__ = (
+    "MisskeyCircuitOpenError",
+)
+
+
+# Raised without sending the request while the circuit of its endpoint is
+# open
+class MisskeyCircuitOpenError(Exception):
+    endpoint: str
+    retry_after: float
+
+    def __init__(self, *, endpoint: str, retry_after: float):
+        self.endpoint = endpoint
+        self.retry_after = retry_after
+
+    def __str__(self):
+        return (f"Circuit of {self.endpoint} is open, "
+                f"retry after {self.retry_after:.1f}s")
@@ -0,0 +1,9 @@
+__all__ = (
+    "MisskeyOverloadedError",
+)
+
+
+# Raised when the scheduler sheds a request, as the queue of its priority
+# is full
+class MisskeyOverloadedError(Exception):
+    pass
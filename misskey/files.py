@@ -0,0 +1,38 @@
+import hashlib
+import mmap
+import os
+from typing import Union
+
+__all__ = (
+    "md5_file",
+)
+
+MD5_CHUNK_SIZE = 1024 * 1024
+
+
+def md5_file(
+    path: Union[str, os.PathLike], *,
+    chunk_size: int = MD5_CHUNK_SIZE,
+) -> str:
+    """
+    Returns the MD5 hex digest of a file, as in ``DriveFile.md5``.
+
+    The file is memory-mapped and hashed chunk by chunk, so it is never
+    copied into memory as a whole. ``hashlib`` releases the GIL while
+    hashing, so several files can be hashed in parallel with threads.
+    """
+    digest = hashlib.md5()
+    with open(path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        try:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (ValueError, OSError):
+            # Empty files and file systems which can not be mapped
+            for chunk in iter(lambda: f.read(chunk_size), b""):
+                digest.update(chunk)
+            return digest.hexdigest()
+
+        with mapped, memoryview(mapped) as view:
+            for offset in range(0, size, chunk_size):
+                digest.update(view[offset:offset + chunk_size])
+    return digest.hexdigest()
@@ -1 +1,62 @@
-from .aid import AID
+from typing import TYPE_CHECKING
+
+from misskey._lazy import lazy_attributes
+
+__all__ = (
+    "MisskeyID",
+    "AID",
+    "aids_to_timestamps",
+    "timestamps_to_aids",
+    "AIDX",
+    "MEID",
+    "MEIDG",
+    "ObjectID",
+    "ULID",
+    "ID_SCHEMES",
+    "detect_id_type",
+    "parse_id",
+    "AIDGenerator",
+    "AIDXGenerator",
+)
+
+if TYPE_CHECKING:
+    from .base import MisskeyID
+    from .aid import (
+        AID,
+        aids_to_timestamps,
+        timestamps_to_aids,
+    )
+    from .aidx import AIDX
+    from .meid import (
+        MEID,
+        MEIDG,
+    )
+    from .objectid import ObjectID
+    from .ulid import ULID
+    from .parse import (
+        ID_SCHEMES,
+        detect_id_type,
+        parse_id,
+    )
+    from .generator import (
+        AIDGenerator,
+        AIDXGenerator,
+    )
+
+# NumPy is imported only by the array functions, on first call
+__getattr__, __dir__ = lazy_attributes(__name__, {
+    "MisskeyID": ".base",
+    "AID": ".aid",
+    "aids_to_timestamps": ".aid",
+    "timestamps_to_aids": ".aid",
+    "AIDX": ".aidx",
+    "MEID": ".meid",
+    "MEIDG": ".meid",
+    "ObjectID": ".objectid",
+    "ULID": ".ulid",
+    "ID_SCHEMES": ".parse",
+    "detect_id_type": ".parse",
+    "parse_id": ".parse",
+    "AIDGenerator": ".generator",
+    "AIDXGenerator": ".generator",
+})
@@ -1,29 +1,53 @@
+from __future__ import annotations
+
 import datetime
 import re
 import secrets
+import threading
 import math
-import numpy as np
+from typing import TYPE_CHECKING, Iterable, Optional, Union
 
 from .base import MisskeyID
+from .base36 import (
+    encode_base36,
+    decode_base36,
+    decode_base36_array,
+    _encode_base36_chars,
+)
+
+if TYPE_CHECKING:
+    import numpy as np
 
 __all__ = (
     "AID",
     "AID_REGEXP",
+    "aids_to_timestamps",
+    "timestamps_to_aids",
 )
 
 TIME2000_UTC = datetime.datetime(2000, 1, 1, 0, 0, 0, 0, datetime.timezone.utc)
+TIME2000_MS = 946684800000  # TIME2000_UTC as UNIX time in milliseconds
 
-AID_REGEXP = re.compile(r"^[0-9a-z]{10}", flags=re.I)
+AID_REGEXP = re.compile(r"^[0-9a-z]{10}$", flags=re.I)
+
+AID_TIME_LENGTH = 8
+AID_NOISE_LENGTH = 2
 
 
 class AID(MisskeyID):
+    __slots__ = ()
+
+    REGEXP = AID_REGEXP
+    MIN_SUFFIX = "0" * AID_NOISE_LENGTH
+    MAX_SUFFIX = "z" * AID_NOISE_LENGTH
+
     aid_counter: int = int.from_bytes(
         secrets.token_bytes(2), byteorder="big")  # Static
 
-    def __init__(self, i: str):
-        self.id = i
+    _counter_lock = threading.Lock()
 
-    # TODO: It would be better if IDs could be compared
+    def __init__(self, i: str):
+        self.id = i.lower()
 
     @staticmethod
     def get_time(*, t: datetime.datetime) -> str:
@@ -33,17 +57,71 @@ class AID(MisskeyID):
             time_counter = math.floor(
                 (t - TIME2000_UTC).total_seconds() * 1000)
 
-        return np.base_repr(time_counter, 36).zfill(8).lower()
+        return encode_base36(time_counter, AID_TIME_LENGTH)
+
+    @classmethod
+    def get_time_part(cls, ms: int) -> str:
+        return encode_base36(max(ms - TIME2000_MS, 0), AID_TIME_LENGTH)
 
     @staticmethod
     def get_noise() -> str:
-        return np.base_repr(AID.aid_counter, 36).zfill(2)[-2:].lower()
+        return encode_base36(
+            AID.aid_counter, AID_NOISE_LENGTH)[-AID_NOISE_LENGTH:]
 
     @classmethod
     def generate(cls, *, t: datetime.datetime):
-        AID.aid_counter += 1
-        return cls(cls.get_time(t=t) + cls.get_noise())
+        with AID._counter_lock:
+            AID.aid_counter += 1
+            noise = cls.get_noise()
+        return cls(cls.get_time(t=t) + noise)
+
+    @property
+    def time_ms(self) -> int:
+        return decode_base36(self.id[:AID_TIME_LENGTH]) + TIME2000_MS
 
     def to_date(self) -> datetime.datetime:
-        time = int(self.id[:-2], 36) / 1000
-        return TIME2000_UTC + datetime.timedelta(seconds=time)
+        time = decode_base36(self.id[:AID_TIME_LENGTH])
+        return TIME2000_UTC + datetime.timedelta(milliseconds=time)
+
+
+def aids_to_timestamps(
+    ids: Union[Iterable[str], np.ndarray],
+) -> np.ndarray:
+    """
+    Decode the creation time of many AIDs at once.
+    Returns an ``int64`` array of UNIX time in milliseconds.
+    """
+    return decode_base36_array(ids, stop=AID_TIME_LENGTH) + TIME2000_MS
+
+
+def timestamps_to_aids(
+    timestamps: Union[Iterable[int], np.ndarray],
+    *,
+    noise: Optional[Union[Iterable[int], np.ndarray]] = None,
+) -> np.ndarray:
+    """
+    Encode many UNIX times in milliseconds (or a ``datetime64`` array)
+    into AIDs at once.
+    If ``noise`` is not given, the noise part is filled with zeros,
+    which is the smallest AID for each time.
+    """
+    import numpy as np
+
+    times = np.asarray(timestamps)
+    if times.dtype.kind == "M":
+        times = times.astype("datetime64[ms]").astype(np.int64)
+    times = np.maximum(times.astype(np.int64).ravel() - TIME2000_MS, 0)
+
+    width = AID_TIME_LENGTH + AID_NOISE_LENGTH
+    chars = np.empty((times.size, width), dtype=np.uint8)
+    _encode_base36_chars(times, AID_TIME_LENGTH, chars[:, :AID_TIME_LENGTH])
+    if noise is None:
+        chars[:, AID_TIME_LENGTH:] = ord("0")
+    else:
+        _encode_base36_chars(
+            np.broadcast_to(
+                np.asarray(noise, dtype=np.int64) % 36 ** AID_NOISE_LENGTH,
+                times.shape),
+            AID_NOISE_LENGTH, chars[:, AID_TIME_LENGTH:])
+
+    return chars.view(f"S{width}").ravel().astype(f"U{width}")
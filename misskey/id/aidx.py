@@ -0,0 +1,64 @@
+import datetime
+import re
+import secrets
+import threading
+
+from .base import MisskeyID, datetime_to_ms
+from .base36 import encode_base36, decode_base36
+from .aid import TIME2000_MS, AID_TIME_LENGTH
+
+__all__ = (
+    "AIDX",
+    "AIDX_REGEXP",
+)
+
+AIDX_REGEXP = re.compile(r"^[0-9a-z]{16}$", flags=re.I)
+
+AIDX_NODE_LENGTH = 4
+AIDX_NOISE_LENGTH = 4
+
+
+class AIDX(MisskeyID):
+    """
+    AID with a node ID, used by the ``aidx`` ID scheme.
+    It consists of 8 characters of time, 4 characters of node ID and
+    4 characters of counter in base36.
+    """
+
+    __slots__ = ()
+
+    REGEXP = AIDX_REGEXP
+    MIN_SUFFIX = "0" * (AIDX_NODE_LENGTH + AIDX_NOISE_LENGTH)
+    MAX_SUFFIX = "z" * (AIDX_NODE_LENGTH + AIDX_NOISE_LENGTH)
+
+    node_id: str = encode_base36(
+        secrets.randbelow(36 ** AIDX_NODE_LENGTH), AIDX_NODE_LENGTH)  # Static
+    aidx_counter: int = 0  # Static
+
+    _counter_lock = threading.Lock()
+
+    def __init__(self, i: str):
+        self.id = i.lower()
+
+    @classmethod
+    def get_time_part(cls, ms: int) -> str:
+        return encode_base36(
+            max(ms - TIME2000_MS, 0), AID_TIME_LENGTH)[-AID_TIME_LENGTH:]
+
+    @staticmethod
+    def get_noise() -> str:
+        return encode_base36(
+            AIDX.aidx_counter, AIDX_NOISE_LENGTH)[-AIDX_NOISE_LENGTH:]
+
+    @classmethod
+    def generate(cls, *, t: datetime.datetime):
+        with AIDX._counter_lock:
+            AIDX.aidx_counter += 1
+            noise = cls.get_noise()
+        return cls(
+            cls.get_time_part(datetime_to_ms(t)) +
+            AIDX.node_id + noise)
+
+    @property
+    def time_ms(self) -> int:
+        return decode_base36(self.id[:AID_TIME_LENGTH]) + TIME2000_MS
@@ -1,15 +1,120 @@
 import datetime
+import re
+from typing import Pattern
+
+__all__ = (
+    "MisskeyID",
+)
+
+UNIX_EPOCH_UTC = datetime.datetime(1970, 1, 1, tzinfo=datetime.timezone.utc)
+
+
+def datetime_to_ms(t: datetime.datetime) -> int:
+    # Naive datetimes are treated as UTC.
+    if t.tzinfo is None:
+        t = t.replace(tzinfo=datetime.timezone.utc)
+    return (t - UNIX_EPOCH_UTC) // datetime.timedelta(milliseconds=1)
+
+
+def ms_to_datetime(ms: int) -> datetime.datetime:
+    return UNIX_EPOCH_UTC + datetime.timedelta(milliseconds=ms)
 
 
 class MisskeyID(object):
+    """
+    Base class of the ID schemes used by Misskey.
+
+    IDs of the same scheme are ordered by their creation time, and since
+    every scheme places the time at the head of a fixed-width string in an
+    order-preserving alphabet, they are compared as plain strings without
+    converting them to datetime.
+    IDs of different schemes can not be compared with each other.
+    """
+
+    __slots__ = ("id",)
+
     id: str
 
+    # Pattern of a valid ID string of the scheme.
+    REGEXP: Pattern = re.compile(r"^$")
+    # Characters filled after the time part to get the smallest
+    # and the largest ID of the same time.
+    MIN_SUFFIX: str = ""
+    MAX_SUFFIX: str = ""
+    # Milliseconds between the times the time part can represent.
+    TIME_RESOLUTION_MS: int = 1
+
+    def __init__(self, i: str):
+        self.id = i
+
     def __str__(self) -> str:
         return self.id
 
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.id!r})"
+
+    def __hash__(self) -> int:
+        return hash(self.id)
+
+    def __eq__(self, other) -> bool:
+        if type(other) is type(self):
+            return self.id == other.id
+        return NotImplemented
+
+    def __lt__(self, other) -> bool:
+        if type(other) is type(self):
+            return self.id < other.id
+        return NotImplemented
+
+    def __le__(self, other) -> bool:
+        if type(other) is type(self):
+            return self.id <= other.id
+        return NotImplemented
+
+    def __gt__(self, other) -> bool:
+        if type(other) is type(self):
+            return self.id > other.id
+        return NotImplemented
+
+    def __ge__(self, other) -> bool:
+        if type(other) is type(self):
+            return self.id >= other.id
+        return NotImplemented
+
+    @classmethod
+    def is_valid(cls, i: str) -> bool:
+        return cls.REGEXP.match(i) is not None
+
     @classmethod
     def generate(cls, *args, **kwargs):
         raise NotImplementedError()
 
-    def to_date(self) -> datetime.datetime:
+    @classmethod
+    def get_time_part(cls, ms: int) -> str:
+        # Encode UNIX time in milliseconds as the time part of the ID
         raise NotImplementedError()
+
+    @classmethod
+    def lower_bound(cls, t: datetime.datetime):
+        """
+        Returns the smallest ID which can be generated at ``t``.
+        It is suitable for ``since_id`` (to get notes created at or
+        after ``t``) and for ``until_id`` (to get notes created before
+        ``t``).
+        """
+        return cls(cls.get_time_part(datetime_to_ms(t)) + cls.MIN_SUFFIX)
+
+    @classmethod
+    def upper_bound(cls, t: datetime.datetime):
+        """
+        Returns the largest ID which can be generated at ``t``.
+        """
+        return cls(cls.get_time_part(datetime_to_ms(t)) + cls.MAX_SUFFIX)
+
+    @property
+    def time_ms(self) -> int:
+        # UNIX time in milliseconds when the ID was generated
+        raise NotImplementedError()
+
+    def to_date(self) -> datetime.datetime:
+        return ms_to_datetime(self.time_ms)
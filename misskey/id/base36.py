@@ -0,0 +1,141 @@
+from __future__ import annotations
+
+import functools
+from typing import TYPE_CHECKING, Iterable, Optional, Tuple, Union
+
+if TYPE_CHECKING:
+    import numpy as np
+
+__all__ = (
+    "BASE36_DIGITS",
+    "encode_base36",
+    "decode_base36",
+    "encode_base36_array",
+    "decode_base36_array",
+)
+
+BASE36_DIGITS = "0123456789abcdefghijklmnopqrstuvwxyz"
+
+# All two-digit combinations, used to encode two digits per division.
+_DIGIT_PAIRS = tuple(a + b for a in BASE36_DIGITS for b in BASE36_DIGITS)
+
+_INVALID_DIGIT = 36
+
+
+@functools.lru_cache(maxsize=None)
+def _numpy_tables() -> Tuple[np.ndarray, np.ndarray]:
+    # Built on first use, so that NumPy is imported only by the array
+    # functions
+    import numpy as np
+
+    digit_bytes = np.frombuffer(BASE36_DIGITS.encode("ascii"), dtype=np.uint8)
+
+    # Lookup table from an ASCII byte to its base36 digit value.
+    # Bytes which are not base36 digits are mapped to 36 (invalid).
+    # Code points above 255 are clipped to 255 before the lookup.
+    decode_table = np.full(256, _INVALID_DIGIT, dtype=np.int64)
+    for value, char in enumerate(BASE36_DIGITS):
+        decode_table[ord(char)] = value
+        decode_table[ord(char.upper())] = value
+    return digit_bytes, decode_table
+
+
+def encode_base36(value: int, width: int) -> str:
+    # Equivalent to `value.toString(36).padStart(width, "0")` in JavaScript
+    if value < 0:
+        raise ValueError("value must be a non-negative integer")
+
+    pairs = []
+    while value or 2 * len(pairs) < width:
+        value, remainder = divmod(value, 1296)
+        pairs.append(_DIGIT_PAIRS[remainder])
+    encoded = "".join(reversed(pairs))
+    if len(encoded) > width and encoded[0] == "0":
+        encoded = encoded[1:]
+    return encoded
+
+
+def decode_base36(value: str) -> int:
+    return int(value, 36)
+
+
+def encode_base36_array(
+    values: Union[Iterable[int], np.ndarray],
+    width: int,
+) -> np.ndarray:
+    """
+    Encode an array of non-negative integers into fixed-width, lower-case
+    base36 strings.
+    The result is a NumPy array of ``str`` (``<U{width}``).
+    """
+    chars = _encode_base36_chars(values, width)
+    return chars.view(f"S{width}").ravel().astype(f"U{width}")
+
+
+def _encode_base36_chars(
+    values: Union[Iterable[int], np.ndarray],
+    width: int,
+    out: Optional[np.ndarray] = None,
+) -> np.ndarray:
+    # Writes ASCII digits of each value into the rows of a uint8 matrix
+    import numpy as np
+
+    digit_bytes, _ = _numpy_tables()
+    numbers = np.array(values, dtype=np.int64).ravel()
+    if numbers.size and (
+            numbers.min() < 0 or numbers.max() >= 36 ** width):
+        raise ValueError(
+            f"values must be in range [0, 36 ** {width}) to fit "
+            f"{width} digits")
+
+    if out is None:
+        out = np.empty((numbers.size, width), dtype=np.uint8)
+    for position in range(width - 1, -1, -1):
+        numbers, remainder = np.divmod(numbers, 36)
+        out[:, position] = digit_bytes[remainder]
+    return out
+
+
+def decode_base36_array(
+    values: Union[Iterable[str], np.ndarray],
+    *,
+    start: int = 0,
+    stop: Optional[int] = None,
+) -> np.ndarray:
+    """
+    Decode the ``[start:stop]`` slice of each base36 string into an
+    ``int64`` NumPy array.
+    Each string must contain at least ``stop`` characters.
+    """
+    import numpy as np
+
+    _, decode_table = _numpy_tables()
+    strings = np.asarray(values)
+    if strings.size == 0:
+        return np.zeros(0, dtype=np.int64)
+    if strings.dtype == object:
+        strings = strings.astype(np.str_)
+    if strings.dtype.kind == "U":
+        # UCS-4 code points, read in place without encoding to bytes
+        code_unit, width = np.uint32, strings.dtype.itemsize // 4
+    elif strings.dtype.kind == "S":
+        code_unit, width = np.uint8, strings.dtype.itemsize
+    else:
+        raise TypeError("values must be an array of strings")
+
+    strings = np.ascontiguousarray(strings.ravel())
+    if stop is None:
+        stop = width
+    if stop > width or not 0 <= start < stop:
+        raise ValueError("Illegal slice for the given strings")
+
+    chars = strings.view(code_unit).reshape(strings.size, width)
+    digits = decode_table[np.minimum(chars[:, start:stop], 255)]
+    if (digits == _INVALID_DIGIT).any():
+        raise ValueError("values contain non-base36 characters")
+
+    result = np.zeros(strings.size, dtype=np.int64)
+    for position in range(digits.shape[1]):
+        result *= 36
+        result += digits[:, position]
+    return result
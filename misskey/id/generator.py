@@ -0,0 +1,205 @@
+from __future__ import annotations
+
+import datetime
+import os
+import secrets
+import threading
+import time
+import weakref
+from typing import TYPE_CHECKING, Optional, Tuple
+
+from .base import datetime_to_ms
+from .aid import AID, TIME2000_MS, AID_TIME_LENGTH, AID_NOISE_LENGTH
+from .aidx import AIDX, AIDX_NODE_LENGTH, AIDX_NOISE_LENGTH
+from .base36 import encode_base36, _encode_base36_chars
+
+if TYPE_CHECKING:
+    import numpy as np
+
+__all__ = (
+    "AIDGenerator",
+    "AIDXGenerator",
+)
+
+
+def _after_fork_callback(ref: weakref.ref):
+    def after_fork():
+        generator = ref()
+        if generator is not None:
+            generator._after_fork_in_child()
+    return after_fork
+
+
+class AIDGenerator(object):
+    """
+    Thread-safe generator of monotonically increasing AIDs.
+
+    IDs generated by one generator are unique and strictly increasing,
+    even when they are generated in the same millisecond or the clock goes
+    backwards. When the noise of a millisecond is exhausted, the generator
+    borrows the next millisecond.
+
+    To generate IDs from several processes without collisions, give each
+    process its own ``worker_id`` out of ``worker_count``; the noise space
+    is partitioned so that worker ``w`` only uses noise values ``n`` where
+    ``n % worker_count == w``. A generator inherited by a forked child
+    process shares its worker with the parent, so each should only be
+    used by one of them.
+    """
+
+    id_type = AID
+    noise_length = AID_NOISE_LENGTH
+
+    def __init__(
+        self, *,
+        worker_id: int = 0,
+        worker_count: int = 1,
+    ):
+        if worker_count < 1:
+            raise ValueError("worker_count must be 1 or more")
+        if not 0 <= worker_id < worker_count:
+            raise ValueError("worker_id must be in range [0, worker_count)")
+        noise_space = 36 ** self.noise_length
+        if worker_count > noise_space:
+            raise ValueError(
+                f"worker_count must be {noise_space} or less")
+
+        self.worker_id = worker_id
+        self.worker_count = worker_count
+        # Number of IDs a worker can generate in a millisecond
+        self.capacity = (noise_space - worker_id - 1) // worker_count + 1
+
+        self._lock = threading.Lock()
+        self._last_ms = -1
+        self._last_sequence = -1
+        if hasattr(os, "register_at_fork"):
+            os.register_at_fork(
+                after_in_child=_after_fork_callback(weakref.ref(self)))
+
+    def _after_fork_in_child(self):
+        # A lock held by another thread at fork time would never be
+        # released in the child process.
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _now_ms() -> int:
+        return time.time_ns() // 1_000_000
+
+    def _reserve(self, n: int, ms: Optional[int]) -> Tuple[int, int]:
+        # Reserves n consecutive slots and returns the first (ms, sequence)
+        with self._lock:
+            if ms is None:
+                ms = self._now_ms()
+            if ms > self._last_ms:
+                start_ms, start_sequence = ms, 0
+            elif self._last_sequence + 1 < self.capacity:
+                start_ms = self._last_ms
+                start_sequence = self._last_sequence + 1
+            else:
+                start_ms, start_sequence = self._last_ms + 1, 0
+
+            last_ms, last_sequence = divmod(
+                start_sequence + n - 1, self.capacity)
+            self._last_ms = start_ms + last_ms
+            self._last_sequence = last_sequence
+        return start_ms, start_sequence
+
+    def _noise(self, sequence: int) -> int:
+        return sequence * self.worker_count + self.worker_id
+
+    def _format(self, ms: int, noise: int) -> str:
+        return (
+            encode_base36(max(ms - TIME2000_MS, 0), AID_TIME_LENGTH) +
+            encode_base36(noise, self.noise_length))
+
+    def _format_many(self, ms: np.ndarray, noise: np.ndarray) -> np.ndarray:
+        import numpy as np
+
+        width = AID_TIME_LENGTH + self.noise_length
+        chars = np.empty((ms.size, width), dtype=np.uint8)
+        _encode_base36_chars(
+            np.maximum(ms - TIME2000_MS, 0), AID_TIME_LENGTH,
+            chars[:, :AID_TIME_LENGTH])
+        _encode_base36_chars(
+            noise, self.noise_length, chars[:, AID_TIME_LENGTH:])
+        return chars.view(f"S{width}").ravel().astype(f"U{width}")
+
+    def generate(self, *, t: Optional[datetime.datetime] = None):
+        ms, sequence = self._reserve(
+            1, None if t is None else datetime_to_ms(t))
+        return self.id_type(self._format(ms, self._noise(sequence)))
+
+    def generate_many(
+        self, n: int, *,
+        t: Optional[datetime.datetime] = None,
+    ) -> np.ndarray:
+        """
+        Generates ``n`` consecutive IDs at once.
+        Returns a NumPy array of ID strings in ascending order.
+        """
+        import numpy as np
+
+        if n < 0:
+            raise ValueError("n must be a non-negative integer")
+        if n == 0:
+            return np.empty(0, dtype=str)
+
+        start_ms, start_sequence = self._reserve(
+            n, None if t is None else datetime_to_ms(t))
+        ms_offset, sequence = np.divmod(
+            np.arange(start_sequence, start_sequence + n, dtype=np.int64),
+            self.capacity)
+        return self._format_many(start_ms + ms_offset, self._noise(sequence))
+
+
+class AIDXGenerator(AIDGenerator):
+    """
+    Thread-safe generator of monotonically increasing AIDXs.
+    Processes can be told apart by ``node_id`` (4 base36 characters)
+    in addition to the noise partitioning of :class:`AIDGenerator`.
+    Without ``node_id``, a random one is used, and a forked child process
+    picks a new one so that it does not collide with its parent.
+    """
+
+    id_type = AIDX
+    noise_length = AIDX_NOISE_LENGTH
+
+    def __init__(
+        self, *,
+        node_id: Optional[str] = None,
+        **kwargs,
+    ):
+        super().__init__(**kwargs)
+        self._random_node = node_id is None
+        if node_id is None:
+            node_id = AIDX.node_id
+        elif (len(node_id) != AIDX_NODE_LENGTH or
+              not node_id.isascii() or not node_id.isalnum()):
+            raise ValueError(
+                f"node_id must be {AIDX_NODE_LENGTH} base36 characters")
+        self.node_id = node_id.lower()
+
+    def _after_fork_in_child(self):
+        super()._after_fork_in_child()
+        if self._random_node:
+            self.node_id = encode_base36(
+                secrets.randbelow(36 ** AIDX_NODE_LENGTH), AIDX_NODE_LENGTH)
+
+    def _format(self, ms: int, noise: int) -> str:
+        return (
+            AIDX.get_time_part(ms) + self.node_id +
+            encode_base36(noise, self.noise_length))
+
+    def _format_many(self, ms: np.ndarray, noise: np.ndarray) -> np.ndarray:
+        import numpy as np
+
+        node_end = AID_TIME_LENGTH + AIDX_NODE_LENGTH
+        width = node_end + self.noise_length
+        chars = np.empty((ms.size, width), dtype=np.uint8)
+        _encode_base36_chars(
+            np.maximum(ms - TIME2000_MS, 0) % 36 ** AID_TIME_LENGTH,
+            AID_TIME_LENGTH, chars[:, :AID_TIME_LENGTH])
+        chars[:, AID_TIME_LENGTH:node_end] = np.frombuffer(
+            self.node_id.encode("ascii"), dtype=np.uint8)
+        _encode_base36_chars(noise, self.noise_length, chars[:, node_end:])
+        return chars.view(f"S{width}").ravel().astype(f"U{width}")
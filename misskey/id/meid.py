@@ -0,0 +1,82 @@
+import datetime
+import re
+import secrets
+
+from .base import MisskeyID, datetime_to_ms
+
+__all__ = (
+    "MEID",
+    "MEID_REGEXP",
+    "MEIDG",
+    "MEIDG_REGEXP",
+)
+
+MEID_REGEXP = re.compile(r"^[0-9a-f]{24}$", flags=re.I)
+MEIDG_REGEXP = re.compile(r"^g[0-9a-f]{23}$", flags=re.I)
+
+MEID_TIME_OFFSET = 0x800000000000
+MEID_TIME_LENGTH = 12
+MEIDG_TIME_LENGTH = 11
+MEID_RANDOM_LENGTH = 12
+
+
+def _get_random() -> str:
+    return secrets.token_hex(MEID_RANDOM_LENGTH // 2)
+
+
+class MEID(MisskeyID):
+    """
+    ID of the ``meid`` scheme.
+    It consists of 12 hex characters of UNIX time in milliseconds with
+    the most significant bit set, followed by 12 random hex characters.
+    """
+
+    __slots__ = ()
+
+    REGEXP = MEID_REGEXP
+    MIN_SUFFIX = "0" * MEID_RANDOM_LENGTH
+    MAX_SUFFIX = "f" * MEID_RANDOM_LENGTH
+
+    def __init__(self, i: str):
+        self.id = i.lower()
+
+    @classmethod
+    def get_time_part(cls, ms: int) -> str:
+        return format(max(ms, 0) + MEID_TIME_OFFSET, "012x")
+
+    @classmethod
+    def generate(cls, *, t: datetime.datetime):
+        return cls(cls.get_time_part(datetime_to_ms(t)) + _get_random())
+
+    @property
+    def time_ms(self) -> int:
+        return int(self.id[:MEID_TIME_LENGTH], 16) - MEID_TIME_OFFSET
+
+
+class MEIDG(MisskeyID):
+    """
+    ID of the ``meidg`` scheme.
+    It consists of a fixed ``g``, 11 hex characters of UNIX time in
+    milliseconds, followed by 12 random hex characters.
+    """
+
+    __slots__ = ()
+
+    REGEXP = MEIDG_REGEXP
+    MIN_SUFFIX = "0" * MEID_RANDOM_LENGTH
+    MAX_SUFFIX = "f" * MEID_RANDOM_LENGTH
+
+    def __init__(self, i: str):
+        self.id = i.lower()
+
+    @classmethod
+    def get_time_part(cls, ms: int) -> str:
+        return "g" + format(max(ms, 0), "011x")
+
+    @classmethod
+    def generate(cls, *, t: datetime.datetime):
+        return cls(cls.get_time_part(datetime_to_ms(t)) + _get_random())
+
+    @property
+    def time_ms(self) -> int:
+        return int(self.id[1:1 + MEIDG_TIME_LENGTH], 16)
@@ -0,0 +1,47 @@
+import datetime
+import re
+import secrets
+
+from .base import MisskeyID, datetime_to_ms
+
+__all__ = (
+    "ObjectID",
+    "OBJECTID_REGEXP",
+)
+
+OBJECTID_REGEXP = re.compile(r"^[0-9a-f]{24}$", flags=re.I)
+
+OBJECTID_TIME_LENGTH = 8
+OBJECTID_RANDOM_LENGTH = 16
+
+
+class ObjectID(MisskeyID):
+    """
+    ID of the ``objectid`` scheme (compatible with MongoDB's ObjectId).
+    It consists of 8 hex characters of UNIX time in seconds, followed by
+    16 random hex characters.
+    """
+
+    __slots__ = ()
+
+    REGEXP = OBJECTID_REGEXP
+    MIN_SUFFIX = "0" * OBJECTID_RANDOM_LENGTH
+    MAX_SUFFIX = "f" * OBJECTID_RANDOM_LENGTH
+    TIME_RESOLUTION_MS = 1000
+
+    def __init__(self, i: str):
+        self.id = i.lower()
+
+    @classmethod
+    def get_time_part(cls, ms: int) -> str:
+        return format(max(ms, 0) // 1000, "08x")
+
+    @classmethod
+    def generate(cls, *, t: datetime.datetime):
+        return cls(
+            cls.get_time_part(datetime_to_ms(t)) +
+            secrets.token_hex(OBJECTID_RANDOM_LENGTH // 2))
+
+    @property
+    def time_ms(self) -> int:
+        return int(self.id[:OBJECTID_TIME_LENGTH], 16) * 1000
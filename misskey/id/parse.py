@@ -0,0 +1,63 @@
+from typing import Dict, Optional, Type
+
+from .base import MisskeyID
+from .aid import AID
+from .aidx import AIDX
+from .meid import MEID, MEIDG
+from .objectid import ObjectID
+from .ulid import ULID
+
+__all__ = (
+    "ID_SCHEMES",
+    "detect_id_type",
+    "parse_id",
+)
+
+# Names of the ID schemes as used in Misskey's configuration (`id:`)
+ID_SCHEMES: Dict[str, Type[MisskeyID]] = {
+    "aid": AID,
+    "aidx": AIDX,
+    "meid": MEID,
+    "meidg": MEIDG,
+    "ulid": ULID,
+    "objectid": ObjectID,
+}
+
+# meid sets the most significant bit of its time part, so it always starts
+# with 8-f, while objectid starts with 0-7 until the year 2038.
+_MEID_HEAD = frozenset("89abcdefABCDEF")
+
+
+def detect_id_type(i: str) -> Type[MisskeyID]:
+    length = len(i)
+    if length == 10 and AID.is_valid(i):
+        return AID
+    elif length == 16 and AIDX.is_valid(i):
+        return AIDX
+    elif length == 26 and ULID.is_valid(i):
+        return ULID
+    elif length == 24:
+        if MEIDG.is_valid(i):
+            return MEIDG
+        elif MEID.is_valid(i):
+            return MEID if i[0] in _MEID_HEAD else ObjectID
+
+    raise ValueError(f'Could not detect the ID scheme of "{i}"')
+
+
+def parse_id(i: str, *, scheme: Optional[str] = None) -> MisskeyID:
+    """
+    Returns an ID object for the given ID string.
+    If ``scheme`` (e.g. ``"aid"``) is not given, it is detected from the
+    format of the string.
+    """
+    if scheme is None:
+        return detect_id_type(i)(i)
+
+    try:
+        id_type = ID_SCHEMES[scheme]
+    except KeyError:
+        raise ValueError(f'Unknown ID scheme "{scheme}"')
+    if not id_type.is_valid(i):
+        raise ValueError(f'"{i}" is not a valid {scheme} ID')
+    return id_type(i)
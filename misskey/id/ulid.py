@@ -0,0 +1,57 @@
+import datetime
+import re
+import secrets
+
+from .base import MisskeyID, datetime_to_ms
+
+__all__ = (
+    "ULID",
+    "ULID_REGEXP",
+)
+
+ULID_REGEXP = re.compile(r"^[0-7][0-9a-hjkmnp-tv-z]{25}$", flags=re.I)
+
+# Crockford's Base32
+ULID_DIGITS = "0123456789ABCDEFGHJKMNPQRSTVWXYZ"
+ULID_TIME_LENGTH = 10
+ULID_RANDOM_LENGTH = 16
+
+
+class ULID(MisskeyID):
+    """
+    ID of the ``ulid`` scheme.
+    It consists of 10 characters of UNIX time in milliseconds, followed by
+    16 random characters in Crockford's Base32.
+    """
+
+    __slots__ = ()
+
+    REGEXP = ULID_REGEXP
+    MIN_SUFFIX = "0" * ULID_RANDOM_LENGTH
+    MAX_SUFFIX = "Z" * ULID_RANDOM_LENGTH
+
+    def __init__(self, i: str):
+        self.id = i.upper()
+
+    @classmethod
+    def get_time_part(cls, ms: int) -> str:
+        ms = max(ms, 0)
+        chars = []
+        for _ in range(ULID_TIME_LENGTH):
+            ms, remainder = divmod(ms, 32)
+            chars.append(ULID_DIGITS[remainder])
+        return "".join(reversed(chars))
+
+    @classmethod
+    def generate(cls, *, t: datetime.datetime):
+        return cls(
+            cls.get_time_part(datetime_to_ms(t)) + "".join(
+                secrets.choice(ULID_DIGITS)
+                for _ in range(ULID_RANDOM_LENGTH)))
+
+    @property
+    def time_ms(self) -> int:
+        ms = 0
+        for char in self.id[:ULID_TIME_LENGTH]:
+            ms = ms * 32 + ULID_DIGITS.index(char)
+        return ms
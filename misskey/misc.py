@@ -1,6 +1,18 @@
-from typing import Optional, List
+from typing import Any, Optional, List
 
 from .sync_base import Misskey as Base
+from .enum import HttpMethodEnum
+from .exceptions import (
+    MisskeyAPIError,
+    MisskeyNetworkError,
+    MisskeyResponseError,
+)
+from .registry import (
+    REGISTRY_MAX_AGE,
+    EndpointRegistry,
+    prepare_call,
+    registry_cache_path,
+)
 from .schemas import AnnouncementsSchema, Announcements
 from .schemas.arguments import AnnouncementsArgumentsSchema
 
@@ -10,9 +22,64 @@ __all__ = (
 
 
 class Misskey(Base):
+    registry: Optional[EndpointRegistry] = None
+
     def endpoints(self) -> List[str]:
         return self._api_request(endpoint="/api/endpoints")
 
+    def fetch_registry(self) -> EndpointRegistry:
+        try:
+            document = self._api_request(
+                method=HttpMethodEnum.GET, endpoint="/api.json")
+        except (MisskeyAPIError, MisskeyNetworkError, MisskeyResponseError):
+            # No OpenAPI document, so only the names are known
+            return EndpointRegistry.from_endpoint_names(self.endpoints())
+        return EndpointRegistry.from_openapi(document)
+
+    def load_registry(
+        self, *,
+        cache_dir: Optional[str] = None,
+        max_age: Optional[float] = REGISTRY_MAX_AGE,
+        refresh: bool = False,
+        validate_responses: bool = False,
+    ) -> EndpointRegistry:
+        """
+        Loads the endpoint registry used by :meth:`call` from the cache
+        in ``cache_dir``, or fetches and caches it if there is no cache
+        newer than ``max_age`` seconds (or ``refresh`` is true). If the
+        cache cannot be written, the fetched registry is used anyway.
+        """
+        path = registry_cache_path(self.address, cache_dir)
+        registry = None
+        if not refresh:
+            registry = EndpointRegistry.load(path, max_age=max_age)
+        if registry is None:
+            registry = self.fetch_registry()
+            try:
+                registry.save(path)
+            except OSError:
+                # Only a cache, e.g. on a read-only home directory
+                pass
+        registry.validate_responses = validate_responses
+        self.registry = registry
+        return registry
+
+    def call(self, endpoint: str, params: Optional[dict] = None, /,
+             **kwargs) -> Any:
+        """
+        Calls any endpoint, e.g. ``mk.call("notes/search", query="a")``.
+
+        Keyword arguments are converted to camelCase; ``params`` are sent
+        as they are. If a registry is loaded with :meth:`load_registry`,
+        the parameters (and optionally the response) are validated
+        against the schemas of the endpoint.
+        """
+        name, payload = prepare_call(self.registry, endpoint, params, kwargs)
+        response = self._api_request(endpoint=f"/api/{name}", params=payload)
+        if self.registry is not None and self.registry.validate_responses:
+            self.registry.validate_response(name, response)
+        return response
+
     def announcements(
         self, *,
         limit: int = 10,
@@ -5,6 +5,7 @@ from .users import Misskey as UsersMisskey
 from .drive import Misskey as DriveMisskey
 from .misc import Misskey as MiscMisskey
 from .notifications import Misskey as NotificationsMisskey
+from .channels import Misskey as ChannelsMisskey
 
 __all__ = (
     "Misskey",
@@ -19,5 +20,6 @@ class Misskey(
     DriveMisskey,
     MiscMisskey,
     NotificationsMisskey,
+    ChannelsMisskey,
 ):
     pass
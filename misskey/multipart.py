@@ -0,0 +1,187 @@
+import io
+import mimetypes
+import os
+import secrets
+from dataclasses import dataclass
+from typing import BinaryIO, Callable, Dict, Optional, Union
+
+__all__ = (
+    "ProgressCallback",
+    "UploadFile",
+    "MultipartEncoder",
+)
+
+# Called with (bytes sent so far, total bytes)
+ProgressCallback = Callable[[int, int], None]
+
+UploadSource = Union[str, os.PathLike, BinaryIO, bytes, bytearray, memoryview]
+
+
+@dataclass
+class UploadFile:
+    """
+    A file to be uploaded, read from its current position to the end.
+    Use :meth:`open` to make one from a path, a binary file object,
+    a memory-mapped file (``mmap.mmap``) or bytes.
+    """
+
+    file: BinaryIO
+    size: int
+    filename: str
+    content_type: str = "application/octet-stream"
+    should_close: bool = False
+
+    @classmethod
+    def open(
+        cls,
+        source: UploadSource, *,
+        filename: Optional[str] = None,
+        content_type: Optional[str] = None,
+    ):
+        should_close = False
+        if isinstance(source, (str, os.PathLike)):
+            path = os.fspath(source)
+            file = open(path, "rb")
+            should_close = True
+            default_filename = os.path.basename(path)
+        elif isinstance(source, (bytes, bytearray, memoryview)):
+            file = io.BytesIO(source)
+            default_filename = "file"
+        else:
+            file = source
+            default_filename = os.path.basename(
+                getattr(source, "name", None) or "file")
+            if not isinstance(default_filename, str):
+                # e.g. file objects opened from a file descriptor
+                default_filename = "file"
+
+        try:
+            size = cls._remaining_size(file)
+        except Exception:
+            if should_close:
+                file.close()
+            raise
+
+        if filename is None:
+            filename = default_filename
+        if content_type is None:
+            content_type = (
+                mimetypes.guess_type(filename)[0] or
+                "application/octet-stream")
+
+        return cls(
+            file=file,
+            size=size,
+            filename=filename,
+            content_type=content_type,
+            should_close=should_close,
+        )
+
+    @staticmethod
+    def _remaining_size(file: BinaryIO) -> int:
+        position = file.tell()
+        try:
+            end = os.fstat(file.fileno()).st_size
+        except (AttributeError, OSError, io.UnsupportedOperation):
+            # In-memory streams and memory-mapped files
+            if hasattr(file, "__len__"):
+                end = len(file)
+            else:
+                end = file.seek(0, os.SEEK_END)
+                file.seek(position)
+        return max(end - position, 0)
+
+    def close(self):
+        if self.should_close:
+            self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+def _quote(value: str) -> str:
+    # Same escaping as browsers use in multipart/form-data
+    return (value.replace("\r", "%0D").replace("\n", "%0A")
+            .replace('"', "%22"))
+
+
+class MultipartEncoder(object):
+    """
+    A ``multipart/form-data`` body which streams the file part from disk
+    instead of building the whole body in memory.
+
+    It behaves as a readable file object with a known length, so it can be
+    given to ``requests`` as ``data``, or read chunk by chunk for aiohttp.
+    """
+
+    def __init__(
+        self, *,
+        fields: Dict[str, str],
+        file_field: str,
+        upload: UploadFile,
+        progress: Optional[ProgressCallback] = None,
+    ):
+        self.boundary = secrets.token_hex(16)
+        self.fields = dict(fields)
+        self.file_field = file_field
+        self.upload = upload
+        self.progress = progress
+
+        head = io.BytesIO()
+        for key, value in fields.items():
+            head.write(
+                f"--{self.boundary}\r\n"
+                f'Content-Disposition: form-data; name="{_quote(key)}"'
+                f"\r\n\r\n{value}\r\n".encode("utf-8"))
+        head.write(
+            f"--{self.boundary}\r\n"
+            f'Content-Disposition: form-data; name="{_quote(file_field)}"; '
+            f'filename="{_quote(upload.filename)}"\r\n'
+            f"Content-Type: {upload.content_type}\r\n\r\n".encode("utf-8"))
+        self._head = head.getvalue()
+        self._tail = f"\r\n--{self.boundary}--\r\n".encode("utf-8")
+
+        self._length = len(self._head) + upload.size + len(self._tail)
+        self._position = 0
+        self._file_remaining = upload.size
+
+    @property
+    def content_type(self) -> str:
+        return f"multipart/form-data; boundary={self.boundary}"
+
+    def __len__(self) -> int:
+        return self._length
+
+    def read(self, size: int = -1) -> bytes:
+        if size is None or size < 0:
+            size = self._length - self._position
+
+        chunks = []
+        while size > 0 and self._position < self._length:
+            chunk = self._read_chunk(size)
+            chunks.append(chunk)
+            size -= len(chunk)
+            self._position += len(chunk)
+
+        data = b"".join(chunks)
+        if data and self.progress is not None:
+            self.progress(self._position, self._length)
+        return data
+
+    def _read_chunk(self, size: int) -> bytes:
+        head_length = len(self._head)
+        if self._position < head_length:
+            return self._head[self._position:self._position + size]
+
+        if self._file_remaining > 0:
+            chunk = self.upload.file.read(min(size, self._file_remaining))
+            if not chunk:
+                raise IOError("File was truncated while uploading")
+            self._file_remaining -= len(chunk)
+            return chunk
+
+        tail_position = self._position - head_length - self.upload.size
+        return self._tail[tail_position:tail_position + size]
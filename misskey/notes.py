@@ -11,6 +11,9 @@ from .schemas import (
 from .schemas.arguments import (
     NotesCreateArgumentsSchema,
     NotesLocalTimelineArgumentsSchema,
+    NotesTimelineArgumentsSchema,
+    NotesHybridTimelineArgumentsSchema,
+    NotesGlobalTimelineArgumentsSchema,
 )
 from .enum import (
     VisibilityEnum,
@@ -22,6 +25,10 @@ __all__ = (
     "Misskey",
 )
 
+# Schemas are stateless, so the ones used per note are built only once
+_notes_create_arguments_schema = NotesCreateArgumentsSchema()
+_created_note_schema = CreatedNoteSchema()
+
 
 class Misskey(Base):
     def notes_create(
@@ -69,9 +76,9 @@ class Misskey(Base):
 
         payload_dict.update(kwargs)
 
-        payload = NotesCreateArgumentsSchema().dump(payload_dict)
+        payload = _notes_create_arguments_schema.dump(payload_dict)
 
-        return CreatedNoteSchema().load(
+        return _created_note_schema.load(
             self._api_request(endpoint="/api/notes/create", params=payload))
 
     def notes_show(self, *, note_id: str) -> Note:
@@ -146,3 +153,85 @@ class Misskey(Base):
                 endpoint="/api/notes/local-timeline", params=payload),
             many=True,
         )
+
+    def notes_timeline(
+        self, *,
+        with_files: bool = False,
+        with_renotes: bool = False,
+        limit: int = 10,
+        since_id: Optional[str] = None,
+        until_id: Optional[str] = None,
+    ) -> List[Note]:
+        payload_dict = {
+            "with_files": with_files,
+            "with_renotes": with_renotes,
+            "limit": limit,
+        }
+        if since_id is not None:
+            payload_dict["since_id"] = since_id
+        if until_id is not None:
+            payload_dict["until_id"] = until_id
+
+        payload = NotesTimelineArgumentsSchema().dump(payload_dict)
+
+        return NoteSchema().load(
+            self._api_request(
+                endpoint="/api/notes/timeline", params=payload),
+            many=True,
+        )
+
+    def notes_hybrid_timeline(
+        self, *,
+        with_files: bool = False,
+        with_renotes: bool = False,
+        with_replies: bool = False,
+        exclude_nsfw: bool = False,
+        limit: int = 10,
+        since_id: Optional[str] = None,
+        until_id: Optional[str] = None,
+    ) -> List[Note]:
+        payload_dict = {
+            "with_files": with_files,
+            "with_renotes": with_renotes,
+            "with_replies": with_replies,
+            "exclude_nsfw": exclude_nsfw,
+            "limit": limit,
+        }
+        if since_id is not None:
+            payload_dict["since_id"] = since_id
+        if until_id is not None:
+            payload_dict["until_id"] = until_id
+
+        payload = NotesHybridTimelineArgumentsSchema().dump(payload_dict)
+
+        return NoteSchema().load(
+            self._api_request(
+                endpoint="/api/notes/hybrid-timeline", params=payload),
+            many=True,
+        )
+
+    def notes_global_timeline(
+        self, *,
+        with_files: bool = False,
+        with_renotes: bool = False,
+        limit: int = 10,
+        since_id: Optional[str] = None,
+        until_id: Optional[str] = None,
+    ) -> List[Note]:
+        payload_dict = {
+            "with_files": with_files,
+            "with_renotes": with_renotes,
+            "limit": limit,
+        }
+        if since_id is not None:
+            payload_dict["since_id"] = since_id
+        if until_id is not None:
+            payload_dict["until_id"] = until_id
+
+        payload = NotesGlobalTimelineArgumentsSchema().dump(payload_dict)
+
+        return NoteSchema().load(
+            self._api_request(
+                endpoint="/api/notes/global-timeline", params=payload),
+            many=True,
+        )
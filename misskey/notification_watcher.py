@@ -0,0 +1,167 @@
+import json
+import os
+import threading
+import time
+from typing import Iterator, List, Optional, Union
+
+from .enum import NotificationTypeEnum
+from .misskey import Misskey
+from .schemas import Notification
+
+__all__ = (
+    "NotificationWatcherBase",
+    "NotificationWatcher",
+)
+
+
+class NotificationWatcherBase(object):
+    """
+    State and policy shared by the sync and async notification watchers.
+
+    - ``since_id`` is persisted to ``state_path`` (if given) after each
+      batch is consumed, so a restarted watcher resumes where it stopped.
+    - The polling interval drops to ``min_interval`` when notifications
+      arrive and grows by ``backoff`` times per empty poll up to
+      ``max_interval``.
+    - Notifications are fetched without marking them as read, and
+      ``notifications/mark-all-as-read`` is called once per
+      ``mark_batch_size`` notifications or ``mark_interval`` seconds.
+    """
+
+    def __init__(
+        self, *,
+        since_id: Optional[str] = None,
+        state_path: Optional[Union[str, os.PathLike]] = None,
+        limit: int = 100,
+        min_interval: float = 1.0,
+        max_interval: float = 60.0,
+        backoff: float = 2.0,
+        mark_as_read: bool = True,
+        mark_batch_size: int = 50,
+        mark_interval: float = 30.0,
+        include_types: Optional[List[NotificationTypeEnum]] = None,
+        exclude_types: Optional[List[NotificationTypeEnum]] = None,
+    ):
+        self.state_path = (
+            os.fspath(state_path) if state_path is not None else None)
+        self.limit = limit
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.backoff = backoff
+        self.mark_as_read = mark_as_read
+        self.mark_batch_size = mark_batch_size
+        self.mark_interval = mark_interval
+        self.include_types = include_types
+        self.exclude_types = exclude_types
+
+        self.since_id = since_id
+        if self.since_id is None:
+            self.since_id = self._load_state()
+        self.interval = min_interval
+        self._unread = 0
+        self._last_marked_at = time.monotonic()
+
+    def _load_state(self) -> Optional[str]:
+        if self.state_path is None:
+            return None
+        try:
+            with open(self.state_path, "r", encoding="utf-8") as f:
+                return json.load(f).get("since_id")
+        except FileNotFoundError:
+            return None
+
+    def _save_state(self) -> None:
+        if self.state_path is None:
+            return
+        temp_path = self.state_path + ".tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump({"since_id": self.since_id}, f)
+        os.replace(temp_path, self.state_path)
+
+    def _request_kwargs(self, until_id: Optional[str]) -> dict:
+        return {
+            "limit": self.limit,
+            "since_id": self.since_id,
+            "until_id": until_id,
+            "mark_as_read": False,
+            "include_types": self.include_types,
+            "exclude_types": self.exclude_types,
+        }
+
+    def _has_more(self, page: List[Notification]) -> bool:
+        # Without since_id only the latest page is fetched. With since_id
+        # the server returns the newest notifications first, so a full
+        # page means older unseen notifications may remain.
+        return self.since_id is not None and len(page) >= self.limit
+
+    def _accept(self, items: List[Notification]) -> List[Notification]:
+        # Returns new notifications in ascending order
+        unique = {n.id: n for n in items}
+        notifications = [unique[i] for i in sorted(unique)]
+        if notifications:
+            self.since_id = notifications[-1].id
+            self.interval = self.min_interval
+        else:
+            self.interval = min(
+                self.max_interval, self.interval * self.backoff)
+        self._unread += len(notifications)
+        return notifications
+
+    def _should_mark(self) -> bool:
+        return self.mark_as_read and self._unread > 0 and (
+            self._unread >= self.mark_batch_size or
+            time.monotonic() - self._last_marked_at >= self.mark_interval)
+
+    def _marked(self) -> None:
+        self._unread = 0
+        self._last_marked_at = time.monotonic()
+
+
+class NotificationWatcher(NotificationWatcherBase):
+    """
+    Watches notifications by adaptive polling.
+
+    .. code-block:: python
+
+       watcher = NotificationWatcher(mk, state_path="notifications.json")
+       for notification in watcher:
+           handle(notification)
+
+    See :class:`NotificationWatcherBase` for the options.
+    """
+
+    def __init__(self, mk: Misskey, **kwargs):
+        super().__init__(**kwargs)
+        self.mk = mk
+        self._stop_event = threading.Event()
+
+    def poll(self) -> List[Notification]:
+        items = []
+        until_id = None
+        while True:
+            page = self.mk.i_notifications(**self._request_kwargs(until_id))
+            items.extend(page)
+            if not page or not self._has_more(page):
+                break
+            until_id = min(n.id for n in page)
+        return self._accept(items)
+
+    def commit(self) -> None:
+        # Called after a batch is consumed
+        self._save_state()
+        if self._should_mark():
+            self.mk.notifications_mark_all_as_read()
+            self._marked()
+
+    def stop(self) -> None:
+        self._stop_event.set()
+
+    def watch(self) -> Iterator[Notification]:
+        self._stop_event.clear()
+        while not self._stop_event.is_set():
+            yield from self.poll()
+            self.commit()
+            self._stop_event.wait(self.interval)
+
+    def __iter__(self) -> Iterator[Notification]:
+        return self.watch()
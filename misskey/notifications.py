@@ -1,12 +1,44 @@
-from typing import Optional
+from typing import Optional, List
 
 from .sync_base import Misskey as Base
+from .schemas import (
+    Notification,
+    NotificationSchema,
+)
+from .schemas.arguments import INotificationsArgumentsSchema
+from .enum import NotificationTypeEnum
 
 __all__ = (
     "Misskey",
+    "i_notifications_payload",
 )
 
 
+def i_notifications_payload(
+    *,
+    limit: int = 10,
+    since_id: Optional[str] = None,
+    until_id: Optional[str] = None,
+    mark_as_read: bool = True,
+    include_types: Optional[List[NotificationTypeEnum]] = None,
+    exclude_types: Optional[List[NotificationTypeEnum]] = None,
+) -> dict:
+    payload_dict = {
+        "limit": limit,
+        "mark_as_read": mark_as_read,
+    }
+    if since_id is not None:
+        payload_dict["since_id"] = since_id
+    if until_id is not None:
+        payload_dict["until_id"] = until_id
+    if include_types is not None:
+        payload_dict["include_types"] = include_types
+    if exclude_types is not None:
+        payload_dict["exclude_types"] = exclude_types
+
+    return INotificationsArgumentsSchema().dump(payload_dict)
+
+
 class Misskey(Base):
     def i_notifications(
         self, *,
@@ -14,11 +46,21 @@ class Misskey(Base):
         since_id: Optional[str] = None,
         until_id: Optional[str] = None,
         mark_as_read: bool = True,
-        # TODO: Add enum
-        include_types=None,  # Optional[List[...Enum]]
-        exclude_types=None,  # Optional[List[...Enum]]
-    ):  # TODO: Add return value (Add new schema)
-        pass
+        include_types: Optional[List[NotificationTypeEnum]] = None,
+        exclude_types: Optional[List[NotificationTypeEnum]] = None,
+    ) -> List[Notification]:
+        payload = i_notifications_payload(
+            limit=limit,
+            since_id=since_id,
+            until_id=until_id,
+            mark_as_read=mark_as_read,
+            include_types=include_types,
+            exclude_types=exclude_types,
+        )
+        return NotificationSchema().load(
+            self._api_request(
+                endpoint="/api/i/notifications", params=payload),
+            many=True)
 
     def i_notifications_grouped(
         self, *,
@@ -26,11 +68,21 @@ class Misskey(Base):
         since_id: Optional[str] = None,
         until_id: Optional[str] = None,
         mark_as_read: bool = True,
-        # TODO: Add enum
-        include_types=None,  # Optional[List[...Enum]]
-        exclude_types=None,  # Optional[List[...Enum]]
-    ):  # TODO: Add return value (Add new schema)
-        raise NotImplementedError()
+        include_types: Optional[List[NotificationTypeEnum]] = None,
+        exclude_types: Optional[List[NotificationTypeEnum]] = None,
+    ) -> List[Notification]:
+        payload = i_notifications_payload(
+            limit=limit,
+            since_id=since_id,
+            until_id=until_id,
+            mark_as_read=mark_as_read,
+            include_types=include_types,
+            exclude_types=exclude_types,
+        )
+        return NotificationSchema().load(
+            self._api_request(
+                endpoint="/api/i/notifications-grouped", params=payload),
+            many=True)
 
     def notifications_create(
         self, *,
@@ -40,8 +92,8 @@ class Misskey(Base):
     ):
         raise NotImplementedError()
 
-    def notifications_mark_all_as_read(self):
-        raise NotImplementedError()
+    def notifications_mark_all_as_read(self) -> None:
+        self._api_request(endpoint="/api/notifications/mark-all-as-read")
 
     def notifications_test_notification(self):
         raise NotImplementedError()
@@ -0,0 +1,82 @@
+import threading
+import time
+from typing import Optional
+
+from .exceptions import MisskeyAPIError
+
+__all__ = (
+    "RATE_LIMIT_ERROR_CODE",
+    "is_rate_limit_error",
+    "RateLimiter",
+)
+
+RATE_LIMIT_ERROR_CODE = "RATE_LIMIT_EXCEEDED"
+
+
+def is_rate_limit_error(error: BaseException) -> bool:
+    return (isinstance(error, MisskeyAPIError) and
+            error.code == RATE_LIMIT_ERROR_CODE)
+
+
+class RateLimiter(object):
+    """
+    Token bucket which allows ``rate`` requests per second on average and
+    bursts of up to ``burst`` requests.
+
+    It is thread-safe, and may be shared by threads and event loops:
+    :meth:`reserve` only computes the delay, which the caller sleeps for
+    with :meth:`acquire` or :meth:`acquire_async`.
+    """
+
+    def __init__(self, rate: float, burst: int = 1):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        # Number of times the server answered RATE_LIMIT_EXCEEDED
+        self.penalties = 0
+        self._updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(
+            self.burst, self._tokens + (now - self._updated_at) * self.rate)
+        self._updated_at = now
+
+    def reserve(self) -> float:
+        """
+        Takes a token and returns the seconds to wait before using it.
+        """
+        with self._lock:
+            self._refill(time.monotonic())
+            self._tokens -= 1
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate
+
+    def penalize(self, delay: Optional[float] = None) -> None:
+        """
+        Empties the bucket so that following requests wait at least
+        ``delay`` seconds (one token interval if not given), e.g. after
+        the server answered ``RATE_LIMIT_EXCEEDED``.
+        """
+        if delay is None:
+            delay = 1 / self.rate
+        with self._lock:
+            self.penalties += 1
+            self._refill(time.monotonic())
+            self._tokens = min(self._tokens, -delay * self.rate)
+
+    def acquire(self) -> None:
+        delay = self.reserve()
+        if delay > 0:
+            time.sleep(delay)
+
+    async def acquire_async(self) -> None:
+        # Imported here, as the sync client imports this module too
+        import asyncio
+
+        delay = self.reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
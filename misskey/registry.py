@@ -0,0 +1,421 @@
+import enum
+import json
+import os
+import re
+import time
+from dataclasses import asdict, dataclass
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+from urllib.parse import urlparse
+
+from .exceptions import MisskeyIllegalArgumentError, MisskeyResponseError
+
+__all__ = (
+    "REGISTRY_MAX_AGE",
+    "EndpointSpec",
+    "EndpointRegistry",
+    "camelize",
+    "normalize_endpoint",
+    "default_registry_cache_dir",
+    "registry_cache_path",
+    "prepare_call",
+)
+
+# Seconds before a cached registry is fetched again
+REGISTRY_MAX_AGE = 24 * 60 * 60
+
+REGISTRY_FORMAT_VERSION = 1
+
+JSONSchema = Dict[str, Any]
+
+# Raises with the path of the first invalid value
+Validator = Callable[[Any, str], None]
+
+
+def camelize(name: str) -> str:
+    head, *rest = name.split("_")
+    return head + "".join(part[:1].upper() + part[1:] for part in rest)
+
+
+def normalize_endpoint(endpoint: str) -> str:
+    # "/api/notes/create", "api/notes/create" and "notes/create" are all
+    # "notes/create"
+    name = endpoint.strip("/")
+    if name.startswith("api/"):
+        name = name[len("api/"):]
+    return name
+
+
+@dataclass
+class EndpointSpec:
+    name: str
+    request: Optional[JSONSchema] = None
+    response: Optional[JSONSchema] = None
+    requires_credential: bool = False
+
+
+def _json_schema(content: Optional[dict]) -> Optional[JSONSchema]:
+    if not content:
+        return None
+    return content.get("content", {}).get("application/json", {}).get(
+        "schema")
+
+
+_TYPE_CHECKS: Dict[str, Callable[[Any], bool]] = {
+    "string": lambda v: isinstance(v, str),
+    "integer": lambda v: isinstance(v, int) and not isinstance(v, bool),
+    "number": lambda v: (
+        isinstance(v, (int, float)) and not isinstance(v, bool)),
+    "boolean": lambda v: isinstance(v, bool),
+    "array": lambda v: isinstance(v, (list, tuple)),
+    "object": lambda v: isinstance(v, dict),
+    "null": lambda v: v is None,
+}
+
+
+class SchemaCompiler(object):
+    """
+    Compiles the subset of JSON Schema used by Misskey's OpenAPI document
+    into validator closures. ``$ref`` to ``components`` are compiled on
+    first use, so recursive schemas such as ``Note`` are supported.
+    """
+
+    def __init__(self, components: Dict[str, JSONSchema]):
+        self.components = components
+        self._refs: Dict[str, Validator] = {}
+
+    def _ref(self, ref: str) -> Validator:
+        name = ref.rsplit("/", 1)[-1]
+
+        def validate(value: Any, path: str) -> None:
+            validator = self._refs.get(name)
+            if validator is None:
+                try:
+                    schema = self.components[name]
+                except KeyError:
+                    # Unknown to this document, so anything is accepted
+                    schema = {}
+                validator = self._refs[name] = self.compile(schema)
+            validator(value, path)
+        return validate
+
+    def compile(self, schema: JSONSchema) -> Validator:
+        checks: List[Validator] = []
+        # Keywords next to the reference, such as nullable, still apply
+        if "$ref" in schema:
+            checks.append(self._ref(schema["$ref"]))
+
+        types = schema.get("type", [])
+        if isinstance(types, str):
+            types = [types]
+        nullable = "null" in types or bool(schema.get("nullable"))
+        type_checks = [_TYPE_CHECKS[t] for t in types if t in _TYPE_CHECKS]
+
+        if type_checks:
+            expected = " or ".join(types)
+
+            def check_type(value: Any, path: str) -> None:
+                if not any(check(value) for check in type_checks):
+                    raise MisskeyIllegalArgumentError(
+                        f"{path}: expected {expected}, "
+                        f"got {type(value).__name__}")
+            checks.append(check_type)
+
+        if "enum" in schema:
+            choices = schema["enum"]
+
+            def check_enum(value: Any, path: str) -> None:
+                if value not in choices:
+                    raise MisskeyIllegalArgumentError(
+                        f"{path}: must be one of {choices}")
+            checks.append(check_enum)
+
+        checks.extend(self._compile_constraints(schema))
+
+        for keyword in ("anyOf", "oneOf"):
+            if keyword in schema:
+                checks.append(self._compile_any(schema[keyword]))
+
+        for sub_schema in schema.get("allOf", []):
+            checks.append(self.compile(sub_schema))
+
+        def validate(value: Any, path: str) -> None:
+            if value is None and nullable:
+                return
+            for check in checks:
+                check(value, path)
+        return validate
+
+    def _compile_any(self, schemas: List[JSONSchema]) -> Validator:
+        alternatives = [self.compile(schema) for schema in schemas]
+
+        def check_any(value: Any, path: str) -> None:
+            errors = []
+            for alternative in alternatives:
+                try:
+                    alternative(value, path)
+                    return
+                except MisskeyIllegalArgumentError as e:
+                    errors.append(str(e))
+            raise MisskeyIllegalArgumentError(
+                f"{path}: no alternative matched ({'; '.join(errors)})")
+        return check_any
+
+    def _compile_constraints(self, schema: JSONSchema) -> List[Validator]:
+        checks: List[Validator] = []
+
+        min_length = schema.get("minLength")
+        max_length = schema.get("maxLength")
+        if min_length is not None or max_length is not None:
+            def check_length(value: Any, path: str) -> None:
+                if not isinstance(value, str):
+                    return
+                if min_length is not None and len(value) < min_length:
+                    raise MisskeyIllegalArgumentError(
+                        f"{path}: shorter than {min_length}")
+                if max_length is not None and len(value) > max_length:
+                    raise MisskeyIllegalArgumentError(
+                        f"{path}: longer than {max_length}")
+            checks.append(check_length)
+
+        if "pattern" in schema:
+            try:
+                pattern = re.compile(schema["pattern"])
+            except re.error:
+                # Not every JavaScript pattern is a Python one
+                pattern = None
+            if pattern is not None:
+                def check_pattern(value: Any, path: str) -> None:
+                    if isinstance(value, str) and not pattern.search(value):
+                        raise MisskeyIllegalArgumentError(
+                            f"{path}: does not match {pattern.pattern}")
+                checks.append(check_pattern)
+
+        minimum = schema.get("minimum")
+        maximum = schema.get("maximum")
+        if minimum is not None or maximum is not None:
+            def check_range(value: Any, path: str) -> None:
+                if not _TYPE_CHECKS["number"](value):
+                    return
+                if minimum is not None and value < minimum:
+                    raise MisskeyIllegalArgumentError(
+                        f"{path}: less than {minimum}")
+                if maximum is not None and value > maximum:
+                    raise MisskeyIllegalArgumentError(
+                        f"{path}: greater than {maximum}")
+            checks.append(check_range)
+
+        if "items" in schema:
+            validate_item = self.compile(schema["items"])
+
+            def check_items(value: Any, path: str) -> None:
+                if isinstance(value, (list, tuple)):
+                    for index, item in enumerate(value):
+                        validate_item(item, f"{path}[{index}]")
+            checks.append(check_items)
+
+        properties = {
+            name: self.compile(sub_schema)
+            for name, sub_schema in schema.get("properties", {}).items()
+        }
+        required = tuple(schema.get("required", ()))
+        if properties or required:
+            def check_properties(value: Any, path: str) -> None:
+                if not isinstance(value, dict):
+                    return
+                for name in required:
+                    if name not in value:
+                        raise MisskeyIllegalArgumentError(
+                            f"{path}.{name}: required")
+                for name, item in value.items():
+                    validator = properties.get(name)
+                    if validator is not None:
+                        validator(item, f"{path}.{name}")
+            checks.append(check_properties)
+
+        return checks
+
+
+class EndpointRegistry(object):
+    """
+    Endpoints of a server and the schemas of their parameters and
+    responses, built from the OpenAPI document served at ``/api.json``
+    (or only the names from ``endpoints()`` on servers without it).
+
+    Validators are compiled from the schemas on first use per endpoint.
+    The registry is saved to and loaded from a JSON file, so the document
+    is fetched and trimmed once rather than per process.
+    """
+
+    def __init__(
+        self,
+        endpoints: Dict[str, EndpointSpec], *,
+        components: Optional[Dict[str, JSONSchema]] = None,
+        version: Optional[str] = None,
+        fetched_at: Optional[float] = None,
+        validate_responses: bool = False,
+    ):
+        self.endpoints = endpoints
+        self.components = components or {}
+        self.version = version
+        self.fetched_at = time.time() if fetched_at is None else fetched_at
+        self.validate_responses = validate_responses
+        self._compiler = SchemaCompiler(self.components)
+        self._validators: Dict[Tuple[str, str], Validator] = {}
+
+    @classmethod
+    def from_openapi(cls, document: dict, **kwargs) -> "EndpointRegistry":
+        endpoints = {}
+        for path, item in document.get("paths", {}).items():
+            operation = item.get("post") or item.get("get")
+            if operation is None:
+                continue
+            name = normalize_endpoint(path)
+            endpoints[name] = EndpointSpec(
+                name=name,
+                request=_json_schema(operation.get("requestBody")),
+                response=_json_schema(
+                    operation.get("responses", {}).get("200")),
+                requires_credential=bool(operation.get("security")),
+            )
+        return cls(
+            endpoints,
+            components=document.get("components", {}).get("schemas", {}),
+            version=document.get("info", {}).get("version"),
+            **kwargs,
+        )
+
+    @classmethod
+    def from_endpoint_names(
+        cls,
+        names: Iterable[str],
+        **kwargs,
+    ) -> "EndpointRegistry":
+        endpoints = {
+            normalize_endpoint(name): EndpointSpec(
+                name=normalize_endpoint(name))
+            for name in names
+        }
+        return cls(endpoints, **kwargs)
+
+    def to_dict(self) -> dict:
+        return {
+            "format": REGISTRY_FORMAT_VERSION,
+            "version": self.version,
+            "fetched_at": self.fetched_at,
+            "components": self.components,
+            "endpoints": [asdict(spec) for spec in self.endpoints.values()],
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict, **kwargs) -> "EndpointRegistry":
+        if data.get("format") != REGISTRY_FORMAT_VERSION:
+            raise MisskeyResponseError("Unsupported registry format")
+        endpoints = {
+            spec["name"]: EndpointSpec(**spec) for spec in data["endpoints"]
+        }
+        return cls(
+            endpoints,
+            components=data["components"],
+            version=data["version"],
+            fetched_at=data["fetched_at"],
+            **kwargs,
+        )
+
+    def save(self, path: str) -> None:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        try:
+            with open(temp_path, "w", encoding="utf-8") as f:
+                json.dump(self.to_dict(), f, separators=(",", ":"))
+            os.replace(temp_path, path)
+        except BaseException:
+            # Do not leave a partial file behind, e.g. on a full disk
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+    @classmethod
+    def load(
+        cls,
+        path: str, *,
+        max_age: Optional[float] = REGISTRY_MAX_AGE,
+        **kwargs,
+    ) -> Optional["EndpointRegistry"]:
+        """
+        Returns the registry saved to ``path``, or ``None`` if there is no
+        usable one or it is older than ``max_age`` seconds.
+        """
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                registry = cls.from_dict(json.load(f), **kwargs)
+        except (OSError, ValueError, KeyError, TypeError,
+                MisskeyResponseError):
+            return None
+        if max_age is not None and time.time() - registry.fetched_at > max_age:
+            return None
+        return registry
+
+    def __contains__(self, endpoint: str) -> bool:
+        return normalize_endpoint(endpoint) in self.endpoints
+
+    def __len__(self) -> int:
+        return len(self.endpoints)
+
+    def get(self, endpoint: str) -> EndpointSpec:
+        try:
+            return self.endpoints[normalize_endpoint(endpoint)]
+        except KeyError:
+            raise MisskeyIllegalArgumentError(
+                f"Unknown endpoint: {endpoint}") from None
+
+    def _validator(self, endpoint: str, kind: str) -> Validator:
+        spec = self.get(endpoint)
+        key = (spec.name, kind)
+        validator = self._validators.get(key)
+        if validator is None:
+            schema = getattr(spec, kind) or {}
+            validator = self._validators[key] = self._compiler.compile(schema)
+        return validator
+
+    def validate_request(self, endpoint: str, params: dict) -> None:
+        self._validator(endpoint, "request")(params, "params")
+
+    def validate_response(self, endpoint: str, data: Any) -> None:
+        try:
+            self._validator(endpoint, "response")(data, "response")
+        except MisskeyIllegalArgumentError as e:
+            raise MisskeyResponseError(str(e)) from None
+
+
+def default_registry_cache_dir() -> str:
+    cache_home = os.environ.get("XDG_CACHE_HOME") or os.path.join(
+        os.path.expanduser("~"), ".cache")
+    return os.path.join(cache_home, "misskey.py", "registry")
+
+
+def registry_cache_path(address: str, cache_dir: Optional[str] = None) -> str:
+    host = re.sub(r"[^A-Za-z0-9.-]", "_", urlparse(address).netloc)
+    return os.path.join(
+        cache_dir or default_registry_cache_dir(), f"{host}.json")
+
+
+def prepare_call(
+    registry: Optional[EndpointRegistry],
+    endpoint: str,
+    params: Optional[dict],
+    kwargs: Dict[str, Any],
+) -> Tuple[str, dict]:
+    """
+    Returns the endpoint name and the payload of a generic call.
+    Keyword arguments are converted to camelCase and enums to their
+    values, and the payload is validated if ``registry`` is given.
+    """
+    name = normalize_endpoint(endpoint)
+    payload = dict(params or {})
+    for key, value in kwargs.items():
+        if isinstance(value, enum.Enum):
+            value = value.value
+        payload[camelize(key)] = value
+    if registry is not None:
+        registry.validate_request(name, payload)
+    return name, payload
@@ -0,0 +1,258 @@
+import contextlib
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field, replace
+from typing import (
+    Any,
+    AsyncIterator,
+    Callable,
+    Deque,
+    Dict,
+    Iterator,
+    Mapping,
+    Optional,
+)
+
+from .enum import RequestPriorityEnum
+from .exceptions import MisskeyOverloadedError
+
+__all__ = (
+    "PriorityClass",
+    "PriorityStats",
+    "RequestScheduler",
+)
+
+# Number of recent wait times kept per class for percentiles
+WAIT_SAMPLES = 1024
+
+
+@dataclass
+class PriorityClass:
+    """
+    Limits of a priority class of :class:`RequestScheduler`.
+
+    At most ``concurrency`` requests of the class run at once (up to the
+    total concurrency if ``None``), and new requests are shed with
+    :class:`~misskey.exceptions.MisskeyOverloadedError` while
+    ``max_queue`` requests of the class are waiting.
+    """
+    concurrency: Optional[int] = None
+    max_queue: Optional[int] = None
+
+
+@dataclass
+class PriorityStats:
+    submitted: int = 0
+    completed: int = 0
+    shed: int = 0
+    cancelled: int = 0
+    waiting: int = 0
+    active: int = 0
+    total_wait: float = 0.0
+    max_wait: float = 0.0
+    recent_waits: Deque[float] = field(
+        default_factory=lambda: deque(maxlen=WAIT_SAMPLES))
+
+    @property
+    def mean_wait(self) -> float:
+        started = self.submitted - self.waiting - self.cancelled
+        return self.total_wait / started if started > 0 else 0.0
+
+    def wait_percentile(self, percentile: float) -> float:
+        """
+        Returns the wait time in seconds at ``percentile`` (0 to 100) of the
+        recent requests.
+        """
+        if not self.recent_waits:
+            return 0.0
+        waits = sorted(self.recent_waits)
+        index = round(percentile / 100 * (len(waits) - 1))
+        return waits[min(max(index, 0), len(waits) - 1)]
+
+
+class _Ticket(object):
+    __slots__ = ("priority", "enqueued_at", "grant", "granted")
+
+    def __init__(
+        self,
+        priority: RequestPriorityEnum,
+        grant: Callable[[], Any],
+    ):
+        self.priority = priority
+        self.enqueued_at = time.monotonic()
+        self.grant = grant
+        self.granted = False
+
+
+def _resolve(future: Any) -> None:
+    if not future.done():
+        future.set_result(None)
+
+
+class RequestScheduler(object):
+    """
+    Admits the requests of clients by priority.
+
+    At most ``concurrency`` requests run at once. Waiting requests are
+    started in the order of their priority, then of their arrival, within
+    the quota of their :class:`PriorityClass`. By default, background
+    requests may only use half of the slots, so the rest are kept for
+    interactive and normal requests, and at most 256 of them wait.
+
+    One scheduler may be shared by clients in many threads and event
+    loops. Set it as the ``scheduler`` of the clients, and choose the
+    priority of their requests with ``with_priority``; otherwise it is
+    chosen by :meth:`classify`.
+    """
+
+    def __init__(
+        self,
+        concurrency: int = 8, *,
+        classes: Optional[
+            Mapping[RequestPriorityEnum, PriorityClass]] = None,
+        default_priority: RequestPriorityEnum = RequestPriorityEnum.NORMAL,
+    ):
+        if concurrency < 1:
+            raise ValueError("concurrency must be positive")
+        self.concurrency = concurrency
+        self.default_priority = default_priority
+        self.classes: Dict[RequestPriorityEnum, PriorityClass] = {
+            RequestPriorityEnum.INTERACTIVE: PriorityClass(),
+            RequestPriorityEnum.NORMAL: PriorityClass(),
+            RequestPriorityEnum.BACKGROUND: PriorityClass(
+                concurrency=max(1, concurrency // 2), max_queue=256),
+        }
+        if classes is not None:
+            self.classes.update(classes)
+        self._queues: Dict[RequestPriorityEnum, Deque[_Ticket]] = {
+            priority: deque() for priority in sorted(self.classes)
+        }
+        self._stats: Dict[RequestPriorityEnum, PriorityStats] = {
+            priority: PriorityStats() for priority in self.classes
+        }
+        self._active = 0
+        self._lock = threading.Lock()
+
+    def classify(
+        self,
+        endpoint: str,
+        params: Optional[dict],
+    ) -> RequestPriorityEnum:
+        """
+        Returns the priority of a request of a client without its own
+        priority. Replies are interactive, everything else has the
+        default priority.
+        """
+        if (endpoint == "/api/notes/create" and params is not None and
+                params.get("replyId") is not None):
+            return RequestPriorityEnum.INTERACTIVE
+        return self.default_priority
+
+    @property
+    def stats(self) -> Dict[RequestPriorityEnum, PriorityStats]:
+        with self._lock:
+            return {
+                priority: replace(
+                    stats, recent_waits=deque(stats.recent_waits))
+                for priority, stats in self._stats.items()
+            }
+
+    def _enqueue(
+        self,
+        priority: RequestPriorityEnum,
+        grant: Callable[[], Any],
+    ) -> _Ticket:
+        with self._lock:
+            queue = self._queues[priority]
+            stats = self._stats[priority]
+            max_queue = self.classes[priority].max_queue
+            if max_queue is not None and len(queue) >= max_queue:
+                stats.shed += 1
+                raise MisskeyOverloadedError(
+                    f"Queue of {priority.name} requests is full")
+            ticket = _Ticket(priority, grant)
+            queue.append(ticket)
+            stats.submitted += 1
+            stats.waiting += 1
+            self._dispatch()
+            return ticket
+
+    def _dispatch(self) -> None:
+        # Called with the lock held
+        now = time.monotonic()
+        for priority, queue in self._queues.items():
+            stats = self._stats[priority]
+            quota = self.classes[priority].concurrency or self.concurrency
+            while (queue and self._active < self.concurrency and
+                   stats.active < quota):
+                ticket = queue.popleft()
+                ticket.granted = True
+                self._active += 1
+                stats.active += 1
+                stats.waiting -= 1
+                wait = now - ticket.enqueued_at
+                stats.total_wait += wait
+                stats.max_wait = max(stats.max_wait, wait)
+                stats.recent_waits.append(wait)
+                ticket.grant()
+
+    def _release(self, priority: RequestPriorityEnum) -> None:
+        with self._lock:
+            self._active -= 1
+            self._stats[priority].active -= 1
+            self._stats[priority].completed += 1
+            self._dispatch()
+
+    def _abandon(self, ticket: _Ticket) -> None:
+        with self._lock:
+            stats = self._stats[ticket.priority]
+            if ticket.granted:
+                # Granted while being cancelled, so give the slot back
+                self._active -= 1
+                stats.active -= 1
+                stats.completed += 1
+                self._dispatch()
+            else:
+                self._queues[ticket.priority].remove(ticket)
+                stats.waiting -= 1
+                stats.cancelled += 1
+
+    @contextlib.contextmanager
+    def slot(self, priority: RequestPriorityEnum) -> Iterator[None]:
+        """
+        Blocks until a request of ``priority`` may run, and holds its slot
+        in the ``with`` block.
+        """
+        event = threading.Event()
+        ticket = self._enqueue(priority, event.set)
+        try:
+            event.wait()
+        except BaseException:
+            self._abandon(ticket)
+            raise
+        try:
+            yield
+        finally:
+            self._release(priority)
+
+    @contextlib.asynccontextmanager
+    async def slot_async(
+        self, priority: RequestPriorityEnum
+    ) -> AsyncIterator[None]:
+        # Imported here, as the sync client imports this module too
+        import asyncio
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        ticket = self._enqueue(
+            priority, lambda: loop.call_soon_threadsafe(_resolve, future))
+        try:
+            await future
+        except BaseException:
+            self._abandon(ticket)
+            raise
+        try:
+            yield
+        finally:
+            self._release(priority)
@@ -1,36 +1,102 @@
-from .user_detailed import (
-    UserDetailed,
-    UserDetailedSchema,
-)
-from .miauth import (
-    MiAuthResult,
-    MiAuthResultSchema,
-)
-from .me_detailed import (
-    MeDetailed,
-    MeDetailedSchema,
-)
-from .notes import (
-    CreatedNote,
-    CreatedNoteSchema,
-    Note,
-    NoteSchema,
-)
-from .meta import (
-    Meta,
-    MetaSchema,
-)
-from .user_lite import (
-    UserLiteSchema,
-    UserLite,
-)
-from .announcements import (
-    Announcements,
-    AnnouncementsSchema,
-)
-from .drive import (
-    Drive,
-    DriveSchema,
-    DriveFile,
-    DriveFileSchema,
+from typing import TYPE_CHECKING
+
+from misskey._lazy import lazy_attributes
+
+__all__ = (
+    "UserDetailed",
+    "UserDetailedSchema",
+    "MiAuthResult",
+    "MiAuthResultSchema",
+    "MeDetailed",
+    "MeDetailedSchema",
+    "CreatedNote",
+    "CreatedNoteSchema",
+    "Note",
+    "NoteSchema",
+    "Meta",
+    "MetaSchema",
+    "UserLiteSchema",
+    "UserLite",
+    "Announcements",
+    "AnnouncementsSchema",
+    "Drive",
+    "DriveSchema",
+    "DriveFile",
+    "DriveFileSchema",
+    "DriveFolder",
+    "DriveFolderSchema",
+    "Notification",
+    "NotificationSchema",
 )
+
+if TYPE_CHECKING:
+    from .user_detailed import (
+        UserDetailed,
+        UserDetailedSchema,
+    )
+    from .miauth import (
+        MiAuthResult,
+        MiAuthResultSchema,
+    )
+    from .me_detailed import (
+        MeDetailed,
+        MeDetailedSchema,
+    )
+    from .notes import (
+        CreatedNote,
+        CreatedNoteSchema,
+        Note,
+        NoteSchema,
+    )
+    from .meta import (
+        Meta,
+        MetaSchema,
+    )
+    from .user_lite import (
+        UserLiteSchema,
+        UserLite,
+    )
+    from .announcements import (
+        Announcements,
+        AnnouncementsSchema,
+    )
+    from .drive import (
+        Drive,
+        DriveSchema,
+        DriveFile,
+        DriveFileSchema,
+        DriveFolder,
+        DriveFolderSchema,
+    )
+    from .notifications import (
+        Notification,
+        NotificationSchema,
+    )
+
+# Each schema module is imported on first access of one of its names
+__getattr__, __dir__ = lazy_attributes(__name__, {
+    "UserDetailed": ".user_detailed",
+    "UserDetailedSchema": ".user_detailed",
+    "MiAuthResult": ".miauth",
+    "MiAuthResultSchema": ".miauth",
+    "MeDetailed": ".me_detailed",
+    "MeDetailedSchema": ".me_detailed",
+    "CreatedNote": ".notes",
+    "CreatedNoteSchema": ".notes",
+    "Note": ".notes",
+    "NoteSchema": ".notes",
+    "Meta": ".meta",
+    "MetaSchema": ".meta",
+    "UserLiteSchema": ".user_lite",
+    "UserLite": ".user_lite",
+    "Announcements": ".announcements",
+    "AnnouncementsSchema": ".announcements",
+    "Drive": ".drive",
+    "DriveSchema": ".drive",
+    "DriveFile": ".drive",
+    "DriveFileSchema": ".drive",
+    "DriveFolder": ".drive",
+    "DriveFolderSchema": ".drive",
+    "Notification": ".notifications",
+    "NotificationSchema": ".notifications",
+})
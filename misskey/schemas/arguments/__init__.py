@@ -12,5 +12,16 @@ from .users import (
     UsersArgumentsSchema,
 )
 from .notes_timeline import (
+    NotesTimelineArgumentsSchema,
     NotesLocalTimelineArgumentsSchema,
+    NotesHybridTimelineArgumentsSchema,
+    NotesGlobalTimelineArgumentsSchema,
+    ChannelsTimelineArgumentsSchema,
+)
+from .drive import (
+    DriveFilesArgumentsSchema,
+    DriveFoldersArgumentsSchema,
+)
+from .notifications import (
+    INotificationsArgumentsSchema,
 )
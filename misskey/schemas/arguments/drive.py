@@ -0,0 +1,26 @@
+from marshmallow import Schema, fields
+
+from misskey.enum import (
+    DriveFilesSortEnum,
+)
+
+__all__ = (
+    "DriveFilesArgumentsSchema",
+    "DriveFoldersArgumentsSchema",
+)
+
+
+class DriveFilesArgumentsSchema(Schema):
+    limit = fields.Integer(default=10)
+    since_id = fields.String(data_key="sinceId")
+    until_id = fields.String(data_key="untilId")
+    folder_id = fields.String(allow_none=True, data_key="folderId")
+    type = fields.String(allow_none=True)
+    sort = fields.Enum(DriveFilesSortEnum, by_value=True, allow_none=True)
+
+
+class DriveFoldersArgumentsSchema(Schema):
+    limit = fields.Integer(default=10)
+    since_id = fields.String(data_key="sinceId")
+    until_id = fields.String(data_key="untilId")
+    folder_id = fields.String(allow_none=True, data_key="folderId")
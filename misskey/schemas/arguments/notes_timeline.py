@@ -1,10 +1,24 @@
 from marshmallow import Schema, fields
 
 __all__ = (
+    "NotesTimelineArgumentsSchema",
     "NotesLocalTimelineArgumentsSchema",
+    "NotesHybridTimelineArgumentsSchema",
+    "NotesGlobalTimelineArgumentsSchema",
+    "ChannelsTimelineArgumentsSchema",
 )
 
 
+class NotesTimelineArgumentsSchema(Schema):
+    with_files = fields.Boolean(default=False, data_key="withFiles")
+    with_renotes = fields.Boolean(default=False, data_key="withRenotes")
+    limit = fields.Integer(default=10)
+    since_id = fields.String(data_key="sinceId")
+    until_id = fields.String(data_key="untilId")
+    since_date = fields.DateTime("timestamp_ms", data_key="sinceDate")
+    until_date = fields.DateTime("timestamp_ms", data_key="untilDate")
+
+
 class NotesLocalTimelineArgumentsSchema(Schema):
     with_files = fields.Boolean(default=False, data_key="withFiles")
     with_renotes = fields.Boolean(default=False, data_key="withRenotes")
@@ -15,3 +29,20 @@ class NotesLocalTimelineArgumentsSchema(Schema):
     until_id = fields.String(data_key="untilId")
     since_date = fields.DateTime("timestamp_ms", data_key="sinceDate")
     until_date = fields.DateTime("timestamp_ms", data_key="untilDate")
+
+
+class NotesHybridTimelineArgumentsSchema(NotesLocalTimelineArgumentsSchema):
+    pass
+
+
+class NotesGlobalTimelineArgumentsSchema(NotesTimelineArgumentsSchema):
+    pass
+
+
+class ChannelsTimelineArgumentsSchema(Schema):
+    channel_id = fields.String(required=True, data_key="channelId")
+    limit = fields.Integer(default=10)
+    since_id = fields.String(data_key="sinceId")
+    until_id = fields.String(data_key="untilId")
+    since_date = fields.DateTime("timestamp_ms", data_key="sinceDate")
+    until_date = fields.DateTime("timestamp_ms", data_key="untilDate")
@@ -0,0 +1,22 @@
+from marshmallow import Schema, fields
+
+from misskey.enum import (
+    NotificationTypeEnum,
+)
+
+__all__ = (
+    "INotificationsArgumentsSchema",
+)
+
+
+class INotificationsArgumentsSchema(Schema):
+    limit = fields.Integer(default=10)
+    since_id = fields.String(data_key="sinceId")
+    until_id = fields.String(data_key="untilId")
+    mark_as_read = fields.Boolean(default=True, data_key="markAsRead")
+    include_types = fields.List(
+        fields.Enum(NotificationTypeEnum, by_value=True),
+        data_key="includeTypes")
+    exclude_types = fields.List(
+        fields.Enum(NotificationTypeEnum, by_value=True),
+        data_key="excludeTypes")
@@ -1,3 +1,5 @@
+from __future__ import annotations
+
 import inspect
 import datetime
 from dataclasses import dataclass, field as dc_field
@@ -10,6 +12,8 @@ __all__ = (
     "DriveSchema",
     "DriveFile",
     "DriveFileSchema",
+    "DriveFolder",
+    "DriveFolderSchema",
 )
 
 
@@ -105,3 +109,48 @@ class DriveFileSchema(Schema):
 
     class Meta:
         unknown = INCLUDE
+
+
+@dataclass
+class DriveFolder:
+    id: str
+    created_at: datetime.datetime
+    name: str
+    parent_id: Optional[str] = None
+    folders_count: Optional[int] = None
+    files_count: Optional[int] = None
+    parent: Optional[DriveFolder] = None
+
+    _extra: dict = dc_field(default_factory=dict)
+
+    @classmethod
+    def from_dict(cls, data: dict):
+        payload = {
+            k: v for k, v in data.items()
+            if k in inspect.signature(cls).parameters
+        }
+        payload["_extra"] = {
+            k: v for k, v in data.items()
+            if k not in inspect.signature(cls).parameters
+        }
+        return cls(**payload)
+
+
+class DriveFolderSchema(Schema):
+    id = fields.String(required=True)
+    created_at = fields.DateTime("iso", data_key="createdAt", required=True)
+    name = fields.String(required=True)
+    parent_id = fields.String(
+        required=True, allow_none=True, data_key="parentId")
+    folders_count = fields.Integer(data_key="foldersCount")
+    files_count = fields.Integer(data_key="filesCount")
+    parent = fields.Nested(
+        lambda: DriveFolderSchema(), allow_none=True)
+
+    # noinspection PyUnusedLocal
+    @post_load()
+    def load_schema(self, data, **kwargs):
+        return DriveFolder.from_dict(data)
+
+    class Meta:
+        unknown = INCLUDE
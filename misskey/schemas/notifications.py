@@ -0,0 +1,101 @@
+import datetime
+import inspect
+from dataclasses import dataclass, field as dc_field
+from typing import Optional, List, Union
+
+from marshmallow import (
+    Schema,
+    fields,
+    post_load,
+    INCLUDE,
+    ValidationError,
+)
+
+from misskey.enum import NotificationTypeEnum
+from .notes import (
+    Note,
+    NoteSchema,
+)
+from .user_lite import (
+    UserLite,
+    UserLiteSchema,
+)
+
+__all__ = (
+    "Notification",
+    "NotificationSchema",
+)
+
+
+@dataclass
+class Notification:
+    id: str
+    created_at: datetime.datetime
+    # The raw string for types newer than NotificationTypeEnum
+    type: Union[NotificationTypeEnum, str]
+    user_id: Optional[str] = None
+    user: Optional[UserLite] = None
+    note: Optional[Note] = None
+    reaction: Optional[str] = None
+    achievement: Optional[str] = None
+    header: Optional[str] = None
+    body: Optional[str] = None
+    icon: Optional[str] = None
+    # Only for grouped notifications
+    reactions: Optional[List[dict]] = None
+    users: Optional[List[UserLite]] = None
+
+    _extra: dict = dc_field(default_factory=dict)
+
+    @classmethod
+    def from_dict(cls, data: dict):
+        payload = {
+            k: v for k, v in data.items()
+            if k in inspect.signature(cls).parameters
+        }
+        payload["_extra"] = {
+            k: v for k, v in data.items()
+            if k not in inspect.signature(cls).parameters
+        }
+        return cls(**payload)
+
+
+class _NotificationTypeField(fields.Enum):
+    # Keeps types unknown to NotificationTypeEnum as strings, so the
+    # notifications added by newer servers do not fail whole pages
+
+    def __init__(self, **kwargs):
+        super().__init__(NotificationTypeEnum, by_value=True, **kwargs)
+
+    def _deserialize(self, value, attr, data, **kwargs):
+        try:
+            return super()._deserialize(value, attr, data, **kwargs)
+        except ValidationError:
+            if isinstance(value, str):
+                return value
+            raise
+
+
+class NotificationSchema(Schema):
+    id = fields.String(required=True)
+    created_at = fields.DateTime("iso", required=True, data_key="createdAt")
+    type = _NotificationTypeField(required=True)
+    user_id = fields.String(allow_none=True, data_key="userId")
+    user = fields.Nested(UserLiteSchema(), allow_none=True)
+    note = fields.Nested(NoteSchema(), allow_none=True)
+    reaction = fields.String(allow_none=True)
+    achievement = fields.String(allow_none=True)
+    header = fields.String(allow_none=True)
+    body = fields.String(allow_none=True)
+    icon = fields.String(allow_none=True)
+    # role = fields.Nested(...  # TODO: TBD
+    reactions = fields.List(fields.Dict(), allow_none=True)
+    users = fields.List(fields.Nested(UserLiteSchema()), allow_none=True)
+
+    # noinspection PyUnusedLocal
+    @post_load()
+    def load_schema(self, data, **kwargs):
+        return Notification.from_dict(data)
+
+    class Meta:
+        unknown = INCLUDE
@@ -35,7 +35,7 @@ class UserLite:
 class UserLiteSchema(Schema):
     id = fields.String(required=True)
     username = fields.String(required=True)
-    host = fields.String()
+    host = fields.String(allow_none=True)
     name = fields.String(allow_none=True)
 
     class Meta:
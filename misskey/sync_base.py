@@ -1,15 +1,20 @@
+from __future__ import annotations
+
+import contextlib
 import copy
-import requests
-from typing import Optional, Any
+from typing import TYPE_CHECKING, ContextManager, Optional, Any, Tuple
 
 from .base import BaseMisskey
 from .exceptions import (
     MisskeyNetworkError,
     MisskeyIllegalArgumentError,
-    MisskeyAPIError,
     MisskeyResponseError
 )
 from .enum import HttpMethodEnum
+from .multipart import MultipartEncoder, UploadFile, ProgressCallback
+
+if TYPE_CHECKING:
+    import requests
 
 __all__ = (
     "Misskey",
@@ -27,6 +32,9 @@ class Misskey(BaseMisskey):
         super().__init__(**kwargs)
 
         if session is None:
+            # Imported here to keep requests off the import path of
+            # modules which only share helpers with the sync client
+            import requests
             self.session = requests.Session()
         else:
             self.session = session
@@ -46,6 +54,73 @@ class Misskey(BaseMisskey):
         if self.token is not None:
             params["i"] = self.token
 
+        cache_key, cached = self._cache_lookup(endpoint, params)
+        if cached is not None:
+            return cached
+
+        self._check_circuit(endpoint)
+        with self._request_slot(endpoint, params):
+            if self.rate_limiter is not None:
+                self.rate_limiter.acquire()
+            with self._circuit_guard(endpoint):
+                body = self._send_request(method, endpoint, params)
+
+        if cache_key is not None:
+            self._cache_store(cache_key, endpoint, body)
+        return body
+
+    def _api_request_multipart(
+        self, *,
+        endpoint: str,
+        params: Optional[dict] = None,
+        file_field: str = "file",
+        upload: UploadFile,
+        progress: Optional[ProgressCallback] = None,
+    ) -> Any:
+        # Multipart form fields are always strings
+        fields = {} if params is None else dict(params)
+        if self.token is not None:
+            fields["i"] = self.token
+
+        self._check_circuit(endpoint)
+        with self._request_slot(endpoint, fields):
+            if self.rate_limiter is not None:
+                self.rate_limiter.acquire()
+            body = MultipartEncoder(
+                fields=fields,
+                file_field=file_field,
+                upload=upload,
+                progress=progress,
+            )
+            with self._circuit_guard(endpoint):
+                return self._send_multipart(endpoint, body)
+
+    def _send_request(
+        self,
+        method: HttpMethodEnum,
+        endpoint: str,
+        params: dict,
+    ) -> Any:
+        if self.transport is not None:
+            status, body = self.transport.send_request(
+                self, method, endpoint, params)
+        else:
+            status, body = self._http_request(method, endpoint, params)
+        return self._handle_response(status, body)
+
+    def _send_multipart(self, endpoint: str, body: MultipartEncoder) -> Any:
+        if self.transport is not None:
+            status, data = self.transport.send_multipart(self, endpoint, body)
+        else:
+            status, data = self._http_multipart(endpoint, body)
+        return self._handle_response(status, data)
+
+    def _http_request(
+        self,
+        method: HttpMethodEnum,
+        endpoint: str,
+        params: dict,
+    ) -> Tuple[int, Any]:
         try:
             if method == HttpMethodEnum.GET:
                 context = self.session.get(
@@ -58,6 +133,42 @@ class Misskey(BaseMisskey):
         except Exception as e:
             raise MisskeyNetworkError(f"Could not complete request: {e}")
 
+        return self._read_context(context)
+
+    def _http_multipart(
+        self,
+        endpoint: str,
+        body: MultipartEncoder,
+    ) -> Tuple[int, Any]:
+        try:
+            context = self.session.post(
+                url=self.address + endpoint,
+                data=body,
+                headers={
+                    "Content-Type": body.content_type,
+                    "Content-Length": str(len(body)),
+                },
+            )
+        except Exception as e:
+            raise MisskeyNetworkError(f"Could not complete request: {e}")
+
+        return self._read_context(context)
+
+    def _request_slot(
+        self,
+        endpoint: str,
+        params: Optional[dict],
+    ) -> ContextManager[None]:
+        if self.scheduler is None:
+            return contextlib.nullcontext()
+        return self.scheduler.slot(self._request_priority(endpoint, params))
+
+    @staticmethod
+    def _read_context(
+        context: Optional[requests.Response]
+    ) -> Tuple[int, Any]:
+        import requests
+
         if context is None:
             raise MisskeyIllegalArgumentError("Illegal response")
 
@@ -65,13 +176,8 @@ class Misskey(BaseMisskey):
             if (context.ok and
                context.status_code == requests.codes.no_content):
                 # response is ok, but body is empty
-                return
-
-            response = context.json()
+                return context.status_code, None
 
-            if context.ok:
-                return response
-            else:
-                raise MisskeyAPIError.from_dict(response)
+            return context.status_code, context.json()
         except requests.exceptions.JSONDecodeError:
             raise MisskeyResponseError("JSON decode error")
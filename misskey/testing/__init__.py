@@ -0,0 +1,23 @@
+from typing import TYPE_CHECKING
+
+from misskey._lazy import lazy_attributes
+
+__all__ = (
+    "MockState",
+    "MockAPIError",
+    "MockFaults",
+    "MockMisskeyServer",
+)
+
+if TYPE_CHECKING:
+    from .endpoints import MockAPIError
+    from .server import MockFaults, MockMisskeyServer
+    from .state import MockState
+
+# The server requires aiohttp, so it is only imported when used
+__getattr__, __dir__ = lazy_attributes(__name__, {
+    "MockState": ".state",
+    "MockAPIError": ".endpoints",
+    "MockFaults": ".server",
+    "MockMisskeyServer": ".server",
+})
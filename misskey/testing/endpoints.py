@@ -0,0 +1,698 @@
+import hashlib
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional
+
+from .state import DRIVE_CAPACITY, MockState, date_bound, paginate
+
+__all__ = (
+    "MockAPIError",
+    "MockEndpoint",
+    "ENDPOINTS",
+    "endpoint",
+)
+
+
+class MockAPIError(Exception):
+    """
+    Error response of the mock server, raised by endpoint handlers.
+    """
+
+    def __init__(
+        self,
+        status: int,
+        code: str,
+        id: str,
+        message: str = "",
+    ):
+        super().__init__(code)
+        self.status = status
+        self.code = code
+        self.id = id
+        self.message = message
+
+    def to_dict(self) -> dict:
+        return {
+            "error": {
+                "code": self.code,
+                "id": self.id,
+                "message": self.message,
+            },
+        }
+
+
+# The errors of Misskey, with their IDs
+
+def invalid_param(message: str) -> MockAPIError:
+    return MockAPIError(
+        400, "INVALID_PARAM", "3d81ceae-475f-4600-b2a8-2bc116157532", message)
+
+
+def credential_required() -> MockAPIError:
+    return MockAPIError(
+        401, "CREDENTIAL_REQUIRED", "1384574d-a912-4b81-8601-c7b1c4085df1",
+        "Credential required.")
+
+
+def authentication_failed() -> MockAPIError:
+    return MockAPIError(
+        401, "AUTHENTICATION_FAILED", "b0a7f5f8-dc2f-4171-b91f-de88ad238e14",
+        "Authentication failed. Please ensure your token is correct.")
+
+
+def no_such_endpoint() -> MockAPIError:
+    return MockAPIError(
+        404, "NO_SUCH_ENDPOINT", "7b73e38d-6e57-4d37-9a4d-9e0fe93a0cc4",
+        "No such endpoint.")
+
+
+def rate_limit_exceeded() -> MockAPIError:
+    return MockAPIError(
+        429, "RATE_LIMIT_EXCEEDED", "d5826d14-3982-4d2e-8011-b9e9f02499ef",
+        "Rate limit exceeded. Please try again later.")
+
+
+def internal_error() -> MockAPIError:
+    return MockAPIError(
+        500, "INTERNAL_ERROR", "5d37dbcb-891e-41ca-a3d6-e690c97775ac",
+        "Internal error occurred.")
+
+
+def no_such(code: str, id: str) -> MockAPIError:
+    return MockAPIError(400, code, id, code.replace("_", " ").capitalize())
+
+
+def access_denied(id: str) -> MockAPIError:
+    return MockAPIError(400, "ACCESS_DENIED", id, "Access denied.")
+
+
+# Handlers take the state, the authenticated user (None without a token)
+# and the parameters, and return the response body (None for 204)
+Handler = Callable[[MockState, Optional[dict], dict], Any]
+
+
+@dataclass
+class MockEndpoint:
+    handler: Handler
+    requires_credential: bool = False
+    # Parameters are multipart/form-data fields, with the file as "file"
+    multipart: bool = False
+
+
+ENDPOINTS: Dict[str, MockEndpoint] = {}
+
+
+def endpoint(
+    name: str, *,
+    requires_credential: bool = False,
+    multipart: bool = False,
+) -> Callable[[Handler], Handler]:
+    def register(handler: Handler) -> Handler:
+        ENDPOINTS[name] = MockEndpoint(
+            handler, requires_credential, multipart)
+        return handler
+    return register
+
+
+def _limit(params: dict, default: int = 10, maximum: int = 100) -> int:
+    limit = params.get("limit", default)
+    if not isinstance(limit, int) or not 1 <= limit <= maximum:
+        raise invalid_param(f"limit must be in [1, {maximum}]")
+    return limit
+
+
+def _bounds(params: dict) -> Dict[str, Optional[str]]:
+    since_id = params.get("sinceId")
+    until_id = params.get("untilId")
+    if since_id is None and params.get("sinceDate") is not None:
+        since_id = date_bound(params["sinceDate"], upper=True)
+    if until_id is None and params.get("untilDate") is not None:
+        until_id = date_bound(params["untilDate"], upper=False)
+    return {"since_id": since_id, "until_id": until_id}
+
+
+def _flag(value: Any) -> bool:
+    # Multipart fields are strings
+    return value is True or value == "true"
+
+
+def _get_note(state: MockState, me: Optional[dict], note_id: Any) -> dict:
+    note = state.notes.get(note_id) if isinstance(note_id, str) else None
+    if note is None or not state.can_see_note(note, me):
+        raise no_such("NO_SUCH_NOTE", "24fcbfc6-2e37-42b6-8388-c29b3861a08d")
+    return note
+
+
+def _get_own_file(state: MockState, me: dict, file_id: Any) -> dict:
+    drive_file = state.files.get(file_id) if isinstance(file_id, str) else None
+    if drive_file is None:
+        raise no_such("NO_SUCH_FILE", "067bc436-2718-4795-b0fb-ecbe43949e31")
+    if drive_file["userId"] != me["id"]:
+        raise access_denied("25b73c73-68b1-41d0-bad1-381cfdf6579f")
+    return drive_file
+
+
+def _get_own_folder(state: MockState, me: dict, folder_id: Any) -> dict:
+    folder = state.folders.get(folder_id) if isinstance(
+        folder_id, str) else None
+    if folder is None or folder["userId"] != me["id"]:
+        raise no_such(
+            "NO_SUCH_FOLDER", "d74ab9eb-bb09-4bba-bf24-fb58f761e1e9")
+    return folder
+
+
+# Meta and misc
+
+@endpoint("/api/meta")
+def meta(state: MockState, me: Optional[dict], params: dict) -> dict:
+    body = {
+        "maintainerName": None,
+        "maintainerEmail": None,
+        "shortName": None,
+        "uri": state.url,
+        "description": "Mock Misskey server",
+        "langs": [],
+        "tosUrl": None,
+        "repositoryUrl": "https://github.com/misskey-dev/misskey",
+        "feedbackUrl": "https://github.com/misskey-dev/misskey/issues/new",
+        "defaultDarkTheme": None,
+        "defaultLightTheme": None,
+        "disableRegistration": False,
+        "emailRequiredForSignup": False,
+        "enableHcaptcha": False,
+        "hcaptchaSiteKey": None,
+        "enableRecaptcha": False,
+        "recaptchaSiteKey": None,
+        "enableTurnstile": False,
+        "turnstileSiteKey": None,
+        "swPublickey": None,
+        "themeColor": None,
+        "mascotImageUrl": None,
+        "bannerUrl": None,
+        "serverErrorImageUrl": None,
+        "infoImageUrl": None,
+        "notFoundImageUrl": None,
+        "iconUrl": None,
+        "maxNoteTextLength": 3000,
+        "ads": [],
+        "notesPerOneAd": 0,
+        "enableEmail": False,
+        "enableServiceWorker": False,
+        "translatorAvailable": False,
+        "mediaProxy": f"{state.url}/proxy",
+        "features": {},
+    }
+    body.update(state.meta)
+    return body
+
+
+@endpoint("/api/endpoints")
+def endpoints(state: MockState, me: Optional[dict], params: dict) -> list:
+    return sorted(name[len("/api/"):] for name in ENDPOINTS)
+
+
+@endpoint("/api/announcements")
+def announcements(
+    state: MockState,
+    me: Optional[dict],
+    params: dict,
+) -> list:
+    read = state.read_announcements.get(me["id"], set()) if me else set()
+    # Only the unread announcements are returned with withUnreads
+    only_unread = params.get("withUnreads", False)
+    ids = paginate(
+        state.announcement_ids,
+        lambda i: not only_unread or i not in read,
+        limit=_limit(params),
+        **_bounds(params),
+    )
+    result = []
+    for announcement_id in ids:
+        packed = dict(state.announcements[announcement_id])
+        if me is not None:
+            packed["isRead"] = announcement_id in read
+        result.append(packed)
+    return result
+
+
+# Account
+
+@endpoint("/api/i", requires_credential=True)
+def i(state: MockState, me: dict, params: dict) -> dict:
+    return state.pack_user(me, me)
+
+
+def _notifications(state: MockState, me: dict, params: dict) -> List[dict]:
+    include = params.get("includeTypes")
+    exclude = params.get("excludeTypes") or ()
+    notifications = state.notifications.get(me["id"], [])
+    by_id = {notification["id"]: notification
+             for notification in notifications}
+    ids = paginate(
+        [notification["id"] for notification in notifications],
+        lambda i: ((include is None or by_id[i]["type"] in include) and
+                   by_id[i]["type"] not in exclude),
+        limit=_limit(params),
+        **_bounds(params),
+    )
+    page = [by_id[i] for i in ids]
+    if params.get("markAsRead", True):
+        for notification in page:
+            notification["isRead"] = True
+    return page
+
+
+@endpoint("/api/i/notifications", requires_credential=True)
+def i_notifications(state: MockState, me: dict, params: dict) -> list:
+    return [
+        state.pack_notification(notification, me)
+        for notification in _notifications(state, me, params)
+    ]
+
+
+@endpoint("/api/i/notifications-grouped", requires_credential=True)
+def i_notifications_grouped(
+    state: MockState,
+    me: dict,
+    params: dict,
+) -> list:
+    # Consecutive reactions and renotes of the same note are grouped
+    grouped: List[dict] = []
+    for notification in _notifications(state, me, params):
+        packed = state.pack_notification(notification, me)
+        kind = notification["type"]
+        last = grouped[-1] if grouped else None
+        if (kind in ("reaction", "renote") and last is not None and
+                last["type"].split(":")[0] == kind and
+                last.get("note", {}).get("id") == notification["noteId"]):
+            if not last["type"].endswith(":grouped"):
+                first = dict(last)
+                last.clear()
+                last.update({
+                    "id": first["id"],
+                    "createdAt": first["createdAt"],
+                    "type": kind + ":grouped",
+                    "note": first.get("note"),
+                })
+                if kind == "reaction":
+                    last["reactions"] = [{
+                        "user": first.get("user"),
+                        "reaction": first.get("reaction"),
+                    }]
+                else:
+                    last["users"] = [first.get("user")]
+            if kind == "reaction":
+                last["reactions"].append({
+                    "user": packed.get("user"),
+                    "reaction": packed.get("reaction"),
+                })
+            else:
+                last["users"].append(packed.get("user"))
+            continue
+        grouped.append(packed)
+    return grouped
+
+
+@endpoint("/api/notifications/mark-all-as-read", requires_credential=True)
+def notifications_mark_all_as_read(
+    state: MockState,
+    me: dict,
+    params: dict,
+) -> None:
+    for notification in state.notifications.get(me["id"], []):
+        notification["isRead"] = True
+
+
+# Users
+
+_USERS_SORT_KEYS = {
+    "follower": lambda state, user: state.followers_count(user["id"]),
+    "createdAt": lambda state, user: user["createdAt"],
+    "updatedAt": lambda state, user: user["updatedAt"],
+}
+
+
+@endpoint("/api/users")
+def users(state: MockState, me: Optional[dict], params: dict) -> list:
+    limit = _limit(params)
+    offset = params.get("offset", 0)
+    origin = params.get("origin", "local")
+    hostname = params.get("hostname")
+    user_state = params.get("state", "all")
+
+    def matches(user: dict) -> bool:
+        if origin == "local" and user["host"] is not None:
+            return False
+        if origin == "remote" and user["host"] is None:
+            return False
+        if hostname is not None and user["host"] != hostname:
+            return False
+        if user_state == "admin":
+            return user["isAdmin"]
+        if user_state == "moderator":
+            return user["isModerator"]
+        if user_state == "adminOrModerator":
+            return user["isAdmin"] or user["isModerator"]
+        return True
+
+    found = [user for user in state.users.values() if matches(user)]
+    sort = params.get("sort")
+    if sort is not None:
+        key = _USERS_SORT_KEYS.get(sort[1:])
+        if key is None or sort[0] not in "+-":
+            raise invalid_param("Unknown sort")
+        # "+" is descending
+        found.sort(key=lambda user: key(state, user), reverse=sort[0] == "+")
+    return [state.pack_user(user, me) for user in found[offset:][:limit]]
+
+
+@endpoint("/api/users/show")
+def users_show(state: MockState, me: Optional[dict], params: dict) -> Any:
+    if params.get("userIds") is not None:
+        return [
+            state.pack_user(state.users[user_id], me)
+            for user_id in params["userIds"] if user_id in state.users
+        ]
+    if params.get("userId") is not None:
+        user = state.users.get(params["userId"])
+    elif params.get("username") is not None:
+        user = state.find_user(params["username"], params.get("host"))
+    else:
+        raise invalid_param("userId, userIds or username is required")
+    if user is None:
+        raise no_such("NO_SUCH_USER", "4362f8dc-731f-4ad8-a694-be5a88922a24")
+    return state.pack_user(user, me)
+
+
+# Notes
+
+@endpoint("/api/notes/create", requires_credential=True)
+def notes_create(state: MockState, me: dict, params: dict) -> dict:
+    visibility = params.get("visibility", "public")
+    if visibility not in ("public", "home", "followers", "specified"):
+        raise invalid_param("Unknown visibility")
+    file_ids = params.get("fileIds") or params.get("mediaIds") or []
+    for file_id in file_ids:
+        _get_own_file(state, me, file_id)
+    reply_id = params.get("replyId")
+    renote_id = params.get("renoteId")
+    if reply_id is not None:
+        _get_note(state, me, reply_id)
+    if renote_id is not None:
+        _get_note(state, me, renote_id)
+    text = params.get("text")
+    if text is None and not file_ids and renote_id is None:
+        raise invalid_param("text, fileIds or renoteId is required")
+    note = state.create_note(
+        me["id"],
+        text=text,
+        cw=params.get("cw"),
+        visibility=visibility,
+        visible_user_ids=params.get("visibleUserIds"),
+        reply_id=reply_id,
+        renote_id=renote_id,
+        file_ids=file_ids,
+        channel_id=params.get("channelId"),
+        local_only=params.get("localOnly", False),
+        reaction_acceptance=params.get("reactionAcceptance"),
+    )
+    return {"createdNote": state.pack_note(note, me)}
+
+
+@endpoint("/api/notes/show")
+def notes_show(state: MockState, me: Optional[dict], params: dict) -> dict:
+    return state.pack_note(_get_note(state, me, params.get("noteId")), me)
+
+
+@endpoint("/api/notes/delete", requires_credential=True)
+def notes_delete(state: MockState, me: dict, params: dict) -> None:
+    note = state.notes.get(params.get("noteId") or "")
+    if note is None:
+        raise no_such("NO_SUCH_NOTE", "490be23f-8c1f-4796-819f-94cb4f9d1630")
+    if note["userId"] != me["id"] and not (
+            me["isAdmin"] or me["isModerator"]):
+        raise access_denied("fe8d7103-0ea8-4ec3-814d-f8b401dc69e9")
+    state.delete_note(note["id"])
+
+
+@endpoint("/api/notes/reactions/create", requires_credential=True)
+def notes_reactions_create(state: MockState, me: dict, params: dict) -> None:
+    note = _get_note(state, me, params.get("noteId"))
+    reaction = params.get("reaction")
+    if not isinstance(reaction, str) or not reaction:
+        raise invalid_param("reaction is required")
+    reactions = state.reactions[note["id"]]
+    if reactions.get(me["id"]) == reaction:
+        raise no_such(
+            "ALREADY_REACTED", "71efcf98-86d6-4e2b-b2ad-9d032369366b")
+    # Another reaction of the user is replaced
+    reactions[me["id"]] = reaction
+    if note["userId"] != me["id"]:
+        state.notify(
+            note["userId"], "reaction", user_id=me["id"],
+            note_id=note["id"], reaction=reaction)
+
+
+@endpoint("/api/notes/reactions/delete", requires_credential=True)
+def notes_reactions_delete(state: MockState, me: dict, params: dict) -> None:
+    note = _get_note(state, me, params.get("noteId"))
+    if state.reactions[note["id"]].pop(me["id"], None) is None:
+        raise no_such("NOT_REACTED", "92f4426d-4196-4125-aa5b-02943e2ec8fc")
+
+
+def _timeline(
+    state: MockState,
+    me: Optional[dict],
+    params: dict,
+    source: Callable[[dict], bool],
+) -> list:
+    with_files = params.get("withFiles", False)
+    with_renotes = params.get("withRenotes", True)
+
+    def matches(note_id: str) -> bool:
+        note = state.notes[note_id]
+        if not source(note) or not state.can_see_note(note, me):
+            return False
+        if with_files and not note["fileIds"]:
+            return False
+        if (not with_renotes and note["renoteId"] is not None and
+                note["text"] is None and not note["fileIds"]):
+            return False
+        return True
+
+    ids = paginate(
+        state.note_ids, matches, limit=_limit(params), **_bounds(params))
+    return [state.pack_note(state.notes[note_id], me) for note_id in ids]
+
+
+def _is_local_public(state: MockState, note: dict) -> bool:
+    return (note["visibility"] == "public" and note["channelId"] is None and
+            state.users[note["userId"]]["host"] is None)
+
+
+def _is_home(state: MockState, me: dict, note: dict) -> bool:
+    return note["channelId"] is None and (
+        note["userId"] == me["id"] or
+        note["userId"] in state.following.get(me["id"], ()))
+
+
+@endpoint("/api/notes/timeline", requires_credential=True)
+def notes_timeline(state: MockState, me: dict, params: dict) -> list:
+    return _timeline(
+        state, me, params, lambda note: _is_home(state, me, note))
+
+
+@endpoint("/api/notes/hybrid-timeline", requires_credential=True)
+def notes_hybrid_timeline(state: MockState, me: dict, params: dict) -> list:
+    return _timeline(
+        state, me, params,
+        lambda note: (_is_home(state, me, note) or
+                      _is_local_public(state, note)))
+
+
+@endpoint("/api/notes/local-timeline")
+def notes_local_timeline(
+    state: MockState,
+    me: Optional[dict],
+    params: dict,
+) -> list:
+    return _timeline(
+        state, me, params, lambda note: _is_local_public(state, note))
+
+
+@endpoint("/api/notes/global-timeline")
+def notes_global_timeline(
+    state: MockState,
+    me: Optional[dict],
+    params: dict,
+) -> list:
+    return _timeline(
+        state, me, params,
+        lambda note: (note["visibility"] == "public" and
+                      note["channelId"] is None))
+
+
+@endpoint("/api/channels/timeline")
+def channels_timeline(
+    state: MockState,
+    me: Optional[dict],
+    params: dict,
+) -> list:
+    channel_id = params.get("channelId")
+    if not isinstance(channel_id, str):
+        raise invalid_param("channelId is required")
+    return _timeline(
+        state, me, params, lambda note: note["channelId"] == channel_id)
+
+
+# Drive
+
+@endpoint("/api/drive", requires_credential=True)
+def drive(state: MockState, me: dict, params: dict) -> dict:
+    return {"capacity": DRIVE_CAPACITY, "usage": state.drive_usage(me["id"])}
+
+
+@endpoint("/api/drive/files", requires_credential=True)
+def drive_files(state: MockState, me: dict, params: dict) -> list:
+    folder_id = params.get("folderId")
+    content_type = params.get("type")
+
+    def matches(file_id: str) -> bool:
+        drive_file = state.files[file_id]
+        if (drive_file["userId"] != me["id"] or
+                drive_file["folderId"] != folder_id):
+            return False
+        if content_type is None:
+            return True
+        if content_type.endswith("/*"):
+            return drive_file["type"].startswith(content_type[:-1])
+        return drive_file["type"] == content_type
+
+    sort = params.get("sort")
+    if sort is None:
+        ids = paginate(
+            state.file_ids, matches, limit=_limit(params), **_bounds(params))
+    else:
+        if sort[1:] not in ("createdAt", "name", "size") or (
+                sort[0] not in "+-"):
+            raise invalid_param("Unknown sort")
+        # Sorted listings are not paginated by ID, as in Misskey
+        ids = [i for i in state.file_ids if matches(i)]
+        ids.sort(
+            key=lambda i: state.files[i][sort[1:]], reverse=sort[0] == "+")
+        ids = ids[:_limit(params)]
+    return [state.pack_file(state.files[file_id]) for file_id in ids]
+
+
+@endpoint(
+    "/api/drive/files/create", requires_credential=True, multipart=True)
+def drive_files_create(state: MockState, me: dict, params: dict) -> dict:
+    upload = params.get("file")
+    if upload is None:
+        raise invalid_param("file is required")
+    filename, content_type, data = upload
+    folder_id = params.get("folderId") or None
+    if folder_id is not None:
+        _get_own_folder(state, me, folder_id)
+    name = params.get("name") or filename or "untitled"
+    if not _flag(params.get("force")):
+        md5 = hashlib.md5(data).hexdigest()
+        for drive_file in state.files.values():
+            if drive_file["userId"] == me["id"] and drive_file["md5"] == md5:
+                # Misskey returns the existing file of the same content
+                return state.pack_file(drive_file)
+    drive_file = state.create_file(
+        me["id"],
+        data,
+        name=name,
+        content_type=content_type or "application/octet-stream",
+        folder_id=folder_id,
+        comment=params.get("comment") or None,
+        is_sensitive=_flag(params.get("isSensitive")),
+    )
+    return state.pack_file(drive_file)
+
+
+@endpoint("/api/drive/files/check-existence", requires_credential=True)
+def drive_files_check_existence(
+    state: MockState,
+    me: dict,
+    params: dict,
+) -> bool:
+    return any(
+        drive_file["userId"] == me["id"] and
+        drive_file["md5"] == params.get("md5")
+        for drive_file in state.files.values())
+
+
+@endpoint("/api/drive/files/find-by-hash", requires_credential=True)
+def drive_files_find_by_hash(
+    state: MockState,
+    me: dict,
+    params: dict,
+) -> list:
+    return [
+        state.pack_file(drive_file)
+        for drive_file in state.files.values()
+        if (drive_file["userId"] == me["id"] and
+            drive_file["md5"] == params.get("md5"))
+    ]
+
+
+@endpoint("/api/drive/files/show", requires_credential=True)
+def drive_files_show(state: MockState, me: dict, params: dict) -> dict:
+    file_id = params.get("fileId")
+    if file_id is None and params.get("url") is not None:
+        file_id = params["url"].rsplit("/", 1)[-1]
+    return state.pack_file(_get_own_file(state, me, file_id))
+
+
+@endpoint("/api/drive/files/update", requires_credential=True)
+def drive_files_update(state: MockState, me: dict, params: dict) -> dict:
+    drive_file = _get_own_file(state, me, params.get("fileId"))
+    if "folderId" in params:
+        if params["folderId"] is not None:
+            _get_own_folder(state, me, params["folderId"])
+        drive_file["folderId"] = params["folderId"]
+    for key in ("name", "isSensitive", "comment"):
+        if key in params:
+            drive_file[key] = params[key]
+    return state.pack_file(drive_file)
+
+
+@endpoint("/api/drive/files/delete", requires_credential=True)
+def drive_files_delete(state: MockState, me: dict, params: dict) -> None:
+    drive_file = state.files.get(params.get("fileId") or "")
+    if drive_file is None:
+        raise no_such("NO_SUCH_FILE", "908939ec-e52b-4458-b395-1025195cea58")
+    if drive_file["userId"] != me["id"]:
+        raise access_denied("5eb8d909-2540-4970-90b8-dd6f86088121")
+    state.delete_file(drive_file["id"])
+
+
+@endpoint("/api/drive/folders", requires_credential=True)
+def drive_folders(state: MockState, me: dict, params: dict) -> list:
+    folder_id = params.get("folderId")
+    ids = paginate(
+        state.folder_ids,
+        lambda i: (state.folders[i]["userId"] == me["id"] and
+                   state.folders[i]["parentId"] == folder_id),
+        limit=_limit(params),
+        **_bounds(params),
+    )
+    return [state.pack_folder(state.folders[i]) for i in ids]
+
+
+@endpoint("/api/drive/folders/create", requires_credential=True)
+def drive_folders_create(state: MockState, me: dict, params: dict) -> dict:
+    parent_id = params.get("parentId")
+    if parent_id is not None:
+        _get_own_folder(state, me, parent_id)
+    folder = state.create_folder(
+        me["id"], params.get("name") or "Untitled", parent_id=parent_id)
+    return state.pack_folder(folder)
+
+
+@endpoint("/api/drive/folders/show", requires_credential=True)
+def drive_folders_show(state: MockState, me: dict, params: dict) -> dict:
+    folder = _get_own_folder(state, me, params.get("folderId"))
+    return state.pack_folder(folder, detail=True)
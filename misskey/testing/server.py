@@ -0,0 +1,315 @@
+import asyncio
+import json
+import logging
+import random
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+from aiohttp import web
+
+from .endpoints import (
+    ENDPOINTS,
+    MockAPIError,
+    authentication_failed,
+    credential_required,
+    internal_error,
+    invalid_param,
+    no_such_endpoint,
+    rate_limit_exceeded,
+)
+from .state import MockState
+
+__all__ = (
+    "MockFaults",
+    "MockMisskeyServer",
+)
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class MockFaults:
+    # Seconds added to each response, plus a random jitter up to ``jitter``
+    latency: float = 0.0
+    jitter: float = 0.0
+    # Probabilities of answering with INTERNAL_ERROR (500) or
+    # RATE_LIMIT_EXCEEDED (429) instead of handling the request
+    error_rate: float = 0.0
+    rate_limit_rate: float = 0.0
+
+
+class _TokenBucket(object):
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+
+    def take(self) -> bool:
+        now = time.monotonic()
+        self.tokens = min(
+            self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens < 1:
+            return False
+        self.tokens -= 1
+        return True
+
+
+class MockMisskeyServer(object):
+    """
+    In-process Misskey server for tests and load tests, serving the
+    endpoints of :mod:`misskey.testing.endpoints` over the records of a
+    :class:`~misskey.testing.MockState`.
+
+    ``faults`` apply to every endpoint, unless overridden for an endpoint
+    (such as ``"/api/notes/create"``) in ``endpoint_faults``. With
+    ``rate_limit``, each token may send that many requests per second
+    (with bursts of ``rate_limit_burst``) before getting 429 responses.
+    Random faults are drawn from a generator seeded with ``seed``.
+
+    The server runs on the current event loop with :meth:`start`, or on
+    a thread of its own with :meth:`start_in_thread` for sync clients.
+    Uploaded files are served at ``{address}/files/{id}``.
+    """
+
+    def __init__(
+        self,
+        state: Optional[MockState] = None, *,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        faults: Optional[MockFaults] = None,
+        endpoint_faults: Optional[Dict[str, MockFaults]] = None,
+        rate_limit: Optional[float] = None,
+        rate_limit_burst: int = 10,
+        seed: Optional[int] = 0,
+    ):
+        self.state = MockState() if state is None else state
+        self.host = host
+        self.port = port
+        self.faults = MockFaults() if faults is None else faults
+        self.endpoint_faults = dict(endpoint_faults or {})
+        self.rate_limit = rate_limit
+        self.rate_limit_burst = rate_limit_burst
+        # Requests received per endpoint, including failed ones
+        self.requests: Counter = Counter()
+        self._random = random.Random(seed)
+        self._buckets: Dict[Optional[str], _TokenBucket] = {}
+        self._failures: Dict[str, List[MockAPIError]] = {}
+        self._runner: Optional[web.AppRunner] = None
+        self._thread: Optional[threading.Thread] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    @property
+    def address(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    def fail_next(
+        self,
+        endpoint: str,
+        code: str = "INTERNAL_ERROR",
+        status: int = 500,
+        count: int = 1, *,
+        id: str = "5d37dbcb-891e-41ca-a3d6-e690c97775ac",
+    ) -> None:
+        """
+        Makes the next ``count`` requests to ``endpoint`` fail with the
+        API error ``code``.
+        """
+        error = MockAPIError(status, code, id, "Injected error.")
+        with self.state.lock:
+            self._failures.setdefault(endpoint, []).extend([error] * count)
+
+    def _app(self) -> web.Application:
+        # Large enough for any upload, as the drive has no size limit here
+        app = web.Application(client_max_size=1024 ** 3)
+        app.router.add_post("/api/{endpoint:.+}", self._handle)
+        app.router.add_get("/files/{file_id}", self._handle_file)
+        return app
+
+    @staticmethod
+    async def _read_params(
+        request: web.Request,
+        multipart: bool,
+    ) -> dict:
+        if not multipart:
+            if not request.can_read_body:
+                return {}
+            try:
+                params = await request.json()
+            except json.JSONDecodeError:
+                raise invalid_param("Body is not JSON")
+            if not isinstance(params, dict):
+                raise invalid_param("Body is not a JSON object")
+            return params
+
+        params: Dict[str, Any] = {}
+        reader = await request.multipart()
+        async for part in reader:
+            if part.filename is not None:
+                params[part.name] = (
+                    part.filename,
+                    part.headers.get("Content-Type"),
+                    bytes(await part.read()),
+                )
+            else:
+                params[part.name] = await part.text()
+        return params
+
+    def _fault(self, endpoint: str, token: Optional[str]) -> Tuple[
+        float, Optional[MockAPIError]
+    ]:
+        # Called with the lock held, so faults are drawn in order
+        faults = self.endpoint_faults.get(endpoint, self.faults)
+        delay = faults.latency
+        if faults.jitter > 0:
+            delay += self._random.uniform(0, faults.jitter)
+        failures = self._failures.get(endpoint)
+        if failures:
+            return delay, failures.pop(0)
+        if self.rate_limit is not None:
+            bucket = self._buckets.get(token)
+            if bucket is None:
+                bucket = _TokenBucket(self.rate_limit, self.rate_limit_burst)
+                self._buckets[token] = bucket
+            if not bucket.take():
+                return delay, rate_limit_exceeded()
+        draw = self._random.random()
+        if draw < faults.error_rate:
+            return delay, internal_error()
+        if draw < faults.error_rate + faults.rate_limit_rate:
+            return delay, rate_limit_exceeded()
+        return delay, None
+
+    def _call(self, endpoint: str, params: dict) -> Any:
+        mock = ENDPOINTS.get(endpoint)
+        if mock is None:
+            raise no_such_endpoint()
+        with self.state.lock:
+            me = None
+            token = params.pop("i", None)
+            if token is not None:
+                user_id = self.state.tokens.get(token)
+                if user_id is None:
+                    raise authentication_failed()
+                me = self.state.users[user_id]
+            elif mock.requires_credential:
+                raise credential_required()
+            return mock.handler(self.state, me, params)
+
+    async def _handle(self, request: web.Request) -> web.StreamResponse:
+        endpoint = "/api/" + request.match_info["endpoint"]
+        mock = ENDPOINTS.get(endpoint)
+        try:
+            params = await self._read_params(
+                request, mock is not None and mock.multipart)
+            with self.state.lock:
+                self.requests[endpoint] += 1
+                token = params.get("i")
+                delay, error = self._fault(endpoint, token)
+            if delay > 0:
+                await asyncio.sleep(delay)
+            if error is not None:
+                raise error
+            try:
+                body = self._call(endpoint, params)
+            except MockAPIError:
+                raise
+            except Exception:
+                # Misskey answers with INTERNAL_ERROR, rather than a page
+                logger.exception("Error while handling %s", endpoint)
+                raise internal_error()
+        except MockAPIError as e:
+            return web.json_response(e.to_dict(), status=e.status)
+        if body is None:
+            return web.Response(status=204)
+        return web.json_response(body)
+
+    async def _handle_file(self, request: web.Request) -> web.StreamResponse:
+        file_id = request.match_info["file_id"]
+        with self.state.lock:
+            drive_file = self.state.files.get(file_id)
+            data = self.state.file_data.get(file_id)
+        if drive_file is None or data is None:
+            raise web.HTTPNotFound()
+        return web.Response(body=data, content_type=drive_file["type"])
+
+    async def start(self) -> "MockMisskeyServer":
+        """
+        Starts serving on the current event loop.
+        """
+        runner = web.AppRunner(self._app(), access_log=None)
+        await runner.setup()
+        # A large backlog, so bursts of new connections are not refused
+        site = web.TCPSite(runner, self.host, self.port, backlog=4096)
+        await site.start()
+        self._runner = runner
+        self.port = runner.addresses[0][1]
+        self.state.url = self.address
+        return self
+
+    async def close(self) -> None:
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    async def __aenter__(self) -> "MockMisskeyServer":
+        return await self.start()
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+    def start_in_thread(self) -> "MockMisskeyServer":
+        """
+        Starts serving on an event loop of a daemon thread, and returns
+        once the server accepts connections.
+        """
+        started = threading.Event()
+        errors: List[BaseException] = []
+
+        def run() -> None:
+            loop = asyncio.new_event_loop()
+            asyncio.set_event_loop(loop)
+            self._loop = loop
+            try:
+                loop.run_until_complete(self.start())
+            except BaseException as e:
+                errors.append(e)
+                started.set()
+                loop.close()
+                return
+            started.set()
+            try:
+                loop.run_forever()
+            finally:
+                loop.run_until_complete(self.close())
+                loop.close()
+
+        self._thread = threading.Thread(
+            target=run, name="MockMisskeyServer", daemon=True)
+        self._thread.start()
+        started.wait()
+        if errors:
+            self._thread = None
+            raise errors[0]
+        return self
+
+    def stop(self) -> None:
+        """
+        Stops the server started by :meth:`start_in_thread`.
+        """
+        if self._thread is None or self._loop is None:
+            return
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._thread = None
+        self._loop = None
+
+    def __enter__(self) -> "MockMisskeyServer":
+        return self.start_in_thread()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
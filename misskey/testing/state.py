@@ -0,0 +1,548 @@
+import bisect
+import datetime
+import hashlib
+import secrets
+import threading
+from collections import defaultdict
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+from misskey.id import AID, AIDGenerator
+from misskey.id.base import ms_to_datetime
+
+__all__ = (
+    "DRIVE_CAPACITY",
+    "MockState",
+)
+
+DRIVE_CAPACITY = 10 * 1024 ** 3
+
+
+def format_date(t: datetime.datetime) -> str:
+    return t.strftime("%Y-%m-%dT%H:%M:%S.") + f"{t.microsecond // 1000:03d}Z"
+
+
+def date_bound(ms: int, *, upper: bool) -> str:
+    # ID bound for sinceDate / untilDate (in ms)
+    t = ms_to_datetime(ms)
+    return str(AID.upper_bound(t) if upper else AID.lower_bound(t))
+
+
+def paginate(
+    ids: List[str],
+    predicate: Callable[[str], bool], *,
+    limit: int,
+    since_id: Optional[str] = None,
+    until_id: Optional[str] = None,
+) -> List[str]:
+    """
+    Returns up to ``limit`` IDs of the sorted ``ids`` between the exclusive
+    bounds which match ``predicate``, as Misskey does: in ascending order
+    with only ``since_id``, otherwise in descending order.
+    """
+    start = bisect.bisect_right(ids, since_id) if since_id else 0
+    stop = bisect.bisect_left(ids, until_id) if until_id else len(ids)
+    if since_id and not until_id:
+        candidates = (ids[i] for i in range(start, stop))
+    else:
+        candidates = (ids[i] for i in range(stop - 1, start - 1, -1))
+    page = []
+    for i in candidates:
+        if len(page) >= limit:
+            break
+        if predicate(i):
+            page.append(i)
+    return page
+
+
+class MockState(object):
+    """
+    In-memory data of a mock Misskey server.
+
+    Records are dicts with the fields of the API, which are packed into
+    responses by the ``pack_*`` methods. The ``create_*`` methods may be
+    used to seed the state before or while the server runs; they hold
+    ``lock``, as the server does while handling a request.
+    """
+
+    def __init__(
+        self, *,
+        url: str = "http://localhost",
+        name: str = "Mock Misskey",
+        version: str = "2024.5.0",
+    ):
+        self.url = url
+        self.lock = threading.RLock()
+        self.ids = AIDGenerator()
+        self.meta: Dict[str, Any] = {
+            "name": name,
+            "version": version,
+        }
+
+        self.users: Dict[str, dict] = {}
+        self.tokens: Dict[str, str] = {}
+        self.following: Dict[str, Set[str]] = defaultdict(set)
+        self.notes: Dict[str, dict] = {}
+        self.note_ids: List[str] = []
+        # Note ID to user ID to reaction
+        self.reactions: Dict[str, Dict[str, str]] = defaultdict(dict)
+        self.files: Dict[str, dict] = {}
+        self.file_ids: List[str] = []
+        self.file_data: Dict[str, bytes] = {}
+        self.folders: Dict[str, dict] = {}
+        self.folder_ids: List[str] = []
+        self.announcements: Dict[str, dict] = {}
+        self.announcement_ids: List[str] = []
+        self.read_announcements: Dict[str, Set[str]] = defaultdict(set)
+        self.notifications: Dict[str, List[dict]] = defaultdict(list)
+
+    def _new_id(self) -> Tuple[str, str]:
+        now = datetime.datetime.now(datetime.timezone.utc)
+        return str(self.ids.generate(t=now)), format_date(now)
+
+    @staticmethod
+    def _insert(ids: List[str], i: str) -> None:
+        # IDs only increase, unless records are created in the past
+        if not ids or ids[-1] < i:
+            ids.append(i)
+        else:
+            bisect.insort(ids, i)
+
+    @staticmethod
+    def _remove(ids: List[str], i: str) -> None:
+        index = bisect.bisect_left(ids, i)
+        if index < len(ids) and ids[index] == i:
+            del ids[index]
+
+    # Users
+
+    def create_user(
+        self,
+        username: str, *,
+        host: Optional[str] = None,
+        name: Optional[str] = None,
+        token: Optional[str] = None,
+        is_admin: bool = False,
+        is_moderator: bool = False,
+        is_bot: bool = False,
+        description: Optional[str] = None,
+    ) -> Tuple[dict, Optional[str]]:
+        """
+        Creates a user and returns it with its token. Local users get a
+        random token if not given; remote users (with ``host``) have none.
+        """
+        with self.lock:
+            user_id, created_at = self._new_id()
+            user = {
+                "id": user_id,
+                "username": username,
+                "host": host,
+                "name": name,
+                "createdAt": created_at,
+                "updatedAt": created_at,
+                "isAdmin": is_admin,
+                "isModerator": is_moderator,
+                "isBot": is_bot,
+                "description": description,
+                "notesCount": 0,
+            }
+            self.users[user_id] = user
+            if host is None:
+                if token is None:
+                    token = secrets.token_hex(16)
+                self.tokens[token] = user_id
+            return user, token
+
+    def find_user(
+        self,
+        username: str,
+        host: Optional[str] = None,
+    ) -> Optional[dict]:
+        username = username.lower()
+        for user in self.users.values():
+            if (user["username"].lower() == username and
+                    user["host"] == host):
+                return user
+        return None
+
+    def follow(self, follower_id: str, followee_id: str) -> None:
+        with self.lock:
+            self.following[follower_id].add(followee_id)
+
+    def followers_count(self, user_id: str) -> int:
+        return sum(
+            user_id in followees for followees in self.following.values())
+
+    def pack_user_lite(self, user: dict) -> dict:
+        return {
+            "id": user["id"],
+            "name": user["name"],
+            "username": user["username"],
+            "host": user["host"],
+            "avatarUrl": f"{self.url}/identicon/{user['id']}",
+            "avatarBlurhash": None,
+            "avatarDecorations": [],
+            "isBot": user["isBot"],
+            "isCat": False,
+            "emojis": {},
+            "onlineStatus": "unknown",
+            "badgeRoles": [],
+        }
+
+    def pack_user(self, user: dict, me: Optional[dict] = None) -> dict:
+        packed = self.pack_user_lite(user)
+        packed.update({
+            "url": None,
+            "uri": None,
+            "movedTo": None,
+            "alsoKnownAs": None,
+            "createdAt": user["createdAt"],
+            "updatedAt": user["updatedAt"],
+            "lastFetchedAt": None,
+            "bannerUrl": None,
+            "bannerBlurhash": None,
+            "isLocked": False,
+            "isSilenced": False,
+            "isSuspended": False,
+            "description": user["description"],
+            "location": None,
+            "birthday": None,
+            "lang": None,
+            "fields": [],
+            "verifiedLinks": [],
+            "followersCount": self.followers_count(user["id"]),
+            "followingCount": len(self.following.get(user["id"], ())),
+            "notesCount": user["notesCount"],
+            "pinnedNoteIds": [],
+            "pinnedNotes": [],
+            "pinnedPageId": None,
+            "pinnedPage": None,
+            "publicReactions": True,
+            "ffVisibility": "public",
+            "twoFactorEnabled": False,
+            "usePasswordLessLogin": False,
+            "securityKeys": False,
+            "roles": [],
+            "memo": None,
+        })
+        if me is not None and me["id"] == user["id"]:
+            packed.update(self._pack_me(user))
+        return packed
+
+    def _pack_me(self, user: dict) -> dict:
+        unread = sum(
+            not notification["isRead"]
+            for notification in self.notifications.get(user["id"], ()))
+        unread_announcements = (
+            set(self.announcement_ids) -
+            self.read_announcements.get(user["id"], set()))
+        return {
+            "avatarId": None,
+            "bannerId": None,
+            "isModerator": user["isModerator"],
+            "isAdmin": user["isAdmin"],
+            "injectFeaturedNote": True,
+            "receiveAnnouncementEmail": True,
+            "alwaysMarkNsfw": False,
+            "autoSensitive": False,
+            "carefulBot": False,
+            "autoAcceptFollowed": True,
+            "noCrawle": False,
+            "preventAiLearning": True,
+            "isExplorable": True,
+            "isDeleted": False,
+            "twoFactorBackupCodesStock": "none",
+            "hideOnlineStatus": False,
+            "hasUnreadSpecifiedNotes": False,
+            "hasUnreadMentions": False,
+            "hasUnreadAnnouncement": bool(unread_announcements),
+            "hasUnreadAntenna": False,
+            "hasUnreadChannel": False,
+            "hasUnreadNotification": unread > 0,
+            "hasPendingReceivedFollowRequest": False,
+            "unreadNotificationsCount": unread,
+            "mutedWords": [],
+            "mutedInstances": [],
+            "notificationRecieveConfig": {},
+            "emailNotificationTypes": [],
+            "achievements": [],
+            "loggedInDays": 1,
+            "policies": {},
+            "email": None,
+            "emailVerified": None,
+            "securityKeysList": [],
+        }
+
+    # Notes
+
+    def create_note(
+        self,
+        user_id: str, *,
+        text: Optional[str] = None,
+        cw: Optional[str] = None,
+        visibility: str = "public",
+        visible_user_ids: Optional[List[str]] = None,
+        reply_id: Optional[str] = None,
+        renote_id: Optional[str] = None,
+        file_ids: Optional[List[str]] = None,
+        channel_id: Optional[str] = None,
+        local_only: bool = False,
+        reaction_acceptance: Optional[str] = None,
+    ) -> dict:
+        with self.lock:
+            note_id, created_at = self._new_id()
+            note = {
+                "id": note_id,
+                "createdAt": created_at,
+                "userId": user_id,
+                "text": text,
+                "cw": cw,
+                "visibility": visibility,
+                "visibleUserIds": list(visible_user_ids or []),
+                "replyId": reply_id,
+                "renoteId": renote_id,
+                "fileIds": list(file_ids or []),
+                "channelId": channel_id,
+                "localOnly": local_only,
+                "reactionAcceptance": reaction_acceptance,
+                "tags": [],
+                "mentions": [],
+                "renoteCount": 0,
+                "repliesCount": 0,
+            }
+            self.notes[note_id] = note
+            self._insert(self.note_ids, note_id)
+            self._count_note(note, 1)
+
+            parent_id = reply_id or renote_id
+            parent = self.notes.get(parent_id) if parent_id else None
+            if parent is not None and parent["userId"] != user_id:
+                if reply_id is not None:
+                    kind = "reply"
+                elif text is None and not note["fileIds"]:
+                    kind = "renote"
+                else:
+                    kind = "quote"
+                self.notify(
+                    parent["userId"], kind, user_id=user_id,
+                    note_id=note_id)
+            return note
+
+    def _count_note(self, note: dict, delta: int) -> None:
+        self.users[note["userId"]]["notesCount"] += delta
+        if note["replyId"] in self.notes:
+            self.notes[note["replyId"]]["repliesCount"] += delta
+        if note["renoteId"] in self.notes:
+            self.notes[note["renoteId"]]["renoteCount"] += delta
+
+    def delete_note(self, note_id: str) -> None:
+        with self.lock:
+            note = self.notes.pop(note_id, None)
+            if note is None:
+                return
+            self._count_note(note, -1)
+            self.reactions.pop(note_id, None)
+            self._remove(self.note_ids, note_id)
+
+    def can_see_note(self, note: dict, me: Optional[dict]) -> bool:
+        if note["visibility"] in ("public", "home"):
+            return True
+        if me is None:
+            return False
+        if me["id"] == note["userId"]:
+            return True
+        if note["visibility"] == "followers":
+            return note["userId"] in self.following.get(me["id"], ())
+        return me["id"] in note["visibleUserIds"]
+
+    def pack_note(
+        self,
+        note: dict,
+        me: Optional[dict] = None, *,
+        detail: bool = True,
+    ) -> dict:
+        reactions: Dict[str, int] = {}
+        for reaction in self.reactions.get(note["id"], {}).values():
+            reactions[reaction] = reactions.get(reaction, 0) + 1
+        packed = dict(note)
+        packed.update({
+            "user": self.pack_user_lite(self.users[note["userId"]]),
+            "isHidden": False,
+            "files": [
+                self.pack_file(self.files[file_id])
+                for file_id in note["fileIds"] if file_id in self.files
+            ],
+            "poll": None,
+            "reactionEmojis": {},
+            "reactions": reactions,
+            "reactionCount": sum(reactions.values()),
+        })
+        if me is not None and note["id"] in self.reactions:
+            packed["myReaction"] = self.reactions[note["id"]].get(me["id"])
+        if detail:
+            # Nested notes are packed one level deep, as Misskey does
+            for key in ("reply", "renote"):
+                nested = self.notes.get(note[key + "Id"] or "")
+                if nested is not None:
+                    packed[key] = self.pack_note(nested, me, detail=False)
+        return packed
+
+    # Drive
+
+    def create_folder(
+        self,
+        user_id: str,
+        name: str = "Untitled", *,
+        parent_id: Optional[str] = None,
+    ) -> dict:
+        with self.lock:
+            folder_id, created_at = self._new_id()
+            folder = {
+                "id": folder_id,
+                "createdAt": created_at,
+                "name": name,
+                "parentId": parent_id,
+                "userId": user_id,
+            }
+            self.folders[folder_id] = folder
+            self._insert(self.folder_ids, folder_id)
+            return folder
+
+    def create_file(
+        self,
+        user_id: str,
+        data: bytes, *,
+        name: str = "untitled",
+        content_type: str = "application/octet-stream",
+        folder_id: Optional[str] = None,
+        comment: Optional[str] = None,
+        is_sensitive: bool = False,
+    ) -> dict:
+        with self.lock:
+            file_id, created_at = self._new_id()
+            drive_file = {
+                "id": file_id,
+                "createdAt": created_at,
+                "name": name,
+                "type": content_type,
+                "md5": hashlib.md5(data).hexdigest(),
+                "size": len(data),
+                "isSensitive": is_sensitive,
+                "comment": comment,
+                "folderId": folder_id,
+                "userId": user_id,
+            }
+            self.files[file_id] = drive_file
+            self.file_data[file_id] = data
+            self._insert(self.file_ids, file_id)
+            return drive_file
+
+    def delete_file(self, file_id: str) -> None:
+        with self.lock:
+            self.files.pop(file_id, None)
+            self.file_data.pop(file_id, None)
+            self._remove(self.file_ids, file_id)
+
+    def drive_usage(self, user_id: str) -> int:
+        return sum(
+            drive_file["size"] for drive_file in self.files.values()
+            if drive_file["userId"] == user_id)
+
+    def pack_file(self, drive_file: dict) -> dict:
+        packed = dict(drive_file)
+        packed.update({
+            "blurhash": None,
+            "properties": {},
+            "url": f"{self.url}/files/{drive_file['id']}",
+            "thumbnailUrl": None,
+            "folder": None,
+            "user": None,
+        })
+        return packed
+
+    def pack_folder(self, folder: dict, *, detail: bool = False) -> dict:
+        packed = {
+            "id": folder["id"],
+            "createdAt": folder["createdAt"],
+            "name": folder["name"],
+            "parentId": folder["parentId"],
+            "foldersCount": sum(
+                other["parentId"] == folder["id"]
+                for other in self.folders.values()),
+            "filesCount": sum(
+                drive_file["folderId"] == folder["id"]
+                for drive_file in self.files.values()),
+        }
+        parent = self.folders.get(folder["parentId"] or "")
+        if detail and parent is not None:
+            packed["parent"] = self.pack_folder(parent, detail=True)
+        return packed
+
+    # Announcements and notifications
+
+    def create_announcement(
+        self,
+        title: str,
+        text: str, *,
+        image_url: Optional[str] = None,
+    ) -> dict:
+        with self.lock:
+            announcement_id, created_at = self._new_id()
+            announcement = {
+                "id": announcement_id,
+                "createdAt": created_at,
+                "updatedAt": None,
+                "title": title,
+                "text": text,
+                "imageUrl": image_url,
+                "icon": "info",
+                "display": "normal",
+                "needConfirmationToRead": False,
+                "silence": False,
+                "forYou": False,
+            }
+            self.announcements[announcement_id] = announcement
+            self._insert(self.announcement_ids, announcement_id)
+            return announcement
+
+    def notify(
+        self,
+        recipient_id: str,
+        type: str, *,
+        user_id: Optional[str] = None,
+        note_id: Optional[str] = None,
+        reaction: Optional[str] = None,
+    ) -> dict:
+        """
+        Adds a notification of ``type`` for ``recipient_id``, caused by
+        ``user_id``.
+        """
+        with self.lock:
+            notification_id, created_at = self._new_id()
+            notification = {
+                "id": notification_id,
+                "createdAt": created_at,
+                "type": type,
+                "isRead": False,
+                "userId": user_id,
+                "noteId": note_id,
+                "reaction": reaction,
+            }
+            self.notifications[recipient_id].append(notification)
+            return notification
+
+    def pack_notification(
+        self,
+        notification: dict,
+        me: Optional[dict] = None,
+    ) -> dict:
+        packed = {
+            key: value for key, value in notification.items()
+            if key not in ("noteId", "isRead") and value is not None
+        }
+        user = self.users.get(notification["userId"] or "")
+        if user is not None:
+            packed["user"] = self.pack_user_lite(user)
+        note = self.notes.get(notification["noteId"] or "")
+        if note is not None:
+            packed["note"] = self.pack_note(note, me)
+        return packed
@@ -0,0 +1,263 @@
+import heapq
+import threading
+from collections import OrderedDict
+from concurrent.futures import Executor, Future, ThreadPoolExecutor
+from typing import (
+    Callable,
+    Dict,
+    Hashable,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Union,
+)
+
+from .schemas import Note
+
+__all__ = (
+    "TimelineFetch",
+    "note_dedup_key",
+    "SeenSet",
+    "TimelineMergerBase",
+    "TimelineMerger",
+)
+
+# A timeline method such as ``mk.notes_local_timeline`` or
+# ``functools.partial(mk.channels_timeline, channel_id=...)``, called with
+# ``limit``, ``since_id`` and ``until_id``
+TimelineFetch = Callable[..., List[Note]]
+
+
+def is_pure_renote(note: Note) -> bool:
+    return (
+        note.renote_id is not None and
+        note.text is None and
+        note.cw is None and
+        not note.file_ids and
+        note._extra.get("poll") is None
+    )
+
+
+def note_dedup_key(note: Note) -> str:
+    """
+    Returns the ID of the renoted note for a pure renote, and the ID of
+    the note otherwise, so a note and its renotes share one key.
+    """
+    if is_pure_renote(note):
+        return note.renote_id
+    return note.id
+
+
+class SeenSet(object):
+    """
+    Set of the ``maxsize`` most recently seen keys.
+    """
+
+    def __init__(self, maxsize: int = 10000):
+        self.maxsize = maxsize
+        self._keys: "OrderedDict[Hashable, None]" = OrderedDict()
+
+    def add(self, key: Hashable) -> bool:
+        """
+        Adds ``key`` and returns whether it was not seen before.
+        """
+        if key in self._keys:
+            self._keys.move_to_end(key)
+            return False
+        self._keys[key] = None
+        if len(self._keys) > self.maxsize:
+            self._keys.popitem(last=False)
+        return True
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._keys
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+
+def newest_first(page: List[Note]) -> List[Note]:
+    return sorted(page, key=lambda note: note.id, reverse=True)
+
+
+def oldest_first(page: List[Note]) -> List[Note]:
+    return sorted(page, key=lambda note: note.id)
+
+
+class TimelineMergerBase(object):
+    """
+    State shared by the sync and async timeline mergers.
+
+    ``sources`` is a sequence or a mapping of :data:`TimelineFetch`.
+    Notes are deduplicated by :func:`note_dedup_key` (or ``key``) with a
+    :class:`SeenSet` of ``seen_size`` keys.
+    """
+
+    def __init__(
+        self,
+        sources: Union[
+            Sequence[TimelineFetch],
+            Mapping[Hashable, TimelineFetch],
+        ], *,
+        limit: int = 100,
+        seen_size: int = 10000,
+        key: Callable[[Note], Hashable] = note_dedup_key,
+    ):
+        if isinstance(sources, Mapping):
+            self.sources = dict(sources)
+        else:
+            self.sources = dict(enumerate(sources))
+        self.limit = limit
+        self.key = key
+        self.seen = SeenSet(seen_size)
+        # The newest note ID polled from each source
+        self.cursors: Dict[Hashable, Optional[str]] = {
+            name: None for name in self.sources
+        }
+
+    def _is_new(self, note: Note) -> bool:
+        return self.seen.add(self.key(note))
+
+    def _merge_polled(self, polled: Dict[Hashable, List[Note]]) -> List[Note]:
+        for name, notes in polled.items():
+            if notes:
+                self.cursors[name] = notes[-1].id
+        return [
+            note for note in heapq.merge(
+                *polled.values(), key=lambda n: n.id)
+            if self._is_new(note)
+        ]
+
+
+class TimelineMerger(TimelineMergerBase):
+    """
+    Merges several timelines into one stream ordered by note ID, with
+    duplicate notes and renotes removed.
+
+    .. code-block:: python
+
+       merger = TimelineMerger({
+           "local": mk.notes_local_timeline,
+           "home": mk.notes_timeline,
+           "channel": functools.partial(
+               mk.channels_timeline, channel_id=channel_id),
+       })
+       for note in merger.history(since_id=since_id):
+           ...  # newest first
+       for note in merger.watch(interval=10):
+           ...  # oldest first, as they arrive
+
+    Sources are fetched concurrently in a pool of ``max_workers`` threads
+    (one per source by default). Close the merger to shut it down.
+    """
+
+    def __init__(
+        self,
+        sources: Union[
+            Sequence[TimelineFetch],
+            Mapping[Hashable, TimelineFetch],
+        ], *,
+        max_workers: Optional[int] = None,
+        **kwargs,
+    ):
+        super().__init__(sources, **kwargs)
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers or max(1, len(self.sources)))
+        self._stop_event = threading.Event()
+
+    def _iter_source(
+        self,
+        executor: Executor,
+        fetch: TimelineFetch,
+        future: "Future[List[Note]]",
+        since_id: Optional[str],
+    ) -> Iterator[Note]:
+        # Pages backwards from the first page in ``future``, fetching the
+        # next page while the current one is merged
+        try:
+            while future is not None:
+                page = newest_first(future.result())
+                future = None
+                if len(page) >= self.limit:
+                    future = executor.submit(
+                        fetch, limit=self.limit, until_id=page[-1].id)
+                for note in page:
+                    if since_id is not None and note.id <= since_id:
+                        return
+                    yield note
+        finally:
+            if future is not None:
+                future.cancel()
+
+    def history(
+        self, *,
+        until_id: Optional[str] = None,
+        since_id: Optional[str] = None,
+    ) -> Iterator[Note]:
+        """
+        Yields notes older than ``until_id`` (or the newest notes) down to
+        ``since_id`` (or the end of the timelines), newest first.
+        """
+        # The first pages are all requested before merging starts, as
+        # heapq.merge would otherwise pull them one source at a time
+        first_pages = [
+            (fetch, self._executor.submit(
+                fetch, limit=self.limit, until_id=until_id))
+            for fetch in self.sources.values()
+        ]
+        streams = [
+            self._iter_source(self._executor, fetch, future, since_id)
+            for fetch, future in first_pages
+        ]
+        for note in heapq.merge(
+            *streams, key=lambda n: n.id, reverse=True,
+        ):
+            if self._is_new(note):
+                yield note
+
+    def _poll_source(self, name: Hashable) -> List[Note]:
+        fetch = self.sources[name]
+        since_id = self.cursors[name]
+        if since_id is None:
+            # First poll, so only the latest page
+            return oldest_first(fetch(limit=self.limit))
+        notes = []
+        while True:
+            # With only since_id, pages are returned oldest first
+            page = oldest_first(fetch(limit=self.limit, since_id=since_id))
+            notes.extend(page)
+            if len(page) < self.limit:
+                return notes
+            since_id = page[-1].id
+
+    def poll(self) -> List[Note]:
+        """
+        Fetches the notes posted to any source since the last poll, and
+        returns the new ones oldest first.
+        """
+        names = list(self.sources)
+        polled = self._executor.map(self._poll_source, names)
+        return self._merge_polled(dict(zip(names, polled)))
+
+    def stop(self) -> None:
+        self._stop_event.set()
+
+    def watch(self, *, interval: float = 10.0) -> Iterator[Note]:
+        """
+        Polls every ``interval`` seconds until :meth:`stop` is called.
+        """
+        self._stop_event.clear()
+        while not self._stop_event.is_set():
+            yield from self.poll()
+            self._stop_event.wait(interval)
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def __enter__(self) -> "TimelineMerger":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
@@ -0,0 +1,310 @@
+import gzip
+import json
+import random
+import threading
+import time
+from collections import deque
+from typing import IO, Any, Deque, Dict, Iterator, Optional, Tuple
+
+from .enum import HttpMethodEnum
+from .exceptions import MisskeyCassetteError
+from .multipart import MultipartEncoder
+
+__all__ = (
+    "CASSETTE_VERSION",
+    "Transport",
+    "RecordingTransport",
+    "ReplayTransport",
+    "read_cassette",
+)
+
+CASSETTE_VERSION = 1
+
+# Status and decoded JSON body (None if empty) of a response
+RawResponse = Tuple[int, Any]
+
+
+class Transport(object):
+    """
+    Sends the requests of a client in place of its HTTP session, when set as
+    the ``transport`` of :class:`~misskey.Misskey` or
+    :class:`~misskey.asynchronous.AsyncMisskey`.
+
+    Methods get the client, and return the status and the decoded body of
+    the response. ``client._http_request`` and ``client._http_multipart``
+    send the request for real.
+    """
+
+    def send_request(
+        self,
+        client: Any,
+        method: HttpMethodEnum,
+        endpoint: str,
+        params: dict,
+    ) -> RawResponse:
+        raise NotImplementedError()
+
+    async def send_request_async(
+        self,
+        client: Any,
+        method: HttpMethodEnum,
+        endpoint: str,
+        params: dict,
+    ) -> RawResponse:
+        raise NotImplementedError()
+
+    def send_multipart(
+        self,
+        client: Any,
+        endpoint: str,
+        body: MultipartEncoder,
+    ) -> RawResponse:
+        raise NotImplementedError()
+
+    async def send_multipart_async(
+        self,
+        client: Any,
+        endpoint: str,
+        body: MultipartEncoder,
+        chunk_size: int,
+    ) -> RawResponse:
+        raise NotImplementedError()
+
+
+def _open_cassette(path: str, mode: str) -> IO[str]:
+    if path.endswith(".gz"):
+        return gzip.open(path, mode + "t", encoding="utf-8")
+    return open(path, mode, encoding="utf-8")
+
+
+def _without_token(params: dict) -> dict:
+    return {key: value for key, value in params.items() if key != "i"}
+
+
+def _upload_entry(body: MultipartEncoder) -> dict:
+    return {
+        "field": body.file_field,
+        "filename": body.upload.filename,
+        "size": body.upload.size,
+        "contentType": body.upload.content_type,
+    }
+
+
+def _request_key(entry: dict) -> str:
+    return json.dumps(
+        [entry["method"], entry["endpoint"], entry["params"],
+         entry.get("upload")],
+        sort_keys=True,
+        separators=(",", ":"),
+    )
+
+
+def read_cassette(path: str) -> Iterator[dict]:
+    """
+    Yields the recorded interactions of a cassette file.
+    """
+    with _open_cassette(path, "r") as f:
+        header = json.loads(f.readline() or "null")
+        if (not isinstance(header, dict) or
+                header.get("version") != CASSETTE_VERSION):
+            raise MisskeyCassetteError(f"{path} is not a cassette")
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+class RecordingTransport(Transport):
+    """
+    Sends requests for real, and appends each request and its response to
+    the cassette file at ``path`` (gzip compressed if it ends with
+    ``.gz``).
+
+    Requests are stored as their method, endpoint and parameters without
+    the token (``i``), so cassettes can be shared. Uploads are stored as
+    the form fields and the name, size and type of the file.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = _open_cassette(path, "w")
+        self._lock = threading.Lock()
+        self._write({"version": CASSETTE_VERSION})
+
+    def _write(self, entry: dict) -> None:
+        line = json.dumps(entry, separators=(",", ":"), ensure_ascii=False)
+        with self._lock:
+            self._file.write(line + "\n")
+            self._file.flush()
+
+    def _record(
+        self,
+        method: HttpMethodEnum,
+        endpoint: str,
+        params: dict,
+        upload: Optional[dict],
+        response: RawResponse,
+        elapsed: float,
+    ) -> RawResponse:
+        entry = {
+            "method": method.value,
+            "endpoint": endpoint,
+            "params": _without_token(params),
+            "status": response[0],
+            "body": response[1],
+            "elapsed": round(elapsed, 6),
+        }
+        if upload is not None:
+            entry["upload"] = upload
+        self._write(entry)
+        return response
+
+    def send_request(self, client, method, endpoint, params):
+        started = time.monotonic()
+        response = client._http_request(method, endpoint, params)
+        return self._record(
+            method, endpoint, params, None, response,
+            time.monotonic() - started)
+
+    async def send_request_async(self, client, method, endpoint, params):
+        started = time.monotonic()
+        response = await client._http_request(method, endpoint, params)
+        return self._record(
+            method, endpoint, params, None, response,
+            time.monotonic() - started)
+
+    def send_multipart(self, client, endpoint, body):
+        started = time.monotonic()
+        response = client._http_multipart(endpoint, body)
+        return self._record(
+            HttpMethodEnum.POST, endpoint, body.fields, _upload_entry(body),
+            response, time.monotonic() - started)
+
+    async def send_multipart_async(self, client, endpoint, body, chunk_size):
+        started = time.monotonic()
+        response = await client._http_multipart(endpoint, body, chunk_size)
+        return self._record(
+            HttpMethodEnum.POST, endpoint, body.fields, _upload_entry(body),
+            response, time.monotonic() - started)
+
+    def close(self) -> None:
+        with self._lock:
+            self._file.close()
+
+    def __enter__(self) -> "RecordingTransport":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+class ReplayTransport(Transport):
+    """
+    Serves the responses of a cassette without any network access.
+
+    A request is matched by its method, endpoint, upload and parameters
+    other than the token. Identical requests get their recorded responses in
+    order, and the last one again once they run out (unless ``repeat`` is
+    false). A request which was not recorded raises
+    :class:`~misskey.exceptions.MisskeyCassetteError`.
+
+    Each response is delayed by ``latency`` seconds plus a random jitter of
+    up to ``jitter`` seconds, drawn from a generator seeded with ``seed``
+    so runs are reproducible. With ``recorded_latency``, the recorded
+    time of the request multiplied by ``latency_scale`` is used instead
+    of ``latency``.
+    """
+
+    def __init__(
+        self,
+        path: str, *,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        seed: Optional[int] = 0,
+        recorded_latency: bool = False,
+        latency_scale: float = 1.0,
+        repeat: bool = True,
+    ):
+        self.path = path
+        self.latency = latency
+        self.jitter = jitter
+        self.recorded_latency = recorded_latency
+        self.latency_scale = latency_scale
+        self.repeat = repeat
+        self._random = random.Random(seed)
+        self._responses: Dict[str, Deque[dict]] = {}
+        for entry in read_cassette(path):
+            self._responses.setdefault(
+                _request_key(entry), deque()).append(entry)
+        self._lock = threading.Lock()
+
+    def _lookup(
+        self,
+        method: HttpMethodEnum,
+        endpoint: str,
+        params: dict,
+        upload: Optional[dict] = None,
+    ) -> Tuple[RawResponse, float]:
+        key = _request_key({
+            "method": method.value,
+            "endpoint": endpoint,
+            "params": _without_token(params),
+            "upload": upload,
+        })
+        with self._lock:
+            responses = self._responses.get(key)
+            if not responses:
+                raise MisskeyCassetteError(
+                    f"No recorded response for {method.value.upper()} "
+                    f"{endpoint}")
+            if len(responses) > 1 or not self.repeat:
+                entry = responses.popleft()
+            else:
+                entry = responses[0]
+            delay = (entry.get("elapsed", 0.0) * self.latency_scale
+                     if self.recorded_latency else self.latency)
+            if self.jitter > 0:
+                delay += self._random.uniform(0, self.jitter)
+        return (entry["status"], entry["body"]), delay
+
+    @staticmethod
+    def _sleep(delay: float) -> None:
+        if delay > 0:
+            time.sleep(delay)
+
+    @staticmethod
+    async def _sleep_async(delay: float) -> None:
+        # Imported here, as the sync client imports this module too
+        import asyncio
+
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def send_request(self, client, method, endpoint, params):
+        response, delay = self._lookup(method, endpoint, params)
+        self._sleep(delay)
+        return response
+
+    async def send_request_async(self, client, method, endpoint, params):
+        response, delay = self._lookup(method, endpoint, params)
+        await self._sleep_async(delay)
+        return response
+
+    def send_multipart(self, client, endpoint, body):
+        response, delay = self._lookup(
+            HttpMethodEnum.POST, endpoint, body.fields, _upload_entry(body))
+        self._sleep(delay)
+        return response
+
+    async def send_multipart_async(self, client, endpoint, body, chunk_size):
+        response, delay = self._lookup(
+            HttpMethodEnum.POST, endpoint, body.fields, _upload_entry(body))
+        await self._sleep_async(delay)
+        return response
+
+    @property
+    def remaining(self) -> int:
+        """
+        Number of recorded responses which were not served yet.
+        """
+        with self._lock:
+            return sum(map(len, self._responses.values()))
@@ -28,6 +28,61 @@ __all__ = (
 )
 
 
+def users_payload(
+    *,
+    limit: int = 10,
+    offset: int = 0,
+    sort: Optional[UsersSortEnum] = None,
+    state: Optional[UsersStateEnum] = None,
+    origin: UsersOriginEnum = UsersOriginEnum.LOCAL,
+    hostname: Optional[str] = None,
+) -> dict:
+    payload_dict = {
+        "limit": limit,
+        "offset": offset,
+        "hostname": hostname,
+    }
+    if sort is not None:
+        payload_dict["sort"] = sort
+    if state is not None:
+        payload_dict["state"] = state
+    if origin is not None:
+        payload_dict["origin"] = origin
+
+    return UsersArgumentsSchema().dump(payload_dict)
+
+
+def users_show_payload(
+    *,
+    user_id: Optional[str] = None,
+    user_ids: Optional[List[str]] = None,
+    username: Optional[str] = None,
+    host: Optional[str] = None,
+) -> dict:
+    payload_dict = {}
+    if user_id is not None:
+        payload_dict["user_id"] = user_id
+    if user_ids is not None:
+        payload_dict["user_ids"] = user_ids
+    if username is not None:
+        payload_dict["username"] = username
+        payload_dict["host"] = host
+
+    return UsersShowArgumentsSchema().dump(payload_dict)
+
+
+def load_user(data: dict) -> Union[UserDetailed, MeDetailed]:
+    # TODO: Maybe there's a better way to identify them.
+    if "avatarId" in data:
+        return MeDetailedSchema().load(data)
+    else:
+        return UserDetailedSchema().load(data)
+
+
+def load_users(data: List[dict]) -> List[Union[UserDetailed, MeDetailed]]:
+    return [load_user(res) for res in data]
+
+
 class Misskey(Base):
     def users(
         self, *,
@@ -38,30 +93,16 @@ class Misskey(Base):
         origin: UsersOriginEnum = UsersOriginEnum.LOCAL,
         hostname: Optional[str] = None,
     ) -> List[Union[UserDetailed, MeDetailed]]:
-        payload_dict = {
-            "limit": limit,
-            "offset": offset,
-            "hostname": hostname,
-        }
-        if sort is not None:
-            payload_dict["sort"] = sort
-        if state is not None:
-            payload_dict["state"] = state
-        if origin is not None:
-            payload_dict["origin"] = origin
-
-        payload = UsersArgumentsSchema().dump(payload_dict)
-        response = self._api_request(
-            endpoint="/api/users", params=payload)
-
-        # TODO: Maybe there's a better way to identify them.
-        return_data = []
-        for res in response:
-            if "avatarId" in response:
-                return_data.append(MeDetailedSchema().load(res))
-            else:
-                return_data.append(UserDetailedSchema().load(res))
-        return return_data
+        payload = users_payload(
+            limit=limit,
+            offset=offset,
+            sort=sort,
+            state=state,
+            origin=origin,
+            hostname=hostname,
+        )
+        return load_users(
+            self._api_request(endpoint="/api/users", params=payload))
 
     def users_show(
         self, *,
@@ -74,34 +115,19 @@ class Misskey(Base):
         MeDetailed,
         List[Union[UserDetailed, MeDetailed]]
     ]:
-        payload_dict = {}
-        if user_id is not None:
-            payload_dict["user_id"] = user_id
-        if user_ids is not None:
-            payload_dict["user_ids"] = user_ids
-        if username is not None:
-            payload_dict["username"] = username
-            payload_dict["host"] = host
-
-        payload = UsersShowArgumentsSchema().dump(payload_dict)
+        payload = users_show_payload(
+            user_id=user_id,
+            user_ids=user_ids,
+            username=username,
+            host=host,
+        )
         response = self._api_request(
             endpoint="/api/users/show", params=payload)
 
         if type(response) is dict:
-            # TODO: Maybe there's a better way to identify them.
-            if "avatarId" in response:
-                return MeDetailedSchema().load(response)
-            else:
-                return UserDetailedSchema().load(response)
+            return load_user(response)
         elif type(response) is list:
-            # TODO: Maybe there's a better way to identify them.
-            return_data = []
-            for res in response:
-                if "avatarId" in response:
-                    return_data.append(MeDetailedSchema().load(res))
-                else:
-                    return_data.append(UserDetailedSchema().load(res))
-            return return_data
+            return load_users(response)
         else:
             raise MisskeyResponseError("Illegal response type received")
 
@@ -0,0 +1,101 @@
+from collections import deque
+from concurrent.futures import Executor, Future, ThreadPoolExecutor
+from typing import Deque, Iterator, List, Optional, Tuple, Union
+
+from .enum import UsersOriginEnum, UsersSortEnum, UsersStateEnum
+from .misskey import Misskey
+from .schemas import MeDetailed, UserDetailed
+from .users import load_users, users_payload
+
+__all__ = (
+    "USERS_PAGE_LIMIT",
+    "crawl_users",
+)
+
+# Maximum limit of /api/users
+USERS_PAGE_LIMIT = 100
+
+
+def crawl_users(
+    mk: Misskey, *,
+    sort: Optional[UsersSortEnum] = None,
+    state: Optional[UsersStateEnum] = None,
+    origin: UsersOriginEnum = UsersOriginEnum.LOCAL,
+    hostname: Optional[str] = None,
+    offset: int = 0,
+    max_users: Optional[int] = None,
+    limit: int = USERS_PAGE_LIMIT,
+    max_workers: int = 4,
+    decode_executor: Optional[Executor] = None,
+) -> Iterator[Union[UserDetailed, MeDetailed]]:
+    """
+    Yields all users matching the filters of ``users``, starting at
+    ``offset``, in the order of the listing.
+
+    Offset pages are independent, so up to ``max_workers`` pages are
+    fetched at once. No more pages are requested after the first short
+    page, and the crawl stops after ``max_users`` users if given.
+
+    Pages are decoded into schemas in ``decode_executor`` if given (e.g. a
+    ``ProcessPoolExecutor``), otherwise in the fetching threads. Users
+    shifted across pages by concurrent sign-ups are yielded once.
+    """
+    def fetch(page_offset: int) -> Tuple[int, Union[List, Future]]:
+        payload = users_payload(
+            limit=limit,
+            offset=page_offset,
+            sort=sort,
+            state=state,
+            origin=origin,
+            hostname=hostname,
+        )
+        raw = mk._api_request(endpoint="/api/users", params=payload)
+        if decode_executor is not None:
+            return len(raw), decode_executor.submit(load_users, raw)
+        return len(raw), load_users(raw)
+
+    seen = set()
+    count = 0
+    duplicates = 0
+
+    def wanted(page_offset: int) -> bool:
+        # Each duplicate skipped takes one more user from the listing
+        return (max_users is None or
+                page_offset < offset + max_users + duplicates)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        pending: Deque[Tuple[int, Future]] = deque()
+        next_offset = offset
+        finished = False
+        try:
+            while True:
+                while (not finished and len(pending) < max_workers and
+                       wanted(next_offset)):
+                    pending.append(
+                        (next_offset, executor.submit(fetch, next_offset)))
+                    next_offset += limit
+                if not pending:
+                    return
+
+                _, future = pending.popleft()
+                size, users = future.result()
+                if size < limit:
+                    # End of data, so the pages after it are empty
+                    finished = True
+                    while pending:
+                        pending.pop()[1].cancel()
+                if isinstance(users, Future):
+                    users = users.result()
+
+                for user in users:
+                    if user.id in seen:
+                        duplicates += 1
+                        continue
+                    seen.add(user.id)
+                    yield user
+                    count += 1
+                    if max_users is not None and count >= max_users:
+                        return
+        finally:
+            for _, future in pending:
+                future.cancel()
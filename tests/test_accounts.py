@@ -0,0 +1,97 @@
+import unittest
+
+import aiohttp
+
+from misskey import Misskey
+from misskey.accounts import AccountPool
+from misskey.asynchronous import AsyncMisskey
+from misskey.exceptions import MisskeyAPIError
+from misskey.ratelimit import RATE_LIMIT_ERROR_CODE
+from misskey.testing import MockMisskeyServer, MockState
+
+
+class AccountPoolTest(unittest.TestCase):
+    def setUp(self):
+        self.state = MockState()
+        _, self.alice_token = self.state.create_user("alice")
+        _, self.bob_token = self.state.create_user("bob")
+        self.server = MockMisskeyServer(self.state).start_in_thread()
+        self.addCleanup(self.server.stop)
+        self.mk = Misskey(address=self.server.address)
+        self.pool = AccountPool(self.mk, rate=10.0, burst=5)
+
+    def test_handles(self):
+        alice = self.pool[self.alice_token]
+        bob = self.pool.account(self.bob_token)
+        self.assertEqual(alice.i().username, "alice")
+        self.assertEqual(bob.i().username, "bob")
+
+        # One session, one rate limiter per account
+        self.assertIs(alice.session, self.mk.session)
+        self.assertIs(bob.session, self.mk.session)
+        self.assertIsNot(alice.rate_limiter, bob.rate_limiter)
+        self.assertIs(
+            self.pool.account(self.alice_token).rate_limiter,
+            alice.rate_limiter)
+        self.assertIsNone(self.mk.token)
+        self.assertIsNone(self.mk.rate_limiter)
+        self.assertEqual(len(self.pool), 2)
+
+        self.pool.forget(self.alice_token)
+        self.assertEqual(len(self.pool), 1)
+        self.assertIsNot(
+            self.pool[self.alice_token].rate_limiter, alice.rate_limiter)
+
+    def test_rate_limit_penalizes_one_account(self):
+        alice = self.pool[self.alice_token]
+        bob = self.pool[self.bob_token]
+        self.server.fail_next("/api/i", RATE_LIMIT_ERROR_CODE, 429)
+        with self.assertRaises(MisskeyAPIError) as cm:
+            alice.i()
+        self.assertEqual(cm.exception.code, RATE_LIMIT_ERROR_CODE)
+
+        self.assertEqual(alice.rate_limiter.penalties, 1)
+        self.assertEqual(bob.rate_limiter.penalties, 0)
+        # Only alice has to wait
+        self.assertGreater(alice.rate_limiter.reserve(), 0)
+        self.assertEqual(bob.rate_limiter.reserve(), 0)
+        self.assertEqual(bob.i().username, "bob")
+        self.assertEqual(alice.i().username, "alice")
+        self.assertEqual(bob.rate_limiter.penalties, 0)
+
+    def test_without_rate(self):
+        pool = AccountPool(self.mk)
+        alice = pool[self.alice_token]
+        self.assertIsNone(alice.rate_limiter)
+        self.server.fail_next("/api/i", RATE_LIMIT_ERROR_CODE, 429)
+        with self.assertRaises(MisskeyAPIError):
+            alice.i()
+        self.assertEqual(alice.i().username, "alice")
+        self.assertEqual(len(pool), 0)
+
+
+class AsyncAccountPoolTest(unittest.IsolatedAsyncioTestCase):
+    async def test_rate_limit_penalizes_one_account(self):
+        state = MockState()
+        _, alice_token = state.create_user("alice")
+        _, bob_token = state.create_user("bob")
+        server = await MockMisskeyServer(state).start()
+        self.addAsyncCleanup(server.close)
+        session = aiohttp.ClientSession()
+        self.addAsyncCleanup(session.close)
+        pool = AccountPool(
+            AsyncMisskey(address=server.address, session=session),
+            rate=10.0, burst=5)
+
+        alice = pool[alice_token]
+        bob = pool[bob_token]
+        self.assertIs(alice.session, session)
+        self.assertIs(bob.session, session)
+
+        server.fail_next("/api/i", RATE_LIMIT_ERROR_CODE, 429)
+        with self.assertRaises(MisskeyAPIError):
+            await alice.i()
+        self.assertEqual((await bob.i()).username, "bob")
+        self.assertEqual(alice.rate_limiter.penalties, 1)
+        self.assertEqual(bob.rate_limiter.penalties, 0)
+        self.assertEqual((await alice.i()).username, "alice")
@@ -0,0 +1,150 @@
+import datetime
+import unittest
+
+import numpy as np
+
+from misskey.id.aid import (
+    AID,
+    TIME2000_MS,
+    TIME2000_UTC,
+    aids_to_timestamps,
+    timestamps_to_aids,
+)
+from misskey.id.base36 import (
+    decode_base36,
+    decode_base36_array,
+    encode_base36,
+    encode_base36_array,
+)
+
+# 2020-01-01 to 2030-01-01 in UNIX time in milliseconds
+TIME_RANGE = (1577836800000, 1893456000000)
+
+
+class Base36Test(unittest.TestCase):
+    def test_round_trip(self):
+        values = [0, 1, 35, 36, 1295, 1296, 36 ** 8 - 1]
+        values += np.random.default_rng(0).integers(
+            0, 36 ** 8, size=1000).tolist()
+        encoded = [encode_base36(value, 8) for value in values]
+        self.assertTrue(all(len(e) == 8 for e in encoded))
+        self.assertEqual([decode_base36(e) for e in encoded], values)
+
+        encoded = encode_base36_array(values, 8)
+        self.assertEqual(encoded.tolist(),
+                         [encode_base36(value, 8) for value in values])
+        self.assertEqual(decode_base36_array(encoded).tolist(), values)
+
+    def test_encode(self):
+        self.assertEqual(encode_base36(0, 8), "00000000")
+        self.assertEqual(encode_base36(35, 1), "z")
+        self.assertEqual(encode_base36(36, 3), "010")
+        # Wider values are not truncated, as with padStart in JavaScript
+        self.assertEqual(encode_base36(36 ** 8, 8), "100000000")
+        with self.assertRaises(ValueError):
+            encode_base36(-1, 8)
+
+    def test_encode_array_out_of_range(self):
+        for value in (-1, 36 ** 8):
+            with self.subTest(value=value):
+                with self.assertRaises(ValueError):
+                    encode_base36_array([value], 8)
+
+    def test_decode_array(self):
+        self.assertEqual(
+            decode_base36_array(["ZZ", "zz", "10"]).tolist(),
+            [1295, 1295, 36])
+        self.assertEqual(
+            decode_base36_array([b"0z1"], start=1, stop=2).tolist(), [35])
+        self.assertEqual(decode_base36_array([]).tolist(), [])
+
+    def test_decode_array_malformed(self):
+        for values in (["0a-b"], ["0a b"], ["abあc"]):
+            with self.subTest(values=values):
+                with self.assertRaises(ValueError):
+                    decode_base36_array(values)
+        with self.assertRaises(ValueError):
+            decode_base36_array(["abc"], stop=4)
+        with self.assertRaises(TypeError):
+            decode_base36_array([1, 2])
+
+
+class AIDArrayTest(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self.timestamps = rng.integers(*TIME_RANGE, size=1000)
+        self.noise = rng.integers(0, 36 ** 2, size=1000)
+
+    def test_matches_scalar(self):
+        ids = timestamps_to_aids(self.timestamps, noise=self.noise).tolist()
+        self.assertEqual(ids, [
+            AID.get_time_part(int(ms)) + encode_base36(int(noise), 2)
+            for ms, noise in zip(self.timestamps, self.noise)
+        ])
+        self.assertTrue(all(AID.is_valid(i) for i in ids))
+        self.assertEqual(aids_to_timestamps(ids).tolist(),
+                         [AID(i).time_ms for i in ids])
+        self.assertEqual(aids_to_timestamps(ids).tolist(),
+                         self.timestamps.tolist())
+
+    def test_upper_case(self):
+        ids = timestamps_to_aids(self.timestamps, noise=self.noise)
+        upper = [i.upper() for i in ids.tolist()]
+        self.assertEqual(aids_to_timestamps(upper).tolist(),
+                         [AID(i).time_ms for i in upper])
+
+    def test_datetime64(self):
+        times = self.timestamps.astype("datetime64[ms]")
+        self.assertEqual(timestamps_to_aids(times).tolist(),
+                         timestamps_to_aids(self.timestamps).tolist())
+
+    def test_epoch(self):
+        self.assertEqual(
+            timestamps_to_aids([TIME2000_MS]).tolist(), ["0000000000"])
+        self.assertEqual(AID.lower_bound(TIME2000_UTC).id, "0000000000")
+        # Times before 2000 are clamped to it, as by AID.generate
+        self.assertEqual(
+            timestamps_to_aids([TIME2000_MS - 1, 0]).tolist(),
+            ["0000000000", "0000000000"])
+        self.assertEqual(AID.get_time_part(0), "00000000")
+        self.assertEqual(aids_to_timestamps(["0000000000"]).tolist(),
+                         [TIME2000_MS])
+        self.assertEqual(AID("0000000000").to_date(), TIME2000_UTC)
+
+    def test_last_time(self):
+        last = TIME2000_MS + 36 ** 8 - 1
+        self.assertEqual(
+            timestamps_to_aids([last]).tolist(), ["zzzzzzzz00"])
+        self.assertEqual(aids_to_timestamps(["zzzzzzzzzz"]).tolist(),
+                         [last])
+        with self.assertRaises(ValueError):
+            timestamps_to_aids([last + 1])
+
+    def test_noise_rollover(self):
+        self.assertEqual(
+            timestamps_to_aids(
+                [TIME2000_MS] * 3, noise=[36 ** 2 - 1, 36 ** 2, 36 ** 2 + 1],
+            ).tolist(),
+            ["00000000zz", "0000000000", "0000000001"])
+
+        t = datetime.datetime(2000, 1, 1, tzinfo=datetime.timezone.utc)
+        counter = AID.aid_counter
+        self.addCleanup(setattr, AID, "aid_counter", counter)
+        AID.aid_counter = 36 ** 2 - 2
+        self.assertEqual(
+            [AID.generate(t=t).id for _ in range(3)],
+            ["00000000zz", "0000000000", "0000000001"])
+
+    def test_malformed(self):
+        for i in ("", "000000000", "0000000000a", "00000000-0", "あ" * 10):
+            with self.subTest(i=i):
+                self.assertFalse(AID.is_valid(i))
+        with self.assertRaises(ValueError):
+            aids_to_timestamps(["0000-00000"])
+
+    def test_over_long(self):
+        # Only the time part is decoded, as by AID.time_ms
+        self.assertEqual(aids_to_timestamps(["0000000100xyz"]).tolist(),
+                         [AID("0000000100xyz").time_ms])
+        with self.assertRaises(ValueError):
+            aids_to_timestamps(["0000001"])
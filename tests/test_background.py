@@ -0,0 +1,79 @@
+import asyncio
+import concurrent.futures
+import time
+import unittest
+
+from misskey.asynchronous.background import BackgroundMisskey
+from misskey.testing import MockFaults, MockMisskeyServer, MockState
+
+
+async def running_tasks():
+    current = asyncio.current_task()
+    return len([task for task in asyncio.all_tasks() if task is not current])
+
+
+class BackgroundMisskeyTest(unittest.TestCase):
+    def setUp(self):
+        self.state = MockState()
+        _, self.alice = self.state.create_user("alice")
+        _, self.bob = self.state.create_user("bob")
+        self.server = MockMisskeyServer(self.state, endpoint_faults={
+            "/api/i/notifications": MockFaults(latency=2.0),
+        }).start_in_thread()
+        self.addCleanup(self.server.stop)
+        self.mk = BackgroundMisskey(
+            address=self.server.address, token=self.alice)
+        self.addCleanup(self.mk.close)
+
+    def test_blocking(self):
+        self.assertEqual(self.mk.i().username, "alice")
+        note = self.mk.notes_create(text="Hello").created_note
+        self.assertEqual(self.mk.notes_show(note_id=note.id).text, "Hello")
+        self.assertEqual(self.mk.address, self.server.address)
+        self.assertEqual(self.mk.token, self.alice)
+
+    def test_futures(self):
+        notes = [self.mk.notes_create(text=str(n)).created_note
+                 for n in range(5)]
+        futures = [self.mk.futures.notes_show(note_id=note.id)
+                   for note in notes]
+        self.assertTrue(all(
+            isinstance(future, concurrent.futures.Future)
+            for future in futures))
+        self.assertEqual(
+            [future.result(5).text for future in futures],
+            [str(n) for n in range(5)])
+
+    def test_with_token(self):
+        bob = self.mk.with_token(self.bob)
+        self.assertEqual(bob.i().username, "bob")
+        self.assertEqual(bob.futures.i().result(5).username, "bob")
+        self.assertEqual(self.mk.i().username, "alice")
+        self.assertIs(bob.client.session, self.mk.client.session)
+        self.assertIs(bob.loop, self.mk.loop)
+
+        # Closing the handle leaves the client open
+        bob.close()
+        self.assertEqual(self.mk.i().username, "alice")
+
+    def test_close(self):
+        with BackgroundMisskey(
+                address=self.server.address, token=self.alice) as mk:
+            self.assertEqual(mk.i().username, "alice")
+            loop = mk.loop
+            session = mk.client.session
+        self.assertTrue(loop.is_closed())
+        self.assertTrue(session.closed)
+        # Closing twice does nothing
+        mk.close()
+
+    def test_timeout(self):
+        self.mk.timeout = 0.1
+        with self.assertRaises(concurrent.futures.TimeoutError):
+            self.mk.i_notifications()
+        # The request is cancelled instead of running on
+        deadline = time.monotonic() + 1.0
+        while self.mk.run(running_tasks()) > 0:
+            self.assertLess(time.monotonic(), deadline)
+            time.sleep(0.01)
+        self.assertEqual(self.mk.i().username, "alice")
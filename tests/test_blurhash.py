@@ -0,0 +1,148 @@
+import math
+import unittest
+
+import numpy as np
+
+from misskey.blurhash import (
+    BASE83_DIGITS,
+    DECODE_CACHE_SIZE,
+    _blurhash_decode_cached,
+    _decode_colors,
+    blurhash_decode,
+    blurhash_decode_many,
+    blurhash_encode,
+)
+
+BLURHASHES = (
+    # From the examples of the reference implementation
+    "LEHV6nWB2yk8pyo0adR*.7kCMdnj",
+    "LGF5]+Yk^6#M@-5c,1J5@[or[Q6.",
+    "L6PZfSi_.AyE_3t7t7R**0o#DgR4",
+    "LKN]Rv%2Tw=w]~RBVZRi};RPxuwH",
+    # A single component
+    "00TI:j",
+)
+
+
+def _decode83(value):
+    result = 0
+    for char in value:
+        result = result * 83 + BASE83_DIGITS.index(char)
+    return result
+
+
+def _srgb_to_linear(value):
+    v = value / 255
+    if v <= 0.04045:
+        return v / 12.92
+    return ((v + 0.055) / 1.055) ** 2.4
+
+
+def _linear_to_srgb(value):
+    v = max(0.0, min(1.0, value))
+    if v <= 0.0031308:
+        return int(v * 12.92 * 255 + 0.5)
+    return int((1.055 * v ** (1 / 2.4) - 0.055) * 255 + 0.5)
+
+
+def _sign_pow(value, exponent):
+    return math.copysign(abs(value) ** exponent, value)
+
+
+def reference_decode(blurhash, width, height, punch=1.0):
+    """
+    Decodes a BlurHash one pixel at a time, as the reference
+    implementation does. Returns rows of [r, g, b] lists.
+    """
+    size_flag = _decode83(blurhash[0])
+    components_x, components_y = size_flag % 9 + 1, size_flag // 9 + 1
+    max_value = (_decode83(blurhash[1]) + 1) / 166 * punch
+
+    dc = _decode83(blurhash[2:6])
+    colors = [[_srgb_to_linear(dc >> 16),
+               _srgb_to_linear((dc >> 8) & 255),
+               _srgb_to_linear(dc & 255)]]
+    for i in range(1, components_x * components_y):
+        ac = _decode83(blurhash[4 + i * 2:6 + i * 2])
+        colors.append([
+            _sign_pow((ac // (19 * 19) - 9) / 9, 2) * max_value,
+            _sign_pow((ac // 19 % 19 - 9) / 9, 2) * max_value,
+            _sign_pow((ac % 19 - 9) / 9, 2) * max_value,
+        ])
+
+    rows = []
+    for y in range(height):
+        row = []
+        for x in range(width):
+            r = g = b = 0.0
+            for j in range(components_y):
+                for i in range(components_x):
+                    basis = (math.cos(math.pi * x * i / width) *
+                             math.cos(math.pi * y * j / height))
+                    color = colors[i + j * components_x]
+                    r += color[0] * basis
+                    g += color[1] * basis
+                    b += color[2] * basis
+            row.append([
+                _linear_to_srgb(r), _linear_to_srgb(g), _linear_to_srgb(b)])
+        rows.append(row)
+    return rows
+
+
+def assert_pixels_close(test, actual, expected):
+    # Sums in another order may round a channel the other way
+    test.assertEqual(actual.shape, np.shape(expected))
+    test.assertTrue(np.allclose(actual, expected, rtol=0, atol=1))
+
+
+class BlurHashDecodeTest(unittest.TestCase):
+    def test_decode_matches_reference(self):
+        for blurhash in BLURHASHES:
+            for width, height, punch in ((32, 32, 1.0), (20, 7, 1.5)):
+                with self.subTest(blurhash=blurhash, width=width,
+                                  height=height, punch=punch):
+                    assert_pixels_close(
+                        self,
+                        blurhash_decode(blurhash, width, height, punch=punch),
+                        reference_decode(blurhash, width, height, punch))
+
+    def test_decode_many_matches_reference(self):
+        images = blurhash_decode_many(BLURHASHES, 16, 12)
+        self.assertEqual(images.dtype, np.uint8)
+        for image, blurhash in zip(images, BLURHASHES):
+            with self.subTest(blurhash=blurhash):
+                assert_pixels_close(
+                    self, image, reference_decode(blurhash, 16, 12))
+
+    def test_encoded_image_decodes_like_reference(self):
+        image = np.random.default_rng(0).integers(
+            0, 256, size=(24, 32, 3), dtype=np.uint8)
+        for components in ((1, 1), (5, 4), (9, 9)):
+            with self.subTest(components=components):
+                blurhash = blurhash_encode(image, *components)
+                self.assertEqual(
+                    len(blurhash), 4 + 2 * components[0] * components[1])
+                assert_pixels_close(
+                    self,
+                    blurhash_decode(blurhash, 32, 24),
+                    reference_decode(blurhash, 32, 24))
+
+    def test_cache(self):
+        _blurhash_decode_cached.cache_clear()
+        _decode_colors.cache_clear()
+        blurhash = BLURHASHES[0]
+        image = blurhash_decode(blurhash, 8, 8)
+        self.assertIs(blurhash_decode(blurhash, 8, 8), image)
+        self.assertFalse(image.flags.writeable)
+
+        # Other sizes reuse the decoded colors
+        for size in range(9, 9 + DECODE_CACHE_SIZE):
+            blurhash_decode(blurhash, size, size)
+        self.assertEqual(_decode_colors.cache_info().misses, 1)
+        self.assertEqual(
+            _blurhash_decode_cached.cache_info().currsize, DECODE_CACHE_SIZE)
+        self.assertIsNot(blurhash_decode(blurhash, 8, 8), image)
+
+    def test_invalid_length(self):
+        with self.assertRaises(ValueError):
+            blurhash_decode("LEHV6nWB2yk8pyo0adR*.7kCMdn", 8, 8)
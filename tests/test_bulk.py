@@ -0,0 +1,142 @@
+import os
+import tempfile
+import unittest
+
+import aiohttp
+
+from misskey import Misskey
+from misskey.asynchronous import AsyncMisskey
+from misskey.asynchronous.bulk import (
+    bulk_notes_create as async_bulk_notes_create,
+)
+from misskey.asynchronous.bulk_upload import (
+    bulk_upload as async_bulk_upload,
+)
+from misskey.bulk import NoteSpec, bulk_notes_create
+from misskey.bulk_upload import bulk_upload
+from misskey.exceptions import MisskeyAPIError
+from misskey.testing import MockMisskeyServer, MockState
+
+THREAD = [
+    NoteSpec({"text": "Thread"}, key="root"),
+    NoteSpec({"text": "1"}, key="first", reply_to="root"),
+    NoteSpec({"text": "2"}, key="second", reply_to="first"),
+    NoteSpec({}, key="renote", renote_of="root"),
+]
+
+
+def write_files(directory, files):
+    paths = []
+    for name, data in files.items():
+        path = os.path.join(directory, name)
+        with open(path, "wb") as f:
+            f.write(data)
+        paths.append(path)
+    return paths
+
+
+class BulkNotesCreateTest(unittest.TestCase):
+    def setUp(self):
+        self.state = MockState()
+        _, token = self.state.create_user("alice")
+        self.server = MockMisskeyServer(self.state).start_in_thread()
+        self.addCleanup(self.server.stop)
+        self.mk = Misskey(address=self.server.address, token=token)
+
+    def test_thread(self):
+        results = bulk_notes_create(self.mk, THREAD, max_workers=4)
+        self.assertTrue(all(result.ok for result in results))
+        self.assertEqual(
+            [result.key for result in results],
+            ["root", "first", "second", "renote"])
+        notes = {
+            result.key: self.state.notes[result.value.created_note.id]
+            for result in results
+        }
+        self.assertEqual(notes["first"]["replyId"], notes["root"]["id"])
+        self.assertEqual(notes["second"]["replyId"], notes["first"]["id"])
+        self.assertEqual(notes["renote"]["renoteId"], notes["root"]["id"])
+
+    def test_failed_parent(self):
+        self.server.fail_next("/api/notes/create", "NO_SUCH_NOTE", 400)
+        results = bulk_notes_create(
+            self.mk, THREAD[:3], max_workers=1, max_retries=0)
+        self.assertFalse(any(result.ok for result in results))
+        self.assertIsInstance(results[0].error, MisskeyAPIError)
+        self.assertEqual(self.state.notes, {})
+
+    def test_bulk_upload(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        paths = write_files(directory.name, {
+            "a.txt": b"same", "b.txt": b"same", "c.txt": b"other"})
+        missing = os.path.join(directory.name, "missing.txt")
+
+        result = bulk_upload(self.mk, paths + [missing])
+        self.assertFalse(result.ok)
+        self.assertEqual(list(result.errors), [missing])
+        self.assertEqual(result.files[paths[0]].id, result.files[paths[1]].id)
+        self.assertEqual(len(self.state.files), 2)
+
+        # Uploaded files are reused
+        result = bulk_upload(self.mk, paths)
+        self.assertTrue(result.ok)
+        self.assertEqual(len(self.state.files), 2)
+
+    def test_bulk_upload_without_reuse(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        paths = write_files(directory.name, {"a.txt": b"same"})
+        first = bulk_upload(self.mk, paths).files[paths[0]]
+
+        result = bulk_upload(self.mk, paths, reuse_existing=False)
+        self.assertTrue(result.ok)
+        self.assertNotEqual(result.files[paths[0]].id, first.id)
+        self.assertEqual(len(self.state.files), 2)
+
+
+class AsyncBulkNotesCreateTest(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.state = MockState()
+        _, token = self.state.create_user("alice")
+        self.server = await MockMisskeyServer(self.state).start()
+        self.addAsyncCleanup(self.server.close)
+        session = aiohttp.ClientSession()
+        self.addAsyncCleanup(session.close)
+        self.mk = AsyncMisskey(
+            address=self.server.address, token=token, session=session)
+
+    async def test_thread(self):
+        results = await async_bulk_notes_create(self.mk, THREAD)
+        self.assertTrue(all(result.ok for result in results))
+        root, first = (
+            self.state.notes[result.value.created_note.id]
+            for result in results[:2])
+        self.assertEqual(first["replyId"], root["id"])
+
+    async def test_failed_upload(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        paths = write_files(directory.name, {
+            "a.txt": b"same", "b.txt": b"same", "c.txt": b"other"})
+        self.server.fail_next("/api/drive/files/create")
+
+        result = await async_bulk_upload(self.mk, paths, concurrency=1)
+        self.assertFalse(result.ok)
+        self.assertEqual(len(result.files) + len(result.errors), 3)
+        # Files with the same contents fail together
+        self.assertEqual(
+            paths[0] in result.errors, paths[1] in result.errors)
+        self.assertEqual(len(self.state.files), 1)
+
+    async def test_upload_without_reuse(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        paths = write_files(directory.name, {"a.txt": b"same"})
+        first = (await async_bulk_upload(self.mk, paths)).files[paths[0]]
+
+        result = await async_bulk_upload(
+            self.mk, paths, reuse_existing=False)
+        self.assertTrue(result.ok)
+        self.assertNotEqual(result.files[paths[0]].id, first.id)
+        self.assertEqual(len(self.state.files), 2)
@@ -0,0 +1,186 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from misskey import Misskey
+from misskey.cache import PersistentCache
+from misskey.testing import MockMisskeyServer, MockState
+
+HOST = "https://misskey.example"
+
+
+class FakeClock(object):
+    def __init__(self):
+        self.now = 1000.0
+
+    def time(self):
+        return self.now
+
+    def advance(self, seconds):
+        self.now += seconds
+
+
+class PersistentCacheTest(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, "cache.sqlite3")
+        self.clock = FakeClock()
+        patcher = mock.patch("misskey.cache.time", self.clock)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def open(self, **kwargs):
+        cache = PersistentCache(self.path, **kwargs)
+        self.addCleanup(cache.close)
+        return cache
+
+    def put(self, cache, endpoint, body, token="token"):
+        key = cache.key(HOST, endpoint, {}, token)
+        cache.put(key, HOST, endpoint, body)
+        return key
+
+    def total_size(self, cache):
+        (size,) = cache._db.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()
+        self.assertEqual(cache._size(), size)
+        return size
+
+    def test_ttl(self):
+        cache = self.open(ttls={"/api/i": 10.0, "/api/meta": 100.0})
+        i = self.put(cache, "/api/i", {"id": "a"})
+        meta = self.put(cache, "/api/meta", {"name": "b"})
+        self.assertEqual(cache.get(i, HOST), {"id": "a"})
+        self.assertEqual(len(cache), 2)
+
+        self.clock.advance(10.0)
+        self.assertIsNone(cache.get(i, HOST))
+        self.assertEqual(cache.get(meta, HOST), {"name": "b"})
+        self.assertEqual(len(cache), 1)
+        self.assertEqual((cache.hits, cache.misses), (2, 1))
+
+        self.assertTrue(cache.caches("/api/i"))
+        self.assertFalse(cache.caches("/api/notes/create"))
+
+    def test_keys(self):
+        cache = self.open()
+        # Per account, except for shared endpoints
+        self.assertNotEqual(
+            cache.key(HOST, "/api/i", {}, "alice"),
+            cache.key(HOST, "/api/i", {}, "bob"))
+        self.assertEqual(
+            cache.key(HOST, "/api/meta", {}, "alice"),
+            cache.key(HOST, "/api/meta", {}, "bob"))
+        self.assertEqual(
+            cache.key(HOST, "/api/meta", {}, "alice"),
+            cache.key(HOST, "/api/meta", None, None))
+        self.assertNotEqual(
+            cache.key(HOST, "/api/meta", {}, None),
+            cache.key("https://other.example", "/api/meta", {}, None))
+        # The token in the parameters is left out, and only its hash kept
+        key = cache.key(HOST, "/api/users/show",
+                        {"userId": "x", "i": "secret"}, "secret")
+        self.assertNotIn("secret", key)
+        self.assertEqual(key, cache.key(
+            HOST, "/api/users/show", {"userId": "x"}, "secret"))
+        self.assertNotEqual(key, cache.key(
+            HOST, "/api/users/show", {"userId": "y"}, "secret"))
+
+    def test_version(self):
+        cache = self.open()
+        cache.set_version(HOST, "2024.5.0")
+        key = self.put(cache, "/api/i", {"id": "a"})
+        other = cache.key("https://other.example", "/api/i", {}, "token")
+        cache.put(other, "https://other.example", "/api/i", {"id": "b"})
+        self.assertEqual(cache.get(key, HOST), {"id": "a"})
+
+        # Seen by other clients of the same file
+        self.assertEqual(self.open().get(key, HOST), {"id": "a"})
+
+        cache.set_version(HOST, "2024.5.1")
+        self.assertIsNone(cache.get(key, HOST))
+        self.assertIsNone(self.open().get(key, HOST))
+        # Other hosts keep their entries
+        self.assertEqual(
+            cache.get(other, "https://other.example"), {"id": "b"})
+        self.assertGreater(self.total_size(cache), 0)
+
+    def test_size_eviction(self):
+        cache = self.open(ttls={"/api/i": 100.0}, max_size=100)
+        # Each body is 30 bytes
+        keys = []
+        for n in range(5):
+            keys.append(self.put(
+                cache, "/api/i", {"id": "x" * 21}, token=str(n)))
+            self.clock.advance(1.0)
+            self.assertLessEqual(self.total_size(cache), 100)
+        # The oldest are evicted first
+        self.assertEqual(
+            [cache.get(key, HOST) is not None for key in keys],
+            [False, False, True, True, True])
+
+        # Replacing an entry counts its new size only
+        self.put(cache, "/api/i", {"id": "y" * 21}, token="4")
+        self.assertEqual(self.total_size(cache), 90)
+        self.assertIsNotNone(cache.get(keys[2], HOST))
+
+        cache.invalidate(HOST, "/api/i")
+        self.assertEqual(self.total_size(cache), 0)
+
+    def test_expired_evicted_first(self):
+        cache = self.open(ttls={"/api/i": 100.0, "/api/meta": 1.0},
+                          max_size=70)
+        i = self.put(cache, "/api/i", {"id": "x" * 21})
+        self.clock.advance(1.0)
+        self.put(cache, "/api/meta", {"id": "y" * 21})
+        self.clock.advance(1.0)
+        # The expired meta is evicted instead of the older i
+        self.put(cache, "/api/i", {"id": "z" * 21}, token="other")
+        self.assertEqual(cache.get(i, HOST), {"id": "x" * 21})
+        self.assertEqual(self.total_size(cache), 60)
+
+    def test_schema_version(self):
+        cache = self.open()
+        key = self.put(cache, "/api/i", {"id": "a"})
+        cache._db.execute("PRAGMA user_version=0")
+        # Written by another version, so dropped
+        other = self.open()
+        self.assertIsNone(other.get(key, HOST))
+        self.assertEqual(self.total_size(other), 0)
+
+
+class CachedClientTest(unittest.TestCase):
+    def setUp(self):
+        self.state = MockState()
+        _, self.alice = self.state.create_user("alice")
+        _, self.bob = self.state.create_user("bob")
+        self.server = MockMisskeyServer(self.state).start_in_thread()
+        self.addCleanup(self.server.stop)
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.cache = PersistentCache(
+            os.path.join(directory.name, "cache.sqlite3"))
+        self.addCleanup(self.cache.close)
+        self.mk = Misskey(
+            address=self.server.address, token=self.alice, cache=self.cache)
+
+    def test_accounts(self):
+        bob = self.mk.with_token(self.bob)
+        for _ in range(2):
+            self.mk.meta()
+            bob.meta()
+            self.assertEqual(self.mk.i().username, "alice")
+            self.assertEqual(bob.i().username, "bob")
+        self.assertEqual(self.server.requests["/api/i"], 2)
+        self.assertEqual(self.server.requests["/api/meta"], 1)
+
+    def test_version_change(self):
+        self.mk.meta()
+        self.mk.i()
+        self.state.meta["version"] = "2024.5.1"
+        self.cache.invalidate(endpoint="/api/meta")
+        self.assertEqual(self.mk.meta().version, "2024.5.1")
+        # The entries of the old version are gone
+        self.mk.i()
+        self.assertEqual(self.server.requests["/api/i"], 2)
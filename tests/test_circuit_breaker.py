@@ -0,0 +1,139 @@
+import unittest
+from unittest import mock
+
+import aiohttp
+
+from misskey.asynchronous import AsyncMisskey
+from misskey.circuit_breaker import CircuitBreaker
+from misskey.enum import CircuitStateEnum
+from misskey.exceptions import (
+    MisskeyAPIError,
+    MisskeyCircuitOpenError,
+    MisskeyNetworkError,
+)
+from misskey.testing import MockFaults, MockMisskeyServer, MockState
+
+ENDPOINT = "/api/notes/create"
+
+
+class FakeClock(object):
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+    def advance(self, seconds: float) -> None:
+        self.now += seconds
+
+
+def api_error(code):
+    return MisskeyAPIError(id="0", code=code, message="")
+
+
+class CircuitBreakerTest(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        patcher = mock.patch("misskey.circuit_breaker.time", self.clock)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.breaker = CircuitBreaker(
+            window_size=4, min_requests=2, error_rate=0.5,
+            slow_call_duration=1.0, open_timeout=30.0)
+
+    def call(self, error=None, duration=0.0):
+        with self.breaker.guard(ENDPOINT):
+            self.clock.advance(duration)
+            if error is not None:
+                raise error
+
+    def fail(self, error=None):
+        with self.assertRaises(Exception):
+            self.call(error or MisskeyNetworkError("Connection refused"))
+
+    def state(self):
+        return self.breaker.health(ENDPOINT).state
+
+    def open_circuit(self):
+        self.call()
+        self.fail()
+        self.assertEqual(self.state(), CircuitStateEnum.OPEN)
+
+    def test_opens_on_errors(self):
+        self.fail()
+        # Fewer than min_requests outcomes are known
+        self.assertEqual(self.state(), CircuitStateEnum.CLOSED)
+        self.call()
+        self.assertEqual(self.state(), CircuitStateEnum.OPEN)
+
+        self.clock.advance(10)
+        with self.assertRaises(MisskeyCircuitOpenError) as cm:
+            self.call()
+        self.assertEqual(cm.exception.retry_after, 20)
+        self.assertEqual(self.breaker.health(ENDPOINT).rejected, 1)
+
+    def test_half_open_probe_closes(self):
+        self.open_circuit()
+        self.clock.advance(30)
+        self.assertTrue(self.breaker.is_available(ENDPOINT))
+
+        with self.breaker.guard(ENDPOINT):
+            self.assertEqual(self.state(), CircuitStateEnum.HALF_OPEN)
+            # Only half_open_probes requests are let through at once
+            with self.assertRaises(MisskeyCircuitOpenError):
+                self.breaker.check(ENDPOINT)
+        self.assertEqual(self.state(), CircuitStateEnum.CLOSED)
+        self.call()
+
+    def test_half_open_probe_opens_again(self):
+        self.open_circuit()
+        self.clock.advance(30)
+        self.fail()
+        self.assertEqual(self.state(), CircuitStateEnum.OPEN)
+        self.assertEqual(self.breaker.health(ENDPOINT).retry_after, 30)
+
+    def test_timeouts_and_slow_calls(self):
+        self.fail(TimeoutError())
+        self.fail(TimeoutError())
+        self.assertEqual(self.state(), CircuitStateEnum.OPEN)
+
+        self.breaker.reset(ENDPOINT)
+        self.call(duration=2.0)
+        self.call(duration=2.0)
+        self.assertEqual(self.state(), CircuitStateEnum.OPEN)
+
+    def test_api_errors(self):
+        # The server answered, so the endpoint is healthy
+        for _ in range(4):
+            self.fail(api_error("NO_SUCH_NOTE"))
+        self.assertEqual(self.state(), CircuitStateEnum.CLOSED)
+        self.fail(api_error("INTERNAL_ERROR"))
+        self.fail(api_error("INTERNAL_ERROR"))
+        self.assertEqual(self.state(), CircuitStateEnum.OPEN)
+
+
+class AsyncCircuitBreakerTest(unittest.IsolatedAsyncioTestCase):
+    async def test_timeout_opens_circuit(self):
+        state = MockState()
+        _, token = state.create_user("alice")
+        server = MockMisskeyServer(state, endpoint_faults={
+            "/api/i": MockFaults(latency=1.0),
+        })
+        await server.start()
+        self.addAsyncCleanup(server.close)
+        session = aiohttp.ClientSession(
+            timeout=aiohttp.ClientTimeout(total=0.1))
+        self.addAsyncCleanup(session.close)
+        breaker = CircuitBreaker(window_size=1, min_requests=1)
+        mk = AsyncMisskey(address=server.address, token=token,
+                          session=session, circuit_breaker=breaker)
+
+        with self.assertRaises(MisskeyNetworkError):
+            await mk.i()
+        self.assertEqual(
+            breaker.health("/api/i").state, CircuitStateEnum.OPEN)
+        with self.assertRaises(MisskeyCircuitOpenError):
+            await mk.i()
+        self.assertEqual(server.requests["/api/i"], 1)
+        # Other endpoints have circuits of their own
+        await mk.meta()
@@ -0,0 +1,96 @@
+import unittest
+
+import aiohttp
+
+from misskey import Misskey
+from misskey.asynchronous import AsyncMisskey
+from misskey.exceptions import MisskeyAPIError
+from misskey.testing import MockMisskeyServer, MockState
+
+
+class MisskeyTest(unittest.TestCase):
+    def setUp(self):
+        self.state = MockState()
+        self.alice, alice_token = self.state.create_user("alice")
+        self.bob, bob_token = self.state.create_user("bob")
+        self.server = MockMisskeyServer(self.state).start_in_thread()
+        self.addCleanup(self.server.stop)
+        self.mk = Misskey(address=self.server.address, token=alice_token)
+        self.bob_mk = Misskey(address=self.server.address, token=bob_token)
+
+    def test_i(self):
+        me = self.mk.i()
+        self.assertEqual(me.id, self.alice["id"])
+        self.assertEqual(me.username, "alice")
+
+    def test_notes(self):
+        note = self.mk.notes_create(text="Hello").created_note
+        reply = self.bob_mk.notes_create(
+            text="Hi", reply_id=note.id).created_note
+        self.assertEqual(self.mk.notes_show(note_id=reply.id).reply.id,
+                         note.id)
+        self.assertEqual(self.mk.notes_show(note_id=note.id).replies_count,
+                         1)
+
+        self.mk.notes_delete(note_id=note.id)
+        with self.assertRaises(MisskeyAPIError) as cm:
+            self.mk.notes_show(note_id=note.id)
+        self.assertEqual(cm.exception.code, "NO_SUCH_NOTE")
+
+    def test_drive_files(self):
+        drive_file = self.mk.drive_files_create(
+            file=b"Hello, world", name="hello.txt")
+        self.assertEqual(drive_file.name, "hello.txt")
+        self.assertEqual(drive_file.size, 12)
+        found = self.mk.drive_files_find_by_hash(md5=drive_file.md5)
+        self.assertEqual([f.id for f in found], [drive_file.id])
+
+    def test_api_error(self):
+        self.server.fail_next("/api/i", "RATE_LIMIT_EXCEEDED", 429)
+        with self.assertRaises(MisskeyAPIError) as cm:
+            self.mk.i()
+        self.assertEqual(cm.exception.code, "RATE_LIMIT_EXCEEDED")
+        self.assertEqual(self.mk.i().username, "alice")
+        self.assertEqual(self.server.requests["/api/i"], 2)
+
+    def test_invalid_token(self):
+        mk = Misskey(address=self.server.address, token="invalid")
+        with self.assertRaises(MisskeyAPIError) as cm:
+            mk.i()
+        self.assertEqual(cm.exception.code, "AUTHENTICATION_FAILED")
+
+
+class AsyncMisskeyTest(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.state = MockState()
+        self.alice, token = self.state.create_user("alice")
+        self.server = await MockMisskeyServer(self.state).start()
+        self.addAsyncCleanup(self.server.close)
+        session = aiohttp.ClientSession()
+        self.addAsyncCleanup(session.close)
+        self.mk = AsyncMisskey(
+            address=self.server.address, token=token, session=session)
+
+    async def test_i(self):
+        me = await self.mk.i()
+        self.assertEqual(me.id, self.alice["id"])
+
+    async def test_notes(self):
+        note = (await self.mk.notes_create(text="Hello")).created_note
+        shown = await self.mk.notes_show(note_id=note.id)
+        self.assertEqual(shown.text, "Hello")
+        timeline = await self.mk.notes_local_timeline()
+        self.assertEqual([n.id for n in timeline], [note.id])
+
+    async def test_drive_files(self):
+        drive_file = await self.mk.drive_files_create(
+            file=b"Hello, world", name="hello.txt")
+        self.assertEqual(drive_file.size, 12)
+        self.assertIn(drive_file.id, self.state.files)
+
+    async def test_api_error(self):
+        self.server.fail_next("/api/notes/create")
+        with self.assertRaises(MisskeyAPIError) as cm:
+            await self.mk.notes_create(text="Hello")
+        self.assertEqual(cm.exception.code, "INTERNAL_ERROR")
+        self.assertEqual(self.state.notes, {})
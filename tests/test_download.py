@@ -0,0 +1,100 @@
+import os
+import tempfile
+import unittest
+
+import aiohttp
+
+from misskey import Misskey
+from misskey.asynchronous import AsyncMisskey
+from misskey.asynchronous.download import (
+    download_drive_files as async_download_drive_files,
+)
+from misskey.download import download_drive_files
+from misskey.exceptions import MisskeyNetworkError, MisskeyResponseError
+from misskey.testing import MockMisskeyServer, MockState
+
+CONTENTS = {
+    "good.txt": b"Hello, world",
+    "corrupt.txt": b"Hello, drive",
+    "missing.txt": b"Hello, files",
+}
+
+
+def break_files(state, drive_files):
+    # Same size, other contents, so only the MD5 check catches it
+    state.file_data[drive_files["corrupt.txt"].id] = b"Hello, WORLD"
+    del state.file_data[drive_files["missing.txt"].id]
+
+
+class DownloadTest(unittest.TestCase):
+    def setUp(self):
+        self.state = MockState()
+        _, token = self.state.create_user("alice")
+        self.server = MockMisskeyServer(self.state).start_in_thread()
+        self.addCleanup(self.server.stop)
+        self.mk = Misskey(address=self.server.address, token=token)
+        self.drive_files = {
+            name: self.mk.drive_files_create(file=data, name=name)
+            for name, data in CONTENTS.items()
+        }
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+
+    def test_download(self):
+        result = download_drive_files(
+            self.mk, self.drive_files.values(), self.directory)
+        self.assertTrue(result.ok, result.errors)
+        for name, drive_file in self.drive_files.items():
+            with open(result.paths[drive_file.id], "rb") as f:
+                self.assertEqual(f.read(), CONTENTS[name])
+
+    def test_partial_failure(self):
+        break_files(self.state, self.drive_files)
+        result = download_drive_files(
+            self.mk, self.drive_files.values(), self.directory,
+            max_workers=1)
+        self.assertFalse(result.ok)
+
+        good = self.drive_files["good.txt"].id
+        self.assertEqual(list(result.paths), [good])
+        self.assertTrue(os.path.exists(result.paths[good]))
+        self.assertIsInstance(
+            result.errors[self.drive_files["corrupt.txt"].id],
+            MisskeyResponseError)
+        self.assertIsInstance(
+            result.errors[self.drive_files["missing.txt"].id],
+            MisskeyNetworkError)
+        # Neither a broken file nor its part is left behind
+        self.assertEqual(
+            os.listdir(self.directory), [os.path.basename(result.paths[good])])
+
+
+class AsyncDownloadTest(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.state = MockState()
+        _, token = self.state.create_user("alice")
+        self.server = await MockMisskeyServer(self.state).start()
+        self.addAsyncCleanup(self.server.close)
+        session = aiohttp.ClientSession()
+        self.addAsyncCleanup(session.close)
+        self.mk = AsyncMisskey(
+            address=self.server.address, token=token, session=session)
+
+    async def test_partial_failure(self):
+        drive_files = {
+            name: await self.mk.drive_files_create(file=data, name=name)
+            for name, data in CONTENTS.items()
+        }
+        break_files(self.state, drive_files)
+        with tempfile.TemporaryDirectory() as directory:
+            result = await async_download_drive_files(
+                self.mk, drive_files.values(), directory)
+            self.assertFalse(result.ok)
+            good = drive_files["good.txt"].id
+            with open(result.paths[good], "rb") as f:
+                self.assertEqual(f.read(), CONTENTS["good.txt"])
+            self.assertEqual(
+                set(result.errors),
+                {drive_files["corrupt.txt"].id,
+                 drive_files["missing.txt"].id})
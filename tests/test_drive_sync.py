@@ -0,0 +1,99 @@
+import os
+import tempfile
+import unittest
+
+from misskey import Misskey
+from misskey.drive_sync import DriveSync
+from misskey.enum import DriveSyncActionEnum, DriveSyncDirectionEnum
+from misskey.testing import MockMisskeyServer, MockState
+
+FILES = {
+    "a/x.txt": b"same",
+    # The same contents in another folder, which the server deduplicates
+    # unless forced
+    "b/x.txt": b"same",
+    "c.txt": b"other",
+}
+
+
+def write_tree(root, files):
+    for path, data in files.items():
+        local_path = os.path.join(root, *path.split("/"))
+        os.makedirs(os.path.dirname(local_path), exist_ok=True)
+        with open(local_path, "wb") as f:
+            f.write(data)
+
+
+def read_tree(root):
+    files = {}
+    for directory, _, names in os.walk(root):
+        for name in names:
+            if name.startswith("."):
+                continue
+            local_path = os.path.join(directory, name)
+            path = os.path.relpath(local_path, root).replace(os.sep, "/")
+            with open(local_path, "rb") as f:
+                files[path] = f.read()
+    return files
+
+
+class DriveSyncTest(unittest.TestCase):
+    def setUp(self):
+        self.state = MockState()
+        _, token = self.state.create_user("alice")
+        self.server = MockMisskeyServer(self.state).start_in_thread()
+        self.addCleanup(self.server.stop)
+        self.mk = Misskey(address=self.server.address, token=token)
+
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.local_dir = directory.name
+
+    def drive_paths(self):
+        paths = []
+        for drive_file in self.state.files.values():
+            folder_id, parts = drive_file["folderId"], [drive_file["name"]]
+            while folder_id is not None:
+                folder = self.state.folders[folder_id]
+                parts.insert(0, folder["name"])
+                folder_id = folder["parentId"]
+            paths.append("/".join(parts))
+        return sorted(paths)
+
+    def test_push(self):
+        write_tree(self.local_dir, FILES)
+        sync = DriveSync(self.mk, self.local_dir)
+        self.assertEqual(len(sync.sync(dry_run=True).actions), 3)
+        self.assertEqual(self.state.files, {})
+
+        result = DriveSync(self.mk, self.local_dir).sync()
+        self.assertTrue(result.ok, result.errors)
+        self.assertEqual(self.drive_paths(), sorted(FILES))
+        self.assertEqual(DriveSync(self.mk, self.local_dir).plan(), [])
+
+    def test_push_changes(self):
+        write_tree(self.local_dir, FILES)
+        DriveSync(self.mk, self.local_dir).sync()
+
+        write_tree(self.local_dir, {"c.txt": b"changed"})
+        os.remove(os.path.join(self.local_dir, "a", "x.txt"))
+        result = DriveSync(self.mk, self.local_dir).sync()
+        self.assertTrue(result.ok, result.errors)
+        self.assertEqual(
+            sorted((action.path, action.action) for action in result.actions),
+            [("a/x.txt", DriveSyncActionEnum.DELETE_REMOTE),
+             ("c.txt", DriveSyncActionEnum.UPLOAD)],
+        )
+        self.assertEqual(self.drive_paths(), ["b/x.txt", "c.txt"])
+        self.assertEqual(DriveSync(self.mk, self.local_dir).plan(), [])
+
+    def test_pull(self):
+        write_tree(self.local_dir, FILES)
+        DriveSync(self.mk, self.local_dir).sync()
+
+        with tempfile.TemporaryDirectory() as pull_dir:
+            sync = DriveSync(
+                self.mk, pull_dir, direction=DriveSyncDirectionEnum.PULL)
+            result = sync.sync()
+            self.assertTrue(result.ok, result.errors)
+            self.assertEqual(read_tree(pull_dir), FILES)
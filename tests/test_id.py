@@ -0,0 +1,136 @@
+import datetime
+import unittest
+
+from misskey.id import (
+    AID,
+    AIDX,
+    ID_SCHEMES,
+    MEID,
+    MEIDG,
+    ULID,
+    ObjectID,
+    detect_id_type,
+    parse_id,
+)
+from misskey.id.base import datetime_to_ms, ms_to_datetime
+
+# 2024-01-02T03:04:05.678Z
+TIME = datetime.datetime(
+    2024, 1, 2, 3, 4, 5, 678000, tzinfo=datetime.timezone.utc)
+TIME_MS = 1704164645678
+
+# (scheme, ID generated at TIME, its time in milliseconds)
+IDS = (
+    ("aid", AID, "9nzbxxke4l", TIME_MS),
+    ("aidx", AIDX, "9nzbxxkelwej0001", TIME_MS),
+    ("meid", MEID, "818cc820db2e33ea7721c5e1", TIME_MS),
+    ("meidg", MEIDG, "g18cc820db2e15b5eabeac92", TIME_MS),
+    # Only whole seconds
+    ("objectid", ObjectID, "65937d25519777893164307a", TIME_MS // 1000 * 1000),
+    ("ulid", ULID, "01HK421PSEF3DZ3T2XNVV4QQD4", TIME_MS),
+    # The example of the ULID specification
+    ("ulid", ULID, "01ARZ3NDEKTSV4RRFFQ69G5FAV", 1469922850259),
+)
+
+
+class IDSchemeTest(unittest.TestCase):
+    def test_detect(self):
+        for scheme, id_type, i, _ in IDS:
+            with self.subTest(i=i):
+                self.assertIs(detect_id_type(i), id_type)
+                self.assertIs(ID_SCHEMES[scheme], id_type)
+                self.assertEqual(parse_id(i), id_type(i))
+                self.assertEqual(parse_id(i, scheme=scheme), id_type(i))
+
+    def test_time(self):
+        for _, id_type, i, ms in IDS:
+            with self.subTest(i=i):
+                self.assertEqual(id_type(i).time_ms, ms)
+                self.assertEqual(id_type(i).to_date(), ms_to_datetime(ms))
+
+    def test_case_insensitive(self):
+        for _, id_type, i, _ in IDS:
+            with self.subTest(i=i):
+                self.assertEqual(parse_id(i.swapcase()), id_type(i))
+                self.assertEqual(str(id_type(i.swapcase())), i)
+
+    def test_bounds(self):
+        for _, id_type, i, ms in IDS[:-1]:
+            with self.subTest(id_type=id_type.__name__):
+                lower = id_type.lower_bound(TIME)
+                upper = id_type.upper_bound(TIME)
+                self.assertTrue(lower <= id_type(i) <= upper)
+                self.assertEqual(lower.time_ms, ms)
+                self.assertEqual(upper.time_ms, ms)
+                self.assertTrue(id_type.is_valid(str(lower)))
+                self.assertTrue(id_type.is_valid(str(upper)))
+
+                # Adjacent units of time do not overlap
+                resolution = datetime.timedelta(
+                    milliseconds=id_type.TIME_RESOLUTION_MS)
+                self.assertLess(id_type.upper_bound(TIME - resolution), lower)
+                self.assertLess(upper, id_type.lower_bound(TIME + resolution))
+
+    def test_bounds_before_epoch(self):
+        # Times before the epoch of the scheme are clamped to it
+        t = datetime.datetime(1990, 1, 1, tzinfo=datetime.timezone.utc)
+        self.assertEqual(str(AID.lower_bound(t)), "0000000000")
+        self.assertEqual(AID.upper_bound(t), AID.upper_bound(
+            datetime.datetime(2000, 1, 1, tzinfo=datetime.timezone.utc)))
+
+    def test_ordering(self):
+        times = [TIME + datetime.timedelta(seconds=s) for s in (0, 1, 2, 3)]
+        for id_type in ID_SCHEMES.values():
+            with self.subTest(id_type=id_type.__name__):
+                ids = [id_type.generate(t=t) for t in reversed(times)]
+                self.assertEqual(
+                    [i.time_ms // 1000 for i in sorted(ids)],
+                    [datetime_to_ms(t) // 1000 for t in times])
+                self.assertEqual(sorted(ids), sorted(ids, key=str))
+
+    def test_different_schemes(self):
+        meid = MEID("818cc820db2e33ea7721c5e1")
+        objectid = ObjectID("818cc820db2e33ea7721c5e1")
+        self.assertNotEqual(meid, objectid)
+        self.assertEqual(len({meid, objectid, MEID(str(meid))}), 2)
+        with self.assertRaises(TypeError):
+            meid < objectid
+
+    def test_ambiguous(self):
+        # 24 hex characters are meid when the time bit is set, and
+        # objectid otherwise
+        for i, id_type in (
+            ("818cc820db2e33ea7721c5e1", MEID),
+            ("F18cc820db2e33ea7721c5e1", MEID),
+            ("718cc820db2e33ea7721c5e1", ObjectID),
+            ("018cc820db2e33ea7721c5e1", ObjectID),
+            ("g18cc820db2e33ea7721c5e1", MEIDG),
+            # Base36 of the length of an AID or AIDX
+            ("0123456789", AID),
+            ("0123456789abcdef", AIDX),
+        ):
+            with self.subTest(i=i):
+                self.assertIs(detect_id_type(i), id_type)
+        # The scheme decides when it is known
+        self.assertIsInstance(
+            parse_id("018cc820db2e33ea7721c5e1", scheme="meid"), MEID)
+
+    def test_invalid(self):
+        for i in (
+            "",
+            "9nzbxxke4",
+            "9nzbxxke4l0",
+            "9nzbxxke-l",
+            # Out of the range of ULID, and not hex either
+            "81HK421PSEF3DZ3T2XNVV4QQD4",
+            "01HK421PSEF3DZ3T2XNVV4QQDU",
+            "g18cc820db2e33ea7721c5eg",
+            "x18cc820db2e33ea7721c5e1",
+        ):
+            with self.subTest(i=i):
+                with self.assertRaises(ValueError):
+                    detect_id_type(i)
+        with self.assertRaises(ValueError):
+            parse_id("9nzbxxke4l", scheme="meid")
+        with self.assertRaises(ValueError):
+            parse_id("9nzbxxke4l", scheme="snowflake")
@@ -0,0 +1,170 @@
+import datetime
+import os
+import threading
+import unittest
+
+from misskey.id import AID, AIDX
+from misskey.id.generator import AIDGenerator, AIDXGenerator
+
+# 2024-01-02T03:04:05.678Z
+TIME = datetime.datetime(
+    2024, 1, 2, 3, 4, 5, 678000, tzinfo=datetime.timezone.utc)
+
+
+def noise(i, length):
+    return int(str(i)[-length:], 36)
+
+
+class AIDGeneratorTest(unittest.TestCase):
+    def test_threads(self):
+        for generator in (AIDGenerator(), AIDXGenerator()):
+            with self.subTest(id_type=generator.id_type.__name__):
+                results = []
+
+                def run():
+                    ids = []
+                    for _ in range(200):
+                        ids.append(str(generator.generate()))
+                        ids.extend(generator.generate_many(10).tolist())
+                    results.append(ids)
+
+                threads = [threading.Thread(target=run) for _ in range(8)]
+                for thread in threads:
+                    thread.start()
+                for thread in threads:
+                    thread.join()
+
+                for ids in results:
+                    # Strictly increasing within each thread
+                    self.assertTrue(all(a < b for a, b in zip(ids, ids[1:])))
+                    self.assertTrue(all(generator.id_type.is_valid(i)
+                                        for i in ids))
+                ids = [i for ids in results for i in ids]
+                self.assertEqual(len(set(ids)), 8 * 200 * 11)
+
+    def test_same_time(self):
+        # Borrows the next milliseconds when the noise is exhausted
+        generator = AIDGenerator()
+        ids = [generator.generate(t=TIME) for _ in range(generator.capacity)]
+        self.assertEqual({i.time_ms for i in ids}, {ids[0].time_ms})
+        borrowed = generator.generate(t=TIME)
+        self.assertEqual(borrowed.time_ms, ids[0].time_ms + 1)
+        ids.append(borrowed)
+        self.assertTrue(all(a < b for a, b in zip(ids, ids[1:])))
+
+    def test_clock_backwards(self):
+        generator = AIDGenerator()
+        later = generator.generate(t=TIME + datetime.timedelta(seconds=1))
+        earlier = generator.generate(t=TIME)
+        self.assertLess(later, earlier)
+        self.assertEqual(earlier.time_ms, later.time_ms)
+
+    def test_generate_many(self):
+        generator = AIDGenerator()
+        ids = generator.generate_many(2000, t=TIME).tolist()
+        self.assertEqual(ids, sorted(set(ids)))
+        self.assertEqual(ids[0], str(AIDGenerator().generate(t=TIME)))
+        # Continues where the batch ended
+        self.assertLess(ids[-1], str(generator.generate(t=TIME)))
+        self.assertEqual(generator.generate_many(0).tolist(), [])
+        with self.assertRaises(ValueError):
+            generator.generate_many(-1)
+
+    def test_generate_many_matches_generate(self):
+        for many, one in (
+            (AIDGenerator(worker_id=1, worker_count=3),
+             AIDGenerator(worker_id=1, worker_count=3)),
+            # Many workers make for a small capacity
+            (AIDXGenerator(node_id="abcd", worker_count=10000),
+             AIDXGenerator(node_id="abcd", worker_count=10000)),
+        ):
+            with self.subTest(id_type=many.id_type.__name__):
+                n = many.capacity + 5
+                self.assertEqual(
+                    many.generate_many(n, t=TIME).tolist(),
+                    [str(one.generate(t=TIME)) for _ in range(n)])
+
+    def test_workers(self):
+        for generator_type in (AIDGenerator, AIDXGenerator):
+            with self.subTest(id_type=generator_type.id_type.__name__):
+                workers = [
+                    generator_type(
+                        worker_id=w, worker_count=5, node_id="abcd")
+                    if generator_type is AIDXGenerator else
+                    generator_type(worker_id=w, worker_count=5)
+                    for w in range(5)
+                ]
+                seen = set()
+                for w, generator in enumerate(workers):
+                    ids = set(generator.generate_many(
+                        1000, t=TIME).tolist())
+                    self.assertTrue(seen.isdisjoint(ids))
+                    self.assertEqual({noise(i, generator.noise_length) % 5
+                                      for i in ids}, {w})
+                    seen |= ids
+
+    def test_capacity(self):
+        self.assertEqual(AIDGenerator().capacity, 36 ** 2)
+        self.assertEqual(
+            sum(AIDGenerator(worker_id=w, worker_count=7).capacity
+                for w in range(7)),
+            36 ** 2)
+
+    def test_invalid(self):
+        for kwargs in (
+            {"worker_count": 0},
+            {"worker_id": -1},
+            {"worker_id": 2, "worker_count": 2},
+            {"worker_count": 36 ** 2 + 1},
+        ):
+            with self.subTest(kwargs=kwargs):
+                with self.assertRaises(ValueError):
+                    AIDGenerator(**kwargs)
+        for node_id in ("abc", "abcde", "ab-d", "あいうえ"):
+            with self.subTest(node_id=node_id):
+                with self.assertRaises(ValueError):
+                    AIDXGenerator(node_id=node_id)
+        self.assertEqual(AIDXGenerator(node_id="ABCD").node_id, "abcd")
+        self.assertEqual(AIDXGenerator().node_id, AIDX.node_id)
+        self.assertIsInstance(AIDGenerator().generate(), AID)
+
+
+@unittest.skipUnless(hasattr(os, "fork"), "needs os.fork")
+class AIDGeneratorForkTest(unittest.TestCase):
+    def fork(self, child):
+        # Runs child() in a forked process and returns what it wrote
+        read_fd, write_fd = os.pipe()
+        pid = os.fork()
+        if pid == 0:
+            try:
+                os.close(read_fd)
+                os.write(write_fd, child().encode())
+            finally:
+                os._exit(0)
+        os.close(write_fd)
+        with os.fdopen(read_fd) as f:
+            output = f.read()
+        os.waitpid(pid, 0)
+        return output
+
+    def test_reseed(self):
+        random_node = AIDXGenerator()
+        fixed_node = AIDXGenerator(node_id="abcd")
+        output = self.fork(lambda: " ".join((
+            random_node.node_id,
+            str(random_node.generate(t=TIME)),
+            str(fixed_node.generate(t=TIME)),
+        )))
+        node_id, random_id, fixed_id = output.split()
+        self.assertNotEqual(node_id, random_node.node_id)
+        self.assertNotEqual(random_id, str(random_node.generate(t=TIME)))
+        self.assertEqual(node_id, random_id[8:12])
+        # An explicit node ID is kept
+        self.assertEqual(fixed_id, str(fixed_node.generate(t=TIME)))
+
+    def test_lock_held_at_fork(self):
+        generator = AIDGenerator()
+        with generator._lock:
+            # Would deadlock in the child if the lock were not reset
+            output = self.fork(lambda: str(generator.generate(t=TIME)))
+        self.assertTrue(AID.is_valid(output))
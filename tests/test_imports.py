@@ -0,0 +1,60 @@
+import json
+import os
+import subprocess
+import sys
+import unittest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Modules which only the optional features of the client need
+OPTIONAL_MODULES = (
+    "gzip",
+    "sqlite3",
+    "misskey.cache",
+    "misskey.circuit_breaker",
+    "misskey.scheduler",
+    "misskey.transport",
+    "misskey.ratelimit",
+)
+
+# Heavy dependencies, only needed once a client or a helper is used
+HEAVY_PACKAGES = (
+    "numpy",
+    "marshmallow",
+    "requests",
+    "aiohttp",
+)
+
+
+def loaded_modules(statement: str) -> set:
+    # A fresh interpreter, as this one has imported everything already
+    code = (f"import json, sys\n{statement}\n"
+            "print(json.dumps(list(sys.modules)))")
+    output = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=ROOT,
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+    return set(json.loads(output))
+
+
+class ImportTest(unittest.TestCase):
+    def test_import_misskey_is_lazy(self):
+        modules = loaded_modules("import misskey")
+        self.assertNotIn("misskey.misskey", modules)
+        self.assertNotIn("marshmallow", modules)
+
+    def test_skips_heavy_packages(self):
+        for statement in ("import misskey", "import misskey.id"):
+            modules = loaded_modules(statement)
+            for name in HEAVY_PACKAGES:
+                with self.subTest(statement=statement, name=name):
+                    self.assertNotIn(name, modules)
+
+    def test_client_skips_optional_modules(self):
+        modules = loaded_modules("from misskey import Misskey")
+        for name in OPTIONAL_MODULES:
+            with self.subTest(name=name):
+                self.assertNotIn(name, modules)
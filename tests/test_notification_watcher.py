@@ -0,0 +1,103 @@
+import os
+import tempfile
+import unittest
+
+import aiohttp
+
+from misskey import Misskey
+from misskey.asynchronous import AsyncMisskey
+from misskey.asynchronous.notification_watcher import (
+    AsyncNotificationWatcher,
+)
+from misskey.enum import NotificationTypeEnum
+from misskey.notification_watcher import NotificationWatcher
+from misskey.testing import MockMisskeyServer, MockState
+
+
+class NotificationWatcherTest(unittest.TestCase):
+    def setUp(self):
+        self.state = MockState()
+        self.alice, token = self.state.create_user("alice")
+        self.bob, _ = self.state.create_user("bob")
+        self.server = MockMisskeyServer(self.state).start_in_thread()
+        self.addCleanup(self.server.stop)
+        self.mk = Misskey(address=self.server.address, token=token)
+
+    def notify(self, count, type="follow"):
+        return [
+            self.state.notify(self.alice["id"], type, user_id=self.bob["id"])
+            for _ in range(count)
+        ]
+
+    def watch(self, watcher, count):
+        received = []
+        for notification in watcher:
+            received.append(notification)
+            if len(received) == count:
+                watcher.stop()
+        return received
+
+    def test_pages_since_id(self):
+        notifications = self.notify(25)
+        watcher = NotificationWatcher(
+            self.mk, since_id=notifications[4]["id"], limit=10,
+            min_interval=0.01, mark_batch_size=10)
+        received = self.watch(watcher, 20)
+        self.assertEqual(
+            [n.id for n in received],
+            [n["id"] for n in notifications[5:]])
+        self.assertTrue(all(
+            n["isRead"] for n in self.state.notifications[self.alice["id"]]))
+
+    def test_state_path(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        state_path = os.path.join(directory.name, "notifications.json")
+        self.notify(3)
+        watcher = NotificationWatcher(
+            self.mk, state_path=state_path, min_interval=0.01)
+        self.watch(watcher, 3)
+
+        # Resumes after the notifications already seen
+        watcher = NotificationWatcher(self.mk, state_path=state_path)
+        self.assertEqual(watcher.poll(), [])
+        notifications = self.notify(1)
+        self.assertEqual(
+            [n.id for n in watcher.poll()], [notifications[0]["id"]])
+
+    def test_unknown_type(self):
+        self.notify(1, "somethingNew")
+        self.notify(1)
+        watcher = NotificationWatcher(self.mk, min_interval=0.01)
+        self.assertEqual(
+            [n.type for n in self.watch(watcher, 2)],
+            ["somethingNew", NotificationTypeEnum.FOLLOW])
+
+
+class AsyncNotificationWatcherTest(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.state = MockState()
+        self.alice, token = self.state.create_user("alice")
+        self.bob, _ = self.state.create_user("bob")
+        self.server = await MockMisskeyServer(self.state).start()
+        self.addAsyncCleanup(self.server.close)
+        session = aiohttp.ClientSession()
+        self.addAsyncCleanup(session.close)
+        self.mk = AsyncMisskey(
+            address=self.server.address, token=token, session=session)
+
+    async def test_watch(self):
+        notifications = [
+            self.state.notify(
+                self.alice["id"], "follow", user_id=self.bob["id"])
+            for _ in range(15)
+        ]
+        watcher = AsyncNotificationWatcher(
+            self.mk, since_id=notifications[2]["id"], limit=5,
+            min_interval=0.01)
+        received = []
+        async for notification in watcher:
+            received.append(notification.id)
+            if len(received) == 12:
+                watcher.stop()
+        self.assertEqual(received, [n["id"] for n in notifications[3:]])
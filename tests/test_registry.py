@@ -0,0 +1,249 @@
+import os
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+import aiohttp
+
+from misskey import Misskey
+from misskey.asynchronous import AsyncMisskey
+from misskey.enum import VisibilityEnum
+from misskey.exceptions import MisskeyIllegalArgumentError
+from misskey.registry import (
+    EndpointRegistry,
+    SchemaCompiler,
+    camelize,
+    prepare_call,
+    registry_cache_path,
+)
+from misskey.testing import MockMisskeyServer, MockState
+
+COMPONENTS = {
+    "Note": {
+        "type": "object",
+        "properties": {
+            "id": {"type": "string"},
+            "text": {"type": ["string", "null"]},
+            "renote": {"$ref": "#/components/schemas/Note", "nullable": True},
+            "replies": {
+                "type": "array",
+                "items": {"$ref": "#/components/schemas/Note"},
+            },
+        },
+        "required": ["id"],
+    },
+}
+
+DOCUMENT = {
+    "info": {"version": "2024.5.0"},
+    "paths": {
+        "/notes/create": {"post": {
+            "requestBody": {"content": {"application/json": {"schema": {
+                "type": "object",
+                "properties": {
+                    "text": {"type": "string", "maxLength": 3000},
+                    "replyId": {"type": "string", "nullable": True},
+                    "visibility": {
+                        "type": "string",
+                        "enum": ["public", "home", "followers"],
+                    },
+                },
+                "required": ["text"],
+            }}}},
+            "security": [{"bearerAuth": []}],
+        }},
+    },
+    "components": {"schemas": COMPONENTS},
+}
+
+
+class SchemaCompilerTest(unittest.TestCase):
+    def setUp(self):
+        self.compiler = SchemaCompiler(COMPONENTS)
+
+    def assertInvalid(self, validate, value, message):
+        with self.assertRaises(MisskeyIllegalArgumentError) as cm:
+            validate(value, "value")
+        self.assertIn(message, str(cm.exception))
+
+    def test_ref_recursion(self):
+        validate = self.compiler.compile(
+            {"$ref": "#/components/schemas/Note"})
+        note = {"id": "a", "text": None, "renote": {
+            "id": "b", "renote": {"id": "c", "replies": [{"id": "d"}]}}}
+        validate(note, "value")
+        note["renote"]["renote"]["replies"][0]["text"] = 1
+        self.assertInvalid(
+            validate, note,
+            "value.renote.renote.replies[0].text: expected string or null")
+        # Unknown components accept anything
+        self.compiler.compile({"$ref": "#/components/schemas/Unknown"})(
+            1, "value")
+
+    def test_nullable(self):
+        for schema in (
+            {"type": ["string", "null"]},
+            {"type": "string", "nullable": True},
+            {"$ref": "#/components/schemas/Note", "nullable": True},
+        ):
+            with self.subTest(schema=schema):
+                self.compiler.compile({"properties": {"x": schema}})(
+                    {"x": None}, "value")
+        self.assertInvalid(
+            self.compiler.compile({"type": "string"}), None,
+            "value: expected string, got NoneType")
+
+    def test_any_of(self):
+        for keyword in ("anyOf", "oneOf"):
+            with self.subTest(keyword=keyword):
+                validate = self.compiler.compile({keyword: [
+                    {"type": "string", "maxLength": 2},
+                    {"type": "integer"},
+                ]})
+                validate("ab", "value")
+                validate(3, "value")
+                self.assertInvalid(validate, "abc", "no alternative matched")
+                self.assertInvalid(validate, 1.5, "expected integer")
+
+    def test_required(self):
+        validate = self.compiler.compile(
+            {"$ref": "#/components/schemas/Note"})
+        self.assertInvalid(validate, {"text": "a"}, "value.id: required")
+        self.assertInvalid(
+            validate, {"id": "a", "replies": [{}]},
+            "value.replies[0].id: required")
+        # Only objects have properties
+        self.compiler.compile({"required": ["id"]})("a", "value")
+
+    def test_constraints(self):
+        validate = self.compiler.compile({
+            "type": "integer", "minimum": 1, "maximum": 100})
+        validate(1, "value")
+        self.assertInvalid(validate, 0, "less than 1")
+        self.assertInvalid(validate, 101, "greater than 100")
+        self.assertInvalid(validate, True, "expected integer")
+        validate = self.compiler.compile({
+            "type": "string", "pattern": "^[a-z]+$", "enum": ["a", "b1"]})
+        self.assertInvalid(validate, "b1", "does not match")
+        self.assertInvalid(validate, "c", "must be one of")
+
+
+class PrepareCallTest(unittest.TestCase):
+    def test_camelize(self):
+        for name, expected in (
+            ("reply_id", "replyId"),
+            ("with_files_only", "withFilesOnly"),
+            ("text", "text"),
+            ("userId", "userId"),
+        ):
+            with self.subTest(name=name):
+                self.assertEqual(camelize(name), expected)
+
+    def test_prepare_call(self):
+        name, payload = prepare_call(
+            None, "/api/notes/create", {"local_only": True},
+            {"reply_id": "x", "visibility": VisibilityEnum.HOME})
+        self.assertEqual(name, "notes/create")
+        # Only the keyword arguments are converted
+        self.assertEqual(payload, {
+            "local_only": True, "replyId": "x", "visibility": "home"})
+
+    def test_validate(self):
+        registry = EndpointRegistry.from_openapi(DOCUMENT)
+        name, payload = prepare_call(
+            registry, "notes/create", None,
+            {"text": "a", "reply_id": None,
+             "visibility": VisibilityEnum.PUBLIC})
+        self.assertEqual(payload, {
+            "text": "a", "replyId": None, "visibility": "public"})
+        for kwargs, message in (
+            ({}, "params.text: required"),
+            ({"text": "a" * 3001}, "params.text: longer than 3000"),
+            ({"text": "a", "visibility": VisibilityEnum.SPECIFIED},
+             "params.visibility: must be one of"),
+            ({"text": "a", "reply_id": 1}, "params.replyId: expected string"),
+        ):
+            with self.subTest(kwargs=kwargs):
+                with self.assertRaises(MisskeyIllegalArgumentError) as cm:
+                    prepare_call(registry, "notes/create", None, kwargs)
+                self.assertIn(message, str(cm.exception))
+        with self.assertRaises(MisskeyIllegalArgumentError):
+            prepare_call(registry, "notes/delete", None, {})
+
+
+class EndpointRegistryTest(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+
+    def test_save_load(self):
+        registry = EndpointRegistry.from_openapi(DOCUMENT)
+        self.assertTrue(registry.get("/api/notes/create").requires_credential)
+        path = registry_cache_path("https://misskey.example", self.directory)
+        registry.save(path)
+        loaded = EndpointRegistry.load(path)
+        self.assertEqual(loaded.to_dict(), registry.to_dict())
+        self.assertEqual(os.listdir(self.directory), ["misskey.example.json"])
+
+        with mock.patch("misskey.registry.time.time",
+                        return_value=time.time() + 3600):
+            self.assertIsNone(EndpointRegistry.load(path, max_age=60))
+
+    def test_save_failure(self):
+        registry = EndpointRegistry.from_openapi(DOCUMENT)
+        path = os.path.join(self.directory, "registry.json")
+        with mock.patch("misskey.registry.os.replace",
+                        side_effect=PermissionError):
+            with self.assertRaises(PermissionError):
+                registry.save(path)
+        # No partial file is left behind
+        self.assertEqual(os.listdir(self.directory), [])
+
+
+class LoadRegistryTest(unittest.TestCase):
+    def setUp(self):
+        state = MockState()
+        _, token = state.create_user("alice")
+        self.server = MockMisskeyServer(state).start_in_thread()
+        self.addCleanup(self.server.stop)
+        self.mk = Misskey(address=self.server.address, token=token)
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+
+    def test_cached(self):
+        registry = self.mk.load_registry(cache_dir=self.directory)
+        self.assertIn("notes/create", registry)
+        self.assertIs(self.mk.registry, registry)
+        self.mk.load_registry(cache_dir=self.directory)
+        self.assertEqual(self.server.requests["/api/endpoints"], 1)
+        self.mk.load_registry(cache_dir=self.directory, refresh=True)
+        self.assertEqual(self.server.requests["/api/endpoints"], 2)
+
+    def test_unwritable_cache(self):
+        # A file where the directory should be
+        cache_dir = os.path.join(self.directory, "file")
+        open(cache_dir, "w").close()
+        registry = self.mk.load_registry(cache_dir=cache_dir)
+        self.assertIn("notes/create", registry)
+        self.assertEqual(self.mk.call("i")["username"], "alice")
+        with self.assertRaises(MisskeyIllegalArgumentError):
+            self.mk.call("notes/unknown")
+
+
+class AsyncLoadRegistryTest(unittest.IsolatedAsyncioTestCase):
+    async def test_unwritable_cache(self):
+        state = MockState()
+        _, token = state.create_user("alice")
+        server = await MockMisskeyServer(state).start()
+        self.addAsyncCleanup(server.close)
+        session = aiohttp.ClientSession()
+        self.addAsyncCleanup(session.close)
+        mk = AsyncMisskey(address=server.address, token=token,
+                          session=session)
+        with tempfile.NamedTemporaryFile() as f:
+            registry = await mk.load_registry(cache_dir=f.name)
+        self.assertIn("notes/create", registry)
+        self.assertEqual((await mk.call("i"))["username"], "alice")
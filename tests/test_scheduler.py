@@ -0,0 +1,231 @@
+import asyncio
+import threading
+import time
+import unittest
+
+import aiohttp
+
+from misskey import Misskey
+from misskey.asynchronous import AsyncMisskey
+from misskey.enum import RequestPriorityEnum
+from misskey.exceptions import MisskeyOverloadedError
+from misskey.scheduler import PriorityClass, RequestScheduler
+from misskey.testing import MockMisskeyServer, MockState
+
+INTERACTIVE = RequestPriorityEnum.INTERACTIVE
+NORMAL = RequestPriorityEnum.NORMAL
+BACKGROUND = RequestPriorityEnum.BACKGROUND
+
+# Queued in this order behind a blocked slot
+MIXED = (
+    ("b1", BACKGROUND),
+    ("n1", NORMAL),
+    ("i1", INTERACTIVE),
+    ("b2", BACKGROUND),
+    ("i2", INTERACTIVE),
+    ("n2", NORMAL),
+)
+ADMITTED = ["i1", "i2", "n1", "n2", "b1", "b2"]
+
+
+def waiting(scheduler):
+    return sum(stats.waiting for stats in scheduler.stats.values())
+
+
+def wait_until(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            raise AssertionError("Timed out")
+        time.sleep(0.001)
+
+
+async def wait_until_async(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            raise AssertionError("Timed out")
+        await asyncio.sleep(0.001)
+
+
+class RequestSchedulerTest(unittest.TestCase):
+    def test_priority_order(self):
+        scheduler = RequestScheduler(1)
+        admitted = []
+
+        def run(label, priority):
+            with scheduler.slot(priority):
+                admitted.append(label)
+
+        threads = []
+        with scheduler.slot(INTERACTIVE):
+            for n, (label, priority) in enumerate(MIXED, 1):
+                thread = threading.Thread(target=run, args=(label, priority))
+                thread.start()
+                threads.append(thread)
+                wait_until(lambda: waiting(scheduler) == n)
+            self.assertEqual(admitted, [])
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(admitted, ADMITTED)
+        stats = scheduler.stats
+        self.assertEqual(stats[INTERACTIVE].completed, 3)
+        self.assertEqual(stats[BACKGROUND].submitted, 2)
+        self.assertEqual(waiting(scheduler), 0)
+        self.assertGreater(stats[BACKGROUND].max_wait, 0.0)
+
+    def test_classify(self):
+        scheduler = RequestScheduler()
+        for endpoint, params, priority in (
+            ("/api/notes/create", {"replyId": "x"}, INTERACTIVE),
+            ("/api/notes/create", {"replyId": None}, NORMAL),
+            ("/api/notes/create", {"text": "x"}, NORMAL),
+            ("/api/notes/create", None, NORMAL),
+            ("/api/notes/show", {"replyId": "x"}, NORMAL),
+        ):
+            with self.subTest(endpoint=endpoint, params=params):
+                self.assertIs(
+                    scheduler.classify(endpoint, params), priority)
+        scheduler = RequestScheduler(default_priority=BACKGROUND)
+        self.assertIs(scheduler.classify("/api/i", {}), BACKGROUND)
+
+    def test_invalid(self):
+        with self.assertRaises(ValueError):
+            RequestScheduler(0)
+
+
+class AsyncRequestSchedulerTest(unittest.IsolatedAsyncioTestCase):
+    async def hold(self, scheduler, priority, released):
+        async with scheduler.slot_async(priority):
+            await released.wait()
+
+    async def test_priority_order(self):
+        scheduler = RequestScheduler(1)
+        admitted = []
+
+        async def run(label, priority):
+            async with scheduler.slot_async(priority):
+                admitted.append(label)
+
+        tasks = []
+        async with scheduler.slot_async(BACKGROUND):
+            for n, (label, priority) in enumerate(MIXED, 1):
+                tasks.append(asyncio.create_task(run(label, priority)))
+                await wait_until_async(lambda: waiting(scheduler) == n)
+        await asyncio.gather(*tasks)
+        self.assertEqual(admitted, ADMITTED)
+
+    async def test_background_quota(self):
+        # Background requests may only use half of the slots
+        scheduler = RequestScheduler(2)
+        released = asyncio.Event()
+        tasks = [
+            asyncio.create_task(self.hold(scheduler, priority, released))
+            for priority in (BACKGROUND, BACKGROUND, NORMAL)
+        ]
+        await wait_until_async(
+            lambda: scheduler.stats[NORMAL].active == 1)
+        stats = scheduler.stats
+        self.assertEqual(stats[BACKGROUND].active, 1)
+        self.assertEqual(stats[BACKGROUND].waiting, 1)
+        released.set()
+        await asyncio.gather(*tasks)
+        self.assertEqual(scheduler.stats[BACKGROUND].completed, 2)
+
+    async def test_shed(self):
+        scheduler = RequestScheduler(1, classes={
+            BACKGROUND: PriorityClass(concurrency=1, max_queue=1)})
+        released = asyncio.Event()
+        holder = asyncio.create_task(self.hold(scheduler, NORMAL, released))
+        queued = asyncio.create_task(
+            self.hold(scheduler, BACKGROUND, released))
+        await wait_until_async(lambda: waiting(scheduler) == 1)
+        with self.assertRaises(MisskeyOverloadedError):
+            async with scheduler.slot_async(BACKGROUND):
+                pass
+        # Other classes are not limited
+        normal = asyncio.create_task(self.hold(scheduler, NORMAL, released))
+        await wait_until_async(lambda: waiting(scheduler) == 2)
+        released.set()
+        await asyncio.gather(holder, queued, normal)
+        self.assertEqual(scheduler.stats[BACKGROUND].shed, 1)
+        self.assertEqual(scheduler.stats[BACKGROUND].completed, 1)
+
+    async def test_cancel(self):
+        scheduler = RequestScheduler(1)
+        released = asyncio.Event()
+        holder = asyncio.create_task(self.hold(scheduler, NORMAL, released))
+        queued = asyncio.create_task(self.hold(scheduler, NORMAL, released))
+        await wait_until_async(lambda: waiting(scheduler) == 1)
+        queued.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            await queued
+        stats = scheduler.stats[NORMAL]
+        self.assertEqual((stats.cancelled, stats.waiting), (1, 0))
+
+        released.set()
+        await holder
+        # The slot of the cancelled request is not leaked
+        async with scheduler.slot_async(NORMAL):
+            self.assertEqual(scheduler.stats[NORMAL].active, 1)
+        self.assertEqual(scheduler.stats[NORMAL].active, 0)
+
+
+class ScheduledClientTest(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.state = MockState()
+        _, token = self.state.create_user("alice")
+        self.server = await MockMisskeyServer(self.state).start()
+        self.addAsyncCleanup(self.server.close)
+        session = aiohttp.ClientSession()
+        self.addAsyncCleanup(session.close)
+        self.scheduler = RequestScheduler(1)
+        self.mk = AsyncMisskey(
+            address=self.server.address, token=token, session=session,
+            scheduler=self.scheduler)
+
+    async def test_with_priority(self):
+        note = (await self.mk.notes_create(text="note")).created_note
+        background = self.mk.with_priority(BACKGROUND)
+        self.assertIsNone(self.mk.request_priority)
+        self.assertIs(background.scheduler, self.scheduler)
+        self.assertIs(background.session, self.mk.session)
+        self.assertIsNone(background.with_priority(None).request_priority)
+
+        tasks = []
+        async with self.scheduler.slot_async(INTERACTIVE):
+            for n, request in enumerate((
+                background.notes_create(text="background"),
+                self.mk.notes_create(text="normal"),
+                # Replies are classified as interactive
+                self.mk.notes_create(text="reply", reply_id=note.id),
+                # The priority of the handle wins over the classification
+                background.notes_create(
+                    text="background reply", reply_id=note.id),
+            ), 1):
+                tasks.append(asyncio.create_task(request))
+                await wait_until_async(
+                    lambda: waiting(self.scheduler) == n)
+        await asyncio.gather(*tasks)
+
+        self.assertEqual(
+            [self.state.notes[i]["text"] for i in self.state.note_ids[1:]],
+            ["reply", "normal", "background", "background reply"])
+        self.assertEqual(self.scheduler.stats[BACKGROUND].completed, 2)
+
+
+class ScheduledSyncClientTest(unittest.TestCase):
+    def test_requests(self):
+        state = MockState()
+        _, token = state.create_user("alice")
+        server = MockMisskeyServer(state).start_in_thread()
+        self.addCleanup(server.stop)
+        scheduler = RequestScheduler(1)
+        mk = Misskey(address=server.address, token=token, scheduler=scheduler)
+
+        mk.i()
+        mk.with_priority(BACKGROUND).i()
+        stats = scheduler.stats
+        self.assertEqual(stats[NORMAL].completed, 1)
+        self.assertEqual(stats[BACKGROUND].completed, 1)
@@ -0,0 +1,92 @@
+import os
+import tempfile
+import unittest
+
+import aiohttp
+
+from misskey import Misskey
+from misskey.asynchronous import AsyncMisskey
+from misskey.exceptions import MisskeyAPIError, MisskeyCassetteError
+from misskey.testing import MockMisskeyServer, MockState
+from misskey.transport import RecordingTransport, ReplayTransport
+
+# Not served by anything, so replayed requests can not reach a server
+ADDRESS = "http://127.0.0.1:9"
+
+
+def record_session(path):
+    state = MockState()
+    _, token = state.create_user("alice")
+    with MockMisskeyServer(state) as server, \
+            RecordingTransport(path) as transport:
+        mk = Misskey(address=server.address, token=token,
+                     transport=transport)
+        note = mk.notes_create(text="Hello").created_note
+        drive_file = mk.drive_files_create(
+            file=b"Hello, world", name="hello.txt")
+        try:
+            mk.notes_show(note_id="missing")
+        except MisskeyAPIError:
+            pass
+    return note, drive_file
+
+
+class TransportTest(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+
+    def test_replay(self):
+        for name in ("session.jsonl", "session.jsonl.gz"):
+            with self.subTest(name=name):
+                path = os.path.join(self.directory, name)
+                note, drive_file = record_session(path)
+
+                transport = ReplayTransport(path)
+                # Tokens are not part of the recorded requests
+                mk = Misskey(address=ADDRESS, token="other",
+                             transport=transport)
+                self.assertEqual(
+                    mk.notes_create(text="Hello").created_note.id, note.id)
+                self.assertEqual(
+                    mk.drive_files_create(
+                        file=b"Hello, world", name="hello.txt").id,
+                    drive_file.id)
+                with self.assertRaises(MisskeyAPIError) as cm:
+                    mk.notes_show(note_id="missing")
+                self.assertEqual(cm.exception.code, "NO_SUCH_NOTE")
+                self.assertEqual(transport.remaining, 3)
+
+    def test_unrecorded_request(self):
+        path = os.path.join(self.directory, "session.jsonl")
+        record_session(path)
+        mk = Misskey(address=ADDRESS, transport=ReplayTransport(path))
+        with self.assertRaises(MisskeyCassetteError):
+            mk.notes_create(text="Bye")
+
+    def test_no_repeat(self):
+        path = os.path.join(self.directory, "session.jsonl")
+        record_session(path)
+        transport = ReplayTransport(path, repeat=False)
+        mk = Misskey(address=ADDRESS, transport=transport)
+        mk.notes_create(text="Hello")
+        self.assertEqual(transport.remaining, 2)
+        with self.assertRaises(MisskeyCassetteError):
+            mk.notes_create(text="Hello")
+
+
+class AsyncTransportTest(unittest.IsolatedAsyncioTestCase):
+    async def test_replay(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "session.jsonl")
+            note, drive_file = record_session(path)
+
+            async with aiohttp.ClientSession() as session:
+                mk = AsyncMisskey(address=ADDRESS, session=session,
+                                  transport=ReplayTransport(path))
+                created = await mk.notes_create(text="Hello")
+                self.assertEqual(created.created_note.id, note.id)
+                uploaded = await mk.drive_files_create(
+                    file=b"Hello, world", name="hello.txt")
+                self.assertEqual(uploaded.id, drive_file.id)